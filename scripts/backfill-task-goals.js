@@ -0,0 +1,90 @@
+const sdk = require('node-appwrite');
+const { Query } = sdk;
+const path = require('path');
+require('dotenv').config({ path: path.resolve(__dirname, '../.env') });
+
+// Backfills `goalId` on tasks that only carry their `phaseId`. POST /api/gpt/phases/{phaseId}/tasks
+// used to leave it out, so those tasks were missing from the goal trees, which query tasks by goalId.
+// Usage: node scripts/backfill-task-goals.js [--dry-run]
+
+const client = new sdk.Client();
+
+const endpoint = process.env.NEXT_PUBLIC_APPWRITE_ENDPOINT;
+const projectId = process.env.NEXT_PUBLIC_APPWRITE_PROJECT_ID;
+const apiKey = process.env.APPWRITE_API;
+const DB_ID = process.env.NEXT_PUBLIC_APPWRITE_DATABASE_ID;
+
+if (!endpoint || !projectId || !apiKey || !DB_ID) {
+    console.error('Missing Appwrite configuration in .env');
+    process.exit(1);
+}
+
+client
+    .setEndpoint(endpoint)
+    .setProject(projectId)
+    .setKey(apiKey);
+
+const databases = new sdk.Databases(client);
+
+const PAGE_SIZE = 100;
+const dryRun = process.argv.includes('--dry-run');
+
+// phaseId -> goalId, or null for phases that no longer exist
+const phaseGoals = new Map();
+
+async function getPhaseGoal(phaseId) {
+    if (!phaseGoals.has(phaseId)) {
+        try {
+            const phase = await databases.getDocument(DB_ID, 'phases', phaseId, [Query.select(['goalId'])]);
+            phaseGoals.set(phaseId, phase.goalId || null);
+        } catch {
+            phaseGoals.set(phaseId, null);
+        }
+    }
+    return phaseGoals.get(phaseId);
+}
+
+async function backfill() {
+    let cursor = null;
+    let scanned = 0;
+    let updated = 0;
+    let orphaned = 0;
+
+    try {
+        while (true) {
+            const queries = [Query.select(['$id', 'phaseId', 'goalId']), Query.limit(PAGE_SIZE)];
+            if (cursor) queries.push(Query.cursorAfter(cursor));
+
+            const page = await databases.listDocuments(DB_ID, 'tasks', queries);
+            if (page.documents.length === 0) break;
+
+            for (const task of page.documents) {
+                scanned++;
+                if (task.goalId || !task.phaseId) continue;
+
+                const goalId = await getPhaseGoal(task.phaseId);
+                if (!goalId) {
+                    orphaned++;
+                    console.log(`${task.$id}: phase ${task.phaseId} not found, skipped`);
+                    continue;
+                }
+
+                if (!dryRun) {
+                    await databases.updateDocument(DB_ID, 'tasks', task.$id, { goalId });
+                }
+                updated++;
+                console.log(`${dryRun ? '[dry run] ' : ''}${task.$id}: goalId ${goalId}`);
+            }
+
+            cursor = page.documents[page.documents.length - 1].$id;
+            if (page.documents.length < PAGE_SIZE) break;
+        }
+
+        console.log(`Scanned ${scanned} tasks, ${dryRun ? 'would update' : 'updated'} ${updated}, ${orphaned} without a phase.`);
+    } catch (error) {
+        console.error('Backfill failed:', error);
+        process.exit(1);
+    }
+}
+
+backfill();
@@ -0,0 +1,183 @@
+const sdk = require('node-appwrite');
+const { Query } = sdk;
+const path = require('path');
+require('dotenv').config({ path: path.resolve(__dirname, '../.env') });
+
+// Migrates habits from the legacy `completedDates` array to run-length encoded `completedRuns`,
+// and backfills the derived `lastCompletedDate` and `recentRuns` fields the habit lists read.
+// Habits that were never completed get the empty fields too, since the lists treat a missing
+// `recentRuns` as a legacy document and read its whole history.
+// Habits are also migrated lazily whenever they are logged, so this only speeds up the switch.
+// Usage: node scripts/migrate-habit-runs.js [--dry-run]
+
+const client = new sdk.Client();
+
+const endpoint = process.env.NEXT_PUBLIC_APPWRITE_ENDPOINT;
+const projectId = process.env.NEXT_PUBLIC_APPWRITE_PROJECT_ID;
+const apiKey = process.env.APPWRITE_API;
+const DB_ID = process.env.NEXT_PUBLIC_APPWRITE_DATABASE_ID;
+
+if (!endpoint || !projectId || !apiKey || !DB_ID) {
+    console.error('Missing Appwrite configuration in .env');
+    process.exit(1);
+}
+
+client
+    .setEndpoint(endpoint)
+    .setProject(projectId)
+    .setKey(apiKey);
+
+const databases = new sdk.Databases(client);
+
+const PAGE_SIZE = 100;
+// Same window as RECENT_DAYS in src/lib/habit-utils.ts
+const RECENT_DAYS = 30;
+const dryRun = process.argv.includes('--dry-run');
+
+// Same encoding as encodeRuns in src/lib/habit-utils.ts
+function localDateString(date) {
+    const year = date.getFullYear();
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const day = String(date.getDate()).padStart(2, '0');
+    return `${year}-${month}-${day}`;
+}
+
+function nextDay(dateStr) {
+    return addDays(dateStr, 1);
+}
+
+function addDays(dateStr, days) {
+    const [year, month, day] = dateStr.split('-').map(Number);
+    return localDateString(new Date(year, month - 1, day + days));
+}
+
+function encodeRuns(completedDates) {
+    const sortedDates = Array.from(new Set(completedDates)).sort();
+    const runs = [];
+    let start = '';
+    let length = 0;
+    let previous = '';
+
+    for (const dateStr of sortedDates) {
+        if (length > 0 && nextDay(previous) === dateStr) {
+            length++;
+        } else {
+            if (length > 0) runs.push(`${start}/${length}`);
+            start = dateStr;
+            length = 1;
+        }
+        previous = dateStr;
+    }
+    if (length > 0) runs.push(`${start}/${length}`);
+
+    return runs;
+}
+
+function calculateStreaks(runs) {
+    if (runs.length === 0) return { streak: 0, longestStreak: 0 };
+
+    const lengths = runs.map(run => Number(run.split('/')[1]));
+    const [start] = runs[runs.length - 1].split('/');
+    const lastLength = lengths[lengths.length - 1];
+
+    let lastDate = start;
+    for (let i = 1; i < lastLength; i++) lastDate = nextDay(lastDate);
+
+    const today = new Date();
+    const yesterday = new Date();
+    yesterday.setDate(yesterday.getDate() - 1);
+    const isCurrent = lastDate === localDateString(today) || lastDate === localDateString(yesterday);
+
+    return { streak: isCurrent ? lastLength : 0, longestStreak: Math.max(...lengths) };
+}
+
+// Same as summarizeRuns in src/lib/habit-utils.ts, minus the streaks
+function deriveFields(runs) {
+    if (runs.length === 0) return { lastCompletedDate: null, recentRuns: [] };
+
+    const [lastStart, lastLength] = runs[runs.length - 1].split('/');
+    const from = addDays(localDateString(new Date()), 1 - RECENT_DAYS);
+    const recentRuns = [];
+    for (const run of runs) {
+        const [start, length] = run.split('/');
+        const end = addDays(start, Number(length) - 1);
+        if (end < from) continue;
+        if (start >= from) {
+            recentRuns.push(run);
+        } else {
+            const kept = Math.round((new Date(`${end}T00:00:00`) - new Date(`${from}T00:00:00`)) / 86400000) + 1;
+            recentRuns.push(`${from}/${kept}`);
+        }
+    }
+    return { lastCompletedDate: addDays(lastStart, Number(lastLength) - 1), recentRuns };
+}
+
+const sameRuns = (a, b) => Array.isArray(b) && a.length === b.length && a.every((run, i) => run === b[i]);
+
+async function migrate() {
+    let cursor = null;
+    let scanned = 0;
+    let migrated = 0;
+    let datesBefore = 0;
+    let runsAfter = 0;
+
+    try {
+        while (true) {
+            const queries = [Query.limit(PAGE_SIZE)];
+            if (cursor) queries.push(Query.cursorAfter(cursor));
+
+            const page = await databases.listDocuments(DB_ID, 'habits', queries);
+            if (page.documents.length === 0) break;
+
+            for (const habit of page.documents) {
+                scanned++;
+                const completedDates = habit.completedDates || [];
+                const hasRuns = habit.completedRuns && habit.completedRuns.length > 0;
+                if (!hasRuns && completedDates.length === 0) {
+                    if (Array.isArray(habit.recentRuns)) continue;
+                    if (!dryRun) {
+                        await databases.updateDocument(DB_ID, 'habits', habit.$id, {
+                            completedRuns: [], ...deriveFields([]), streak: 0, longestStreak: 0,
+                        });
+                    }
+                    migrated++;
+                    console.log(`${dryRun ? '[dry run] ' : ''}${habit.$id}: no completions, backfilled empty fields`);
+                    continue;
+                }
+
+                const completedRuns = hasRuns ? habit.completedRuns : encodeRuns(completedDates);
+                const derived = deriveFields(completedRuns);
+                const isCurrent = derived.lastCompletedDate === habit.lastCompletedDate
+                    && sameRuns(derived.recentRuns, habit.recentRuns);
+                if (hasRuns && isCurrent) continue;
+
+                const update = { ...calculateStreaks(completedRuns), ...derived };
+                if (!hasRuns) {
+                    update.completedRuns = completedRuns;
+                    update.completedDates = [];
+                    datesBefore += completedDates.length;
+                    runsAfter += completedRuns.length;
+                }
+
+                if (!dryRun) {
+                    await databases.updateDocument(DB_ID, 'habits', habit.$id, update);
+                }
+                migrated++;
+                console.log(hasRuns
+                    ? `${dryRun ? '[dry run] ' : ''}${habit.$id}: backfilled derived fields`
+                    : `${dryRun ? '[dry run] ' : ''}${habit.$id}: ${completedDates.length} dates -> ${completedRuns.length} runs`);
+            }
+
+            cursor = page.documents[page.documents.length - 1].$id;
+            if (page.documents.length < PAGE_SIZE) break;
+        }
+
+        console.log(`Scanned ${scanned} habits, ${dryRun ? 'would migrate' : 'migrated'} ${migrated}.`);
+        console.log(`Stored entries: ${datesBefore} dates -> ${runsAfter} runs.`);
+    } catch (error) {
+        console.error('Migration failed:', error);
+        process.exit(1);
+    }
+}
+
+migrate();
@@ -110,8 +110,13 @@ async function setup() {
         await createAttribute(DB_ID, 'habits', 'string', 'title', 255, true);
         await createAttribute(DB_ID, 'habits', 'integer', 'streak', null, false, 0); // Integer for streak count
         await createAttribute(DB_ID, 'habits', 'integer', 'longestStreak', null, false, 0); // Integer for best streak
-        // Better approach for habits: Array of strings for completed dates (ISO date string YYYY-MM-DD)
+        // Legacy: Array of strings for completed dates (ISO date string YYYY-MM-DD), see migrate-habit-runs.js
         await createAttribute(DB_ID, 'habits', 'string', 'completedDates', 20, false, null, true); // Array of strings
+        // Run-length encoded completions: "YYYY-MM-DD/N" = N consecutive days starting at the date
+        await createAttribute(DB_ID, 'habits', 'string', 'completedRuns', 20, false, null, true); // Array of strings
+        // Derived from completedRuns on every write, so list views can skip the full history
+        await createAttribute(DB_ID, 'habits', 'string', 'lastCompletedDate', 10, false); // YYYY-MM-DD
+        await createAttribute(DB_ID, 'habits', 'string', 'recentRuns', 20, false, null, true); // Runs within the last 30 days
         await createAttribute(DB_ID, 'habits', 'string', 'userId', 255, true);
 
         // Resources
@@ -147,6 +152,18 @@ async function setup() {
         await createIndex(DB_ID, 'api_keys', 'key_idx', 'unique', ['key']);
         await createIndex(DB_ID, 'api_keys', 'userId_idx', 'key', ['userId']);
 
+        // Composite indexes matching each list query's filters and ordering, so the database
+        // reads rows in order instead of sorting every match. testscripts/index_audit.py
+        // checks these against captured queries.
+        await createIndex(DB_ID, 'goals', 'userId_createdAt_idx', 'key', ['userId', '$createdAt']);
+        await createIndex(DB_ID, 'phases', 'goalId_order_idx', 'key', ['goalId', 'order']);
+        await createIndex(DB_ID, 'tasks', 'userId_isCompleted_dueDate_idx', 'key', ['userId', 'isCompleted', 'dueDate']);
+        await createIndex(DB_ID, 'tasks', 'userId_dueDate_idx', 'key', ['userId', 'dueDate']);
+        await createIndex(DB_ID, 'tasks', 'goalId_createdAt_idx', 'key', ['goalId', '$createdAt']);
+        await createIndex(DB_ID, 'tasks', 'phaseId_userId_idx', 'key', ['phaseId', 'userId']);
+        await createIndex(DB_ID, 'resources', 'userId_createdAt_idx', 'key', ['userId', '$createdAt']);
+        await createIndex(DB_ID, 'inbox', 'userId_isProcessed_createdAt_idx', 'key', ['userId', 'isProcessed', '$createdAt']);
+
         // 5. Create Storage Bucket
         console.log('Creating Storage Bucket...');
         const bucketPermissions = [
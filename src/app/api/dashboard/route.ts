@@ -0,0 +1,50 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { getRequestUserId } from '@/lib/server/appwrite';
+import { getDashboardSummary } from '@/lib/server/dashboard';
+import { recordError, withTiming } from '@/lib/server/timing';
+
+/**
+ * Summary behind the dashboard cards: open tasks due by ?dueBefore= (an ISO timestamp,
+ * normally the end of the user's local day) and habit streaks, with only the rendered fields.
+ *
+ * Accepts the app's session JWT or a GPT API key. Summaries are cached per user for a few
+ * seconds; send Cache-Control: no-cache after a write to skip the cache.
+ */
+export const GET = withTiming('GET /api/dashboard', async (req: NextRequest) => {
+    const userId = await getRequestUserId(req);
+    if (userId === undefined) {
+        return NextResponse.json({ error: 'Missing API Key or session token' }, { status: 401 });
+    }
+    if (!userId) {
+        return NextResponse.json({ error: 'Invalid API Key or session token' }, { status: 401 });
+    }
+
+    const dueBeforeParam = req.nextUrl.searchParams.get('dueBefore');
+    let dueBefore: string;
+    if (dueBeforeParam) {
+        const parsed = Date.parse(dueBeforeParam);
+        if (Number.isNaN(parsed)) {
+            return NextResponse.json({ error: 'dueBefore must be an ISO 8601 timestamp' }, { status: 400 });
+        }
+        dueBefore = new Date(parsed).toISOString();
+    } else {
+        const endOfToday = new Date();
+        endOfToday.setUTCHours(23, 59, 59, 999);
+        dueBefore = endOfToday.toISOString();
+    }
+
+    try {
+        const fresh = req.headers.get('Cache-Control')?.includes('no-cache') ?? false;
+        const { summary, cached } = await getDashboardSummary(userId, dueBefore, { fresh });
+        return NextResponse.json(summary, {
+            status: 200,
+            headers: {
+                'Cache-Control': 'private, no-store',
+                'X-Cache': cached ? 'HIT' : 'MISS',
+            },
+        });
+    } catch (error) {
+        recordError('Error loading dashboard', error);
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+    }
+});
@@ -0,0 +1,41 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { AppwriteException } from 'node-appwrite';
+import { databases, DATABASE_ID, getSessionUserId } from '@/lib/server/appwrite';
+import { invalidateDashboard } from '@/lib/server/dashboard';
+import { forgetOwnership, ownsGoal } from '@/lib/server/ownership';
+import { recordError, withTiming } from '@/lib/server/timing';
+
+/**
+ * Deletes one of the signed-in user's goals. Going through the server drops the goal and its
+ * phases from this instance's ownership cache, so the GPT routes stop adding phases and tasks
+ * under it at once instead of after OWNERSHIP_CACHE_TTL_MS.
+ */
+export const DELETE = withTiming('DELETE /api/goals/{goalId}', async (req: NextRequest, { params }: { params: Promise<{ goalId: string }> }) => {
+    const userId = await getSessionUserId(req);
+    if (userId === undefined) {
+        return NextResponse.json({ error: 'Missing session token' }, { status: 401 });
+    }
+    if (!userId) {
+        return NextResponse.json({ error: 'Invalid session token' }, { status: 401 });
+    }
+
+    const { goalId } = await params;
+
+    try {
+        if (!(await ownsGoal(userId, goalId))) {
+            return NextResponse.json({ error: 'Goal not found or access denied' }, { status: 404 });
+        }
+
+        await databases().deleteDocument(DATABASE_ID(), 'goals', goalId);
+        forgetOwnership('goals', goalId);
+        invalidateDashboard(userId);
+        return new NextResponse(null, { status: 204 });
+    } catch (error) {
+        if (error instanceof AppwriteException && error.code === 404) {
+            forgetOwnership('goals', goalId);
+            return NextResponse.json({ error: 'Goal not found or access denied' }, { status: 404 });
+        }
+        recordError('Error deleting goal', error);
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+    }
+});
@@ -1,8 +1,13 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { validateApiKey, databases, DATABASE_ID } from '@/lib/server/appwrite';
-import { ID, Permission, Role } from 'node-appwrite';
+import { ownsGoal, rememberOwnership } from '@/lib/server/ownership';
+import { InvalidCursorError, listPage, pageResponse, parsePageParams } from '@/lib/server/pagination';
+import { withIdempotency } from '@/lib/server/idempotency';
+import { admitRequest } from '@/lib/server/rateLimit';
+import { recordError, withTiming } from '@/lib/server/timing';
+import { ID, Permission, Role, Query } from 'node-appwrite';
 
-export async function POST(req: NextRequest, { params }: { params: Promise<{ goalId: string }> }) {
+export const POST = withTiming('POST /api/gpt/goals/{goalId}/phases', withIdempotency(async (req: NextRequest, { params }: { params: Promise<{ goalId: string }> }) => {
     const apiKey = req.headers.get('X-API-Key');
     if (!apiKey) {
         return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
@@ -13,6 +18,11 @@ export async function POST(req: NextRequest, { params }: { params: Promise<{ goa
         return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
     }
 
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
     const { goalId } = await params;
     const db = databases();
     const dbId = DATABASE_ID();
@@ -25,14 +35,8 @@ export async function POST(req: NextRequest, { params }: { params: Promise<{ goa
             return NextResponse.json({ error: 'Title and order are required' }, { status: 400 });
         }
 
-        // Verify goal ownership (optional but recommended)
-        try {
-            const goal = await db.getDocument(dbId, 'goals', goalId);
-            if (goal.userId !== userId) {
-                 return NextResponse.json({ error: 'Goal not found or access denied' }, { status: 404 });
-            }
-        } catch {
-             return NextResponse.json({ error: 'Goal not found' }, { status: 404 });
+        if (!(await ownsGoal(userId, goalId))) {
+            return NextResponse.json({ error: 'Goal not found or access denied' }, { status: 404 });
         }
 
         const doc = await db.createDocument(
@@ -52,9 +56,49 @@ export async function POST(req: NextRequest, { params }: { params: Promise<{ goa
             ]
         );
 
+        rememberOwnership(userId, 'phases', doc.$id, goalId);
         return NextResponse.json(doc, { status: 201 });
     } catch (error) {
-        console.error('Error creating phase:', error);
+        recordError('Error creating phase', error);
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+    }
+}));
+
+export const GET = withTiming('GET /api/gpt/goals/{goalId}/phases', async (req: NextRequest, { params }: { params: Promise<{ goalId: string }> }) => {
+    const apiKey = req.headers.get('X-API-Key');
+    if (!apiKey) {
+        return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
+    }
+
+    const userId = await validateApiKey(apiKey);
+    if (!userId) {
+        return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
+    }
+
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
+    const { goalId } = await params;
+    const pageParams = parsePageParams(req, 'phases');
+    if ('error' in pageParams) {
+        return NextResponse.json({ error: pageParams.error }, { status: 400 });
+    }
+
+    try {
+        // Phases carry no userId, so ownership is checked on the goal
+        if (!(await ownsGoal(userId, goalId))) {
+            return NextResponse.json({ error: 'Goal not found or access denied' }, { status: 404 });
+        }
+
+        const page = await listPage('phases', [Query.equal('goalId', goalId), Query.orderAsc('order')], pageParams);
+        return pageResponse(req, page);
+    } catch (error) {
+        if (error instanceof InvalidCursorError) {
+            return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 });
+        }
+        recordError('Error listing phases', error);
         return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
     }
-}
+});
@@ -1,8 +1,13 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { validateApiKey, databases, DATABASE_ID } from '@/lib/server/appwrite';
-import { ID, Permission, Role } from 'node-appwrite';
+import { rememberOwnership } from '@/lib/server/ownership';
+import { InvalidCursorError, listPage, pageResponse, parsePageParams } from '@/lib/server/pagination';
+import { withIdempotency } from '@/lib/server/idempotency';
+import { admitRequest } from '@/lib/server/rateLimit';
+import { recordError, withTiming } from '@/lib/server/timing';
+import { ID, Permission, Role, Query } from 'node-appwrite';
 
-export async function POST(req: NextRequest) {
+export const POST = withTiming('POST /api/gpt/goals', withIdempotency(async (req: NextRequest) => {
     const apiKey = req.headers.get('X-API-Key');
     if (!apiKey) {
         return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
@@ -13,6 +18,11 @@ export async function POST(req: NextRequest) {
         return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
     }
 
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
     const db = databases();
     const dbId = DATABASE_ID();
 
@@ -41,9 +51,43 @@ export async function POST(req: NextRequest) {
             ]
         );
 
+        rememberOwnership(userId, 'goals', doc.$id, doc.$id);
         return NextResponse.json(doc, { status: 201 });
     } catch (error) {
-        console.error('Error creating goal:', error);
+        recordError('Error creating goal', error);
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+    }
+}));
+
+export const GET = withTiming('GET /api/gpt/goals', async (req: NextRequest) => {
+    const apiKey = req.headers.get('X-API-Key');
+    if (!apiKey) {
+        return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
+    }
+
+    const userId = await validateApiKey(apiKey);
+    if (!userId) {
+        return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
+    }
+
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
+    const params = parsePageParams(req, 'goals');
+    if ('error' in params) {
+        return NextResponse.json({ error: params.error }, { status: 400 });
+    }
+
+    try {
+        const page = await listPage('goals', [Query.equal('userId', userId)], params);
+        return pageResponse(req, page);
+    } catch (error) {
+        if (error instanceof InvalidCursorError) {
+            return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 });
+        }
+        recordError('Error listing goals', error);
         return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
     }
-}
+});
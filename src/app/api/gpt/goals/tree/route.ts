@@ -0,0 +1,155 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { validateApiKey, databases, DATABASE_ID } from '@/lib/server/appwrite';
+import { invalidateDashboard } from '@/lib/server/dashboard';
+import { rememberOwnership } from '@/lib/server/ownership';
+import { withIdempotency } from '@/lib/server/idempotency';
+import { admitRequest } from '@/lib/server/rateLimit';
+import { recordError, withTiming } from '@/lib/server/timing';
+import {
+    BATCH_CONCURRENCY,
+    CreatedDocuments,
+    MAX_BATCH_PHASES,
+    MAX_BATCH_TASKS,
+    mapWithConcurrency,
+    validateTaskInputs,
+} from '@/lib/server/batch';
+import { ID, Permission, Role } from 'node-appwrite';
+
+interface PhaseInput {
+    title: string;
+    order?: number;
+    tasks?: { title: string; dueDate?: string }[];
+}
+
+/**
+ * Creates a goal with its phases and their tasks in one request.
+ * Phases are created in parallel once the goal exists, then all tasks in parallel.
+ */
+export const POST = withTiming('POST /api/gpt/goals/tree', withIdempotency(async (req: NextRequest) => {
+    const apiKey = req.headers.get('X-API-Key');
+    if (!apiKey) {
+        return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
+    }
+
+    const userId = await validateApiKey(apiKey);
+    if (!userId) {
+        return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
+    }
+
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
+    const db = databases();
+    const dbId = DATABASE_ID();
+    const created = new CreatedDocuments();
+
+    try {
+        const body = await req.json();
+        const { title, description, deadline } = body;
+        const phases: PhaseInput[] = body.phases ?? [];
+
+        // Validate the whole tree before writing anything
+        if (!title) {
+            return NextResponse.json({ error: 'Title is required' }, { status: 400 });
+        }
+        if (!Array.isArray(phases)) {
+            return NextResponse.json({ error: 'phases must be an array' }, { status: 400 });
+        }
+        if (phases.length > MAX_BATCH_PHASES) {
+            return NextResponse.json({ error: `At most ${MAX_BATCH_PHASES} phases per request` }, { status: 400 });
+        }
+        let taskCount = 0;
+        for (let i = 0; i < phases.length; i++) {
+            if (!phases[i] || !phases[i].title) {
+                return NextResponse.json({ error: `phases[${i}].title is required` }, { status: 400 });
+            }
+            const tasksError = validateTaskInputs(phases[i].tasks ?? [], `phases[${i}].tasks`);
+            if (tasksError) {
+                return NextResponse.json({ error: tasksError }, { status: 400 });
+            }
+            taskCount += (phases[i].tasks ?? []).length;
+        }
+        if (taskCount > MAX_BATCH_TASKS) {
+            return NextResponse.json({ error: `At most ${MAX_BATCH_TASKS} tasks per request` }, { status: 400 });
+        }
+
+        const permissions = [
+            Permission.read(Role.user(userId)),
+            Permission.update(Role.user(userId)),
+            Permission.delete(Role.user(userId)),
+        ];
+
+        const goal = await db.createDocument(
+            dbId,
+            'goals',
+            ID.unique(),
+            {
+                title,
+                description,
+                deadline,
+                userId,
+            },
+            permissions
+        );
+        created.add('goals', goal.$id);
+
+        const phaseDocs = await mapWithConcurrency(phases, BATCH_CONCURRENCY, async (phase, index) => {
+            const doc = await db.createDocument(
+                dbId,
+                'phases',
+                ID.unique(),
+                {
+                    title: phase.title,
+                    order: phase.order ?? index + 1,
+                    goalId: goal.$id,
+                    isCompleted: false
+                },
+                permissions
+            );
+            created.add('phases', doc.$id);
+            return doc;
+        });
+
+        // Flatten tasks across phases so the concurrency limit applies to the whole tree
+        const taskInputs = phases.flatMap((phase, phaseIndex) =>
+            (phase.tasks ?? []).map(task => ({ ...task, phaseIndex }))
+        );
+        const taskDocs = await mapWithConcurrency(taskInputs, BATCH_CONCURRENCY, async (task) => {
+            const doc = await db.createDocument(
+                dbId,
+                'tasks',
+                ID.unique(),
+                {
+                    title: task.title,
+                    dueDate: task.dueDate,
+                    phaseId: phaseDocs[task.phaseIndex].$id,
+                    goalId: goal.$id,
+                    isCompleted: false,
+                    userId
+                },
+                permissions
+            );
+            created.add('tasks', doc.$id);
+            return doc;
+        });
+
+        invalidateDashboard(userId);
+        rememberOwnership(userId, 'goals', goal.$id, goal.$id);
+        for (const phase of phaseDocs) {
+            rememberOwnership(userId, 'phases', phase.$id, goal.$id);
+        }
+        return NextResponse.json({
+            ...goal,
+            phases: phaseDocs.map(phase => ({
+                ...phase,
+                tasks: taskDocs.filter(task => task.phaseId === phase.$id),
+            })),
+        }, { status: 201 });
+    } catch (error) {
+        recordError('Error creating goal tree', error);
+        await created.rollback();
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+    }
+}));
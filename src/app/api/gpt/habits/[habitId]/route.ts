@@ -1,8 +1,12 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { validateApiKey, databases, DATABASE_ID } from '@/lib/server/appwrite';
-import { calculateStreaks } from '@/lib/habit-utils';
+import { invalidateDashboard } from '@/lib/server/dashboard';
+import { applyCompletions, isValidDate } from '@/lib/server/habits';
+import { withIdempotency } from '@/lib/server/idempotency';
+import { admitRequest } from '@/lib/server/rateLimit';
+import { recordError, withTiming } from '@/lib/server/timing';
 
-export async function PATCH(req: NextRequest, { params }: { params: Promise<{ habitId: string }> }) {
+export const PATCH = withTiming('PATCH /api/gpt/habits/{habitId}', withIdempotency(async (req: NextRequest, { params }: { params: Promise<{ habitId: string }> }) => {
     const apiKey = req.headers.get('X-API-Key');
     if (!apiKey) {
         return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
@@ -13,6 +17,11 @@ export async function PATCH(req: NextRequest, { params }: { params: Promise<{ ha
         return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
     }
 
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
     const { habitId } = await params;
     const db = databases();
     const dbId = DATABASE_ID();
@@ -21,8 +30,8 @@ export async function PATCH(req: NextRequest, { params }: { params: Promise<{ ha
         const body = await req.json();
         const { date } = body;
 
-        if (!date) {
-            return NextResponse.json({ error: 'Date is required (YYYY-MM-DD)' }, { status: 400 });
+        if (!isValidDate(date)) {
+            return NextResponse.json({ error: 'date must be a valid YYYY-MM-DD date, not after today' }, { status: 400 });
         }
 
         // Fetch habit
@@ -32,32 +41,25 @@ export async function PATCH(req: NextRequest, { params }: { params: Promise<{ ha
             return NextResponse.json({ error: 'Habit not found or access denied' }, { status: 404 });
         }
 
-        let completedDates = habit.completedDates || [];
+        const update = applyCompletions(habit, [date]);
 
-        // Add date if not already present
-        if (!completedDates.includes(date)) {
-            completedDates.push(date);
+        // Already completed and nothing to migrate or refresh (idempotent)
+        if (!update) {
+            return NextResponse.json(habit, { status: 200 });
         }
-        // If already completed, we return success (idempotent)
-
-        // Recalculate streaks
-        const { streak, longestStreak } = calculateStreaks(completedDates);
 
         // Update habit
         const doc = await db.updateDocument(
             dbId,
             'habits',
             habitId,
-            {
-                completedDates,
-                streak,
-                longestStreak
-            }
+            update
         );
 
+        invalidateDashboard(userId);
         return NextResponse.json(doc, { status: 200 });
     } catch (error) {
-        console.error('Error updating habit:', error);
+        recordError('Error updating habit', error);
         return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
     }
-}
+}));
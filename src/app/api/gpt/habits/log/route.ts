@@ -0,0 +1,120 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { AppwriteException } from 'node-appwrite';
+import { validateApiKey, databases, DATABASE_ID } from '@/lib/server/appwrite';
+import { invalidateDashboard } from '@/lib/server/dashboard';
+import { BATCH_CONCURRENCY, mapWithConcurrency } from '@/lib/server/batch';
+import { MAX_HABIT_LOG_ENTRIES, applyCompletions, isValidDate } from '@/lib/server/habits';
+import { withIdempotency } from '@/lib/server/idempotency';
+import { admitRequest } from '@/lib/server/rateLimit';
+import { recordError, withTiming } from '@/lib/server/timing';
+
+interface LogResult {
+    habitId: string;
+    date: string;
+    status: number;
+    error?: string;
+    streak?: number;
+    longestStreak?: number;
+}
+
+/**
+ * Logs many (habitId, date) completions in one request.
+ * Entries are grouped per habit, so each habit is read once, its streaks are computed once
+ * and it is written at most once. Every entry gets its own result, in request order.
+ */
+export const POST = withTiming('POST /api/gpt/habits/log', withIdempotency(async (req: NextRequest) => {
+    const apiKey = req.headers.get('X-API-Key');
+    if (!apiKey) {
+        return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
+    }
+
+    const userId = await validateApiKey(apiKey);
+    if (!userId) {
+        return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
+    }
+
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
+    const db = databases();
+    const dbId = DATABASE_ID();
+
+    try {
+        const body = await req.json();
+        const { entries } = body;
+
+        if (!Array.isArray(entries) || entries.length === 0 || entries.length > MAX_HABIT_LOG_ENTRIES) {
+            return NextResponse.json(
+                { error: `entries must be an array of 1 to ${MAX_HABIT_LOG_ENTRIES} { habitId, date } items` },
+                { status: 400 }
+            );
+        }
+
+        const results: LogResult[] = entries.map(entry => ({
+            habitId: entry?.habitId,
+            date: entry?.date,
+            status: 200,
+        }));
+
+        // Group valid entries per habit, keeping the result indexes to fill in
+        const byHabit = new Map<string, number[]>();
+        results.forEach((result, index) => {
+            if (typeof result.habitId !== 'string' || !result.habitId || !isValidDate(result.date)) {
+                result.status = 400;
+                result.error = 'habitId and a valid date (YYYY-MM-DD, not after today) are required';
+                return;
+            }
+            const indexes = byHabit.get(result.habitId) ?? [];
+            indexes.push(index);
+            byHabit.set(result.habitId, indexes);
+        });
+
+        await mapWithConcurrency(Array.from(byHabit), BATCH_CONCURRENCY, async ([habitId, indexes]) => {
+            const fail = (status: number, error: string) => {
+                for (const index of indexes) {
+                    results[index].status = status;
+                    results[index].error = error;
+                }
+            };
+
+            let habit;
+            try {
+                habit = await db.getDocument(dbId, 'habits', habitId);
+            } catch (error) {
+                if (error instanceof AppwriteException && error.code === 404) {
+                    return fail(404, 'Habit not found or access denied');
+                }
+                recordError(`Error reading habit ${habitId}`, error);
+                return fail(500, 'Internal Server Error');
+            }
+            if (habit.userId !== userId) {
+                return fail(404, 'Habit not found or access denied');
+            }
+
+            try {
+                const update = applyCompletions(habit, indexes.map(index => results[index].date));
+                const doc = update ? await db.updateDocument(dbId, 'habits', habitId, update) : habit;
+                for (const index of indexes) {
+                    results[index].streak = doc.streak;
+                    results[index].longestStreak = doc.longestStreak;
+                }
+            } catch (error) {
+                recordError(`Error logging habit ${habitId}`, error);
+                fail(500, 'Internal Server Error');
+            }
+        });
+
+        invalidateDashboard(userId);
+        const failed = results.filter(result => result.status !== 200).length;
+        return NextResponse.json({
+            logged: results.length - failed,
+            failed,
+            results,
+        }, { status: 200 });
+    } catch (error) {
+        recordError('Error logging habits', error);
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+    }
+}));
@@ -0,0 +1,64 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { validateApiKey } from '@/lib/server/appwrite';
+import { HABIT_SUMMARY_FIELDS, withCurrentSummaries } from '@/lib/server/habits';
+import { InvalidCursorError, listPage, pageResponse, parsePageParams } from '@/lib/server/pagination';
+import { admitRequest } from '@/lib/server/rateLimit';
+import { recordError, withTiming } from '@/lib/server/timing';
+import { Models, Query } from 'node-appwrite';
+
+// Returned unless ?fields= asks for others. The completion history (completedRuns, legacy
+// completedDates) grows with the habit's age, so it is only sent when requested.
+const DEFAULT_HABIT_FIELDS = ['title', ...HABIT_SUMMARY_FIELDS];
+
+/**
+ * Lists the user's habits with their streaks, latest completion and the last 30 days of runs.
+ * Current streaks are reported as 0 once the latest completion is older than yesterday.
+ */
+export const GET = withTiming('GET /api/gpt/habits', async (req: NextRequest) => {
+    const apiKey = req.headers.get('X-API-Key');
+    if (!apiKey) {
+        return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
+    }
+
+    const userId = await validateApiKey(apiKey);
+    if (!userId) {
+        return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
+    }
+
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
+    const params = parsePageParams(req, 'habits');
+    if ('error' in params) {
+        return NextResponse.json({ error: params.error }, { status: 400 });
+    }
+
+    const fields = params.fields ?? DEFAULT_HABIT_FIELDS;
+    // Summaries are checked and brought up to date together, so read all of them when any is asked for
+    const summarized = fields.some(field => HABIT_SUMMARY_FIELDS.includes(field));
+    const select = summarized ? Array.from(new Set([...fields, ...HABIT_SUMMARY_FIELDS])) : fields;
+
+    try {
+        const page = await listPage('habits', [Query.equal('userId', userId)], { ...params, fields: select });
+        if (summarized) {
+            const docs: Record<string, unknown>[] = await withCurrentSummaries(page.data as Models.Document[]);
+            for (const doc of docs) {
+                for (const field of HABIT_SUMMARY_FIELDS) {
+                    if (!fields.includes(field)) {
+                        delete doc[field];
+                    }
+                }
+            }
+            page.data = docs;
+        }
+        return pageResponse(req, page);
+    } catch (error) {
+        if (error instanceof InvalidCursorError) {
+            return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 });
+        }
+        recordError('Error listing habits', error);
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+    }
+});
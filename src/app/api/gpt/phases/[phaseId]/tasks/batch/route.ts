@@ -0,0 +1,90 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { validateApiKey, databases, DATABASE_ID } from '@/lib/server/appwrite';
+import { invalidateDashboard } from '@/lib/server/dashboard';
+import { getOwnedPhaseGoal } from '@/lib/server/ownership';
+import { withIdempotency } from '@/lib/server/idempotency';
+import { admitRequest } from '@/lib/server/rateLimit';
+import { recordError, withTiming } from '@/lib/server/timing';
+import {
+    BATCH_CONCURRENCY,
+    CreatedDocuments,
+    MAX_BATCH_TASKS,
+    mapWithConcurrency,
+    validateTaskInputs,
+} from '@/lib/server/batch';
+import { ID, Permission, Role } from 'node-appwrite';
+
+/**
+ * Adds many tasks to one phase in a single request.
+ */
+export const POST = withTiming('POST /api/gpt/phases/{phaseId}/tasks/batch', withIdempotency(async (req: NextRequest, { params }: { params: Promise<{ phaseId: string }> }) => {
+    const apiKey = req.headers.get('X-API-Key');
+    if (!apiKey) {
+        return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
+    }
+
+    const userId = await validateApiKey(apiKey);
+    if (!userId) {
+        return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
+    }
+
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
+    const { phaseId } = await params;
+    const db = databases();
+    const dbId = DATABASE_ID();
+    const created = new CreatedDocuments();
+
+    try {
+        const body = await req.json();
+        const { tasks } = body;
+
+        const tasksError = validateTaskInputs(tasks, 'tasks');
+        if (tasksError) {
+            return NextResponse.json({ error: tasksError }, { status: 400 });
+        }
+        if (tasks.length === 0 || tasks.length > MAX_BATCH_TASKS) {
+            return NextResponse.json({ error: `Between 1 and ${MAX_BATCH_TASKS} tasks are required` }, { status: 400 });
+        }
+
+        const goalId = await getOwnedPhaseGoal(userId, phaseId);
+        if (!goalId) {
+            return NextResponse.json({ error: 'Phase not found' }, { status: 404 });
+        }
+
+        const permissions = [
+            Permission.read(Role.user(userId)),
+            Permission.update(Role.user(userId)),
+            Permission.delete(Role.user(userId)),
+        ];
+
+        const docs = await mapWithConcurrency(tasks as { title: string; dueDate?: string }[], BATCH_CONCURRENCY, async (task) => {
+            const doc = await db.createDocument(
+                dbId,
+                'tasks',
+                ID.unique(),
+                {
+                    title: task.title,
+                    dueDate: task.dueDate,
+                    phaseId,
+                    goalId,
+                    isCompleted: false,
+                    userId
+                },
+                permissions
+            );
+            created.add('tasks', doc.$id);
+            return doc;
+        });
+
+        invalidateDashboard(userId);
+        return NextResponse.json({ tasks: docs }, { status: 201 });
+    } catch (error) {
+        recordError('Error creating tasks', error);
+        await created.rollback();
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+    }
+}));
@@ -1,8 +1,14 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { validateApiKey, databases, DATABASE_ID } from '@/lib/server/appwrite';
-import { ID, Permission, Role } from 'node-appwrite';
+import { invalidateDashboard } from '@/lib/server/dashboard';
+import { getOwnedPhaseGoal } from '@/lib/server/ownership';
+import { InvalidCursorError, listPage, pageResponse, parsePageParams } from '@/lib/server/pagination';
+import { withIdempotency } from '@/lib/server/idempotency';
+import { admitRequest } from '@/lib/server/rateLimit';
+import { recordError, withTiming } from '@/lib/server/timing';
+import { ID, Permission, Role, Query } from 'node-appwrite';
 
-export async function POST(req: NextRequest, { params }: { params: Promise<{ phaseId: string }> }) {
+export const POST = withTiming('POST /api/gpt/phases/{phaseId}/tasks', withIdempotency(async (req: NextRequest, { params }: { params: Promise<{ phaseId: string }> }) => {
     const apiKey = req.headers.get('X-API-Key');
     if (!apiKey) {
         return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
@@ -13,6 +19,11 @@ export async function POST(req: NextRequest, { params }: { params: Promise<{ pha
         return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
     }
 
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
     const { phaseId } = await params;
     const db = databases();
     const dbId = DATABASE_ID();
@@ -25,11 +36,9 @@ export async function POST(req: NextRequest, { params }: { params: Promise<{ pha
             return NextResponse.json({ error: 'Title is required' }, { status: 400 });
         }
 
-        // Check if phase exists
-        try {
-             await db.getDocument(dbId, 'phases', phaseId);
-        } catch {
-             return NextResponse.json({ error: 'Phase not found' }, { status: 404 });
+        const goalId = await getOwnedPhaseGoal(userId, phaseId);
+        if (!goalId) {
+            return NextResponse.json({ error: 'Phase not found' }, { status: 404 });
         }
 
         const doc = await db.createDocument(
@@ -40,6 +49,7 @@ export async function POST(req: NextRequest, { params }: { params: Promise<{ pha
                 title,
                 dueDate,
                 phaseId,
+                goalId,
                 isCompleted: false,
                 userId
             },
@@ -50,9 +60,45 @@ export async function POST(req: NextRequest, { params }: { params: Promise<{ pha
             ]
         );
 
+        invalidateDashboard(userId);
         return NextResponse.json(doc, { status: 201 });
     } catch (error) {
-        console.error('Error creating task:', error);
+        recordError('Error creating task', error);
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+    }
+}));
+
+export const GET = withTiming('GET /api/gpt/phases/{phaseId}/tasks', async (req: NextRequest, { params }: { params: Promise<{ phaseId: string }> }) => {
+    const apiKey = req.headers.get('X-API-Key');
+    if (!apiKey) {
+        return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
+    }
+
+    const userId = await validateApiKey(apiKey);
+    if (!userId) {
+        return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
+    }
+
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
+    const { phaseId } = await params;
+    const pageParams = parsePageParams(req, 'tasks');
+    if ('error' in pageParams) {
+        return NextResponse.json({ error: pageParams.error }, { status: 400 });
+    }
+
+    try {
+        // Tasks carry userId, so filtering on it scopes the page without reading the phase
+        const page = await listPage('tasks', [Query.equal('phaseId', phaseId), Query.equal('userId', userId)], pageParams);
+        return pageResponse(req, page);
+    } catch (error) {
+        if (error instanceof InvalidCursorError) {
+            return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 });
+        }
+        recordError('Error listing tasks', error);
         return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
     }
-}
+});
@@ -1,7 +1,11 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { validateApiKey, databases, DATABASE_ID } from '@/lib/server/appwrite';
+import { invalidateDashboard } from '@/lib/server/dashboard';
+import { withIdempotency } from '@/lib/server/idempotency';
+import { admitRequest } from '@/lib/server/rateLimit';
+import { recordError, withTiming } from '@/lib/server/timing';
 
-export async function PATCH(req: NextRequest, { params }: { params: Promise<{ taskId: string }> }) {
+export const PATCH = withTiming('PATCH /api/gpt/tasks/{taskId}', withIdempotency(async (req: NextRequest, { params }: { params: Promise<{ taskId: string }> }) => {
     const apiKey = req.headers.get('X-API-Key');
     if (!apiKey) {
         return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
@@ -12,6 +16,11 @@ export async function PATCH(req: NextRequest, { params }: { params: Promise<{ ta
         return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
     }
 
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
     const { taskId } = await params;
     const db = databases();
     const dbId = DATABASE_ID();
@@ -39,9 +48,10 @@ export async function PATCH(req: NextRequest, { params }: { params: Promise<{ ta
             }
         );
 
+        invalidateDashboard(userId);
         return NextResponse.json(doc, { status: 200 });
     } catch (error) {
-        console.error('Error updating task:', error);
+        recordError('Error updating task', error);
         return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
     }
-}
+}));
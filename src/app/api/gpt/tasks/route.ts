@@ -0,0 +1,55 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { validateApiKey } from '@/lib/server/appwrite';
+import { InvalidCursorError, listPage, pageResponse, parsePageParams } from '@/lib/server/pagination';
+import { admitRequest } from '@/lib/server/rateLimit';
+import { recordError, withTiming } from '@/lib/server/timing';
+import { Query } from 'node-appwrite';
+
+/**
+ * Lists the user's tasks across all goals. Optional filters: ?isCompleted=true|false, ?goalId=.
+ */
+export const GET = withTiming('GET /api/gpt/tasks', async (req: NextRequest) => {
+    const apiKey = req.headers.get('X-API-Key');
+    if (!apiKey) {
+        return NextResponse.json({ error: 'Missing API Key' }, { status: 401 });
+    }
+
+    const userId = await validateApiKey(apiKey);
+    if (!userId) {
+        return NextResponse.json({ error: 'Invalid API Key' }, { status: 401 });
+    }
+
+    const throttled = await admitRequest(userId);
+    if (throttled) {
+        return throttled;
+    }
+
+    const params = parsePageParams(req, 'tasks');
+    if ('error' in params) {
+        return NextResponse.json({ error: params.error }, { status: 400 });
+    }
+
+    const queries = [Query.equal('userId', userId)];
+    const isCompleted = req.nextUrl.searchParams.get('isCompleted');
+    if (isCompleted !== null) {
+        if (isCompleted !== 'true' && isCompleted !== 'false') {
+            return NextResponse.json({ error: 'isCompleted must be true or false' }, { status: 400 });
+        }
+        queries.push(Query.equal('isCompleted', isCompleted === 'true'));
+    }
+    const goalId = req.nextUrl.searchParams.get('goalId');
+    if (goalId) {
+        queries.push(Query.equal('goalId', goalId));
+    }
+
+    try {
+        const page = await listPage('tasks', queries, params);
+        return pageResponse(req, page);
+    } catch (error) {
+        if (error instanceof InvalidCursorError) {
+            return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 });
+        }
+        recordError('Error listing tasks', error);
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+    }
+});
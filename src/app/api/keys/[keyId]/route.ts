@@ -0,0 +1,41 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { AppwriteException } from 'node-appwrite';
+import { databases, DATABASE_ID, getSessionUserId, invalidateApiKey } from '@/lib/server/appwrite';
+import { recordError, withTiming } from '@/lib/server/timing';
+
+/**
+ * Revokes one of the signed-in user's API keys. Going through the server drops the key from
+ * this instance's validation cache, so it stops working at once instead of after
+ * API_KEY_CACHE_TTL_MS. Other instances still honour it until their cached entry expires.
+ * Only the app's session JWT is accepted, so one API key can't revoke the user's other keys.
+ */
+export const DELETE = withTiming('DELETE /api/keys/{keyId}', async (req: NextRequest, { params }: { params: Promise<{ keyId: string }> }) => {
+    const userId = await getSessionUserId(req);
+    if (userId === undefined) {
+        return NextResponse.json({ error: 'Missing session token' }, { status: 401 });
+    }
+    if (!userId) {
+        return NextResponse.json({ error: 'Invalid session token' }, { status: 401 });
+    }
+
+    const { keyId } = await params;
+    const db = databases();
+    const dbId = DATABASE_ID();
+
+    try {
+        const apiKey = await db.getDocument(dbId, 'api_keys', keyId);
+        if (apiKey.userId !== userId) {
+            return NextResponse.json({ error: 'API key not found or access denied' }, { status: 404 });
+        }
+
+        await db.deleteDocument(dbId, 'api_keys', keyId);
+        invalidateApiKey(apiKey.key as string);
+        return new NextResponse(null, { status: 204 });
+    } catch (error) {
+        if (error instanceof AppwriteException && error.code === 404) {
+            return NextResponse.json({ error: 'API key not found or access denied' }, { status: 404 });
+        }
+        recordError('Error revoking API key', error);
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+    }
+});
@@ -1,4 +1,5 @@
 import { NextResponse } from 'next/server';
+import { MAX_KEY_LENGTH } from '@/lib/server/idempotency';
 
 const openApiSpec = {
   openapi: '3.1.0',
@@ -14,9 +15,35 @@ const openApiSpec = {
   ],
   paths: {
     '/api/gpt/goals': {
+      get: {
+        operationId: 'listGoals',
+        summary: 'List goals',
+        parameters: [
+          { name: 'limit', in: 'query', schema: { type: 'integer', minimum: 1, maximum: 100, default: 25 } },
+          { name: 'cursor', in: 'query', schema: { type: 'string' }, description: 'nextCursor from the previous page' },
+          { name: 'fields', in: 'query', schema: { type: 'string' }, description: 'Comma-separated attributes to return, e.g. title,isCompleted' },
+        ],
+        responses: {
+          '200': {
+            description: 'A page of results: { data, nextCursor, hasMore }. Pass nextCursor as cursor to get the next page.',
+          },
+          '304': {
+            description: 'Not modified (If-None-Match matched the ETag)',
+          },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
+        },
+      },
       post: {
         operationId: 'createGoal',
         summary: 'Create a new goal',
+        parameters: [
+          { name: 'Idempotency-Key', in: 'header', schema: { type: 'string', maxLength: MAX_KEY_LENGTH }, description: 'Unique per write; a retry with the same key gets the original response instead of writing again' },
+        ],
         requestBody: {
           required: true,
           content: {
@@ -40,10 +67,107 @@ const openApiSpec = {
           '401': {
             description: 'Unauthorized',
           },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
+        },
+      },
+    },
+    '/api/gpt/goals/tree': {
+      post: {
+        operationId: 'createGoalTree',
+        summary: 'Create a goal with its phases and tasks in one request',
+        description: 'Prefer this over separate createGoal, createPhase and createTask calls when planning a whole goal. At most 20 phases and 200 tasks per request.',
+        parameters: [
+          { name: 'Idempotency-Key', in: 'header', schema: { type: 'string', maxLength: MAX_KEY_LENGTH }, description: 'Unique per write; a retry with the same key gets the original response instead of writing again' },
+        ],
+        requestBody: {
+          required: true,
+          content: {
+            'application/json': {
+              schema: {
+                type: 'object',
+                properties: {
+                  title: { type: 'string' },
+                  description: { type: 'string' },
+                  deadline: { type: 'string', format: 'date-time' },
+                  phases: {
+                    type: 'array',
+                    items: {
+                      type: 'object',
+                      properties: {
+                        title: { type: 'string' },
+                        order: { type: 'integer', description: 'Defaults to the position in the list, starting at 1' },
+                        tasks: {
+                          type: 'array',
+                          items: {
+                            type: 'object',
+                            properties: {
+                              title: { type: 'string' },
+                              dueDate: { type: 'string', format: 'date-time' },
+                            },
+                            required: ['title'],
+                          },
+                        },
+                      },
+                      required: ['title'],
+                    },
+                  },
+                },
+                required: ['title'],
+              },
+            },
+          },
+        },
+        responses: {
+          '201': {
+            description: 'Goal created, with the created phases (each with its tasks) under `phases`',
+          },
+          '400': {
+            description: 'Invalid tree or batch limits exceeded; nothing was created',
+          },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
         },
       },
     },
     '/api/gpt/goals/{goalId}/phases': {
+      get: {
+        operationId: 'listPhases',
+        summary: 'List the phases of a goal, ordered by order',
+        parameters: [
+          {
+            name: 'goalId',
+            in: 'path',
+            required: true,
+            schema: { type: 'string' },
+          },
+          { name: 'limit', in: 'query', schema: { type: 'integer', minimum: 1, maximum: 100, default: 25 } },
+          { name: 'cursor', in: 'query', schema: { type: 'string' }, description: 'nextCursor from the previous page' },
+          { name: 'fields', in: 'query', schema: { type: 'string' }, description: 'Comma-separated attributes to return, e.g. title,isCompleted' },
+        ],
+        responses: {
+          '200': {
+            description: 'A page of results: { data, nextCursor, hasMore }. Pass nextCursor as cursor to get the next page.',
+          },
+          '304': {
+            description: 'Not modified (If-None-Match matched the ETag)',
+          },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
+        },
+      },
       post: {
         operationId: 'createPhase',
         summary: 'Add a phase to a goal',
@@ -54,6 +178,7 @@ const openApiSpec = {
             required: true,
             schema: { type: 'string' },
           },
+          { name: 'Idempotency-Key', in: 'header', schema: { type: 'string', maxLength: MAX_KEY_LENGTH }, description: 'Unique per write; a retry with the same key gets the original response instead of writing again' },
         ],
         requestBody: {
           required: true,
@@ -74,10 +199,45 @@ const openApiSpec = {
           '201': {
             description: 'Phase created successfully',
           },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
         },
       },
     },
     '/api/gpt/phases/{phaseId}/tasks': {
+      get: {
+        operationId: 'listPhaseTasks',
+        summary: 'List the tasks of a phase',
+        parameters: [
+          {
+            name: 'phaseId',
+            in: 'path',
+            required: true,
+            schema: { type: 'string' },
+          },
+          { name: 'limit', in: 'query', schema: { type: 'integer', minimum: 1, maximum: 100, default: 25 } },
+          { name: 'cursor', in: 'query', schema: { type: 'string' }, description: 'nextCursor from the previous page' },
+          { name: 'fields', in: 'query', schema: { type: 'string' }, description: 'Comma-separated attributes to return, e.g. title,isCompleted' },
+        ],
+        responses: {
+          '200': {
+            description: 'A page of results: { data, nextCursor, hasMore }. Pass nextCursor as cursor to get the next page.',
+          },
+          '304': {
+            description: 'Not modified (If-None-Match matched the ETag)',
+          },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
+        },
+      },
       post: {
         operationId: 'createTask',
         summary: 'Add a task to a phase',
@@ -88,6 +248,7 @@ const openApiSpec = {
             required: true,
             schema: { type: 'string' },
           },
+          { name: 'Idempotency-Key', in: 'header', schema: { type: 'string', maxLength: MAX_KEY_LENGTH }, description: 'Unique per write; a retry with the same key gets the original response instead of writing again' },
         ],
         requestBody: {
           required: true,
@@ -108,6 +269,117 @@ const openApiSpec = {
           '201': {
             description: 'Task created successfully',
           },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
+        },
+      },
+    },
+    '/api/gpt/phases/{phaseId}/tasks/batch': {
+      post: {
+        operationId: 'createTasks',
+        summary: 'Add several tasks to a phase in one request',
+        parameters: [
+          {
+            name: 'phaseId',
+            in: 'path',
+            required: true,
+            schema: { type: 'string' },
+          },
+          { name: 'Idempotency-Key', in: 'header', schema: { type: 'string', maxLength: MAX_KEY_LENGTH }, description: 'Unique per write; a retry with the same key gets the original response instead of writing again' },
+        ],
+        requestBody: {
+          required: true,
+          content: {
+            'application/json': {
+              schema: {
+                type: 'object',
+                properties: {
+                  tasks: {
+                    type: 'array',
+                    minItems: 1,
+                    maxItems: 200,
+                    items: {
+                      type: 'object',
+                      properties: {
+                        title: { type: 'string' },
+                        dueDate: { type: 'string', format: 'date-time' },
+                      },
+                      required: ['title'],
+                    },
+                  },
+                },
+                required: ['tasks'],
+              },
+            },
+          },
+        },
+        responses: {
+          '201': {
+            description: 'Tasks created successfully, returned under `tasks` in request order',
+          },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
+        },
+      },
+    },
+    '/api/gpt/tasks': {
+      get: {
+        operationId: 'listTasks',
+        summary: 'List the user\'s tasks across goals',
+        parameters: [
+          { name: 'limit', in: 'query', schema: { type: 'integer', minimum: 1, maximum: 100, default: 25 } },
+          { name: 'cursor', in: 'query', schema: { type: 'string' }, description: 'nextCursor from the previous page' },
+          { name: 'fields', in: 'query', schema: { type: 'string' }, description: 'Comma-separated attributes to return, e.g. title,isCompleted' },
+          { name: 'isCompleted', in: 'query', schema: { type: 'boolean' } },
+          { name: 'goalId', in: 'query', schema: { type: 'string' } },
+        ],
+        responses: {
+          '200': {
+            description: 'A page of results: { data, nextCursor, hasMore }. Pass nextCursor as cursor to get the next page.',
+          },
+          '304': {
+            description: 'Not modified (If-None-Match matched the ETag)',
+          },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
+        },
+      },
+    },
+    '/api/gpt/habits': {
+      get: {
+        operationId: 'listHabits',
+        summary: 'List habits with their streaks',
+        description: 'Returns title, streak, longestStreak, lastCompletedDate and recentRuns (the last 30 days) by default. Ask for completedRuns with fields only when the full completion history is needed.',
+        parameters: [
+          { name: 'limit', in: 'query', schema: { type: 'integer', minimum: 1, maximum: 100, default: 25 } },
+          { name: 'cursor', in: 'query', schema: { type: 'string' }, description: 'nextCursor from the previous page' },
+          { name: 'fields', in: 'query', schema: { type: 'string' }, description: 'Comma-separated attributes to return, e.g. title,streak,completedRuns' },
+        ],
+        responses: {
+          '200': {
+            description: 'A page of results: { data, nextCursor, hasMore }. Pass nextCursor as cursor to get the next page.',
+          },
+          '304': {
+            description: 'Not modified (If-None-Match matched the ETag)',
+          },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
         },
       },
     },
@@ -122,6 +394,7 @@ const openApiSpec = {
             required: true,
             schema: { type: 'string' },
           },
+          { name: 'Idempotency-Key', in: 'header', schema: { type: 'string', maxLength: MAX_KEY_LENGTH }, description: 'Unique per write; a retry with the same key gets the original response instead of writing again' },
         ],
         requestBody: {
           required: true,
@@ -141,6 +414,59 @@ const openApiSpec = {
           '200': {
             description: 'Task updated successfully',
           },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
+        },
+      },
+    },
+    '/api/gpt/habits/log': {
+      post: {
+        operationId: 'logHabits',
+        summary: 'Log many habit completions in one request',
+        description: 'Use this instead of repeated updateHabit calls when logging several habits or backfilling several dates. At most 500 entries per request.',
+        parameters: [
+          { name: 'Idempotency-Key', in: 'header', schema: { type: 'string', maxLength: MAX_KEY_LENGTH }, description: 'Unique per write; a retry with the same key gets the original response instead of writing again' },
+        ],
+        requestBody: {
+          required: true,
+          content: {
+            'application/json': {
+              schema: {
+                type: 'object',
+                properties: {
+                  entries: {
+                    type: 'array',
+                    minItems: 1,
+                    maxItems: 500,
+                    items: {
+                      type: 'object',
+                      properties: {
+                        habitId: { type: 'string' },
+                        date: { type: 'string', format: 'date', description: 'A real calendar date, not after today' },
+                      },
+                      required: ['habitId', 'date'],
+                    },
+                  },
+                },
+                required: ['entries'],
+              },
+            },
+          },
+        },
+        responses: {
+          '200': {
+            description: 'Per-entry results in request order, each with a status (200, 400 or 404) and the habit streaks after logging',
+          },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
         },
       },
     },
@@ -155,6 +481,7 @@ const openApiSpec = {
             required: true,
             schema: { type: 'string' },
           },
+          { name: 'Idempotency-Key', in: 'header', schema: { type: 'string', maxLength: MAX_KEY_LENGTH }, description: 'Unique per write; a retry with the same key gets the original response instead of writing again' },
         ],
         requestBody: {
           required: true,
@@ -163,7 +490,7 @@ const openApiSpec = {
               schema: {
                 type: 'object',
                 properties: {
-                  date: { type: 'string', format: 'date' },
+                  date: { type: 'string', format: 'date', description: 'A real calendar date, not after today' },
                 },
                 required: ['date'],
               },
@@ -174,6 +501,12 @@ const openApiSpec = {
           '200': {
             description: 'Habit updated successfully',
           },
+          '429': {
+            description: 'Rate limited. Wait Retry-After seconds before retrying; the body also has retryAfterMs',
+            headers: {
+              'Retry-After': { description: 'Seconds to wait before retrying', schema: { type: 'integer', minimum: 1 } },
+            },
+          },
         },
       },
     },
@@ -0,0 +1,39 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { AppwriteException } from 'node-appwrite';
+import { databases, DATABASE_ID, getSessionUserId } from '@/lib/server/appwrite';
+import { forgetOwnership, getOwnedPhaseGoal } from '@/lib/server/ownership';
+import { recordError, withTiming } from '@/lib/server/timing';
+
+/**
+ * Deletes a phase of one of the signed-in user's goals. Going through the server drops the phase
+ * from this instance's ownership cache, so the GPT routes stop adding tasks to it at once
+ * instead of after OWNERSHIP_CACHE_TTL_MS.
+ */
+export const DELETE = withTiming('DELETE /api/phases/{phaseId}', async (req: NextRequest, { params }: { params: Promise<{ phaseId: string }> }) => {
+    const userId = await getSessionUserId(req);
+    if (userId === undefined) {
+        return NextResponse.json({ error: 'Missing session token' }, { status: 401 });
+    }
+    if (!userId) {
+        return NextResponse.json({ error: 'Invalid session token' }, { status: 401 });
+    }
+
+    const { phaseId } = await params;
+
+    try {
+        if (!(await getOwnedPhaseGoal(userId, phaseId))) {
+            return NextResponse.json({ error: 'Phase not found or access denied' }, { status: 404 });
+        }
+
+        await databases().deleteDocument(DATABASE_ID(), 'phases', phaseId);
+        forgetOwnership('phases', phaseId);
+        return new NextResponse(null, { status: 204 });
+    } catch (error) {
+        if (error instanceof AppwriteException && error.code === 404) {
+            forgetOwnership('phases', phaseId);
+            return NextResponse.json({ error: 'Phase not found or access denied' }, { status: 404 });
+        }
+        recordError('Error deleting phase', error);
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+    }
+});
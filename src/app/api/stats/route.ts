@@ -0,0 +1,28 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { getApiKeyCacheStats } from '@/lib/server/appwrite';
+import { getIdempotencyStats } from '@/lib/server/idempotency';
+import { getOwnershipCacheStats } from '@/lib/server/ownership';
+import { getRateLimitStats } from '@/lib/server/rateLimit';
+
+// Shared secret for reading this instance's counters. The route answers 404 when it is unset.
+const STATS_TOKEN = process.env.STATS_TOKEN;
+
+/**
+ * Counters of the server-side caches, the rate limiter and idempotent replays on this
+ * instance, for checking hit rates and rejections during load and soak runs.
+ * Send the STATS_TOKEN value in X-Stats-Token.
+ */
+export async function GET(req: NextRequest) {
+    if (!STATS_TOKEN || req.headers.get('X-Stats-Token') !== STATS_TOKEN) {
+        return NextResponse.json({ error: 'Not Found' }, { status: 404 });
+    }
+    return NextResponse.json(
+        {
+            apiKeyCache: getApiKeyCacheStats(),
+            ownershipCache: getOwnershipCacheStats(),
+            rateLimit: getRateLimitStats(),
+            idempotency: getIdempotencyStats(),
+        },
+        { status: 200, headers: { 'Cache-Control': 'no-store' } }
+    );
+}
@@ -1,8 +1,7 @@
 'use client';
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect } from 'react';
 import { databases } from '@/lib/appwrite';
-import { Query } from 'appwrite';
 import { Card } from '@/components/ui/Card';
 import { Button } from '@/components/ui/Button';
 import { ConfirmDialog } from '@/components/ui/ConfirmDialog';
@@ -11,6 +10,17 @@ import { PageLoader } from '@/components/ui/LoadingSpinner';
 import { useAuth } from '@/context/AuthContext';
 import { useToast } from '@/components/ui/Toast';
 import { Goal, Phase, Task } from '@/types';
+import {
+    GoalTree,
+    GOAL_TREE_PREFETCH_COUNT,
+    invalidateGoalTree,
+    prefetchGoalTrees,
+    updateGoalTree,
+    useGoalTree,
+} from '@/lib/goal-tree';
+import { deleteGoalOnServer, deletePhaseOnServer, fetchGoals, invalidateDashboard, queryKeys } from '@/lib/queries';
+import { invalidateQueries, removeQueries, setQueryData, useQuery } from '@/lib/query-cache';
+import { applyToList } from '@/lib/realtime';
 import { ChevronDown, ChevronRight, Plus, X, Check, Trash2, Calendar, Target, RefreshCw } from 'lucide-react';
 
 import { Input } from '@/components/ui/Input';
@@ -26,12 +36,7 @@ const getTodayDate = () => {
 export default function GoalsPage() {
     const { user } = useAuth();
     const { success, error: showError } = useToast();
-    const [goals, setGoals] = useState<Goal[]>([]);
     const [expandedGoal, setExpandedGoal] = useState<string | null>(null);
-    const [phases, setPhases] = useState<Record<string, Phase[]>>({});
-    const [tasks, setTasks] = useState<Record<string, Task[]>>({});
-    const [loading, setLoading] = useState(true);
-    const [hasError, setHasError] = useState(false);
 
     // Goal creation
     const [isAddingGoal, setIsAddingGoal] = useState(false);
@@ -64,65 +69,50 @@ export default function GoalsPage() {
 
     const dbId = process.env.NEXT_PUBLIC_APPWRITE_DATABASE_ID;
 
-    const fetchGoals = useCallback(async () => {
-        if (!dbId || !user) return;
-        try {
-            setHasError(false);
-            const response = await databases.listDocuments(dbId, 'goals', [
-                Query.equal('userId', user.$id),
-                Query.orderDesc('$createdAt'),
-            ]);
-            setGoals(response.documents as unknown as Goal[]);
-        } catch (err) {
-            console.error('Error fetching goals:', err);
-            setHasError(true);
+    const goalsKey = user ? queryKeys.goals(user.$id) : null;
+    const goalsQuery = useQuery(goalsKey, () => fetchGoals(user!.$id));
+    const goals = goalsQuery.data ?? [];
+    const loading = goalsQuery.isLoading;
+    const hasError = !!goalsQuery.error && !goalsQuery.data;
+
+    useEffect(() => {
+        if (goalsQuery.error) {
+            console.error('Error fetching goals:', goalsQuery.error);
             showError('Failed to load goals. Please try again.');
-        } finally {
-            setLoading(false);
         }
-    }, [dbId, user, showError]);
+    }, [goalsQuery.error, showError]);
 
+    // The first goals are the likeliest to be expanded
     useEffect(() => {
-        if (user && dbId) {
-            fetchGoals();
-        } else if (!dbId) {
-            console.error('Missing Database ID');
-            setLoading(false);
+        if (goalsQuery.data) {
+            prefetchGoalTrees(goalsQuery.data.slice(0, GOAL_TREE_PREFETCH_COUNT).map(g => g.$id));
         }
-    }, [user, dbId, fetchGoals]);
+    }, [goalsQuery.data]);
 
-    const fetchGoalDetails = async (goalId: string) => {
-        if (!dbId) return;
-        try {
-            // Fetch Phases
-            const phasesRes = await databases.listDocuments(dbId, 'phases', [
-                Query.equal('goalId', goalId),
-                Query.orderAsc('order'),
-            ]);
-            const goalPhases = phasesRes.documents as unknown as Phase[];
-            setPhases(prev => ({ ...prev, [goalId]: goalPhases }));
-
-            // Fetch Tasks for this goal
-            const tasksRes = await databases.listDocuments(dbId, 'tasks', [
-                Query.equal('goalId', goalId),
-                Query.orderAsc('$createdAt'),
-            ]);
-            const goalTasks = tasksRes.documents as unknown as Task[];
-            setTasks(prev => ({ ...prev, [goalId]: goalTasks }));
+    // Only the expanded goal's tree is rendered; realtime events update it in the cache
+    const treeQuery = useGoalTree(expandedGoal);
+    const expandedTree = treeQuery.data;
+    const phases: Record<string, Phase[]> = expandedGoal && expandedTree ? { [expandedGoal]: expandedTree.phases } : {};
+    const tasks: Record<string, Task[]> = expandedGoal && expandedTree ? { [expandedGoal]: expandedTree.tasks } : {};
 
-        } catch (err) {
-            console.error('Error fetching goal details:', err);
+    useEffect(() => {
+        if (treeQuery.error) {
+            console.error('Error fetching goal details:', treeQuery.error);
             showError('Failed to load goal details.');
         }
+    }, [treeQuery.error, showError]);
+
+    // Applies a successful mutation to the cached tree
+    const applyToGoalTree = (goalId: string, update: (tree: GoalTree) => GoalTree) => {
+        updateGoalTree(goalId, update);
+        // Other pages list these tasks too
+        invalidateQueries(['tasks']);
+        invalidateDashboard();
+        invalidateQueries(queryKeys.phases(goalId));
     };
 
     const toggleGoal = (goalId: string) => {
-        if (expandedGoal === goalId) {
-            setExpandedGoal(null);
-        } else {
-            setExpandedGoal(goalId);
-            fetchGoalDetails(goalId);
-        }
+        setExpandedGoal(expandedGoal === goalId ? null : goalId);
     };
 
     const addGoal = async (e: React.FormEvent) => {
@@ -141,7 +131,7 @@ export default function GoalsPage() {
                 Permission.delete(Role.user(user!.$id)),
             ]);
 
-            setGoals([response as unknown as Goal, ...goals]);
+            setQueryData<Goal[]>(goalsKey!, prev => applyToList(prev, 'create', response as unknown as Goal, { prepend: true }));
             setNewGoalTitle('');
             setNewGoalDeadline('');
             setIsAddingGoal(false);
@@ -162,8 +152,12 @@ export default function GoalsPage() {
             onConfirm: async () => {
                 if (!dbId) return;
                 try {
-                    await databases.deleteDocument(dbId, 'goals', goalId);
-                    setGoals(goals.filter(g => g.$id !== goalId));
+                    await deleteGoalOnServer(goalId);
+                    setQueryData<Goal[]>(goalsKey!, prev => prev.filter(g => g.$id !== goalId));
+                    invalidateGoalTree(goalId);
+                    removeQueries(queryKeys.phases(goalId));
+                    invalidateQueries(['tasks']);
+                    invalidateDashboard();
                     if (expandedGoal === goalId) setExpandedGoal(null);
                     success('Goal deleted successfully.');
                 } catch (err) {
@@ -190,9 +184,9 @@ export default function GoalsPage() {
                 Permission.delete(Role.user(user!.$id)),
             ]);
 
-            setPhases(prev => ({
-                ...prev,
-                [goalId]: [...(prev[goalId] || []), response as unknown as Phase]
+            applyToGoalTree(goalId, tree => ({
+                ...tree,
+                phases: applyToList(tree.phases, 'create', response as unknown as Phase)
             }));
             setNewPhaseTitle('');
             setAddingPhaseForGoal(null);
@@ -216,15 +210,11 @@ export default function GoalsPage() {
             onConfirm: async () => {
                 if (!dbId) return;
                 try {
-                    await databases.deleteDocument(dbId, 'phases', phaseId);
-                    setPhases(prev => ({
-                        ...prev,
-                        [goalId]: (prev[goalId] || []).filter(p => p.$id !== phaseId)
-                    }));
+                    await deletePhaseOnServer(phaseId);
                     // Also remove tasks associated with this phase from state
-                    setTasks(prev => ({
-                        ...prev,
-                        [goalId]: (prev[goalId] || []).filter(t => t.phaseId !== phaseId)
+                    applyToGoalTree(goalId, tree => ({
+                        phases: tree.phases.filter(p => p.$id !== phaseId),
+                        tasks: tree.tasks.filter(t => t.phaseId !== phaseId)
                     }));
                     success('Phase deleted successfully.');
                 } catch (err) {
@@ -253,9 +243,9 @@ export default function GoalsPage() {
                 Permission.delete(Role.user(user!.$id)),
             ]);
 
-            setTasks(prev => ({
-                ...prev,
-                [goalId]: [...(prev[goalId] || []), response as unknown as Task]
+            applyToGoalTree(goalId, tree => ({
+                ...tree,
+                tasks: applyToList(tree.tasks, 'create', response as unknown as Task)
             }));
             setNewTaskTitle('');
             setNewTaskDueDate('');
@@ -274,9 +264,9 @@ export default function GoalsPage() {
             await databases.updateDocument(dbId, 'tasks', task.$id, {
                 isCompleted: !task.isCompleted
             });
-            setTasks(prev => ({
-                ...prev,
-                [goalId]: (prev[goalId] || []).map(t =>
+            applyToGoalTree(goalId, tree => ({
+                ...tree,
+                tasks: tree.tasks.map(t =>
                     t.$id === task.$id ? { ...t, isCompleted: !t.isCompleted } : t
                 )
             }));
@@ -293,9 +283,9 @@ export default function GoalsPage() {
         if (!dbId) return;
         try {
             await databases.deleteDocument(dbId, 'tasks', taskId);
-            setTasks(prev => ({
-                ...prev,
-                [goalId]: (prev[goalId] || []).filter(t => t.$id !== taskId)
+            applyToGoalTree(goalId, tree => ({
+                ...tree,
+                tasks: tree.tasks.filter(t => t.$id !== taskId)
             }));
             success('Task deleted.');
         } catch (err) {
@@ -324,7 +314,7 @@ export default function GoalsPage() {
                     title="Failed to load goals"
                     description="We couldn't load your goals. Please check your connection and try again."
                     action={
-                        <Button onClick={fetchGoals}>
+                        <Button onClick={() => goalsQuery.refetch().catch(() => { })}>
                             <RefreshCw className="mr-2 h-4 w-4" />
                             Try Again
                         </Button>
@@ -378,6 +368,7 @@ export default function GoalsPage() {
                         <div
                             className="flex cursor-pointer items-center justify-between p-4 sm:p-5 hover:bg-accent/50 transition-colors"
                             onClick={() => toggleGoal(goal.$id)}
+                            onMouseEnter={() => prefetchGoalTrees([goal.$id])}
                         >
                             <div className="flex items-center flex-1">
                                 {expandedGoal === goal.$id ? (
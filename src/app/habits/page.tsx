@@ -1,8 +1,8 @@
 'use client';
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect } from 'react';
 import { databases } from '@/lib/appwrite';
-import { Query, ID, Permission, Role } from 'appwrite';
+import { ID, Permission, Role } from 'appwrite';
 import { Card } from '@/components/ui/Card';
 import { Button } from '@/components/ui/Button';
 import { Input } from '@/components/ui/Input';
@@ -13,14 +13,21 @@ import { useToast } from '@/components/ui/Toast';
 import { Habit } from '@/types';
 import { Check, Flame, Plus, X, Trophy, RefreshCw } from 'lucide-react';
 import { cn } from '@/lib/utils';
-import { calculateStreaks, getLocalDateString, isDateToday } from '@/lib/habit-utils';
+import {
+    addDateToRuns,
+    getLocalDateString,
+    isDateInRuns,
+    isDateToday,
+    removeDateFromRuns,
+    summarizeRuns,
+} from '@/lib/habit-utils';
+import { fetchHabitHistory, fetchHabits, invalidateDashboard, queryKeys, toHabit } from '@/lib/queries';
+import { setQueryData, useQuery } from '@/lib/query-cache';
+import { applyToList } from '@/lib/realtime';
 
 export default function HabitsPage() {
     const { user } = useAuth();
     const { success, error: showError } = useToast();
-    const [habits, setHabits] = useState<Habit[]>([]);
-    const [loading, setLoading] = useState(true);
-    const [hasError, setHasError] = useState(false);
     const [newHabit, setNewHabit] = useState('');
     const [isAdding, setIsAdding] = useState(false);
     const [isSubmitting, setIsSubmitting] = useState(false);
@@ -36,38 +43,18 @@ export default function HabitsPage() {
 
     const todayStr = getLocalDateString(new Date());
 
-    const fetchHabits = useCallback(async () => {
-        if (!dbId || !user) return;
-        try {
-            setHasError(false);
-            const response = await databases.listDocuments(dbId, 'habits', [
-                Query.equal('userId', user.$id),
-            ]);
-            setHabits(response.documents.map(doc => ({
-                $id: doc.$id,
-                title: doc.title,
-                streak: doc.streak || 0,
-                longestStreak: doc.longestStreak || 0,
-                completedDates: doc.completedDates || [],
-                userId: doc.userId
-            } as Habit)));
-        } catch (err) {
-            console.error('Error fetching habits:', err);
-            setHasError(true);
-            showError('Failed to load habits. Please try again.');
-        } finally {
-            setLoading(false);
-        }
-    }, [dbId, user, showError]);
+    const habitsKey = user ? queryKeys.habits(user.$id) : null;
+    const habitsQuery = useQuery(habitsKey, () => fetchHabits(user!.$id));
+    const habits = habitsQuery.data ?? [];
+    const loading = habitsQuery.isLoading;
+    const hasError = !!habitsQuery.error && !habitsQuery.data;
 
     useEffect(() => {
-        if (user && dbId) {
-            fetchHabits();
-        } else if (!dbId) {
-            console.error('Missing Database ID');
-            setLoading(false);
+        if (habitsQuery.error) {
+            console.error('Error fetching habits:', habitsQuery.error);
+            showError('Failed to load habits. Please try again.');
         }
-    }, [user, dbId, fetchHabits]);
+    }, [habitsQuery.error, showError]);
 
     const addHabit = async (e: React.FormEvent) => {
         e.preventDefault();
@@ -75,30 +62,21 @@ export default function HabitsPage() {
 
         setIsSubmitting(true);
         try {
-            const initialStreak = { streak: 0, longestStreak: 0 };
-
             const doc = await databases.createDocument(dbId, 'habits', ID.unique(), {
                 title: newHabit,
                 userId: user.$id,
-                streak: initialStreak.streak,
-                longestStreak: initialStreak.longestStreak,
-                completedDates: []
+                completedRuns: [],
+                ...summarizeRuns([])
             }, [
                 Permission.read(Role.user(user.$id)),
                 Permission.update(Role.user(user.$id)),
                 Permission.delete(Role.user(user.$id)),
             ]);
 
-            const newHabitObj: Habit = {
-                $id: doc.$id,
-                title: doc.title,
-                streak: doc.streak,
-                longestStreak: doc.longestStreak,
-                completedDates: doc.completedDates,
-                userId: doc.userId
-            };
+            const newHabitObj = toHabit(doc);
 
-            setHabits(prev => [...prev, newHabitObj]);
+            setQueryData<Habit[]>(habitsKey!, prev => applyToList(prev, 'create', newHabitObj));
+            invalidateDashboard();
             setNewHabit('');
             setIsAdding(false);
             success('Habit created! Start building your streak! 🔥');
@@ -120,35 +98,32 @@ export default function HabitsPage() {
             return;
         }
 
-        const isCompleted = habit.completedDates.includes(dateStr);
-        let newCompletedDates = [...habit.completedDates];
-
-        if (isCompleted) {
-            newCompletedDates = newCompletedDates.filter(d => d !== dateStr);
-        } else {
-            newCompletedDates.push(dateStr);
-        }
-
-        // Robust Streak Calculation
-        const { streak, longestStreak } = calculateStreaks(newCompletedDates);
+        const isCompleted = isDateInRuns(habit.recentRuns, dateStr);
 
         try {
+            // The list only holds the last few weeks; streaks need the whole history
+            const completedRuns = await fetchHabitHistory(habit.$id);
+            const newCompletedRuns = isCompleted
+                ? removeDateFromRuns(completedRuns, dateStr)
+                : addDateToRuns(completedRuns, dateStr);
+            const summary = summarizeRuns(newCompletedRuns);
+
+            // completedDates is cleared so legacy documents are migrated on their first toggle
             await databases.updateDocument(dbId, 'habits', habit.$id, {
-                completedDates: newCompletedDates,
-                streak: streak,
-                longestStreak: longestStreak
+                completedRuns: newCompletedRuns,
+                completedDates: [],
+                ...summary
             });
 
             // Update local state
-            setHabits(prevHabits => prevHabits.map(h => h.$id === habit.$id ? {
+            setQueryData<Habit[]>(habitsKey!, prevHabits => prevHabits.map(h => h.$id === habit.$id ? {
                 ...h,
-                completedDates: newCompletedDates,
-                streak,
-                longestStreak
+                ...summary
             } : h));
+            invalidateDashboard();
 
             if (!isCompleted) {
-                success(`Great job! ${streak > 1 ? `${streak} day streak! 🔥` : 'Keep it up!'}`);
+                success(`Great job! ${summary.streak > 1 ? `${summary.streak} day streak! 🔥` : 'Keep it up!'}`);
             }
         } catch (err) {
             console.error('Error updating habit:', err);
@@ -168,7 +143,7 @@ export default function HabitsPage() {
                     title="Failed to load habits"
                     description="We couldn't load your habits. Please check your connection and try again."
                     action={
-                        <Button onClick={fetchHabits}>
+                        <Button onClick={() => habitsQuery.refetch().catch(() => { })}>
                             <RefreshCw className="mr-2 h-4 w-4" />
                             Try Again
                         </Button>
@@ -223,7 +198,7 @@ export default function HabitsPage() {
                         <div className="grid grid-cols-7 gap-1 sm:gap-2">
                             {days.map((date) => {
                                 const dateStr = getLocalDateString(date);
-                                const isCompleted = habit.completedDates.includes(dateStr);
+                                const isCompleted = isDateInRuns(habit.recentRuns, dateStr);
                                 const isToday = dateStr === todayStr;
                                 const isPast = dateStr < todayStr;
                                 const canInteract = isToday;
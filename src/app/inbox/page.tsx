@@ -1,8 +1,8 @@
 'use client';
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect } from 'react';
 import { databases } from '@/lib/appwrite';
-import { ID, Query, Permission, Role } from 'appwrite';
+import { ID, Permission, Role } from 'appwrite';
 import { Button } from '@/components/ui/Button';
 import { Input } from '@/components/ui/Input';
 import { Card } from '@/components/ui/Card';
@@ -10,84 +10,60 @@ import { EmptyState } from '@/components/ui/EmptyState';
 import { PageLoader } from '@/components/ui/LoadingSpinner';
 import { useAuth } from '@/context/AuthContext';
 import { useToast } from '@/components/ui/Toast';
-import { InboxItem, Goal, Phase } from '@/types';
+import { InboxItem } from '@/types';
 import { ArrowRight, Check, Trash2, Inbox, RefreshCw } from 'lucide-react';
 import { cn } from '@/lib/utils';
+import { fetchGoals, fetchInbox, fetchPhases, invalidateDashboard, queryKeys } from '@/lib/queries';
+import { invalidateQueries, setQueryData, useQuery } from '@/lib/query-cache';
+import { applyToList } from '@/lib/realtime';
 
 export default function InboxPage() {
     const { user } = useAuth();
     const { success, error: showError } = useToast();
-    const [items, setItems] = useState<InboxItem[]>([]);
     const [newItem, setNewItem] = useState('');
     const [convertToTask, setConvertToTask] = useState(false);
-    const [goals, setGoals] = useState<Goal[]>([]);
     const [selectedGoal, setSelectedGoal] = useState('');
-    const [phases, setPhases] = useState<Phase[]>([]);
     const [selectedPhase, setSelectedPhase] = useState('');
-    const [loading, setLoading] = useState(true);
-    const [hasError, setHasError] = useState(false);
     const [isSubmitting, setIsSubmitting] = useState(false);
 
     const dbId = process.env.NEXT_PUBLIC_APPWRITE_DATABASE_ID!;
 
-    const fetchInbox = useCallback(async () => {
-        if (!user) return;
-        try {
-            setHasError(false);
-            const response = await databases.listDocuments(dbId, 'inbox', [
-                Query.equal('userId', user.$id),
-                Query.equal('isProcessed', false),
-                Query.orderDesc('$createdAt'),
-            ]);
-            setItems(response.documents as unknown as InboxItem[]);
-        } catch (err) {
-            console.error('Error fetching inbox:', err);
-            setHasError(true);
+    const inboxKey = user ? queryKeys.inbox(user.$id) : null;
+    const inboxQuery = useQuery(inboxKey, () => fetchInbox(user!.$id));
+    const items = inboxQuery.data ?? [];
+    const loading = inboxQuery.isLoading;
+    const hasError = !!inboxQuery.error && !inboxQuery.data;
+
+    // Shared with the goals page, so its list renders from cache here
+    const goalsQuery = useQuery(user ? queryKeys.goals(user.$id) : null, () => fetchGoals(user!.$id));
+    const goals = goalsQuery.data ?? [];
+    const phasesQuery = useQuery(selectedGoal ? queryKeys.phases(selectedGoal) : null, () => fetchPhases(selectedGoal));
+    const phases = selectedGoal ? phasesQuery.data ?? [] : [];
+
+    useEffect(() => {
+        if (inboxQuery.error) {
+            console.error('Error fetching inbox:', inboxQuery.error);
             showError('Failed to load inbox. Please try again.');
-        } finally {
-            setLoading(false);
         }
-    }, [user, dbId, showError]);
+    }, [inboxQuery.error, showError]);
 
-    const fetchGoals = useCallback(async () => {
-        if (!user) return;
-        try {
-            const response = await databases.listDocuments(dbId, 'goals', [
-                Query.equal('userId', user.$id),
-            ]);
-            setGoals(response.documents as unknown as Goal[]);
-        } catch (err) {
-            console.error('Error fetching goals:', err);
+    useEffect(() => {
+        if (goalsQuery.error) {
+            console.error('Error fetching goals:', goalsQuery.error);
         }
-    }, [user, dbId]);
+    }, [goalsQuery.error]);
 
     useEffect(() => {
-        if (user) {
-            fetchInbox();
-            fetchGoals();
+        if (phasesQuery.error) {
+            console.error('Error fetching phases:', phasesQuery.error);
         }
-    }, [user, fetchInbox, fetchGoals]);
+    }, [phasesQuery.error]);
 
     useEffect(() => {
-        const fetchPhases = async (goalId: string) => {
-            try {
-                const response = await databases.listDocuments(dbId, 'phases', [
-                    Query.equal('goalId', goalId),
-                    Query.orderAsc('order'),
-                ]);
-                setPhases(response.documents as unknown as Phase[]);
-            } catch (err) {
-                console.error('Error fetching phases:', err);
-            }
-        };
-
-        if (selectedGoal) {
-            fetchPhases(selectedGoal);
-        } else {
-            setPhases([]);
+        if (!selectedGoal) {
             setSelectedPhase('');
         }
-    }, [selectedGoal, dbId]);
+    }, [selectedGoal]);
 
     const handleCapture = async (e: React.FormEvent) => {
         e.preventDefault();
@@ -109,6 +85,11 @@ export default function InboxPage() {
                     Permission.update(Role.user(user!.$id)),
                     Permission.delete(Role.user(user!.$id)),
                 ]);
+                invalidateQueries(['tasks']);
+                invalidateDashboard();
+                if (selectedGoal) {
+                    invalidateQueries(queryKeys.goalTree(selectedGoal));
+                }
                 success('Task created successfully! ✨');
             } else {
                 // Create Inbox Item
@@ -121,7 +102,7 @@ export default function InboxPage() {
                     Permission.update(Role.user(user!.$id)),
                     Permission.delete(Role.user(user!.$id)),
                 ]);
-                setItems([response as unknown as InboxItem, ...items]);
+                setQueryData<InboxItem[]>(inboxKey!, prev => applyToList(prev, 'create', response as unknown as InboxItem, { prepend: true }));
                 success('Saved to inbox!');
             }
             setNewItem('');
@@ -141,7 +122,7 @@ export default function InboxPage() {
             await databases.updateDocument(dbId, 'inbox', id, {
                 isProcessed: true,
             });
-            setItems(items.filter(item => item.$id !== id));
+            setQueryData<InboxItem[]>(inboxKey!, prev => prev.filter(item => item.$id !== id));
             success('Item processed!');
         } catch (err) {
             console.error('Error processing item:', err);
@@ -161,7 +142,7 @@ export default function InboxPage() {
                     title="Failed to load inbox"
                     description="We couldn't load your inbox. Please check your connection and try again."
                     action={
-                        <Button onClick={fetchInbox}>
+                        <Button onClick={() => inboxQuery.refetch().catch(() => { })}>
                             <RefreshCw className="mr-2 h-4 w-4" />
                             Try Again
                         </Button>
@@ -1,98 +1,47 @@
 'use client';
 
-import React, { useEffect, useState, useCallback } from 'react';
+import React, { useEffect } from 'react';
 import { databases } from '@/lib/appwrite';
-import { Query } from 'appwrite';
 import { Card } from '@/components/ui/Card';
 import { Skeleton } from '@/components/ui/Skeleton';
 import { EmptyState } from '@/components/ui/EmptyState';
-import { Task, Habit } from '@/types';
+import { DashboardSummary } from '@/types';
 import { useAuth } from '@/context/AuthContext';
 import { useToast } from '@/components/ui/Toast';
 import { CheckCircle2, Circle, Flame, RefreshCw } from 'lucide-react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Button } from '@/components/ui/Button';
+import { fetchDashboard, invalidateDashboard, queryKeys } from '@/lib/queries';
+import { invalidateQueries, setQueryData, useQuery } from '@/lib/query-cache';
 
 export default function Dashboard() {
     const { user } = useAuth();
     const { success, error: showError } = useToast();
-    const [tasks, setTasks] = useState<Task[]>([]);
-    const [habits, setHabits] = useState<Habit[]>([]);
-    const [loading, setLoading] = useState(true);
-    const [retrying, setRetrying] = useState(false);
-    const [hasError, setHasError] = useState(false);
 
-    const fetchDashboardData = useCallback(async () => {
-        if (!user) return;
-        
-        try {
-            setHasError(false);
-            const dbId = process.env.NEXT_PUBLIC_APPWRITE_DATABASE_ID!;
-
-            const tasksResponse = await databases.listDocuments(
-                dbId,
-                'tasks',
-                [
-                    Query.equal('userId', user.$id),
-                    Query.equal('isCompleted', false),
-                    Query.orderAsc('dueDate'),
-                    Query.limit(100)
-                ]
-            );
-
-            const today = new Date();
-            today.setHours(23, 59, 59, 999);
-
-            const dueTasks = tasksResponse.documents.map(doc => ({
-                $id: doc.$id,
-                title: doc.title,
-                isCompleted: doc.isCompleted,
-                dueDate: doc.dueDate,
-                userId: doc.userId,
-            } as Task)).filter(task => {
-                const dueDate = new Date(task.dueDate);
-                return dueDate <= today;
-            });
+    // Open tasks due by the end of the user's local day; the server filters and trims the fields
+    const endOfToday = new Date();
+    endOfToday.setHours(23, 59, 59, 999);
+    const dueBefore = endOfToday.toISOString();
+    const summaryKey = user ? queryKeys.dashboard(user.$id, dueBefore) : null;
+    const summaryQuery = useQuery(summaryKey, () => fetchDashboard(dueBefore));
 
-            setTasks(dueTasks);
+    const tasks = summaryQuery.data?.tasks ?? [];
+    const habits = summaryQuery.data?.habits ?? [];
 
-            const habitsResponse = await databases.listDocuments(
-                dbId,
-                'habits',
-                [
-                    Query.equal('userId', user.$id),
-                    Query.limit(20)
-                ]
-            );
-
-            setHabits(habitsResponse.documents.map(doc => ({
-                $id: doc.$id,
-                title: doc.title,
-                streak: doc.streak || 0,
-                completedDates: doc.completedDates || [],
-                userId: doc.userId
-            } as Habit)));
-
-        } catch (err) {
-            console.error('Error fetching dashboard data:', err);
-            setHasError(true);
-            showError('Failed to load dashboard data. Please try again.');
-        } finally {
-            setLoading(false);
-            setRetrying(false);
-        }
-    }, [user, showError]);
+    const loading = summaryQuery.isLoading;
+    const queryError = summaryQuery.error;
+    const hasError = !!queryError && !summaryQuery.data;
+    const retrying = hasError && summaryQuery.isFetching;
 
     useEffect(() => {
-        if (user) {
-            fetchDashboardData();
+        if (queryError) {
+            console.error('Error fetching dashboard data:', queryError);
+            showError('Failed to load dashboard data. Please try again.');
         }
-    }, [user, fetchDashboardData]);
+    }, [queryError, showError]);
 
     const handleRetry = () => {
-        setRetrying(true);
-        setLoading(true);
-        fetchDashboardData();
+        summaryQuery.refetch().catch(() => { });
     };
 
     const toggleTask = async (taskId: string, currentStatus: boolean) => {
@@ -101,7 +50,13 @@ export default function Dashboard() {
             await databases.updateDocument(dbId, 'tasks', taskId, {
                 isCompleted: !currentStatus
             });
-            setTasks(tasks.filter(t => t.$id !== taskId));
+            setQueryData<DashboardSummary>(summaryKey!, prev => ({
+                ...prev,
+                tasks: prev.tasks.filter(t => t.$id !== taskId),
+            }));
+            invalidateDashboard();
+            invalidateQueries(['tasks']);
+            invalidateQueries(['goal-tree']);
             success('Task completed! Great job! 🎉');
         } catch (err) {
             console.error('Error toggling task:', err);
@@ -1,8 +1,8 @@
 'use client';
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect } from 'react';
 import { databases, appwriteStorage } from '@/lib/appwrite';
-import { ID, Query, Permission, Role } from 'appwrite';
+import { ID, Permission, Role } from 'appwrite';
 import { Card } from '@/components/ui/Card';
 import { Button } from '@/components/ui/Button';
 import { EmptyState } from '@/components/ui/EmptyState';
@@ -11,14 +11,14 @@ import { ConfirmDialog } from '@/components/ui/ConfirmDialog';
 import { useAuth } from '@/context/AuthContext';
 import { useToast } from '@/components/ui/Toast';
 import { Resource } from '@/types';
+import { fetchResources, queryKeys } from '@/lib/queries';
+import { setQueryData, useQuery } from '@/lib/query-cache';
+import { applyToList } from '@/lib/realtime';
 import { Download, FileIcon, Trash2, Upload, RefreshCw, FolderOpen } from 'lucide-react';
 
 export default function ResourcesPage() {
     const { user } = useAuth();
     const { success, error: showError, loading: showLoading, removeToast } = useToast();
-    const [resources, setResources] = useState<Resource[]>([]);
-    const [loading, setLoading] = useState(true);
-    const [hasError, setHasError] = useState(false);
     const [uploading, setUploading] = useState(false);
     const [confirmDialog, setConfirmDialog] = useState<{
         isOpen: boolean;
@@ -31,29 +31,18 @@ export default function ResourcesPage() {
     const dbId = process.env.NEXT_PUBLIC_APPWRITE_DATABASE_ID!;
     const bucketId = 'resources';
 
-    const fetchResources = useCallback(async () => {
-        if (!user) return;
-        try {
-            setHasError(false);
-            const response = await databases.listDocuments(dbId, 'resources', [
-                Query.equal('userId', user.$id),
-                Query.orderDesc('$createdAt'),
-            ]);
-            setResources(response.documents as unknown as Resource[]);
-        } catch (err) {
-            console.error('Error fetching resources:', err);
-            setHasError(true);
-            showError('Failed to load resources. Please try again.');
-        } finally {
-            setLoading(false);
-        }
-    }, [user, dbId, showError]);
+    const resourcesKey = user ? queryKeys.resources(user.$id) : null;
+    const resourcesQuery = useQuery(resourcesKey, () => fetchResources(user!.$id));
+    const resources = resourcesQuery.data ?? [];
+    const loading = resourcesQuery.isLoading;
+    const hasError = !!resourcesQuery.error && !resourcesQuery.data;
 
     useEffect(() => {
-        if (user) {
-            fetchResources();
+        if (resourcesQuery.error) {
+            console.error('Error fetching resources:', resourcesQuery.error);
+            showError('Failed to load resources. Please try again.');
         }
-    }, [user, fetchResources]);
+    }, [resourcesQuery.error, showError]);
 
     const handleUpload = async (e: React.ChangeEvent<HTMLInputElement>) => {
         const file = e.target.files?.[0];
@@ -82,7 +71,7 @@ export default function ResourcesPage() {
                 Permission.delete(Role.user(user!.$id)),
             ]);
 
-            setResources([resourceDoc as unknown as Resource, ...resources]);
+            setQueryData<Resource[]>(resourcesKey!, prev => applyToList(prev, 'create', resourceDoc as unknown as Resource, { prepend: true }));
             removeToast(loadingToastId);
             success(`${file.name} uploaded successfully! 📁`);
         } catch (err) {
@@ -106,7 +95,7 @@ export default function ResourcesPage() {
         try {
             await appwriteStorage.deleteFile(bucketId, resource.fileId);
             await databases.deleteDocument(dbId, 'resources', resource.$id);
-            setResources(resources.filter(r => r.$id !== resource.$id));
+            setQueryData<Resource[]>(resourcesKey!, prev => prev.filter(r => r.$id !== resource.$id));
             success('File deleted successfully.');
         } catch (err) {
             console.error('Error deleting resource:', err);
@@ -133,7 +122,7 @@ export default function ResourcesPage() {
                     title="Failed to load resources"
                     description="We couldn't load your files. Please check your connection and try again."
                     action={
-                        <Button onClick={fetchResources}>
+                        <Button onClick={() => resourcesQuery.refetch().catch(() => { })}>
                             <RefreshCw className="mr-2 h-4 w-4" />
                             Try Again
                         </Button>
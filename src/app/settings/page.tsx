@@ -1,6 +1,6 @@
 'use client';
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect } from 'react';
 import { account, databases } from '@/lib/appwrite';
 import { useAuth } from '@/context/AuthContext';
 import { useToast } from '@/components/ui/Toast';
@@ -10,23 +10,18 @@ import { Input } from '@/components/ui/Input';
 import { EmptyState } from '@/components/ui/EmptyState';
 import { PageLoader } from '@/components/ui/LoadingSpinner';
 import { ConfirmDialog } from '@/components/ui/ConfirmDialog';
-import { ID, Query, Permission, Role } from 'appwrite';
-import { Trash2, Key, Copy, Check, RefreshCw, User } from 'lucide-react';
+import { ID, Permission, Role } from 'appwrite';
+import { ApiKey, fetchApiKeys, queryKeys, revokeApiKey } from '@/lib/queries';
+import { setQueryData, useQuery } from '@/lib/query-cache';
+import { applyToList } from '@/lib/realtime';
 
-interface ApiKey {
-    $id: string;
-    key: string;
-    createdAt: string;
-    userId: string;
-}
+import { Trash2, Key, Copy, Check, RefreshCw, User } from 'lucide-react';
 
 export default function SettingsPage() {
     const { user, refreshUser } = useAuth();
     const { success, error: showError } = useToast();
     const [name, setName] = useState('');
     const [isUpdatingProfile, setIsUpdatingProfile] = useState(false);
-    const [apiKeys, setApiKeys] = useState<ApiKey[]>([]);
-    const [isLoadingKeys, setIsLoadingKeys] = useState(true);
     const [isGeneratingKey, setIsGeneratingKey] = useState(false);
     const [newlyGeneratedKey, setNewlyGeneratedKey] = useState<string | null>(null);
     const [copiedId, setCopiedId] = useState<string | null>(null);
@@ -40,30 +35,23 @@ export default function SettingsPage() {
 
     const dbId = process.env.NEXT_PUBLIC_APPWRITE_DATABASE_ID;
 
-    const fetchApiKeys = useCallback(async () => {
-        if (!user || !dbId) return;
-        setIsLoadingKeys(true);
-        try {
-            const response = await databases.listDocuments(
-                dbId,
-                'api_keys',
-                [Query.equal('userId', user.$id)]
-            );
-            setApiKeys(response.documents as unknown as ApiKey[]);
-        } catch (err) {
-            console.error('Error fetching API keys:', err);
+    const apiKeysKey = user ? queryKeys.apiKeys(user.$id) : null;
+    const apiKeysQuery = useQuery(apiKeysKey, () => fetchApiKeys(user!.$id));
+    const apiKeys = apiKeysQuery.data ?? [];
+    const isLoadingKeys = apiKeysQuery.isLoading;
+
+    useEffect(() => {
+        if (apiKeysQuery.error) {
+            console.error('Error fetching API keys:', apiKeysQuery.error);
             showError('Failed to load API keys.');
-        } finally {
-            setIsLoadingKeys(false);
         }
-    }, [user, dbId, showError]);
+    }, [apiKeysQuery.error, showError]);
 
     useEffect(() => {
         if (user) {
             setName(user.name);
-            fetchApiKeys();
         }
-    }, [user, fetchApiKeys]);
+    }, [user]);
 
     const updateProfile = async (e: React.FormEvent) => {
         e.preventDefault();
@@ -110,7 +98,7 @@ export default function SettingsPage() {
             );
 
             setNewlyGeneratedKey(rawKey);
-            setApiKeys(prev => [...prev, doc as unknown as ApiKey]);
+            setQueryData<ApiKey[]>(apiKeysKey!, prev => applyToList(prev, 'create', doc as unknown as ApiKey));
             success('API key generated successfully!');
         } catch (err) {
             console.error('Error generating API key:', err);
@@ -121,11 +109,9 @@ export default function SettingsPage() {
     };
 
     const deleteApiKey = async (id: string) => {
-        if (!dbId) return;
-
         try {
-            await databases.deleteDocument(dbId, 'api_keys', id);
-            setApiKeys(prev => prev.filter(k => k.$id !== id));
+            await revokeApiKey(id);
+            setQueryData<ApiKey[]>(apiKeysKey!, prev => prev.filter(k => k.$id !== id));
             success('API key deleted successfully.');
         } catch (err) {
             console.error('Error deleting API key:', err);
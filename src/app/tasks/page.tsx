@@ -1,8 +1,7 @@
 'use client';
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect } from 'react';
 import { databases } from '@/lib/appwrite';
-import { Query } from 'appwrite';
 import { Card } from '@/components/ui/Card';
 import { EmptyState } from '@/components/ui/EmptyState';
 import { PageLoader } from '@/components/ui/LoadingSpinner';
@@ -12,51 +11,40 @@ import { useToast } from '@/components/ui/Toast';
 import { Task } from '@/types';
 import { Circle, CheckCircle2, RefreshCw, ListTodo } from 'lucide-react';
 import { cn } from '@/lib/utils';
+import { TaskFilter, fetchTasks, invalidateDashboard, queryKeys } from '@/lib/queries';
+import { invalidateQueries, prefetchQuery, setQueryData, useQuery } from '@/lib/query-cache';
+
+const TASK_FILTERS: TaskFilter[] = ['all', 'active', 'completed'];
 
 export default function TasksPage() {
     const { user } = useAuth();
     const { success, error: showError } = useToast();
-    const [tasks, setTasks] = useState<Task[]>([]);
-    const [loading, setLoading] = useState(true);
-    const [hasError, setHasError] = useState(false);
-    const [filter, setFilter] = useState<'all' | 'active' | 'completed'>('active');
+    const [filter, setFilter] = useState<TaskFilter>('active');
 
     const dbId = process.env.NEXT_PUBLIC_APPWRITE_DATABASE_ID;
 
-    const fetchTasks = useCallback(async () => {
-        if (!dbId || !user) return;
-        try {
-            setHasError(false);
-            const queries = [
-                Query.equal('userId', user.$id),
-                Query.orderAsc('dueDate'),
-            ];
-
-            if (filter === 'active') {
-                queries.push(Query.equal('isCompleted', false));
-            } else if (filter === 'completed') {
-                queries.push(Query.equal('isCompleted', true));
-            }
+    const tasksKey = user ? queryKeys.tasks(user.$id, filter) : null;
+    const tasksQuery = useQuery(tasksKey, () => fetchTasks(user!.$id, filter));
+    const tasks = tasksQuery.data ?? [];
+    const loading = tasksQuery.isLoading;
+    const hasError = !!tasksQuery.error && !tasksQuery.data;
 
-            const response = await databases.listDocuments(dbId, 'tasks', queries);
-            setTasks(response.documents as unknown as Task[]);
-        } catch (err) {
-            console.error('Error fetching tasks:', err);
-            setHasError(true);
+    useEffect(() => {
+        if (tasksQuery.error) {
+            console.error('Error fetching tasks:', tasksQuery.error);
             showError('Failed to load tasks. Please try again.');
-        } finally {
-            setLoading(false);
         }
-    }, [dbId, user, filter, showError]);
+    }, [tasksQuery.error, showError]);
 
+    // Load the other filters in the background so switching tabs renders from cache
+    const hasTasks = tasksQuery.data !== undefined;
     useEffect(() => {
-        if (user && dbId) {
-            fetchTasks();
-        } else if (!dbId) {
-            console.error('Missing Database ID');
-            setLoading(false);
+        if (user && hasTasks) {
+            for (const other of TASK_FILTERS) {
+                prefetchQuery(queryKeys.tasks(user.$id, other), () => fetchTasks(user.$id, other));
+            }
         }
-    }, [user, filter, dbId, fetchTasks]);
+    }, [user, hasTasks]);
 
     const toggleTask = async (taskId: string, currentStatus: boolean) => {
         if (!dbId) return;
@@ -66,10 +54,14 @@ export default function TasksPage() {
             });
             // Refresh or optimistic update
             if (filter !== 'all') {
-                setTasks(tasks.filter(t => t.$id !== taskId));
+                setQueryData<Task[]>(tasksKey!, prev => prev.filter(t => t.$id !== taskId));
             } else {
-                setTasks(tasks.map(t => t.$id === taskId ? { ...t, isCompleted: !currentStatus } : t));
+                setQueryData<Task[]>(tasksKey!, prev => prev.map(t => t.$id === taskId ? { ...t, isCompleted: !currentStatus } : t));
             }
+            // The other filters, the dashboard and goal trees list this task too
+            invalidateQueries(['tasks']);
+            invalidateQueries(['goal-tree']);
+            invalidateDashboard();
             if (!currentStatus) {
                 success('Task completed! Great work! 🎉');
             }
@@ -91,7 +83,7 @@ export default function TasksPage() {
                     title="Failed to load tasks"
                     description="We couldn't load your tasks. Please check your connection and try again."
                     action={
-                        <Button onClick={fetchTasks}>
+                        <Button onClick={() => tasksQuery.refetch().catch(() => { })}>
                             <RefreshCw className="mr-2 h-4 w-4" />
                             Try Again
                         </Button>
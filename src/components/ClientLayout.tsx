@@ -6,11 +6,17 @@ import { Sidebar } from "@/components/Sidebar";
 import { Header } from "@/components/Header";
 import { ProtectedRoute } from "@/components/ProtectedRoute";
 import { ErrorBoundary } from "@/components/ui/ErrorBoundary";
+import { useAuth } from "@/context/AuthContext";
+import { useRealtimeSync } from "@/lib/realtime";
 
 export default function ClientLayout({ children }: { children: React.ReactNode }) {
     const pathname = usePathname();
     const isAuthPage = pathname === '/login' || pathname === '/signup';
     const [isSidebarOpen, setIsSidebarOpen] = useState(false);
+    const { user } = useAuth();
+
+    // Push document changes into the shared query cache while signed in
+    useRealtimeSync(user?.$id ?? null);
 
     return (
         <ProtectedRoute>
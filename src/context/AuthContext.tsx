@@ -1,7 +1,8 @@
 'use client';
 
 import { createContext, useContext, useEffect, useState, ReactNode } from 'react';
-import { account } from '@/lib/appwrite';
+import { account, clearSessionJwt } from '@/lib/appwrite';
+import { clearQueryCache } from '@/lib/query-cache';
 import { Models } from 'appwrite';
 import { useRouter } from 'next/navigation';
 
@@ -51,6 +52,8 @@ export const AuthProvider = ({ children }: { children: ReactNode }) => {
     const logout = async () => {
         try {
             await account.deleteSession('current');
+            clearQueryCache();
+            clearSessionJwt();
             setUser(null);
             router.push('/login');
         } catch (error) {
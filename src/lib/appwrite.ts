@@ -1,4 +1,4 @@
-import { Client, Account, Databases, Storage } from 'appwrite';
+import { Client, Account, Databases, Models, Storage } from 'appwrite';
 
 // Lazy initialization to avoid build-time errors when env vars are not set
 let clientInstance: Client | null = null;
@@ -91,3 +91,51 @@ export const client = new Proxy({} as Client, {
 });
 
 export const DATABASE_ID = process.env.NEXT_PUBLIC_APPWRITE_DATABASE_ID || '';
+
+export type DocumentAction = 'create' | 'update' | 'delete';
+
+export interface DocumentEvent {
+    collectionId: string;
+    action: DocumentAction;
+    document: Models.Document;
+}
+
+const DOCUMENT_EVENT = /^databases\.[^.]+\.collections\.([^.]+)\.documents\.[^.]+\.(create|update|delete)$/;
+
+/**
+ * Subscribes to document changes in the given collections over Appwrite Realtime.
+ * Appwrite only delivers documents the signed-in user can read. Returns the unsubscribe function.
+ */
+export function subscribeToDocuments(collectionIds: string[], onEvent: (event: DocumentEvent) => void): () => void {
+    const channels = collectionIds.map(collectionId => `databases.${DATABASE_ID}.collections.${collectionId}.documents`);
+    return getClient().subscribe<Models.Document>(channels, response => {
+        for (const event of response.events) {
+            const match = DOCUMENT_EVENT.exec(event);
+            if (match) {
+                onEvent({ collectionId: match[1], action: match[2] as DocumentAction, document: response.payload });
+                return;
+            }
+        }
+    });
+}
+
+// Appwrite JWTs last 15 minutes; reuse one for a little less than that
+const SESSION_JWT_TTL_MS = 10 * 60 * 1000;
+let sessionJwt: { jwt: string; expiresAt: number } | null = null;
+
+/**
+ * Returns a JWT for the signed-in session, for calling the app's own API routes
+ * with Authorization: Bearer. Reuses the last JWT until it is close to expiring.
+ */
+export async function getSessionJwt(): Promise<string> {
+    if (sessionJwt && sessionJwt.expiresAt > Date.now()) {
+        return sessionJwt.jwt;
+    }
+    const { jwt } = await getAccount().createJWT();
+    sessionJwt = { jwt, expiresAt: Date.now() + SESSION_JWT_TTL_MS };
+    return jwt;
+}
+
+export const clearSessionJwt = () => {
+    sessionJwt = null;
+};
@@ -0,0 +1,55 @@
+import { Query } from 'appwrite';
+import { fetchPhases, listAllDocuments, queryKeys } from '@/lib/queries';
+import { prefetchQuery, removeQueries, setQueryData, useQuery } from '@/lib/query-cache';
+import { Phase, Task } from '@/types';
+
+export interface GoalTree {
+    phases: Phase[];
+    tasks: Task[];
+}
+
+// A cached tree older than this is shown at once and refetched in the background
+export const GOAL_TREE_STALE_MS = 60 * 1000;
+// Goals at the top of the list whose trees are loaded before they are expanded
+export const GOAL_TREE_PREFETCH_COUNT = 3;
+
+async function fetchGoalTree(goalId: string): Promise<GoalTree> {
+    const [phases, tasks] = await Promise.all([
+        fetchPhases(goalId),
+        listAllDocuments<Task>('tasks', [Query.equal('goalId', goalId), Query.orderAsc('$createdAt')]),
+    ]);
+    return { phases, tasks };
+}
+
+/**
+ * Reads a goal's tree from the cache, loading it on first use. Pass null while no goal is expanded.
+ */
+export const useGoalTree = (goalId: string | null) => {
+    return useQuery(goalId ? queryKeys.goalTree(goalId) : null, () => fetchGoalTree(goalId!), { staleMs: GOAL_TREE_STALE_MS });
+};
+
+/**
+ * Warms the cache for goals the user is likely to expand next. Failures are ignored;
+ * expanding the goal retries the load.
+ */
+export const prefetchGoalTrees = (goalIds: string[]) => {
+    for (const goalId of goalIds) {
+        prefetchQuery(queryKeys.goalTree(goalId), () => fetchGoalTree(goalId), { staleMs: GOAL_TREE_STALE_MS });
+    }
+};
+
+/**
+ * Applies a local change (after a successful mutation) to a cached tree and returns the new tree.
+ * Returns undefined when the goal is not cached; the next load will fetch it.
+ */
+export const updateGoalTree = (goalId: string, update: (tree: GoalTree) => GoalTree): GoalTree | undefined => {
+    return setQueryData(queryKeys.goalTree(goalId), update);
+};
+
+/**
+ * Drops a goal's cached tree, e.g. after the goal is deleted. A tree that is still expanded
+ * is refetched instead, so it never keeps showing the deleted goal's phases and tasks.
+ */
+export const invalidateGoalTree = (goalId: string) => {
+    removeQueries(queryKeys.goalTree(goalId));
+};
@@ -1,5 +1,21 @@
 
-import { calculateStreaks, getLocalDateString } from './habit-utils';
+import {
+    RECENT_DAYS,
+    addDateToRuns,
+    calculateStreaks,
+    calculateStreaksFromRuns,
+    clipRunsFrom,
+    decodeRuns,
+    encodeRuns,
+    getCompletionRuns,
+    getCurrentStreak,
+    getLastCompletedDate,
+    getLocalDateString,
+    isDateInRuns,
+    removeDateFromRuns,
+    summarizeAppendedRuns,
+    summarizeRuns,
+} from './habit-utils';
 
 const runTests = () => {
     console.log('Running calculateStreaks tests...');
@@ -73,6 +89,116 @@ const runTests = () => {
     result = calculateStreaks([twoDaysAgoStr, todayStr, yesterdayStr]);
     console.assert(result.streak === 3 && result.longestStreak === 3, 'Test 10 Failed: Unsorted');
 
+    console.log('Running completion run tests...');
+
+    // Test Case 11: Encoding merges consecutive days and ignores order/duplicates
+    let runs = encodeRuns([todayStr, threeDaysAgoStr, yesterdayStr, todayStr]);
+    console.assert(
+        runs.length === 2 && runs[0] === `${threeDaysAgoStr}/1` && runs[1] === `${yesterdayStr}/2`,
+        `Test 11 Failed: encodeRuns. Got ${JSON.stringify(runs)}`
+    );
+
+    // Test Case 12: Decoding round-trips
+    const decoded = decodeRuns(runs);
+    console.assert(
+        decoded.join(',') === [threeDaysAgoStr, yesterdayStr, todayStr].join(','),
+        `Test 12 Failed: decodeRuns. Got ${JSON.stringify(decoded)}`
+    );
+
+    // Test Case 13: Membership
+    console.assert(isDateInRuns(runs, todayStr) && isDateInRuns(runs, threeDaysAgoStr), 'Test 13 Failed: isDateInRuns (present)');
+    console.assert(!isDateInRuns(runs, twoDaysAgoStr) && !isDateInRuns([], todayStr), 'Test 13 Failed: isDateInRuns (absent)');
+
+    // Test Case 14: Adding the gap day merges both neighbouring runs
+    let updated = addDateToRuns(runs, twoDaysAgoStr);
+    console.assert(updated.length === 1 && updated[0] === `${threeDaysAgoStr}/4`, `Test 14 Failed: merge. Got ${JSON.stringify(updated)}`);
+
+    // Test Case 15: Adding an existing date is a no-op
+    console.assert(addDateToRuns(runs, todayStr) === runs, 'Test 15 Failed: add existing date');
+
+    // Test Case 16: Appending extends the last run, prepending extends the first
+    updated = addDateToRuns([`${twoDaysAgoStr}/2`], todayStr);
+    console.assert(updated.length === 1 && updated[0] === `${twoDaysAgoStr}/3`, `Test 16 Failed: append. Got ${JSON.stringify(updated)}`);
+    updated = addDateToRuns([`${twoDaysAgoStr}/2`], threeDaysAgoStr);
+    console.assert(updated.length === 1 && updated[0] === `${threeDaysAgoStr}/3`, `Test 16 Failed: prepend. Got ${JSON.stringify(updated)}`);
+
+    // Test Case 17: Removing a middle date splits the run
+    updated = removeDateFromRuns([`${threeDaysAgoStr}/4`], yesterdayStr);
+    console.assert(
+        updated.length === 2 && updated[0] === `${threeDaysAgoStr}/2` && updated[1] === `${todayStr}/1`,
+        `Test 17 Failed: split. Got ${JSON.stringify(updated)}`
+    );
+    updated = removeDateFromRuns([`${todayStr}/1`], todayStr);
+    console.assert(updated.length === 0, 'Test 17 Failed: remove single-day run');
+
+    // Test Case 18: Streaks from runs match the date-based calculation
+    const histories = [
+        [],
+        [todayStr],
+        [twoDaysAgoStr],
+        [todayStr, twoDaysAgoStr],
+        [todayStr, ...pastRelative],
+        [threeDaysAgoStr, twoDaysAgoStr, yesterdayStr],
+    ];
+    for (const history of histories) {
+        const expected = calculateStreaks(history);
+        const actual = calculateStreaksFromRuns(encodeRuns(history));
+        console.assert(
+            actual.streak === expected.streak && actual.longestStreak === expected.longestStreak,
+            `Test 18 Failed: ${JSON.stringify(history)} gave ${JSON.stringify(actual)}, expected ${JSON.stringify(expected)}`
+        );
+    }
+
+    // Test Case 19: Legacy documents without runs are encoded on read
+    runs = getCompletionRuns(undefined, [yesterdayStr, todayStr]);
+    console.assert(runs.length === 1 && runs[0] === `${yesterdayStr}/2`, 'Test 19 Failed: legacy completedDates');
+    runs = getCompletionRuns([`${todayStr}/1`], []);
+    console.assert(runs[0] === `${todayStr}/1`, 'Test 19 Failed: stored completedRuns');
+
+    // Test Case 20: Clipping trims the run that straddles the start date
+    runs = [`${threeDaysAgoStr}/1`, `${yesterdayStr}/2`];
+    console.assert(clipRunsFrom(runs, todayStr)[0] === `${todayStr}/1`, 'Test 20 Failed: clip inside a run');
+    console.assert(clipRunsFrom(runs, twoDaysAgoStr).length === 1, 'Test 20 Failed: clip between runs');
+    console.assert(clipRunsFrom(runs, threeDaysAgoStr).length === 2, 'Test 20 Failed: clip at first run');
+    console.assert(getLastCompletedDate(runs) === todayStr && getLastCompletedDate([]) === null, 'Test 20 Failed: last completed date');
+
+    // Test Case 21: The summary window stays RECENT_DAYS long however old the habit is
+    const longAgo = new Date();
+    longAgo.setDate(longAgo.getDate() - 400);
+    runs = [`${getLocalDateString(longAgo)}/401`];
+    const summary = summarizeRuns(runs, todayStr);
+    console.assert(
+        summary.streak === 401 && summary.longestStreak === 401 && summary.lastCompletedDate === todayStr,
+        `Test 21 Failed: summary streaks. Got ${JSON.stringify(summary)}`
+    );
+    console.assert(
+        summary.recentRuns.length === 1 && decodeRuns(summary.recentRuns).length === RECENT_DAYS,
+        `Test 21 Failed: recent window. Got ${JSON.stringify(summary.recentRuns)}`
+    );
+
+    // Test Case 22: Appending after the latest completion matches a full summary
+    const appendCases: [string[], string[]][] = [
+        [[`${threeDaysAgoStr}/1`], [twoDaysAgoStr, yesterdayStr]],
+        [[`${getLocalDateString(longAgo)}/100`, `${threeDaysAgoStr}/1`], [yesterdayStr, todayStr]],
+        [[], [todayStr]],
+    ];
+    for (const [before, dates] of appendCases) {
+        const previous = summarizeRuns(before, todayStr);
+        const after = dates.reduce(addDateToRuns, before);
+        const expected = summarizeRuns(after, todayStr);
+        const actual = summarizeAppendedRuns(after, previous, todayStr);
+        console.assert(
+            JSON.stringify(actual) === JSON.stringify(expected),
+            `Test 22 Failed: ${JSON.stringify(before)} + ${JSON.stringify(dates)} gave ${JSON.stringify(actual)}, expected ${JSON.stringify(expected)}`
+        );
+    }
+
+    // Test Case 23: A stored streak ends once its latest completion is older than yesterday
+    console.assert(getCurrentStreak(5, todayStr) === 5, 'Test 23 Failed: streak through today');
+    console.assert(getCurrentStreak(5, yesterdayStr) === 5, 'Test 23 Failed: streak through yesterday');
+    console.assert(getCurrentStreak(5, twoDaysAgoStr) === 0, 'Test 23 Failed: ended streak');
+    console.assert(getCurrentStreak(undefined, null) === 0, 'Test 23 Failed: never completed');
+
     console.log('All tests finished.');
 };
 
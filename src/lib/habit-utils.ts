@@ -20,11 +20,36 @@ export const isDateToday = (dateStr: string): boolean => {
  * Helper to parse YYYY-MM-DD to a local Date object (00:00:00 local time)
  * This avoids UTC offset issues when using new Date('YYYY-MM-DD')
  */
-const parseLocalDate = (dateStr: string): Date => {
+export const parseLocalDate = (dateStr: string): Date => {
     const [year, month, day] = dateStr.split('-').map(Number);
     return new Date(year, month - 1, day);
 };
 
+/**
+ * Whole days from one YYYY-MM-DD date to another (positive when `to` is later).
+ */
+const daysBetween = (from: string, to: string): number => {
+    return Math.round((parseLocalDate(to).getTime() - parseLocalDate(from).getTime()) / 86400000);
+};
+
+/**
+ * Shifts a YYYY-MM-DD date by a number of days.
+ */
+const addDays = (dateStr: string, days: number): string => {
+    const date = parseLocalDate(dateStr);
+    date.setDate(date.getDate() + days);
+    return getLocalDateString(date);
+};
+
+/**
+ * Checks whether a date string is today or yesterday, i.e. still part of a current streak.
+ */
+const isCurrentStreakDate = (dateStr: string): boolean => {
+    const yesterday = new Date();
+    yesterday.setDate(yesterday.getDate() - 1);
+    return dateStr === getLocalDateString() || dateStr === getLocalDateString(yesterday);
+};
+
 /**
  * Calculates current and longest streaks from completed dates.
  *
@@ -104,3 +129,265 @@ export const calculateStreaks = (completedDates: string[]): { streak: number, lo
 
     return { streak: currentStreak, longestStreak: maxStreak };
 };
+
+/**
+ * Completion history stored as run-length encoded ranges.
+ *
+ * Each run is "YYYY-MM-DD/N": a start date and the number of consecutive completed days.
+ * Runs are sorted ascending, never overlap and are never adjacent (adjacent runs are merged),
+ * so a year of daily completions is a single short string instead of 365 dates.
+ */
+export interface CompletionRun {
+    start: string;
+    length: number;
+}
+
+export const parseRun = (run: string): CompletionRun => {
+    const [start, length] = run.split('/');
+    return { start, length: Number(length) || 1 };
+};
+
+const formatRun = (start: string, length: number): string => `${start}/${length}`;
+
+/**
+ * Index of the last run starting on or before the date, or -1. O(log R) binary search;
+ * YYYY-MM-DD strings sort chronologically, so run starts are compared without parsing.
+ */
+const findRunIndex = (runs: string[], date: string): number => {
+    let low = 0;
+    let high = runs.length - 1;
+    let found = -1;
+    while (low <= high) {
+        const mid = (low + high) >> 1;
+        if (runs[mid].slice(0, 10) <= date) {
+            found = mid;
+            low = mid + 1;
+        } else {
+            high = mid - 1;
+        }
+    }
+    return found;
+};
+
+/**
+ * Encodes completed dates (any order, duplicates allowed) into runs.
+ */
+export const encodeRuns = (completedDates: string[]): string[] => {
+    const sortedDates = Array.from(new Set(completedDates)).sort();
+    const runs: string[] = [];
+    let start = '';
+    let length = 0;
+    let previous = '';
+
+    for (const dateStr of sortedDates) {
+        if (length > 0 && addDays(previous, 1) === dateStr) {
+            length++;
+        } else {
+            if (length > 0) runs.push(formatRun(start, length));
+            start = dateStr;
+            length = 1;
+        }
+        previous = dateStr;
+    }
+    if (length > 0) runs.push(formatRun(start, length));
+
+    return runs;
+};
+
+/**
+ * Expands runs back into individual dates (ascending).
+ */
+export const decodeRuns = (runs: string[]): string[] => {
+    const dates: string[] = [];
+    for (const run of runs) {
+        const { start, length } = parseRun(run);
+        for (let i = 0; i < length; i++) {
+            dates.push(addDays(start, i));
+        }
+    }
+    return dates;
+};
+
+/**
+ * Reads a habit's runs, encoding legacy `completedDates` documents on the fly.
+ */
+export const getCompletionRuns = (completedRuns?: string[] | null, completedDates?: string[] | null): string[] => {
+    if (completedRuns && completedRuns.length > 0) {
+        return completedRuns;
+    }
+    return encodeRuns(completedDates || []);
+};
+
+export const isDateInRuns = (runs: string[], date: string): boolean => {
+    const index = findRunIndex(runs, date);
+    if (index === -1) return false;
+    const { start, length } = parseRun(runs[index]);
+    return daysBetween(start, date) < length;
+};
+
+/**
+ * Returns new runs with the date marked as completed, merging neighbouring runs.
+ * Appending the day after the latest run only rewrites that run.
+ */
+export const addDateToRuns = (runs: string[], date: string): string[] => {
+    const index = findRunIndex(runs, date);
+    const previous = index >= 0 ? parseRun(runs[index]) : null;
+    const next = index + 1 < runs.length ? parseRun(runs[index + 1]) : null;
+
+    if (previous && daysBetween(previous.start, date) < previous.length) {
+        return runs; // Already completed
+    }
+
+    const extendsPrevious = previous !== null && daysBetween(previous.start, date) === previous.length;
+    const extendsNext = next !== null && daysBetween(date, next.start) === 1;
+    const result = runs.slice();
+
+    if (extendsPrevious && extendsNext) {
+        result.splice(index, 2, formatRun(previous.start, previous.length + 1 + next.length));
+    } else if (extendsPrevious) {
+        result[index] = formatRun(previous.start, previous.length + 1);
+    } else if (extendsNext) {
+        result[index + 1] = formatRun(date, next.length + 1);
+    } else {
+        result.splice(index + 1, 0, formatRun(date, 1));
+    }
+
+    return result;
+};
+
+/**
+ * Returns new runs with the date removed, splitting its run if needed.
+ */
+export const removeDateFromRuns = (runs: string[], date: string): string[] => {
+    const index = findRunIndex(runs, date);
+    if (index === -1) return runs;
+
+    const { start, length } = parseRun(runs[index]);
+    const offset = daysBetween(start, date);
+    if (offset >= length) return runs;
+
+    const replacement: string[] = [];
+    if (offset > 0) replacement.push(formatRun(start, offset));
+    if (offset < length - 1) replacement.push(formatRun(addDays(date, 1), length - offset - 1));
+
+    const result = runs.slice();
+    result.splice(index, 1, ...replacement);
+    return result;
+};
+
+/**
+ * Calculates current and longest streaks directly from runs.
+ *
+ * Algorithm Complexity:
+ * - Time Complexity: O(R) over the number of runs. Each run already is a streak,
+ *   so only the run lengths are compared and only the latest run's dates are parsed.
+ */
+export const calculateStreaksFromRuns = (runs: string[]): { streak: number, longestStreak: number } => {
+    if (!runs || runs.length === 0) {
+        return { streak: 0, longestStreak: 0 };
+    }
+
+    let longestStreak = 0;
+    for (const run of runs) {
+        const { length } = parseRun(run);
+        if (length > longestStreak) longestStreak = length;
+    }
+
+    const last = parseRun(runs[runs.length - 1]);
+    const lastDateStr = addDays(last.start, last.length - 1);
+    const streak = isCurrentStreakDate(lastDateStr) ? last.length : 0;
+
+    return { streak, longestStreak };
+};
+
+// Days of history kept in a habit's recentRuns; list views never look further back
+export const RECENT_DAYS = 30;
+
+/**
+ * Returns the runs on or after a date, trimming the run that straddles it.
+ */
+export const clipRunsFrom = (runs: string[], fromDate: string): string[] => {
+    const index = findRunIndex(runs, fromDate);
+    const result = runs.slice(index + 1);
+    if (index >= 0) {
+        const { start, length } = parseRun(runs[index]);
+        const offset = daysBetween(start, fromDate);
+        if (offset < length) {
+            result.unshift(formatRun(fromDate, length - offset));
+        }
+    }
+    return result;
+};
+
+/**
+ * Date of the latest completion, or null when the habit was never completed.
+ */
+export const getLastCompletedDate = (runs: string[]): string | null => {
+    if (!runs || runs.length === 0) return null;
+    const last = parseRun(runs[runs.length - 1]);
+    return addDays(last.start, last.length - 1);
+};
+
+/**
+ * The current streak to show for a stored habit. The stored streak is only recomputed when
+ * the habit is logged, so once the latest completion is older than yesterday it has ended.
+ */
+export const getCurrentStreak = (streak: number | null | undefined, lastCompletedDate: string | null | undefined): number => {
+    return streak && lastCompletedDate && isCurrentStreakDate(lastCompletedDate) ? streak : 0;
+};
+
+export interface HabitSummary {
+    streak: number;
+    longestStreak: number;
+    lastCompletedDate: string | null;
+    recentRuns: string[];
+}
+
+/**
+ * Derives the fields stored next to completedRuns so list views can skip the full history:
+ * streaks, the latest completion and the runs within the last RECENT_DAYS days.
+ * The window is anchored on `today`, so its size stays constant however old the habit is.
+ */
+export const summarizeRuns = (runs: string[], today: string = getLocalDateString()): HabitSummary => {
+    const { streak, longestStreak } = calculateStreaksFromRuns(runs);
+    return {
+        streak,
+        longestStreak,
+        lastCompletedDate: getLastCompletedDate(runs),
+        recentRuns: clipRunsFrom(runs, addDays(today, 1 - RECENT_DAYS)),
+    };
+};
+
+/**
+ * summarizeRuns for a write that only added dates after the latest completion, given the
+ * summary stored before it. Only the runs from the one holding the previous latest date
+ * onwards can have changed, so the longest streak is updated from those instead of
+ * rescanning every run.
+ *
+ * Algorithm Complexity:
+ * - Time Complexity: O(log R + K) for R runs, K of them touched by the new dates.
+ *
+ * Callers must check that the stored summary is current and that no date was backfilled;
+ * otherwise use summarizeRuns.
+ */
+export const summarizeAppendedRuns = (
+    runs: string[],
+    previous: { longestStreak: number, lastCompletedDate: string | null },
+    today: string = getLocalDateString()
+): HabitSummary => {
+    const from = previous.lastCompletedDate ? Math.max(0, findRunIndex(runs, previous.lastCompletedDate)) : 0;
+    let longestStreak = previous.longestStreak;
+    for (let i = from; i < runs.length; i++) {
+        const { length } = parseRun(runs[i]);
+        if (length > longestStreak) longestStreak = length;
+    }
+
+    const lastCompletedDate = getLastCompletedDate(runs);
+    const last = runs.length > 0 ? parseRun(runs[runs.length - 1]) : null;
+    return {
+        streak: last && lastCompletedDate && isCurrentStreakDate(lastCompletedDate) ? last.length : 0,
+        longestStreak,
+        lastCompletedDate,
+        recentRuns: clipRunsFrom(runs, addDays(today, 1 - RECENT_DAYS)),
+    };
+};
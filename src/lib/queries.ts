@@ -0,0 +1,194 @@
+import { Models, Query } from 'appwrite';
+import { databases, DATABASE_ID, getSessionJwt } from '@/lib/appwrite';
+import { getCompletionRuns, getCurrentStreak, summarizeRuns } from '@/lib/habit-utils';
+import { invalidateQueries } from '@/lib/query-cache';
+import { DashboardSummary, Goal, Habit, InboxItem, Phase, Resource, Task } from '@/types';
+
+export type TaskFilter = 'all' | 'active' | 'completed';
+
+export interface ApiKey {
+    $id: string;
+    key: string;
+    createdAt: string;
+    userId: string;
+}
+
+// Shared cache keys. Pages reading the same key share one cached list.
+export const queryKeys = {
+    goals: (userId: string) => ['goals', userId] as const,
+    goalTree: (goalId: string) => ['goal-tree', goalId] as const,
+    phases: (goalId: string) => ['phases', goalId] as const,
+    tasks: (userId: string, filter: TaskFilter) => ['tasks', userId, filter] as const,
+    habits: (userId: string) => ['habits', userId] as const,
+    inbox: (userId: string) => ['inbox', userId] as const,
+    resources: (userId: string) => ['resources', userId] as const,
+    apiKeys: (userId: string) => ['api_keys', userId] as const,
+    dashboard: (userId: string, dueBefore: string) => ['dashboard', userId, dueBefore] as const,
+};
+
+const PAGE_SIZE = 100;
+
+/**
+ * Lists every matching document. listDocuments returns 25 documents unless told otherwise,
+ * so this pages through the collection with cursorAfter.
+ */
+export async function listAllDocuments<T>(collectionId: string, queries: string[]): Promise<T[]> {
+    const documents: T[] = [];
+    let cursor: string | null = null;
+    do {
+        const response: Models.DocumentList<Models.Document> = await databases.listDocuments(DATABASE_ID, collectionId, [
+            ...queries,
+            Query.limit(PAGE_SIZE),
+            ...(cursor ? [Query.cursorAfter(cursor)] : []),
+        ]);
+        documents.push(...(response.documents as unknown as T[]));
+        cursor = response.documents.length === PAGE_SIZE ? response.documents[PAGE_SIZE - 1].$id : null;
+    } while (cursor);
+    return documents;
+}
+
+export const fetchGoals = (userId: string) => listAllDocuments<Goal>('goals', [
+    Query.equal('userId', userId),
+    Query.orderDesc('$createdAt'),
+]);
+
+export const fetchPhases = (goalId: string) => listAllDocuments<Phase>('phases', [
+    Query.equal('goalId', goalId),
+    Query.orderAsc('order'),
+]);
+
+export const fetchTasks = (userId: string, filter: TaskFilter) => {
+    const queries = [
+        Query.equal('userId', userId),
+        Query.orderAsc('dueDate'),
+    ];
+    if (filter === 'active') {
+        queries.push(Query.equal('isCompleted', false));
+    } else if (filter === 'completed') {
+        queries.push(Query.equal('isCompleted', true));
+    }
+    return listAllDocuments<Task>('tasks', queries);
+};
+
+// What the habit lists render. Its size does not grow with the habit's age.
+const HABIT_LIST_FIELDS = ['$id', 'title', 'streak', 'longestStreak', 'lastCompletedDate', 'recentRuns', 'userId'];
+// Values per Query.equal
+const MAX_EQUAL_VALUES = 100;
+
+// List queries select only the derived fields. Realtime payloads carry the whole document,
+// including legacy completedDates, so those are summarized from their history. The stored
+// streak is only recomputed on write, so it is shown as 0 once the latest completion is
+// older than yesterday.
+export const toHabit = (doc: Models.Document): Habit => {
+    const summary = doc.completedRuns || doc.completedDates
+        ? summarizeRuns(getCompletionRuns(doc.completedRuns, doc.completedDates))
+        : null;
+    return {
+        $id: doc.$id,
+        title: doc.title,
+        streak: summary ? summary.streak : getCurrentStreak(doc.streak, doc.lastCompletedDate),
+        longestStreak: summary ? summary.longestStreak : doc.longestStreak || 0,
+        lastCompletedDate: summary ? summary.lastCompletedDate : doc.lastCompletedDate ?? null,
+        recentRuns: summary ? summary.recentRuns : doc.recentRuns ?? [],
+        userId: doc.userId
+    };
+};
+
+export const fetchHabits = async (userId: string) => {
+    const documents = await listAllDocuments<Models.Document>('habits', [
+        Query.equal('userId', userId),
+        Query.select(HABIT_LIST_FIELDS),
+    ]);
+
+    // Habits not written since the derived fields were added have no recentRuns yet.
+    // Their history is loaded for just those habits, and toHabit summarizes it.
+    const legacyIds = documents.filter(doc => doc.recentRuns == null).map(doc => doc.$id);
+    const histories = new Map<string, Models.Document>();
+    for (let i = 0; i < legacyIds.length; i += MAX_EQUAL_VALUES) {
+        const history = await listAllDocuments<Models.Document>('habits', [
+            Query.equal('$id', legacyIds.slice(i, i + MAX_EQUAL_VALUES)),
+            Query.select(['$id', 'completedRuns', 'completedDates']),
+        ]);
+        history.forEach(doc => histories.set(doc.$id, doc));
+    }
+
+    return documents.map(doc => toHabit(histories.has(doc.$id) ? { ...doc, ...histories.get(doc.$id) } : doc));
+};
+
+/**
+ * Loads a habit's full completion history, which the lists leave out, e.g. before a write.
+ */
+export const fetchHabitHistory = async (habitId: string): Promise<string[]> => {
+    const doc = await databases.getDocument(DATABASE_ID, 'habits', habitId, [
+        Query.select(['completedRuns', 'completedDates']),
+    ]);
+    return getCompletionRuns(doc.completedRuns, doc.completedDates);
+};
+
+export const fetchInbox = (userId: string) => listAllDocuments<InboxItem>('inbox', [
+    Query.equal('userId', userId),
+    Query.equal('isProcessed', false),
+    Query.orderDesc('$createdAt'),
+]);
+
+export const fetchResources = (userId: string) => listAllDocuments<Resource>('resources', [
+    Query.equal('userId', userId),
+    Query.orderDesc('$createdAt'),
+]);
+
+export const fetchApiKeys = (userId: string) => listAllDocuments<ApiKey>('api_keys', [
+    Query.equal('userId', userId),
+]);
+
+// How long /api/dashboard may serve a cached summary (DASHBOARD_CACHE_TTL_MS on the server)
+const DASHBOARD_SERVER_CACHE_MS = 15 * 1000;
+let dashboardWrittenAt = 0;
+
+/**
+ * Marks the dashboard summary stale after a write to tasks or habits. The app writes straight
+ * to Appwrite, so the next fetch also skips the summary cached on the server.
+ */
+export const invalidateDashboard = () => {
+    dashboardWrittenAt = Date.now();
+    invalidateQueries(['dashboard']);
+};
+
+const deleteOnServer = async (path: string, what: string): Promise<void> => {
+    const response = await fetch(path, {
+        method: 'DELETE',
+        headers: { Authorization: `Bearer ${await getSessionJwt()}` },
+    });
+    if (!response.ok) {
+        throw new Error(`Deleting ${what} failed with status ${response.status}`);
+    }
+};
+
+/**
+ * Revokes an API key through the server, which also drops it from the key validation cache.
+ */
+export const revokeApiKey = (keyId: string): Promise<void> =>
+    deleteOnServer(`/api/keys/${encodeURIComponent(keyId)}`, 'API key');
+
+/**
+ * Deletes a goal through the server, which also drops it from the GPT routes' ownership cache.
+ */
+export const deleteGoalOnServer = (goalId: string): Promise<void> =>
+    deleteOnServer(`/api/goals/${encodeURIComponent(goalId)}`, 'goal');
+
+/**
+ * Deletes a phase through the server, which also drops it from the GPT routes' ownership cache.
+ */
+export const deletePhaseOnServer = (phaseId: string): Promise<void> =>
+    deleteOnServer(`/api/phases/${encodeURIComponent(phaseId)}`, 'phase');
+
+export const fetchDashboard = async (dueBefore: string): Promise<DashboardSummary> => {
+    const headers: Record<string, string> = { Authorization: `Bearer ${await getSessionJwt()}` };
+    if (Date.now() - dashboardWrittenAt < DASHBOARD_SERVER_CACHE_MS) {
+        headers['Cache-Control'] = 'no-cache';
+    }
+    const response = await fetch(`/api/dashboard?dueBefore=${encodeURIComponent(dueBefore)}`, { headers });
+    if (!response.ok) {
+        throw new Error(`Dashboard request failed with status ${response.status}`);
+    }
+    return response.json();
+};
@@ -0,0 +1,235 @@
+'use client';
+
+import { useCallback, useEffect, useRef, useSyncExternalStore } from 'react';
+
+// Keys are arrays whose first element names the collection, e.g. ['tasks', userId, 'active']
+export type QueryKey = readonly (string | number | boolean | null)[];
+
+// Cached data younger than this is not refetched when a page mounts
+export const DEFAULT_STALE_MS = 5 * 1000;
+
+interface QuerySnapshot<T> {
+    data: T | undefined;
+    error: unknown;
+    isFetching: boolean;
+}
+
+interface CacheEntry<T> {
+    key: QueryKey;
+    snapshot: QuerySnapshot<T>;
+    // 0 when the data never came from the server or was invalidated
+    updatedAt: number;
+    // Bumped by local writes, so a fetch that started earlier does not overwrite them
+    version: number;
+    pending?: Promise<T>;
+    // The last fetcher used for this key, so invalidation can refetch what pages are showing
+    fetcher?: () => Promise<T>;
+    listeners: Set<() => void>;
+}
+
+const EMPTY_SNAPSHOT: QuerySnapshot<never> = { data: undefined, error: undefined, isFetching: false };
+
+const cache = new Map<string, CacheEntry<unknown>>();
+
+const hashKey = (key: QueryKey) => JSON.stringify(key);
+
+const startsWith = (key: QueryKey, prefix: QueryKey) => prefix.every((part, i) => key[i] === part);
+
+function getEntry<T>(key: QueryKey): CacheEntry<T> {
+    const hash = hashKey(key);
+    let entry = cache.get(hash);
+    if (!entry) {
+        entry = { key, snapshot: EMPTY_SNAPSHOT, updatedAt: 0, version: 0, listeners: new Set() };
+        cache.set(hash, entry);
+    }
+    return entry as CacheEntry<T>;
+}
+
+function setSnapshot<T>(entry: CacheEntry<T>, changes: Partial<QuerySnapshot<T>>) {
+    entry.snapshot = { ...entry.snapshot, ...changes };
+    entry.listeners.forEach(listener => listener());
+}
+
+/**
+ * Returns cached data for a key, fetching it when missing or older than `staleMs`.
+ * Concurrent calls for the same key share one request; `force` skips the freshness check.
+ */
+export function fetchQuery<T>(
+    key: QueryKey,
+    fetcher: () => Promise<T>,
+    { staleMs = DEFAULT_STALE_MS, force = false }: { staleMs?: number; force?: boolean } = {}
+): Promise<T> {
+    const entry = getEntry<T>(key);
+    entry.fetcher = fetcher;
+    if (entry.pending) {
+        return entry.pending;
+    }
+    if (!force && entry.snapshot.data !== undefined && Date.now() - entry.updatedAt < staleMs) {
+        return Promise.resolve(entry.snapshot.data);
+    }
+
+    const version = entry.version;
+    setSnapshot(entry, { isFetching: true });
+    const pending = fetcher()
+        .then(data => {
+            if (entry.version === version || entry.snapshot.data === undefined) {
+                entry.updatedAt = Date.now();
+                setSnapshot(entry, { data, error: undefined, isFetching: false });
+                return data;
+            }
+            // Keep local writes made while the request was in flight; the next read revalidates
+            entry.updatedAt = 0;
+            setSnapshot(entry, { error: undefined, isFetching: false });
+            return entry.snapshot.data;
+        }, error => {
+            setSnapshot(entry, { error, isFetching: false });
+            throw error;
+        })
+        .finally(() => {
+            entry.pending = undefined;
+        });
+    entry.pending = pending;
+    return pending;
+}
+
+/**
+ * Warms the cache for a key. Failures are ignored; the next read retries.
+ */
+export const prefetchQuery = <T>(key: QueryKey, fetcher: () => Promise<T>, options?: { staleMs?: number }) => {
+    fetchQuery(key, fetcher, options).catch(() => { });
+};
+
+/**
+ * Applies a local change (after a successful mutation) to cached data and returns the new value.
+ * Does nothing and returns undefined when the key holds no data yet.
+ */
+export function setQueryData<T>(key: QueryKey, update: (data: T) => T): T | undefined {
+    const entry = cache.get(hashKey(key)) as CacheEntry<T> | undefined;
+    if (!entry || entry.snapshot.data === undefined) {
+        return undefined;
+    }
+    entry.version += 1;
+    setSnapshot(entry, { data: update(entry.snapshot.data) });
+    return entry.snapshot.data;
+}
+
+/**
+ * Applies a local change to every cached key starting with `prefix`, e.g. for a document
+ * that appears in several filtered lists.
+ */
+export const updateQueries = <T>(prefix: QueryKey, update: (data: T, key: QueryKey) => T) => {
+    for (const entry of cache.values()) {
+        if (startsWith(entry.key, prefix)) {
+            setQueryData<T>(entry.key, data => update(data, entry.key));
+        }
+    }
+};
+
+/**
+ * Refetches an entry in the background. A request already in flight may have read the data
+ * from before the write that caused this, so the refetch waits for it and runs afterwards.
+ */
+function refetchEntry<T>(entry: CacheEntry<T>) {
+    const fetcher = entry.fetcher;
+    if (!fetcher) {
+        return;
+    }
+    const refetch = () => {
+        fetchQuery(entry.key, fetcher, { force: true }).catch(() => { });
+    };
+    if (entry.pending) {
+        entry.pending.then(refetch, refetch);
+    } else {
+        refetch();
+    }
+}
+
+/**
+ * Marks every key starting with `prefix` as stale after a write. Keys a mounted page is
+ * showing are refetched right away; their data keeps rendering until the new data arrives.
+ * The rest are refetched the next time a page reads them.
+ */
+export const invalidateQueries = (prefix: QueryKey) => {
+    for (const entry of cache.values()) {
+        if (startsWith(entry.key, prefix)) {
+            entry.updatedAt = 0;
+            if (entry.listeners.size > 0) {
+                refetchEntry(entry);
+            }
+        }
+    }
+};
+
+/**
+ * Drops every key starting with `prefix`, e.g. after the document behind it is deleted.
+ * Keys a mounted page is still showing can't be dropped from under it, so they are marked
+ * stale and refetched instead.
+ */
+export const removeQueries = (prefix: QueryKey) => {
+    for (const [hash, entry] of cache) {
+        if (!startsWith(entry.key, prefix)) {
+            continue;
+        }
+        if (entry.listeners.size === 0) {
+            cache.delete(hash);
+        } else {
+            entry.updatedAt = 0;
+            refetchEntry(entry);
+        }
+    }
+};
+
+/**
+ * Drops all cached data, e.g. when the signed-in user changes.
+ */
+export const clearQueryCache = () => {
+    cache.clear();
+};
+
+/**
+ * Reads a query from the shared cache. Cached data renders at once and is revalidated in the
+ * background when older than `staleMs`. Pass a null key to wait, e.g. until the user is known.
+ */
+export function useQuery<T>(key: QueryKey | null, fetcher: () => Promise<T>, { staleMs = DEFAULT_STALE_MS } = {}) {
+    const hash = key ? hashKey(key) : null;
+    const fetcherRef = useRef(fetcher);
+    useEffect(() => {
+        fetcherRef.current = fetcher;
+    });
+
+    // Hooks depend on the hash rather than the key array, which is rebuilt on every render
+    const subscribe = useCallback((listener: () => void) => {
+        if (!key) {
+            return () => { };
+        }
+        const entry = getEntry<T>(key);
+        entry.listeners.add(listener);
+        return () => {
+            entry.listeners.delete(listener);
+        };
+    }, [hash]);
+
+    const snapshot = useSyncExternalStore(
+        subscribe,
+        () => (key ? getEntry<T>(key).snapshot : EMPTY_SNAPSHOT),
+        () => EMPTY_SNAPSHOT
+    );
+
+    useEffect(() => {
+        if (key) {
+            fetchQuery(key, () => fetcherRef.current(), { staleMs }).catch(() => { });
+        }
+    }, [hash, staleMs]);
+
+    const refetch = useCallback(() => {
+        return key ? fetchQuery(key, () => fetcherRef.current(), { force: true }) : Promise.resolve(undefined);
+    }, [hash]);
+
+    return {
+        data: snapshot.data as T | undefined,
+        error: snapshot.error,
+        isLoading: snapshot.data === undefined && !snapshot.error,
+        isFetching: snapshot.isFetching,
+        refetch,
+    };
+}
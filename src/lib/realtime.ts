@@ -0,0 +1,158 @@
+'use client';
+
+import { useEffect } from 'react';
+import { DocumentEvent, subscribeToDocuments } from '@/lib/appwrite';
+import { GoalTree } from '@/lib/goal-tree';
+import { TaskFilter, invalidateDashboard, queryKeys, toHabit } from '@/lib/queries';
+import { QueryKey, removeQueries, setQueryData, updateQueries } from '@/lib/query-cache';
+import { DashboardSummary, Habit, Phase, Task } from '@/types';
+
+const SYNCED_COLLECTIONS = ['goals', 'phases', 'tasks', 'habits', 'inbox', 'resources', 'api_keys'];
+
+interface ListOptions<T> {
+    // False when the document no longer belongs in this list, e.g. a completed task in 'active'
+    include?: boolean;
+    // Where new documents go when the list has no sort order of its own
+    prepend?: boolean;
+    compare?: (a: T, b: T) => number;
+}
+
+const byOrder = (a: Phase, b: Phase) => a.order - b.order;
+const byDueDate = (a: { dueDate: string }, b: { dueDate: string }) => (a.dueDate || '').localeCompare(b.dueDate || '');
+
+/**
+ * Returns a list with one document created, updated or deleted, leaving the rest untouched.
+ */
+export function applyToList<T extends { $id: string }>(
+    list: T[],
+    action: DocumentEvent['action'],
+    doc: T,
+    { include = true, prepend = false, compare }: ListOptions<T> = {}
+): T[] {
+    const index = list.findIndex(item => item.$id === doc.$id);
+    if (action === 'delete' || !include) {
+        return index === -1 ? list : list.filter(item => item.$id !== doc.$id);
+    }
+
+    let next: T[];
+    if (index === -1) {
+        next = prepend ? [doc, ...list] : [...list, doc];
+    } else {
+        next = [...list];
+        next[index] = doc;
+    }
+    return compare ? next.sort(compare) : next;
+}
+
+const matchesFilter = (task: Task, filter: TaskFilter) => {
+    return filter === 'all' || (filter === 'active' ? !task.isCompleted : task.isCompleted);
+};
+
+// The dashboard lists open tasks due by its dueBefore, with only the fields it renders
+function applyDashboardTask(userId: string, action: DocumentEvent['action'], task: Task) {
+    updateQueries<DashboardSummary>(['dashboard', userId], summary => ({
+        ...summary,
+        tasks: applyToList(summary.tasks, action, {
+            $id: task.$id,
+            title: task.title,
+            dueDate: task.dueDate,
+            isCompleted: task.isCompleted,
+        }, {
+            include: !task.isCompleted && !!task.dueDate && Date.parse(task.dueDate) <= Date.parse(summary.dueBefore),
+            compare: byDueDate,
+        }),
+    }));
+    invalidateDashboard();
+}
+
+function applyDashboardHabit(userId: string, action: DocumentEvent['action'], habit: Habit) {
+    updateQueries<DashboardSummary>(['dashboard', userId], summary => ({
+        ...summary,
+        // New habits are left to the next fetch, which knows which ones make the cut
+        habits: summary.habits.some(h => h.$id === habit.$id) || action === 'delete'
+            ? applyToList(summary.habits, action, { $id: habit.$id, title: habit.title, streak: habit.streak })
+            : summary.habits,
+    }));
+    invalidateDashboard();
+}
+
+function applyTaskEvent(userId: string, action: DocumentEvent['action'], task: Task) {
+    updateQueries<Task[]>(['tasks', userId], (tasks, key) => applyToList(tasks, action, task, {
+        include: matchesFilter(task, key[2] as TaskFilter),
+        compare: byDueDate,
+    }));
+    applyDashboardTask(userId, action, task);
+    if (task.goalId) {
+        setQueryData<GoalTree>(queryKeys.goalTree(task.goalId), tree => ({
+            ...tree,
+            tasks: applyToList(tree.tasks, action, task),
+        }));
+    }
+}
+
+function applyPhaseEvent(action: DocumentEvent['action'], phase: Phase) {
+    setQueryData<GoalTree>(queryKeys.goalTree(phase.goalId), tree => ({
+        ...tree,
+        phases: applyToList(tree.phases, action, phase, { compare: byOrder }),
+    }));
+    setQueryData<Phase[]>(queryKeys.phases(phase.goalId), phases => applyToList(phases, action, phase, { compare: byOrder }));
+}
+
+/**
+ * Applies one realtime document event to every cached query that lists the document.
+ * Queries that were never loaded are left alone; they fetch fresh data when first read.
+ */
+export function applyDocumentEvent(userId: string, { collectionId, action, document }: DocumentEvent) {
+    // Phases carry no userId; they reach us only through the goal's read permission
+    if ('userId' in document && document.userId !== userId) {
+        return;
+    }
+
+    const list = <T extends { $id: string }>(key: QueryKey, doc: T, options?: ListOptions<T>) => {
+        setQueryData<T[]>(key, items => applyToList(items, action, doc, options));
+    };
+
+    switch (collectionId) {
+        case 'goals':
+            list(queryKeys.goals(userId), document, { prepend: true });
+            if (action === 'delete') {
+                removeQueries(queryKeys.goalTree(document.$id));
+                removeQueries(queryKeys.phases(document.$id));
+            }
+            break;
+        case 'phases':
+            applyPhaseEvent(action, document as unknown as Phase);
+            break;
+        case 'tasks':
+            applyTaskEvent(userId, action, document as unknown as Task);
+            break;
+        case 'habits': {
+            const habit = toHabit(document);
+            list(queryKeys.habits(userId), habit);
+            applyDashboardHabit(userId, action, habit);
+            break;
+        }
+        case 'inbox':
+            list(queryKeys.inbox(userId), document, { prepend: true, include: !document.isProcessed });
+            break;
+        case 'resources':
+            list(queryKeys.resources(userId), document, { prepend: true });
+            break;
+        case 'api_keys':
+            list(queryKeys.apiKeys(userId), document);
+            break;
+    }
+}
+
+/**
+ * Keeps the query cache in sync with the user's documents while signed in, so writes from
+ * other tabs or the GPT API show up without refetching whole collections.
+ */
+export function useRealtimeSync(userId: string | null) {
+    useEffect(() => {
+        if (!userId) {
+            return;
+        }
+        return subscribeToDocuments(SYNCED_COLLECTIONS, event => applyDocumentEvent(userId, event));
+    }, [userId]);
+}
@@ -1,4 +1,6 @@
-import { Client, Databases, Query } from 'node-appwrite';
+import { Account, Client, Databases, Query } from 'node-appwrite';
+import { TtlCache } from './cache';
+import { span } from './timing';
 
 let client: Client | null = null;
 let databases: Databases | null = null;
@@ -24,9 +26,28 @@ function getClient(): Client {
     return client;
 }
 
+// Database calls reported as Server-Timing stages
+const TIMED_CALLS: Record<string, string> = {
+    listDocuments: 'db-list',
+    getDocument: 'db-get',
+    createDocument: 'db-create',
+    updateDocument: 'db-update',
+    deleteDocument: 'db-delete',
+};
+
 function getDatabases(): Databases {
     if (!databases) {
-        databases = new Databases(getClient());
+        const db = new Databases(getClient());
+        databases = new Proxy(db, {
+            get(target, prop, receiver) {
+                const value = Reflect.get(target, prop, receiver);
+                const stage = typeof prop === 'string' ? TIMED_CALLS[prop] : undefined;
+                if (stage && typeof value === 'function') {
+                    return (...args: unknown[]) => span(stage, () => value.apply(target, args));
+                }
+                return value;
+            }
+        });
     }
     return databases;
 }
@@ -44,23 +65,144 @@ function getDatabaseId(): string {
 
 export { getDatabases as databases, getDatabaseId as DATABASE_ID };
 
+// API key -> userId cache. Invalid keys are cached as null for a shorter time so a
+// client retrying with a bad key doesn't cost a listDocuments call per request.
+// A revoked key is dropped from the instance that revoked it; other instances keep
+// accepting it until their entry expires, so API_KEY_CACHE_TTL_MS bounds that window.
+const API_KEY_CACHE_TTL_MS = process.env.API_KEY_CACHE_TTL_MS
+    ? Number(process.env.API_KEY_CACHE_TTL_MS)
+    : 60 * 1000;
+const API_KEY_NEGATIVE_CACHE_TTL_MS = process.env.API_KEY_NEGATIVE_CACHE_TTL_MS
+    ? Number(process.env.API_KEY_NEGATIVE_CACHE_TTL_MS)
+    : 10 * 1000;
+const API_KEY_CACHE_MAX_ENTRIES = 1000;
+
+const apiKeyCache = new TtlCache<string, string | null>(API_KEY_CACHE_MAX_ENTRIES, API_KEY_CACHE_TTL_MS);
+// Concurrent requests with the same cold key share one lookup
+const pendingKeyLookups = new Map<string, Promise<string | null>>();
+// Bumped by invalidateApiKey, so a lookup that started before a revocation doesn't cache its result
+let apiKeyGeneration = 0;
+let negativeHits = 0;
+
+async function lookupApiKey(key: string): Promise<string | null> {
+    const db = getDatabases();
+    const dbId = getDatabaseId();
+    const generation = apiKeyGeneration;
+
+    const response = await db.listDocuments(
+        dbId,
+        'api_keys',
+        [Query.equal('key', key)]
+    );
+
+    const userId = response.documents.length > 0 ? response.documents[0].userId as string : null;
+    if (generation === apiKeyGeneration) {
+        apiKeyCache.set(key, userId, userId ? undefined : API_KEY_NEGATIVE_CACHE_TTL_MS);
+    }
+    return userId;
+}
+
 export async function validateApiKey(key: string): Promise<string | null> {
+    return span('auth', () => resolveApiKey(key));
+}
+
+async function resolveApiKey(key: string): Promise<string | null> {
+    const cached = apiKeyCache.get(key);
+    if (cached !== undefined) {
+        if (cached === null) negativeHits++;
+        return cached;
+    }
+
+    let pending = pendingKeyLookups.get(key);
+    if (!pending) {
+        const lookup: Promise<string | null> = lookupApiKey(key).finally(() => {
+            // invalidateApiKey may already have replaced this lookup with a newer one
+            if (pendingKeyLookups.get(key) === lookup) {
+                pendingKeyLookups.delete(key);
+            }
+        });
+        pending = lookup;
+        pendingKeyLookups.set(key, pending);
+    }
+
     try {
-        const db = getDatabases();
-        const dbId = getDatabaseId();
-        
-        const response = await db.listDocuments(
-            dbId,
-            'api_keys',
-            [Query.equal('key', key)]
-        );
-
-        if (response.documents.length > 0) {
-            return response.documents[0].userId;
-        }
-        return null;
+        return await pending;
     } catch (error) {
+        // Lookup failures are not cached, the next request retries
         console.error('Error validating API key:', error);
         return null;
     }
 }
+
+/**
+ * Drops a key from the validation cache. DELETE /api/keys/{keyId} calls this after revoking a
+ * key so it stops working immediately on this instance instead of after API_KEY_CACHE_TTL_MS.
+ * Lookups already in flight may have read the key before it was deleted: later requests don't
+ * join them, and they don't cache what they read.
+ */
+export function invalidateApiKey(key: string): void {
+    apiKeyGeneration++;
+    pendingKeyLookups.delete(key);
+    apiKeyCache.delete(key);
+}
+
+export function getApiKeyCacheStats() {
+    return { ...apiKeyCache.stats(), negativeHits };
+}
+
+// Session JWT -> userId cache. Appwrite JWTs live for 15 minutes; caching them briefly
+// saves an account lookup on every dashboard request.
+const SESSION_CACHE_TTL_MS = 60 * 1000;
+const SESSION_CACHE_MAX_ENTRIES = 1000;
+
+const sessionCache = new TtlCache<string, string>(SESSION_CACHE_MAX_ENTRIES, SESSION_CACHE_TTL_MS);
+
+/**
+ * Resolves a JWT created in the browser with account.createJWT() to its user ID.
+ */
+export async function validateSessionJwt(jwt: string): Promise<string | null> {
+    const cached = sessionCache.get(jwt);
+    if (cached !== undefined) {
+        return cached;
+    }
+
+    const endpoint = process.env.NEXT_PUBLIC_APPWRITE_ENDPOINT;
+    const projectId = process.env.NEXT_PUBLIC_APPWRITE_PROJECT_ID;
+    if (!endpoint || !projectId) {
+        throw new Error('Missing Appwrite configuration');
+    }
+
+    try {
+        const sessionClient = new Client().setEndpoint(endpoint).setProject(projectId).setJWT(jwt);
+        const user = await new Account(sessionClient).get();
+        sessionCache.set(jwt, user.$id);
+        return user.$id;
+    } catch {
+        // Expired or forged tokens are not cached
+        return null;
+    }
+}
+
+/**
+ * Authenticates a request from either the GPT (X-API-Key) or the signed-in app
+ * (Authorization: Bearer <session JWT>). Returns undefined when neither header is present.
+ */
+export async function getRequestUserId(req: Request): Promise<string | null | undefined> {
+    const apiKey = req.headers.get('X-API-Key');
+    if (apiKey) {
+        return validateApiKey(apiKey);
+    }
+    return getSessionUserId(req);
+}
+
+/**
+ * Authenticates a request from the signed-in app only (Authorization: Bearer <session JWT>),
+ * for actions an API key must not be able to take. Returns undefined without the header.
+ */
+export async function getSessionUserId(req: Request): Promise<string | null | undefined> {
+    const authorization = req.headers.get('Authorization');
+    if (!authorization?.startsWith('Bearer ')) {
+        return undefined;
+    }
+    return span('auth', () => validateSessionJwt(authorization.slice('Bearer '.length)));
+}
@@ -0,0 +1,86 @@
+import { databases, DATABASE_ID } from './appwrite';
+import { forgetOwnership } from './ownership';
+
+// Limits for the batch creation routes, so one request can't fan out unbounded writes
+export const MAX_BATCH_PHASES = 20;
+export const MAX_BATCH_TASKS = 200;
+export const BATCH_CONCURRENCY = 10;
+
+/**
+ * Maps items through an async function with at most `limit` calls in flight.
+ * Results keep the input order. Rejects with the first error, after in-flight calls settle.
+ */
+export async function mapWithConcurrency<T, R>(
+    items: T[],
+    limit: number,
+    fn: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+    const results: R[] = new Array(items.length);
+    let next = 0;
+    let failed = false;
+
+    const worker = async () => {
+        while (!failed && next < items.length) {
+            const index = next++;
+            try {
+                results[index] = await fn(items[index], index);
+            } catch (error) {
+                failed = true;
+                throw error;
+            }
+        }
+    };
+
+    const workers = Array.from({ length: Math.min(limit, items.length) }, worker);
+    const settled = await Promise.allSettled(workers);
+    const rejected = settled.find((result): result is PromiseRejectedResult => result.status === 'rejected');
+    if (rejected) {
+        throw rejected.reason;
+    }
+    return results;
+}
+
+/**
+ * Tracks documents created by a batch so a failed batch can be undone.
+ */
+export class CreatedDocuments {
+    private created: { collectionId: string; documentId: string }[] = [];
+
+    add(collectionId: string, documentId: string): void {
+        this.created.push({ collectionId, documentId });
+    }
+
+    /**
+     * Best-effort delete, newest first, so a retried batch doesn't leave duplicates behind.
+     */
+    async rollback(): Promise<void> {
+        const db = databases();
+        const dbId = DATABASE_ID();
+        const toDelete = this.created.reverse();
+        this.created = [];
+        await mapWithConcurrency(toDelete, BATCH_CONCURRENCY, async ({ collectionId, documentId }) => {
+            try {
+                await db.deleteDocument(dbId, collectionId, documentId);
+                forgetOwnership(collectionId, documentId);
+            } catch (error) {
+                console.error(`Rollback failed for ${collectionId}/${documentId}:`, error);
+            }
+        });
+    }
+}
+
+/**
+ * Validates a list of task inputs; returns an error message or null.
+ */
+export function validateTaskInputs(tasks: unknown, path: string): string | null {
+    if (!Array.isArray(tasks)) {
+        return `${path} must be an array`;
+    }
+    for (let i = 0; i < tasks.length; i++) {
+        const task = tasks[i];
+        if (!task || typeof task !== 'object' || !task.title) {
+            return `${path}[${i}].title is required`;
+        }
+    }
+    return null;
+}
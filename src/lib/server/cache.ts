@@ -0,0 +1,79 @@
+/**
+ * Bounded in-memory cache with per-entry TTL and least-recently-used eviction.
+ *
+ * A Map keeps insertion order, so re-inserting an entry on every hit moves it to
+ * the back and the first key is always the least recently used one.
+ * The cache lives in the memory of a single server instance.
+ */
+export class TtlCache<K, V> {
+    private entries = new Map<K, { value: V; expiresAt: number }>();
+    private hits = 0;
+    private misses = 0;
+    private evictions = 0;
+
+    constructor(private readonly maxEntries: number, private readonly defaultTtlMs: number) { }
+
+    get(key: K): V | undefined {
+        const entry = this.entries.get(key);
+        if (!entry) {
+            this.misses++;
+            return undefined;
+        }
+        if (entry.expiresAt <= Date.now()) {
+            this.entries.delete(key);
+            this.misses++;
+            return undefined;
+        }
+        // Refresh recency
+        this.entries.delete(key);
+        this.entries.set(key, entry);
+        this.hits++;
+        return entry.value;
+    }
+
+    set(key: K, value: V, ttlMs: number = this.defaultTtlMs): void {
+        this.entries.delete(key);
+        while (this.entries.size >= this.maxEntries) {
+            const oldest = this.entries.keys().next().value as K;
+            this.entries.delete(oldest);
+            this.evictions++;
+        }
+        this.entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+    }
+
+    delete(key: K): boolean {
+        return this.entries.delete(key);
+    }
+
+    /**
+     * Removes every entry whose value matches the predicate. O(N), meant for rare invalidations.
+     */
+    deleteWhere(predicate: (value: V, key: K) => boolean): number {
+        let removed = 0;
+        for (const [key, entry] of this.entries) {
+            if (predicate(entry.value, key)) {
+                this.entries.delete(key);
+                removed++;
+            }
+        }
+        return removed;
+    }
+
+    clear(): void {
+        this.entries.clear();
+    }
+
+    get size(): number {
+        return this.entries.size;
+    }
+
+    stats() {
+        return {
+            hits: this.hits,
+            misses: this.misses,
+            evictions: this.evictions,
+            size: this.entries.size,
+            maxEntries: this.maxEntries,
+        };
+    }
+}
@@ -0,0 +1,87 @@
+import { Models, Query } from 'node-appwrite';
+import { databases, DATABASE_ID } from './appwrite';
+import { TtlCache } from './cache';
+import { withCurrentSummaries } from './habits';
+import { DashboardHabit, DashboardSummary, DashboardTask } from '@/types';
+
+// Habit cards shown on the dashboard
+export const DASHBOARD_HABITS = 20;
+
+const DASHBOARD_CACHE_TTL_MS = process.env.DASHBOARD_CACHE_TTL_MS
+    ? Number(process.env.DASHBOARD_CACHE_TTL_MS)
+    : 15 * 1000;
+const DASHBOARD_CACHE_MAX_ENTRIES = 1000;
+const PAGE_SIZE = 100;
+
+// Only what the dashboard cards render
+const TASK_FIELDS = ['$id', 'title', 'dueDate', 'isCompleted'];
+// lastCompletedDate and recentRuns let withCurrentSummaries end old streaks and spot legacy habits
+const HABIT_FIELDS = ['$id', 'title', 'streak', 'lastCompletedDate', 'recentRuns'];
+
+// Keyed by `${userId}|${dueBefore}`
+const summaryCache = new TtlCache<string, DashboardSummary>(DASHBOARD_CACHE_MAX_ENTRIES, DASHBOARD_CACHE_TTL_MS);
+
+/**
+ * Every open task due on or before `dueBefore`, oldest first.
+ * Served in order by the userId_isCompleted_dueDate_idx index.
+ */
+async function listDueTasks(userId: string, dueBefore: string): Promise<DashboardTask[]> {
+    const tasks: DashboardTask[] = [];
+    let cursor: string | null = null;
+    do {
+        const response: Models.DocumentList<Models.Document> = await databases().listDocuments(DATABASE_ID(), 'tasks', [
+            Query.equal('userId', userId),
+            Query.equal('isCompleted', false),
+            Query.lessThanEqual('dueDate', dueBefore),
+            Query.orderAsc('dueDate'),
+            Query.select(TASK_FIELDS),
+            Query.limit(PAGE_SIZE),
+            ...(cursor ? [Query.cursorAfter(cursor)] : []),
+        ]);
+        for (const doc of response.documents) {
+            tasks.push({ $id: doc.$id, title: doc.title, dueDate: doc.dueDate, isCompleted: doc.isCompleted });
+        }
+        cursor = response.documents.length === PAGE_SIZE ? response.documents[PAGE_SIZE - 1].$id : null;
+    } while (cursor);
+    return tasks;
+}
+
+async function listHabits(userId: string): Promise<DashboardHabit[]> {
+    const response = await databases().listDocuments(DATABASE_ID(), 'habits', [
+        Query.equal('userId', userId),
+        Query.select(HABIT_FIELDS),
+        Query.limit(DASHBOARD_HABITS),
+    ]);
+    const habits = await withCurrentSummaries(response.documents);
+    return habits.map(doc => ({ $id: doc.$id, title: doc.title, streak: doc.streak || 0 }));
+}
+
+/**
+ * Builds the dashboard summary for a user, served from a short per-user cache unless `fresh`.
+ * Returns whether the summary came from the cache.
+ */
+export async function getDashboardSummary(
+    userId: string,
+    dueBefore: string,
+    { fresh = false }: { fresh?: boolean } = {}
+): Promise<{ summary: DashboardSummary; cached: boolean }> {
+    const key = `${userId}|${dueBefore}`;
+    if (!fresh) {
+        const cached = summaryCache.get(key);
+        if (cached) {
+            return { summary: cached, cached: true };
+        }
+    }
+
+    const [tasks, habits] = await Promise.all([listDueTasks(userId, dueBefore), listHabits(userId)]);
+    const summary = { dueBefore, tasks, habits };
+    summaryCache.set(key, summary);
+    return { summary, cached: false };
+}
+
+/**
+ * Drops a user's cached summaries. Call after a server-side write to their tasks or habits.
+ */
+export function invalidateDashboard(userId: string): void {
+    summaryCache.deleteWhere((_, key) => key.startsWith(`${userId}|`));
+}
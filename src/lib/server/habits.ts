@@ -0,0 +1,112 @@
+import { Models, Query } from 'node-appwrite';
+import {
+    addDateToRuns, getCompletionRuns, getCurrentStreak, getLastCompletedDate, getLocalDateString, parseLocalDate,
+    summarizeAppendedRuns, summarizeRuns,
+} from '@/lib/habit-utils';
+import { databases, DATABASE_ID } from './appwrite';
+import { span } from './timing';
+
+// Entries accepted by one bulk habit log request
+export const MAX_HABIT_LOG_ENTRIES = 500;
+
+const DATE_PATTERN = /^\d{4}-\d{2}-\d{2}$/;
+
+/**
+ * A real calendar date (YYYY-MM-DD) no later than today. Completion runs sort by their date
+ * strings, so an impossible date like 2024-02-30 would land out of order, and a future date
+ * would hold lastCompletedDate (and so the current streak) until it arrives.
+ */
+export const isValidDate = (date: unknown): date is string => {
+    return typeof date === 'string'
+        && DATE_PATTERN.test(date)
+        && getLocalDateString(parseLocalDate(date)) === date
+        && date <= getLocalDateString();
+};
+
+const sameRuns = (a: string[], b?: string[] | null): boolean => {
+    return !!b && a.length === b.length && a.every((run, i) => run === b[i]);
+};
+
+/**
+ * Marks dates as completed on a habit document and recomputes its derived fields once
+ * (streaks, lastCompletedDate and recentRuns, see summarizeRuns). Appending after the latest
+ * completion updates the stored summary incrementally; backfills recompute it.
+ *
+ * Returns the fields to write, or null when the dates were already logged and the stored
+ * derived fields are still current (idempotent). Legacy documents that still hold completedDates
+ * are migrated to completedRuns on this write.
+ */
+export function applyCompletions(habit: Models.Document, dates: string[]): Record<string, unknown> | null {
+    return span('streaks', () => computeCompletions(habit, dates));
+}
+
+function computeCompletions(habit: Models.Document, dates: string[]): Record<string, unknown> | null {
+    const isLegacy = !habit.completedRuns || habit.completedRuns.length === 0;
+    const currentRuns = getCompletionRuns(habit.completedRuns, habit.completedDates);
+
+    let completedRuns = currentRuns;
+    for (const date of dates) {
+        completedRuns = addDateToRuns(completedRuns, date);
+    }
+    // Dates after the latest completion only extend the tail of the runs. That holds when the
+    // stored summary matches the runs it was derived from; backfills and legacy documents, whose
+    // stored values may come from unsorted completedDates, are summarized from scratch.
+    const previousLast = getLastCompletedDate(currentRuns);
+    const appendOnly = !isLegacy
+        && typeof habit.longestStreak === 'number'
+        && (habit.lastCompletedDate ?? null) === previousLast
+        && dates.every(date => previousLast === null || date > previousLast);
+    const summary = appendOnly
+        ? summarizeAppendedRuns(completedRuns, { longestStreak: habit.longestStreak, lastCompletedDate: previousLast })
+        : summarizeRuns(completedRuns);
+
+    if (completedRuns === currentRuns && !isLegacy
+        && summary.streak === habit.streak && summary.longestStreak === habit.longestStreak
+        && summary.lastCompletedDate === habit.lastCompletedDate
+        && sameRuns(summary.recentRuns, habit.recentRuns)) {
+        return null;
+    }
+
+    return {
+        completedRuns,
+        ...(isLegacy ? { completedDates: [] } : {}),
+        ...summary
+    };
+}
+
+// Stored next to the completion history so lists can skip it (see summarizeRuns)
+export const HABIT_SUMMARY_FIELDS = ['streak', 'longestStreak', 'lastCompletedDate', 'recentRuns'];
+
+// Values per Query.equal
+const MAX_EQUAL_VALUES = 100;
+
+/**
+ * Prepares habit documents listed with the summary fields (and no history) for display.
+ *
+ * Habits not written since the summary fields were added have no recentRuns; their history
+ * is read for just those documents and summarized. Stored streaks are only recomputed on
+ * write, so a streak whose latest completion is older than yesterday is shown as 0.
+ */
+export async function withCurrentSummaries(docs: Models.Document[]): Promise<Models.Document[]> {
+    const legacyIds = docs.filter(doc => doc.recentRuns == null).map(doc => doc.$id);
+    const histories = new Map<string, Models.Document>();
+    for (let i = 0; i < legacyIds.length; i += MAX_EQUAL_VALUES) {
+        const ids = legacyIds.slice(i, i + MAX_EQUAL_VALUES);
+        const response = await databases().listDocuments(DATABASE_ID(), 'habits', [
+            Query.equal('$id', ids),
+            Query.select(['$id', 'completedRuns', 'completedDates']),
+            Query.limit(ids.length),
+        ]);
+        for (const history of response.documents) {
+            histories.set(history.$id, history);
+        }
+    }
+
+    return docs.map(doc => {
+        const history = histories.get(doc.$id);
+        if (history) {
+            return { ...doc, ...summarizeRuns(getCompletionRuns(history.completedRuns, history.completedDates)) };
+        }
+        return { ...doc, streak: getCurrentStreak(doc.streak, doc.lastCompletedDate) };
+    });
+}
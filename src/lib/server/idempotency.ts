@@ -0,0 +1,124 @@
+import { createHash } from 'node:crypto';
+import { NextRequest, NextResponse } from 'next/server';
+import { validateApiKey } from './appwrite';
+import { TtlCache } from './cache';
+
+// Responses to write requests sent with an Idempotency-Key, so a GPT retrying a timed-out tool
+// call gets the original response instead of creating a second document. GPT retries come
+// within seconds; the TTL only needs to outlive them. Entries live in this server instance.
+const IDEMPOTENCY_TTL_MS = process.env.IDEMPOTENCY_TTL_MS
+    ? Number(process.env.IDEMPOTENCY_TTL_MS)
+    : 10 * 60 * 1000;
+const IDEMPOTENCY_MAX_ENTRIES = 5000;
+export const MAX_KEY_LENGTH = 255;
+
+interface StoredResponse {
+    // sha256 of the request body, so a key reused for a different request is refused
+    fingerprint: string;
+    status: number;
+    headers: [string, string][];
+    body: string;
+}
+
+// Keyed by `${userId}|${method} ${path}|${idempotencyKey}`
+const responseCache = new TtlCache<string, StoredResponse>(IDEMPOTENCY_MAX_ENTRIES, IDEMPOTENCY_TTL_MS);
+// Requests still running, so a duplicate sent before the first one finishes waits for its response
+const pending = new Map<string, Promise<StoredResponse>>();
+let replays = 0;
+
+// Server errors and rate-limit rejections are worth retrying, so they are never replayed
+function isStorable(response: StoredResponse): boolean {
+    return response.status < 500 && response.status !== 429;
+}
+
+type RouteHandler<C> = (req: NextRequest, context: C) => Promise<Response>;
+
+function replay(stored: StoredResponse): NextResponse {
+    const response = new NextResponse(stored.body, { status: stored.status, headers: stored.headers });
+    response.headers.set('Idempotent-Replayed', 'true');
+    return response;
+}
+
+/**
+ * Wraps a write route so requests carrying an Idempotency-Key run once per user, path and key.
+ * Repeats get the stored response without reaching Appwrite. A key reused with a different body
+ * gets 422. Server errors and rate-limit rejections are neither stored nor replayed to duplicates
+ * that were waiting on them, so those can be retried.
+ * Requests without the header, or with a missing or invalid API key, go straight to the handler.
+ */
+export function withIdempotency<C>(handler: RouteHandler<C>): RouteHandler<C> {
+    return async (req, context) => {
+        const idempotencyKey = req.headers.get('Idempotency-Key');
+        const apiKey = req.headers.get('X-API-Key');
+        if (!idempotencyKey || !apiKey) {
+            return handler(req, context);
+        }
+        if (idempotencyKey.length > MAX_KEY_LENGTH) {
+            return NextResponse.json(
+                { error: `Idempotency-Key must be at most ${MAX_KEY_LENGTH} characters` },
+                { status: 400 }
+            );
+        }
+        const userId = await validateApiKey(apiKey);
+        if (!userId) {
+            return handler(req, context);
+        }
+
+        const key = `${userId}|${req.method} ${req.nextUrl.pathname}|${idempotencyKey}`;
+        const fingerprint = createHash('sha256').update(await req.clone().text()).digest('hex');
+        const mismatch = () => NextResponse.json(
+            { error: 'Idempotency-Key was already used for a different request' },
+            { status: 422 }
+        );
+
+        for (;;) {
+            const stored = responseCache.get(key);
+            if (stored) {
+                if (stored.fingerprint !== fingerprint) {
+                    return mismatch();
+                }
+                replays++;
+                return replay(stored);
+            }
+
+            const running = pending.get(key);
+            if (!running) {
+                break;
+            }
+            // A duplicate of a request that failed, threw or was rate limited runs the handler
+            // itself (unless another duplicate got there first) instead of replaying the failure
+            const first = await running.catch(() => undefined);
+            if (first && isStorable(first)) {
+                if (first.fingerprint !== fingerprint) {
+                    return mismatch();
+                }
+                replays++;
+                return replay(first);
+            }
+        }
+
+        const result = (async () => {
+            const response = await handler(req, context);
+            return {
+                fingerprint,
+                status: response.status,
+                headers: [...response.headers],
+                body: await response.text(),
+            };
+        })();
+        pending.set(key, result);
+        try {
+            const first = await result;
+            if (isStorable(first)) {
+                responseCache.set(key, first);
+            }
+            return new NextResponse(first.body, { status: first.status, headers: first.headers });
+        } finally {
+            pending.delete(key);
+        }
+    };
+}
+
+export function getIdempotencyStats() {
+    return { ...responseCache.stats(), pending: pending.size, replays };
+}
@@ -0,0 +1,106 @@
+import { AppwriteException, Query } from 'node-appwrite';
+import { databases, DATABASE_ID } from './appwrite';
+import { TtlCache } from './cache';
+import { span } from './timing';
+
+// Which goals and phases a user owns, so nested routes don't read the parent before every insert.
+// Ownership never changes, so entries only go stale when the parent is deleted. The app deletes
+// goals and phases through DELETE /api/goals/{goalId} and /api/phases/{phaseId}, which drop them
+// right away on that instance; other instances pick the delete up after the TTL.
+const OWNERSHIP_CACHE_TTL_MS = process.env.OWNERSHIP_CACHE_TTL_MS
+    ? Number(process.env.OWNERSHIP_CACHE_TTL_MS)
+    : 60 * 1000;
+const OWNERSHIP_CACHE_MAX_ENTRIES = 5000;
+
+export type ParentCollection = 'goals' | 'phases';
+
+// Keyed by `${userId}|${collection}|${documentId}`. The value is the goal a phase belongs to
+// (a goal maps to itself). Only parents the user owns are cached.
+const ownershipCache = new TtlCache<string, string>(OWNERSHIP_CACHE_MAX_ENTRIES, OWNERSHIP_CACHE_TTL_MS);
+
+const cacheKey = (userId: string, collection: ParentCollection, documentId: string) =>
+    `${userId}|${collection}|${documentId}`;
+
+const isNotFound = (error: unknown) => error instanceof AppwriteException && error.code === 404;
+
+/**
+ * Checks that a goal exists and belongs to the user. Errors other than not found are rethrown.
+ */
+export function ownsGoal(userId: string, goalId: string): Promise<boolean> {
+    return span('ownership', () => checkGoal(userId, goalId));
+}
+
+async function checkGoal(userId: string, goalId: string): Promise<boolean> {
+    const key = cacheKey(userId, 'goals', goalId);
+    if (ownershipCache.get(key) !== undefined) {
+        return true;
+    }
+    try {
+        const goal = await databases().getDocument(DATABASE_ID(), 'goals', goalId, [Query.select(['userId'])]);
+        if (goal.userId !== userId) {
+            return false;
+        }
+    } catch (error) {
+        if (isNotFound(error)) {
+            return false;
+        }
+        throw error;
+    }
+    ownershipCache.set(key, goalId);
+    return true;
+}
+
+/**
+ * Returns the goal ID of a phase the user owns, or null when the phase doesn't exist or
+ * belongs to someone else. Phases carry no userId, so ownership comes from their goal.
+ * Errors other than not found are rethrown.
+ */
+export function getOwnedPhaseGoal(userId: string, phaseId: string): Promise<string | null> {
+    return span('ownership', () => checkPhase(userId, phaseId));
+}
+
+async function checkPhase(userId: string, phaseId: string): Promise<string | null> {
+    const key = cacheKey(userId, 'phases', phaseId);
+    const cached = ownershipCache.get(key);
+    if (cached !== undefined) {
+        return cached;
+    }
+    let goalId: string;
+    try {
+        const phase = await databases().getDocument(DATABASE_ID(), 'phases', phaseId, [Query.select(['goalId'])]);
+        goalId = phase.goalId;
+    } catch (error) {
+        if (isNotFound(error)) {
+            return null;
+        }
+        throw error;
+    }
+    if (!goalId || !(await checkGoal(userId, goalId))) {
+        return null;
+    }
+    ownershipCache.set(key, goalId);
+    return goalId;
+}
+
+/**
+ * Records a goal or phase the user just created, so the next nested write skips the lookup.
+ */
+export function rememberOwnership(userId: string, collection: ParentCollection, documentId: string, goalId: string): void {
+    ownershipCache.set(cacheKey(userId, collection, documentId), goalId);
+}
+
+/**
+ * Drops a deleted goal or phase. Deleting a goal also drops its phases.
+ */
+export function forgetOwnership(collection: string, documentId: string): void {
+    if (collection === 'goals') {
+        // Matches the goal's own entries and its phases'
+        ownershipCache.deleteWhere(goalId => goalId === documentId);
+    } else if (collection === 'phases') {
+        ownershipCache.deleteWhere((_, key) => key.endsWith(`|phases|${documentId}`));
+    }
+}
+
+export function getOwnershipCacheStats() {
+    return ownershipCache.stats();
+}
@@ -0,0 +1,126 @@
+import { createHash } from 'crypto';
+import { NextRequest, NextResponse } from 'next/server';
+import { AppwriteException, Query } from 'node-appwrite';
+import { databases, DATABASE_ID } from './appwrite';
+
+export const DEFAULT_PAGE_SIZE = 25;
+export const MAX_PAGE_SIZE = 100;
+
+// Attributes a client may request with ?fields=, per collection
+export const LIST_FIELDS: Record<string, string[]> = {
+    goals: ['title', 'description', 'deadline', 'userId', '$createdAt', '$updatedAt'],
+    phases: ['title', 'order', 'goalId', 'isCompleted', '$createdAt', '$updatedAt'],
+    tasks: ['title', 'isCompleted', 'dueDate', 'phaseId', 'goalId', 'userId', '$createdAt', '$updatedAt'],
+    habits: [
+        'title', 'streak', 'longestStreak', 'lastCompletedDate', 'recentRuns', 'completedRuns', 'completedDates',
+        'userId', '$createdAt', '$updatedAt',
+    ],
+};
+
+/**
+ * Thrown by listPage when Appwrite rejects the ?cursor= (malformed, deleted or from another
+ * collection). Routes answer it with 400 instead of a server error.
+ */
+export class InvalidCursorError extends Error {
+    constructor() {
+        super('Invalid cursor');
+        this.name = 'InvalidCursorError';
+    }
+}
+
+export interface PageParams {
+    limit: number;
+    cursor: string | null;
+    fields: string[] | null;
+}
+
+export interface Page<T> {
+    data: T[];
+    nextCursor: string | null;
+    hasMore: boolean;
+}
+
+/**
+ * Reads ?limit=, ?cursor= and ?fields= (comma-separated). Returns an error message for invalid input.
+ */
+export function parsePageParams(req: NextRequest, collectionId: string): PageParams | { error: string } {
+    const search = req.nextUrl.searchParams;
+
+    let limit = DEFAULT_PAGE_SIZE;
+    const limitParam = search.get('limit');
+    if (limitParam !== null) {
+        limit = Number(limitParam);
+        if (!Number.isInteger(limit) || limit < 1 || limit > MAX_PAGE_SIZE) {
+            return { error: `limit must be an integer between 1 and ${MAX_PAGE_SIZE}` };
+        }
+    }
+
+    let fields: string[] | null = null;
+    const fieldsParam = search.get('fields');
+    if (fieldsParam) {
+        fields = fieldsParam.split(',').map(field => field.trim()).filter(Boolean);
+        const unknown = fields.filter(field => !LIST_FIELDS[collectionId].includes(field));
+        if (unknown.length > 0) {
+            return { error: `Unknown fields: ${unknown.join(', ')}` };
+        }
+    }
+
+    return { limit, cursor: search.get('cursor') || null, fields };
+}
+
+/**
+ * Lists one page of documents after the cursor. `baseQueries` holds the filters and ordering.
+ * Throws InvalidCursorError when Appwrite rejects the cursor.
+ *
+ * Asks for one extra document to learn whether another page exists, instead of relying
+ * on the total count. Selected fields always include $id, which the next cursor needs.
+ */
+export async function listPage(collectionId: string, baseQueries: string[], params: PageParams): Promise<Page<Record<string, unknown>>> {
+    const queries = [...baseQueries, Query.limit(params.limit + 1)];
+    if (params.cursor) {
+        queries.push(Query.cursorAfter(params.cursor));
+    }
+    if (params.fields) {
+        queries.push(Query.select(Array.from(new Set(['$id', ...params.fields]))));
+    }
+
+    let response;
+    try {
+        response = await databases().listDocuments(DATABASE_ID(), collectionId, queries);
+    } catch (error) {
+        if (params.cursor && error instanceof AppwriteException && (error.code === 400 || error.code === 404)) {
+            throw new InvalidCursorError();
+        }
+        throw error;
+    }
+    const hasMore = response.documents.length > params.limit;
+    const data = hasMore ? response.documents.slice(0, params.limit) : response.documents;
+
+    return {
+        data,
+        nextCursor: hasMore ? data[data.length - 1].$id : null,
+        hasMore,
+    };
+}
+
+/**
+ * Sends a page as JSON with a weak ETag of its body; answers 304 when If-None-Match matches.
+ */
+export function pageResponse(req: NextRequest, page: Page<Record<string, unknown>>): NextResponse {
+    const body = JSON.stringify(page);
+    const etag = `W/"${createHash('sha1').update(body).digest('base64url')}"`;
+    const headers = {
+        'ETag': etag,
+        'Cache-Control': 'private, no-cache',
+    };
+
+    const ifNoneMatch = req.headers.get('If-None-Match');
+    if (ifNoneMatch && ifNoneMatch.split(',').some(tag => tag.trim() === etag)) {
+        return new NextResponse(null, { status: 304, headers });
+    }
+
+    return new NextResponse(body, {
+        status: 200,
+        headers: { ...headers, 'Content-Type': 'application/json' },
+    });
+}
@@ -0,0 +1,202 @@
+import { createHash } from 'node:crypto';
+import { mkdir, open, readFile, stat, unlink, writeFile } from 'node:fs/promises';
+import { tmpdir } from 'node:os';
+import { join } from 'node:path';
+import { NextResponse } from 'next/server';
+import { TtlCache } from './cache';
+import { onResponse, recordError, span } from './timing';
+
+// Per-user admission control for the GPT routes: a token bucket refilled at RATE_LIMIT_PER_SECOND
+// up to RATE_LIMIT_BURST, and at most RATE_LIMIT_MAX_CONCURRENT requests in flight.
+// RATE_LIMIT_PER_SECOND=0 turns limiting off.
+const RATE_LIMIT_PER_SECOND = process.env.RATE_LIMIT_PER_SECOND ? Number(process.env.RATE_LIMIT_PER_SECOND) : 20;
+const RATE_LIMIT_BURST = process.env.RATE_LIMIT_BURST ? Number(process.env.RATE_LIMIT_BURST) : 100;
+const RATE_LIMIT_MAX_CONCURRENT = process.env.RATE_LIMIT_MAX_CONCURRENT
+    ? Number(process.env.RATE_LIMIT_MAX_CONCURRENT)
+    : 10;
+// 'memory' keeps buckets per server instance. 'file' keeps them in RATE_LIMIT_DIR, so every
+// instance on the host shares one bucket per user.
+const RATE_LIMIT_STORE = process.env.RATE_LIMIT_STORE ?? 'memory';
+const RATE_LIMIT_DIR = process.env.RATE_LIMIT_DIR ?? join(tmpdir(), 'kai-rate-limit');
+
+export interface BucketLimit {
+    perSecond: number;
+    burst: number;
+}
+
+interface BucketState {
+    tokens: number;
+    updatedAt: number;
+}
+
+/**
+ * Where token buckets live. `take` removes one token from the key's bucket and returns 0, or
+ * returns how many ms until a token is available when the bucket is empty.
+ */
+export interface RateLimitStore {
+    take(key: string, limit: BucketLimit): Promise<number>;
+}
+
+function takeToken(state: BucketState | undefined, limit: BucketLimit, now: number) {
+    // A bucket that doesn't exist yet (or expired) is full
+    const tokens = state
+        ? Math.min(limit.burst, state.tokens + (now - state.updatedAt) * limit.perSecond / 1000)
+        : limit.burst;
+    if (tokens >= 1) {
+        return { state: { tokens: tokens - 1, updatedAt: now }, retryAfterMs: 0 };
+    }
+    return { state: { tokens, updatedAt: now }, retryAfterMs: Math.ceil((1 - tokens) * 1000 / limit.perSecond) };
+}
+
+/**
+ * Buckets in the memory of this server instance. A bucket is dropped once it would have
+ * refilled completely, so idle users cost nothing.
+ */
+export class MemoryRateLimitStore implements RateLimitStore {
+    private buckets: TtlCache<string, BucketState>;
+
+    constructor(maxEntries = 10000) {
+        this.buckets = new TtlCache<string, BucketState>(maxEntries, 60 * 1000);
+    }
+
+    async take(key: string, limit: BucketLimit): Promise<number> {
+        const { state, retryAfterMs } = takeToken(this.buckets.get(key), limit, Date.now());
+        this.buckets.set(key, state, Math.ceil(limit.burst / limit.perSecond * 1000));
+        return retryAfterMs;
+    }
+}
+
+const LOCK_WAIT_MS = 200;
+const LOCK_STALE_MS = 2000;
+
+/**
+ * Buckets as small JSON files in a directory shared by the server instances on one host.
+ * Each update holds a lock file, so concurrent instances never lose a take.
+ */
+export class FileRateLimitStore implements RateLimitStore {
+    private ready: Promise<unknown> | null = null;
+
+    constructor(private readonly dir: string) { }
+
+    async take(key: string, limit: BucketLimit): Promise<number> {
+        this.ready ??= mkdir(this.dir, { recursive: true });
+        await this.ready;
+
+        const file = join(this.dir, `${createHash('sha1').update(key).digest('hex')}.json`);
+        const unlock = await this.lock(`${file}.lock`);
+        try {
+            let saved: BucketState | undefined;
+            try {
+                saved = JSON.parse(await readFile(file, 'utf8'));
+            } catch {
+                // Missing or half-written: start from a full bucket
+            }
+            const { state, retryAfterMs } = takeToken(saved, limit, Date.now());
+            await writeFile(file, JSON.stringify(state));
+            return retryAfterMs;
+        } finally {
+            await unlock();
+        }
+    }
+
+    private async lock(path: string): Promise<() => Promise<void>> {
+        const deadline = Date.now() + LOCK_WAIT_MS;
+        while (true) {
+            try {
+                const handle = await open(path, 'wx');
+                await handle.close();
+                return () => unlink(path).catch(() => undefined);
+            } catch (error) {
+                if ((error as NodeJS.ErrnoException).code !== 'EEXIST') {
+                    throw error;
+                }
+            }
+            // A lock left behind by a crashed instance is broken after LOCK_STALE_MS
+            const held = await stat(path).catch(() => null);
+            if (held && Date.now() - held.mtimeMs > LOCK_STALE_MS) {
+                await unlink(path).catch(() => undefined);
+                continue;
+            }
+            if (Date.now() > deadline) {
+                throw new Error(`Timed out waiting for ${path}`);
+            }
+            await new Promise(resolve => setTimeout(resolve, 2));
+        }
+    }
+}
+
+const store: RateLimitStore = RATE_LIMIT_STORE === 'file'
+    ? new FileRateLimitStore(RATE_LIMIT_DIR)
+    : new MemoryRateLimitStore();
+
+// Requests in flight per user on this instance
+const inFlight = new Map<string, number>();
+let rateLimited = 0;
+let concurrencyLimited = 0;
+let storeErrors = 0;
+
+function release(userId: string): void {
+    const count = (inFlight.get(userId) ?? 1) - 1;
+    if (count > 0) {
+        inFlight.set(userId, count);
+    } else {
+        inFlight.delete(userId);
+    }
+}
+
+function tooManyRequests(reason: string, retryAfterMs: number): NextResponse {
+    return NextResponse.json(
+        { error: 'Too Many Requests', reason, retryAfterMs },
+        { status: 429, headers: { 'Retry-After': String(Math.max(1, Math.ceil(retryAfterMs / 1000))) } }
+    );
+}
+
+/**
+ * Admits a request from an authenticated user, or returns the 429 response to send instead.
+ * An admitted request holds one of the user's concurrency slots until its response is sent.
+ * If the bucket store fails, requests are let through rather than rejected.
+ */
+export async function admitRequest(userId: string): Promise<NextResponse | null> {
+    if (!(RATE_LIMIT_PER_SECOND > 0)) {
+        return null;
+    }
+
+    const active = inFlight.get(userId) ?? 0;
+    if (active >= RATE_LIMIT_MAX_CONCURRENT) {
+        concurrencyLimited++;
+        return tooManyRequests('concurrency', 1000);
+    }
+    // Claim the slot before waiting on the store so concurrent requests see it
+    inFlight.set(userId, active + 1);
+
+    let retryAfterMs = 0;
+    try {
+        retryAfterMs = await span('ratelimit', () =>
+            store.take(userId, { perSecond: RATE_LIMIT_PER_SECOND, burst: RATE_LIMIT_BURST })
+        );
+    } catch (error) {
+        storeErrors++;
+        recordError('Rate limit store failed', error);
+    }
+    if (retryAfterMs > 0) {
+        release(userId);
+        rateLimited++;
+        return tooManyRequests('rate', retryAfterMs);
+    }
+
+    onResponse(() => release(userId));
+    return null;
+}
+
+export function getRateLimitStats() {
+    return {
+        store: RATE_LIMIT_STORE,
+        perSecond: RATE_LIMIT_PER_SECOND,
+        burst: RATE_LIMIT_BURST,
+        maxConcurrent: RATE_LIMIT_MAX_CONCURRENT,
+        inFlightUsers: inFlight.size,
+        rateLimited,
+        concurrencyLimited,
+        storeErrors,
+    };
+}
@@ -0,0 +1,146 @@
+import { AsyncLocalStorage } from 'node:async_hooks';
+import { NextRequest, NextResponse } from 'next/server';
+
+// Fraction of requests (0..1) whose spans are logged as JSON. Failed requests are always logged.
+// Server-Timing headers are sent on every response regardless.
+const TRACE_SAMPLE_RATE = process.env.TRACE_SAMPLE_RATE ? Number(process.env.TRACE_SAMPLE_RATE) : 0;
+
+interface Span {
+    name: string;
+    startMs: number;
+    durationMs: number;
+}
+
+interface Trace {
+    route: string;
+    startedAt: number;
+    spans: Span[];
+    // Run once the response is ready, whether the handler returned or threw
+    finalizers: (() => void)[];
+    error?: { message: string; detail: string };
+}
+
+// The trace of the request being handled, so helpers can add spans without passing it around
+const traceStorage = new AsyncLocalStorage<Trace>();
+
+/**
+ * Times `fn` as a named stage of the current request. Works for sync and async functions, and
+ * outside a request (e.g. in scripts) it just calls `fn`. Nested spans are recorded separately,
+ * so a `db-list` inside `auth` counts towards both.
+ */
+export function span<T>(name: string, fn: () => T): T {
+    const trace = traceStorage.getStore();
+    if (!trace) {
+        return fn();
+    }
+    const start = performance.now();
+    const end = () => {
+        trace.spans.push({ name, startMs: start - trace.startedAt, durationMs: performance.now() - start });
+    };
+    let result: T;
+    try {
+        result = fn();
+    } catch (error) {
+        end();
+        throw error;
+    }
+    if (result instanceof Promise) {
+        return result.finally(end) as T;
+    }
+    end();
+    return result;
+}
+
+/**
+ * Logs a handled error. Inside a request it is attached to the request's trace, which is then
+ * logged with its spans whatever the sample rate.
+ */
+export function recordError(message: string, error: unknown): void {
+    const trace = traceStorage.getStore();
+    if (!trace) {
+        console.error(message, error);
+        return;
+    }
+    trace.error = {
+        message,
+        detail: error instanceof Error ? `${error.name}: ${error.message}` : String(error),
+    };
+}
+
+/**
+ * Runs `fn` once the current request's response is ready, e.g. to free a slot it holds.
+ * Outside a request it runs right away.
+ */
+export function onResponse(fn: () => void): void {
+    const trace = traceStorage.getStore();
+    if (!trace) {
+        fn();
+        return;
+    }
+    trace.finalizers.push(fn);
+}
+
+/**
+ * Formats spans as a Server-Timing header value. Spans with the same name are summed into
+ * one entry, with the number of calls in its description.
+ */
+export function formatServerTiming(spans: Span[], totalMs: number): string {
+    const stages = new Map<string, { durationMs: number; count: number }>();
+    for (const { name, durationMs } of spans) {
+        const stage = stages.get(name) ?? { durationMs: 0, count: 0 };
+        stage.durationMs += durationMs;
+        stage.count++;
+        stages.set(name, stage);
+    }
+    const entries = [...stages].map(([name, { durationMs, count }]) =>
+        `${name};${count > 1 ? `desc="${count} calls";` : ''}dur=${durationMs.toFixed(1)}`
+    );
+    entries.push(`total;dur=${totalMs.toFixed(1)}`);
+    return entries.join(', ');
+}
+
+type RouteHandler<C> = (req: NextRequest, context: C) => Promise<Response>;
+
+/**
+ * Wraps a route handler so each request is traced: stages timed with `span` are reported in a
+ * Server-Timing header, and sampled or failed requests are logged as one JSON line.
+ */
+export function withTiming<C>(route: string, handler: RouteHandler<C>): RouteHandler<C> {
+    return async (req, context) => {
+        const trace: Trace = { route, startedAt: performance.now(), spans: [], finalizers: [] };
+        let response: Response;
+        try {
+            response = await traceStorage.run(trace, () => handler(req, context));
+        } catch (error) {
+            trace.error = { message: 'Unhandled error', detail: String(error) };
+            response = NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+        } finally {
+            for (const finalize of trace.finalizers) {
+                finalize();
+            }
+        }
+        const totalMs = performance.now() - trace.startedAt;
+        response.headers.set('Server-Timing', formatServerTiming(trace.spans, totalMs));
+
+        if (trace.error || Math.random() < TRACE_SAMPLE_RATE) {
+            const entry = JSON.stringify({
+                type: 'trace',
+                route,
+                status: response.status,
+                totalMs: Number(totalMs.toFixed(1)),
+                spans: trace.spans.map(s => ({
+                    name: s.name,
+                    startMs: Number(s.startMs.toFixed(1)),
+                    durationMs: Number(s.durationMs.toFixed(1)),
+                })),
+                ...(trace.error ? { error: trace.error } : {}),
+            });
+            if (trace.error) {
+                console.error(entry);
+            } else {
+                console.log(entry);
+            }
+        }
+        return response;
+    };
+}
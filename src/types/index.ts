@@ -29,7 +29,10 @@ export interface Habit {
     title: string;
     streak: number; // Current streak
     longestStreak: number; // Best streak
-    completedDates: string[]; // Array of ISO date strings (YYYY-MM-DD)
+    lastCompletedDate: string | null; // Latest completion (YYYY-MM-DD)
+    recentRuns: string[]; // Completions within the last RECENT_DAYS days, all that list views load
+    completedRuns?: string[]; // Run-length encoded completions ("YYYY-MM-DD/N"), see habit-utils; loaded on demand
+    completedDates?: string[]; // Legacy: array of ISO date strings (YYYY-MM-DD), migrated to completedRuns
     userId: string;
 }
 
@@ -47,3 +50,23 @@ export interface InboxItem {
     userId: string;
     isProcessed: boolean;
 }
+
+// Slimmed-down documents returned by /api/dashboard
+export interface DashboardTask {
+    $id: string;
+    title: string;
+    dueDate: string;
+    isCompleted: boolean;
+}
+
+export interface DashboardHabit {
+    $id: string;
+    title: string;
+    streak: number;
+}
+
+export interface DashboardSummary {
+    dueBefore: string;
+    tasks: DashboardTask[];
+    habits: DashboardHabit[];
+}
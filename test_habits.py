@@ -1,8 +1,36 @@
-import time
-from playwright.sync_api import sync_playwright
+"""
+Habit data isolation test (Playwright).
+
+    python test_habits.py                       # sequential User A / User B / User A flow
+    python test_habits.py --users 40            # 40 users in parallel browser contexts
+    python test_habits.py --users 40 --processes 4 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import multiprocessing
 import random
 import string
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from playwright.async_api import async_playwright
+from playwright.sync_api import sync_playwright
+
+BASE_URL = "http://localhost:3000"
+
+# Per-action timeout for the parallel mode, in milliseconds
+TIMEOUT_MS = 15000
+# How long a worker process waits for the others to finish their setup phase, in seconds
+BARRIER_TIMEOUT_S = 600
+
+# Rendered once the habits page has finished loading its list
+HABITS_READY = "text=New Habit"
+# Habit card titles (the empty state uses a different heading style)
+HABIT_TITLES = "h3.font-semibold"
 
 def generate_random_email():
     return f"user_{''.join(random.choices(string.ascii_lowercase + string.digits, k=8))}@example.com"
@@ -10,7 +38,13 @@ def generate_random_email():
 def generate_random_password():
     return "password123"
 
-def run_test():
+def open_habits(page):
+    """Navigate to the habits page and wait until its list has been fetched and rendered."""
+    page.click("text=Habits")
+    page.wait_for_url("**/habits")
+    page.wait_for_selector(HABITS_READY)
+
+def run_test(base_url: str = BASE_URL):
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
 
@@ -19,7 +53,7 @@ def run_test():
         page_a = context_a.new_page()
 
         print("Navigating to login page...")
-        page_a.goto("http://localhost:3000/login")
+        page_a.goto(f"{base_url}/login")
 
         # User A Registration
         print("Registering User A...")
@@ -37,11 +71,11 @@ def run_test():
 
         # Wait for redirect to dashboard
         print("Waiting for redirection to dashboard...")
-        page_a.wait_for_url("http://localhost:3000/")
+        page_a.wait_for_url(f"{base_url}/")
 
         # Navigate to Habits
         print("Navigating to Habits page...")
-        page_a.click("text=Habits")
+        open_habits(page_a)
 
         # Create Habit A
         print("Creating Habit A...")
@@ -67,7 +101,7 @@ def run_test():
         print("\n--- Starting User B Flow ---")
         context_b = browser.new_context()
         page_b = context_b.new_page()
-        page_b.goto("http://localhost:3000/login")
+        page_b.goto(f"{base_url}/login")
 
         print("Registering User B...")
         user_b_email = generate_random_email()
@@ -78,14 +112,13 @@ def run_test():
         page_b.fill("input[type='email']", user_b_email)
         page_b.fill("input[type='password']", user_b_password)
         page_b.click("button[type='submit']")
-        page_b.wait_for_url("http://localhost:3000/")
+        page_b.wait_for_url(f"{base_url}/")
 
         print("Navigating to Habits page for User B...")
-        page_b.click("text=Habits")
+        open_habits(page_b)
 
-        # Verify Habit A is NOT visible
+        # Verify Habit A is NOT visible (the list has loaded, so this is final)
         print("Verifying Habit A is NOT visible...")
-        time.sleep(2) # Give it a moment to load
         if page_b.is_visible("text=Habit A"):
             print("ERROR: Habit A is visible for User B!")
             page_b.screenshot(path="error_isolation_leak.png")
@@ -112,7 +145,7 @@ def run_test():
         print("\n--- Returning to User A ---")
         context_a_return = browser.new_context()
         page_a_return = context_a_return.new_page()
-        page_a_return.goto("http://localhost:3000/login")
+        page_a_return.goto(f"{base_url}/login")
 
         # Ensure we are on login page (Sign In mode)
         # Check if we need to toggle. Default might be Sign In or remembered state?
@@ -123,18 +156,15 @@ def run_test():
         page_a_return.fill("input[type='email']", user_a_email)
         page_a_return.fill("input[type='password']", user_a_password)
         page_a_return.click("button[type='submit']")
-        page_a_return.wait_for_url("http://localhost:3000/")
+        page_a_return.wait_for_url(f"{base_url}/")
 
         print("Navigating to Habits page...")
-        page_a_return.click("text=Habits")
+        open_habits(page_a_return)
 
         # Verify A visible, B not visible
         print("Verifying User A sees Habit A but not Habit B...")
 
-        # Wait a bit for data to fetch
-        try:
-            page_a_return.wait_for_selector("text=Habit A", timeout=10000)
-        except Exception as e:
+        if not page_a_return.is_visible("text=Habit A"):
              print("ERROR: Habit A is missing for User A! Taking screenshot.")
              page_a_return.screenshot(path="error_missing_habit_a.png")
              # Print page content for debugging
@@ -151,5 +181,214 @@ def run_test():
 
         browser.close()
 
+# --- Parallel multi-user isolation mode ---
+
+async def open_habits_async(page):
+    """Async variant of open_habits."""
+    await page.click("text=Habits")
+    await page.wait_for_url("**/habits")
+    await page.wait_for_selector(HABITS_READY)
+
+async def sign_up(page, base_url: str, name: str, email: str, password: str):
+    await page.goto(f"{base_url}/login")
+    await page.click("text=Sign Up")
+    await page.fill("input[type='text']", name)
+    await page.fill("input[type='email']", email)
+    await page.fill("input[type='password']", password)
+    await page.click("button[type='submit']")
+    await page.wait_for_url(f"{base_url}/")
+
+async def sign_in(page, base_url: str, email: str, password: str):
+    await page.goto(f"{base_url}/login")
+    await page.fill("input[type='email']", email)
+    await page.fill("input[type='password']", password)
+    await page.click("button[type='submit']")
+    await page.wait_for_url(f"{base_url}/")
+
+async def fail_user(page, result: dict, message: str):
+    """Record a failure for a user and keep a screenshot of the page."""
+    result["ok"] = False
+    result["errors"].append(message)
+    try:
+        await page.screenshot(path=f"fail_{result['user']}.png")
+    except Exception:
+        pass
+
+async def setup_user(browser, base_url: str, run_id: str, index: int, habits_per_user: int,
+                     timeout: float) -> dict:
+    """Sign up a fresh user, check it starts with no habits, then create its own habits."""
+    tag = f"{run_id}-u{index:03d}"
+    result = {
+        "user": tag,
+        "email": f"iso_{tag}@example.com",
+        "password": generate_random_password(),
+        "habits": [f"Habit {tag} #{h + 1}" for h in range(habits_per_user)],
+        "ok": True,
+        "errors": [],
+        "setup_ms": 0.0,
+        "verify_ms": 0.0,
+    }
+    start = time.perf_counter()
+    context = await browser.new_context()
+    context.set_default_timeout(timeout)
+    page = await context.new_page()
+    try:
+        await sign_up(page, base_url, f"Isolation {tag}", result["email"], result["password"])
+        await open_habits_async(page)
+
+        # A brand-new user must not see anyone's habits
+        leaked = await page.locator(HABIT_TITLES).all_inner_texts()
+        if leaked:
+            await fail_user(page, result, f"new user sees {len(leaked)} habit(s): {leaked[:5]}")
+
+        for title in result["habits"]:
+            await page.click("text=New Habit")
+            await page.fill("input[placeholder*='Habit name']", title)
+            await page.click("text=Add")
+            await page.locator(HABIT_TITLES, has_text=title).wait_for()
+    except Exception as e:
+        await fail_user(page, result, f"setup failed: {e}")
+    finally:
+        result["setup_ms"] = (time.perf_counter() - start) * 1000
+        await context.close()
+    return result
+
+async def verify_user(browser, base_url: str, result: dict, timeout: float) -> dict:
+    """Sign in again in a fresh context and check the user sees exactly its own habits."""
+    start = time.perf_counter()
+    context = await browser.new_context()
+    context.set_default_timeout(timeout)
+    page = await context.new_page()
+    try:
+        await sign_in(page, base_url, result["email"], result["password"])
+        await open_habits_async(page)
+
+        seen = set(await page.locator(HABIT_TITLES).all_inner_texts())
+        expected = set(result["habits"])
+        missing = sorted(expected - seen)
+        foreign = sorted(seen - expected)
+        if missing:
+            await fail_user(page, result, f"own habit(s) missing: {missing}")
+        if foreign:
+            await fail_user(page, result, f"sees other users' habit(s): {foreign[:5]}")
+    except Exception as e:
+        await fail_user(page, result, f"verify failed: {e}")
+    finally:
+        result["verify_ms"] = (time.perf_counter() - start) * 1000
+        await context.close()
+    return result
+
+async def run_users(base_url: str, indexes: List[int], run_id: str, concurrency: int, habits_per_user: int,
+                    timeout: float, barrier=None) -> List[dict]:
+    """Run the setup phase for all users in parallel browser contexts, then the verify phase."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            results = await asyncio.gather(*(
+                limited(setup_user(browser, base_url, run_id, index, habits_per_user, timeout))
+                for index in indexes
+            ))
+
+            # Verify only after every user (in every process) has created its habits
+            if barrier is not None:
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, barrier.wait, BARRIER_TIMEOUT_S)
+                except threading.BrokenBarrierError:
+                    print("⚠️  Another worker failed or timed out before the verify phase; verifying anyway")
+
+            await asyncio.gather(*(
+                limited(verify_user(browser, base_url, result, timeout))
+                for result in results if result["ok"]
+            ))
+            await browser.close()
+    except BaseException:
+        # Release the workers waiting at the barrier instead of leaving them blocked forever
+        if barrier is not None:
+            barrier.abort()
+        raise
+    return list(results)
+
+def run_worker(base_url: str, indexes: List[int], run_id: str, concurrency: int, habits_per_user: int,
+               timeout: float, barrier=None) -> List[dict]:
+    """Process pool entry point: one browser per process."""
+    return asyncio.run(run_users(base_url, indexes, run_id, concurrency, habits_per_user, timeout, barrier))
+
+def run_isolation_test(base_url: str, users: int, concurrency: int, processes: int, habits_per_user: int,
+                       timeout: float) -> int:
+    run_id = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
+    processes = max(1, min(processes, users))
+    chunks = [list(range(worker, users, processes)) for worker in range(processes)]
+
+    print("=" * 60)
+    print("PARALLEL HABIT ISOLATION TEST")
+    print(f"Base URL: {base_url}")
+    print(f"Run ID: {run_id}")
+    print(f"Users: {users} ({habits_per_user} habits each), {processes} process(es), "
+          f"{concurrency} contexts per process")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    if processes == 1:
+        results = run_worker(base_url, chunks[0], run_id, concurrency, habits_per_user, timeout)
+    else:
+        with multiprocessing.Manager() as manager:
+            barrier = manager.Barrier(processes)
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                futures = [
+                    pool.submit(run_worker, base_url, chunk, run_id, concurrency, habits_per_user, timeout, barrier)
+                    for chunk in chunks
+                ]
+                results = [result for future in futures for result in future.result()]
+    elapsed = time.perf_counter() - start
+
+    results.sort(key=lambda result: result["user"])
+    failed = [result for result in results if not result["ok"]]
+    for result in failed:
+        print(f"❌ {result['user']}: {'; '.join(result['errors'])}")
+
+    setup_times = sorted(result["setup_ms"] for result in results)
+    verify_times = sorted(result["verify_ms"] for result in results if result["verify_ms"])
+    print("\n" + "=" * 60)
+    print("ISOLATION SUMMARY")
+    print("=" * 60)
+    print(f"Users passed: {len(results) - len(failed)}/{len(results)}")
+    print(f"Wall-clock time: {elapsed:.1f} s")
+    if setup_times:
+        print(f"Per-user setup: median {setup_times[len(setup_times) // 2] / 1000:.1f} s, "
+              f"max {setup_times[-1] / 1000:.1f} s")
+    if verify_times:
+        print(f"Per-user verify: median {verify_times[len(verify_times) // 2] / 1000:.1f} s, "
+              f"max {verify_times[-1] / 1000:.1f} s")
+    print("=" * 60)
+
+    return 0 if not failed else 1
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Check that users only ever see their own habits")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"App URL (default: {BASE_URL})")
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=0,
+        help="Run the parallel mode with this many users (default: the sequential two-user flow)"
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="Browser contexts in flight per process (default: 8)")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes, each with its own browser (default: 1)")
+    parser.add_argument("--habits-per-user", type=int, default=2, help="Habits each user creates (default: 2)")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT_MS, help=f"Per-action timeout in ms (default: {TIMEOUT_MS})")
+    args = parser.parse_args(argv)
+
+    if args.users > 0:
+        sys.exit(run_isolation_test(
+            args.base_url, args.users, args.concurrency, args.processes, args.habits_per_user, args.timeout
+        ))
+    run_test(args.base_url)
+
 if __name__ == "__main__":
-    run_test()
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Asyncio HTTP/1.1 connection pool used by the generated API client (kai_client.py).
+
+Only the standard library is needed. Connections are kept alive and reused, at most
+``max_connections`` requests are in flight, and failed requests are retried with jittered
+exponential backoff when that is safe: idempotent methods, writes carrying an
+Idempotency-Key, and 429s (rejected before the route did anything). ``pipeline`` sends
+several requests back to back on one connection and reads the responses in order.
+"""
+
+import asyncio
+import json
+import random
+import ssl
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+from urllib.parse import urlencode, urlsplit
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+RETRY_STATUSES = {429, 502, 503, 504}
+
+# Defaults for AsyncHTTPPool
+MAX_CONNECTIONS = 10
+RETRIES = 3
+BACKOFF = 0.2
+MAX_BACKOFF = 5.0
+TIMEOUT = 30.0
+
+
+class Response(NamedTuple):
+    status: int
+    reason: str
+    headers: Dict[str, str]
+    body: bytes
+    elapsed_ms: float
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+
+class HTTPRequest(NamedTuple):
+    """A request to send with ``AsyncHTTPPool.send`` or ``AsyncHTTPPool.pipeline``. ``path`` includes the query."""
+    method: str
+    path: str
+    body: Any = None
+    headers: Optional[Dict[str, str]] = None
+
+
+class _Connection:
+    """One keep-alive socket."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.used = False
+
+    @classmethod
+    async def open(cls, host: str, port: int, tls: Optional[ssl.SSLContext]) -> "_Connection":
+        reader, writer = await asyncio.open_connection(host, port, ssl=tls)
+        return cls(reader, writer)
+
+    @property
+    def closed(self) -> bool:
+        return self.writer.is_closing() or self.reader.at_eof()
+
+    def close(self):
+        self.writer.close()
+
+    async def read_response(self, method: str, started: float) -> Response:
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed before the response")
+        _, status, *reason = status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        code = int(status)
+        if method == "HEAD" or code in (204, 304) or 100 <= code < 200:
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    # Trailers end with an empty line
+                    while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await self.reader.read()
+            headers["connection"] = "close"
+        return Response(code, reason[0] if reason else "", headers, body, (time.perf_counter() - started) * 1000)
+
+
+class AsyncHTTPPool:
+    """Keep-alive connection pool for one origin, with bounded concurrency and retries."""
+
+    def __init__(self, base_url: str, headers: Optional[Dict[str, str]] = None,
+                 max_connections: int = MAX_CONNECTIONS, retries: int = RETRIES,
+                 backoff: float = BACKOFF, max_backoff: float = MAX_BACKOFF, timeout: float = TIMEOUT):
+        url = urlsplit(base_url)
+        self.host = url.hostname or "localhost"
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.base_path = url.path.rstrip("/")
+        self.tls = ssl.create_default_context() if url.scheme == "https" else None
+        self.host_header = url.netloc
+        self.headers = dict(headers or {})
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self._idle: List[_Connection] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.stats = {"connections": 0, "requests": 0, "reused": 0, "retries": 0}
+
+    async def __aenter__(self) -> "AsyncHTTPPool":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
+
+    async def _acquire(self) -> _Connection:
+        if self._slots is None:
+            # Created lazily so the pool binds to the running event loop
+            self._slots = asyncio.Semaphore(self.max_connections)
+        await self._slots.acquire()
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.closed:
+                return conn
+            conn.close()
+        try:
+            conn = await _Connection.open(self.host, self.port, self.tls)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.stats["connections"] += 1
+        return conn
+
+    def _release(self, conn: _Connection, reusable: bool):
+        if reusable and not conn.closed:
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def _encode(self, method: str, path: str, body: Any, headers: Optional[Dict[str, str]]) -> bytes:
+        payload = b"" if body is None else json.dumps(body).encode()
+        merged = {"Host": self.host_header, "Accept-Encoding": "identity", **self.headers, **(headers or {})}
+        if body is not None:
+            merged.setdefault("Content-Type", "application/json")
+        if payload or method not in ("GET", "HEAD"):
+            merged["Content-Length"] = str(len(payload))
+        head = f"{method} {self.base_path}{path} HTTP/1.1\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in merged.items())
+        return (head + "\r\n").encode("latin-1") + payload
+
+    async def _send_once(self, method: str, path: str, body: Any, headers: Optional[Dict[str, str]]) -> Response:
+        conn = await self._acquire()
+        reusable = False
+        try:
+            self.stats["requests"] += 1
+            if conn.used:
+                self.stats["reused"] += 1
+            conn.used = True
+            started = time.perf_counter()
+            conn.writer.write(self._encode(method, path, body, headers))
+            await conn.writer.drain()
+            response = await conn.read_response(method, started)
+            reusable = response.keep_alive
+            return response
+        finally:
+            self._release(conn, reusable)
+
+    def _delay(self, attempt: int, response: Optional[Response] = None) -> float:
+        """Full-jitter exponential backoff, but never sooner than the server's Retry-After."""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        retry_after = response.headers.get("retry-after") if response else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return delay
+
+    async def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                      body: Any = None, headers: Optional[Dict[str, str]] = None) -> Response:
+        """Send one request, retrying connection errors, timeouts and 429/502/503/504 when safe."""
+        method = method.upper()
+        query = {k: ("true" if v is True else "false" if v is False else v)
+                 for k, v in (params or {}).items() if v is not None}
+        if query:
+            path = f"{path}?{urlencode(query)}"
+        safe = method in IDEMPOTENT_METHODS or any(k.lower() == "idempotency-key" for k in (headers or {}))
+        attempt = 0
+        while True:
+            try:
+                response = await asyncio.wait_for(self._send_once(method, path, body, headers), self.timeout)
+            except (OSError, EOFError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                if not safe or attempt >= self.retries:
+                    raise
+                delay = self._delay(attempt)
+            else:
+                if response.status not in RETRY_STATUSES or attempt >= self.retries:
+                    return response
+                if not safe and response.status != 429:
+                    return response
+                delay = self._delay(attempt, response)
+            attempt += 1
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    async def send(self, request: HTTPRequest) -> Response:
+        """``request`` for a prepared HTTPRequest."""
+        return await self.request(request.method, request.path, body=request.body, headers=request.headers)
+
+    async def pipeline(self, requests: Sequence[HTTPRequest]) -> List[Response]:
+        """Write several requests on one connection before reading any response (HTTP/1.1 pipelining).
+
+        Saves a round trip per request for independent calls, e.g. completing many tasks.
+        Responses come back in request order. A connection failure raises and the caller
+        decides what to resend; requests answered 429 are resent one by one with backoff,
+        since the server did nothing for them.
+        """
+        if not requests:
+            return []
+        conn = await self._acquire()
+        reusable = False
+        try:
+            started = time.perf_counter()
+            self.stats["requests"] += len(requests)
+            self.stats["reused"] += len(requests) - (0 if conn.used else 1)
+            conn.used = True
+            conn.writer.write(b"".join(self._encode(r.method.upper(), r.path, r.body, r.headers) for r in requests))
+            await conn.writer.drain()
+            responses = []
+            for r in requests:
+                responses.append(await asyncio.wait_for(conn.read_response(r.method.upper(), started), self.timeout))
+            reusable = all(response.keep_alive for response in responses)
+        finally:
+            self._release(conn, reusable)
+
+        for i, response in enumerate(responses):
+            if response.status == 429 and self.retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._delay(0, response))
+                responses[i] = await self.send(requests[i])
+        return responses
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Browser benchmark for the sidebar pages. Signs in once per account, then loads
+each page cold (a fresh browser context, so nothing is cached) and warm (back
+to it through the sidebar from another page, so the in-memory query cache
+serves it and revalidates in the background) and records:
+
+  - navigation timing of cold loads: TTFB, DOMContentLoaded and load
+  - data: ms from navigation start (or the sidebar click) until the page
+    heading is shown and no loading spinner is left, i.e. the page's queries
+    have rendered
+  - requests and bytes received, with the Appwrite listDocuments calls broken
+    down per collection (most pages query Appwrite directly) and the app's own
+    /api/* calls per endpoint (the dashboard reads /api/dashboard)
+  - JS heap used after a forced GC, from the Chrome DevTools Protocol
+
+Run it against accounts of different sizes (seeded with seed_data.py) and the
+scaling table shows which pages' listDocuments and /api calls grow with the account.
+Results can be written to JSON and compared between runs. Requires Playwright
+with Chromium installed (pip install playwright && playwright install chromium).
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
+from realtime_latency import sign_in
+from test_api import BASE_URL, REGRESSION_THRESHOLD, percentile
+
+REPEATS = 3
+TIMEOUT_MS = 30000
+# Shown while a page or a list on it is loading (PageLoader, the settings key list)
+SPINNER = ".animate-spin"
+
+# An Appwrite listDocuments call: GET .../databases/{db}/collections/{collection}/documents
+LIST_DOCUMENTS = re.compile(r"/databases/[^/]+/collections/([^/]+)/documents/?$")
+# The app's own routes, e.g. GET /api/dashboard
+APP_API = re.compile(r"^/api/")
+
+
+class Route(NamedTuple):
+    path: str
+    # Rendered once the page has left its PageLoader
+    ready: str
+
+
+ROUTES = [
+    Route("/", "h2:has-text(\"Today's Plan\")"),
+    Route("/goals", "h2:has-text('Goals')"),
+    Route("/tasks", "h2:has-text('Tasks')"),
+    Route("/habits", "h2:has-text('Habits')"),
+    Route("/inbox", "h2:has-text('Quick Capture')"),
+    Route("/resources", "h2:has-text('Resources')"),
+    Route("/settings", "h2:has-text('Settings')"),
+]
+
+NAVIGATION_SCRIPT = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    return {
+        ttfb_ms: nav.responseStart,
+        dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+        load_ms: nav.loadEventEnd,
+    };
+}
+"""
+
+# Only full page loads have navigation timing; client-side visits record None
+NAVIGATION_METRICS = ["ttfb_ms", "dom_content_loaded_ms", "load_ms"]
+# Numeric metrics of one visit, summarized as medians
+METRICS = NAVIGATION_METRICS + ["data_ms", "requests", "bytes", "list_documents", "list_documents_bytes",
+                                "api_calls", "api_bytes", "heap_mb"]
+
+
+class Account(NamedTuple):
+    label: str
+    email: str
+    password: str
+
+
+def parse_account(value: str) -> Account:
+    """Parse LABEL=EMAIL:PASSWORD."""
+    label, _, credentials = value.partition("=")
+    email, _, password = credentials.partition(":")
+    if not (label and email and password):
+        raise argparse.ArgumentTypeError(f"expected LABEL=EMAIL:PASSWORD, got {value!r}")
+    return Account(label, email, password)
+
+
+class NetworkRecorder:
+    """Collects the requests a page finishes between ``reset`` calls."""
+
+    def __init__(self, page, base_url: str):
+        self.origin = urlsplit(base_url)[:2]
+        self.finished = []
+        self.failed = 0
+        page.on("requestfinished", self.finished.append)
+        page.on("requestfailed", self._failed)
+
+    def _failed(self, request):
+        self.failed += 1
+
+    def reset(self):
+        self.finished.clear()
+        self.failed = 0
+
+    def summary(self) -> dict:
+        total_bytes = 0
+        collections: Dict[str, dict] = {}
+        endpoints: Dict[str, dict] = {}
+
+        def count(bucket: Dict[str, dict], name: str, size: int):
+            entry = bucket.setdefault(name, {"calls": 0, "bytes": 0})
+            entry["calls"] += 1
+            entry["bytes"] += size
+
+        for request in self.finished:
+            sizes = request.sizes()
+            size = sizes["responseHeadersSize"] + max(sizes["responseBodySize"], 0)
+            total_bytes += size
+            url = urlsplit(request.url)
+            match = LIST_DOCUMENTS.search(url.path)
+            if request.method == "GET" and match:
+                count(collections, match.group(1), size)
+            elif url[:2] == self.origin and APP_API.match(url.path):
+                count(endpoints, f"{request.method} {url.path}", size)
+        return {
+            "requests": len(self.finished),
+            "failed": self.failed,
+            "bytes": total_bytes,
+            "list_documents": sum(entry["calls"] for entry in collections.values()),
+            "list_documents_bytes": sum(entry["bytes"] for entry in collections.values()),
+            "api_calls": sum(entry["calls"] for entry in endpoints.values()),
+            "api_bytes": sum(entry["bytes"] for entry in endpoints.values()),
+            "collections": collections,
+            "endpoints": endpoints,
+        }
+
+
+def load(page, url: str) -> Optional[float]:
+    """Full page load; navigation timing applies, so there is no click time to return."""
+    page.goto(url)
+    return None
+
+
+def click_through(page, path: str) -> float:
+    """Client-side navigation through the sidebar link; returns the page clock at the click."""
+    clicked_at = page.evaluate("performance.now()")
+    page.click(f"aside nav a[href='{path}']")
+    return clicked_at
+
+
+def wait_for_data(page, route: Route) -> float:
+    """Wait until the route's data has rendered; returns the page clock at that frame."""
+    page.wait_for_selector(route.ready)
+    # Polls every animation frame, so the stamp is within a frame of the render
+    data_at = page.wait_for_function(
+        f"() => !document.querySelector('{SPINNER}') && performance.now()"
+    ).json_value()
+    page.wait_for_load_state("networkidle")
+    return data_at
+
+
+def visit(page, cdp, recorder: NetworkRecorder, route: Route, navigate) -> dict:
+    """Run ``navigate`` and measure the page until its data has rendered and the network is idle.
+
+    ``navigate`` returns the page clock at a client-side navigation's click, which data_ms then
+    counts from, or None for a full page load.
+    """
+    recorder.reset()
+    clicked_at = navigate()
+    data_at = wait_for_data(page, route)
+
+    cdp.send("HeapProfiler.collectGarbage")
+    metrics = {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+    timing = page.evaluate(NAVIGATION_SCRIPT) if clicked_at is None else dict.fromkeys(NAVIGATION_METRICS)
+    return {
+        **timing,
+        "data_ms": data_at - (clicked_at or 0.0),
+        **recorder.summary(),
+        "heap_mb": metrics.get("JSHeapUsedSize", 0) / (1024 * 1024),
+    }
+
+
+def median(values: List[Optional[float]]) -> Optional[float]:
+    present = [value for value in values if value is not None]
+    return percentile(present, 50) if present else None
+
+
+def summarize_visits(visits: List[dict]) -> dict:
+    """Medians of each metric, plus the per-collection and per-endpoint calls of the median-sized visit."""
+    summary = {metric: median([v[metric] for v in visits]) for metric in METRICS}
+    by_bytes = sorted(visits, key=lambda v: v["list_documents_bytes"] + v["api_bytes"])
+    middle = by_bytes[(len(by_bytes) - 1) // 2]
+    summary["collections"] = middle["collections"]
+    summary["endpoints"] = middle["endpoints"]
+    summary["failed"] = sum(v["failed"] for v in visits)
+    summary["samples"] = len(visits)
+    return summary
+
+
+def bench_account(browser, args, account: Account) -> dict:
+    base_url = args.base_url.rstrip("/")
+    context = browser.new_context()
+    page = context.new_page()
+    page.set_default_timeout(args.timeout)
+    sign_in(page, base_url, account.email, account.password)
+    # Every cold visit starts from this session instead of signing in again
+    state = context.storage_state()
+    context.close()
+
+    routes = {}
+    for route in ROUTES:
+        visits: Dict[str, List[dict]] = {"cold": [], "warm": []}
+        for _ in range(args.repeats):
+            context = browser.new_context(storage_state=state)
+            page = context.new_page()
+            page.set_default_timeout(args.timeout)
+            cdp = context.new_cdp_session(page)
+            cdp.send("Performance.enable")
+            recorder = NetworkRecorder(page, base_url)
+            # Leave through the sidebar and come back, so the warm visit is served from the
+            # query cache the cold visit filled rather than from a fresh page load
+            elsewhere = ROUTES[1] if route is ROUTES[0] else ROUTES[0]
+            try:
+                visits["cold"].append(visit(page, cdp, recorder, route, lambda: load(page, f"{base_url}{route.path}")))
+                click_through(page, elsewhere.path)
+                wait_for_data(page, elsewhere)
+                visits["warm"].append(visit(page, cdp, recorder, route, lambda: click_through(page, route.path)))
+            except PlaywrightTimeoutError:
+                print(f"❌ {account.label} {route.path}: no data after {args.timeout} ms")
+            finally:
+                context.close()
+        routes[route.path] = {mode: summarize_visits(v) for mode, v in visits.items() if v}
+        cold = routes[route.path].get("cold")
+        if cold:
+            print(f"  {account.label:<10} {route.path:<12} cold data {cold['data_ms']:>7.0f} ms, "
+                  f"{cold['list_documents']:.0f} listDocuments, {cold['api_calls']:.0f} /api calls")
+    return {"email": account.email, "routes": routes}
+
+
+def ms(value: Optional[float], width: int) -> str:
+    return f"{value:>{width}.0f}" if value is not None else f"{'-':>{width}}"
+
+
+def print_report(results: dict):
+    accounts = list(results["accounts"])
+    for mode in ("cold", "warm"):
+        print("\n" + "=" * 60)
+        print(f"{mode.upper()} LOADS (medians of {results['run']['repeats']})")
+        print("=" * 60)
+        print(f"{'Account':<10} {'Route':<11} {'TTFB':>6} {'DCL':>6} {'Data':>7} "
+              f"{'Reqs':>5} {'KB':>7} {'Lists':>5} {'List KB':>8} {'API':>4} {'API KB':>7} {'Heap MB':>8}")
+        for label in accounts:
+            for path, modes in results["accounts"][label]["routes"].items():
+                m = modes.get(mode)
+                if not m:
+                    continue
+                print(
+                    f"{label:<10} {path:<11} {ms(m['ttfb_ms'], 6)} {ms(m['dom_content_loaded_ms'], 6)} "
+                    f"{m['data_ms']:>7.0f} {m['requests']:>5.0f} {m['bytes'] / 1024:>7.1f} "
+                    f"{m['list_documents']:>5.0f} {m['list_documents_bytes'] / 1024:>8.1f} "
+                    f"{m['api_calls']:>4.0f} {m['api_bytes'] / 1024:>7.1f} {m['heap_mb']:>8.1f}"
+                )
+    print("=" * 60)
+    print("Times are ms from navigation start; warm visits are sidebar clicks, timed from the click.")
+    print("Data is when the heading is shown and no spinner is left. API is the app's own /api calls.")
+
+    if len(accounts) < 2:
+        return
+    first, last = accounts[0], accounts[-1]
+    print("\n" + "=" * 60)
+    print(f"SCALING, COLD: {first} -> {last}")
+    print("=" * 60)
+    print(f"{'Route':<11} {'Data ms':>17} {'List KB':>19} {'API KB':>19}  Growing collections and endpoints")
+    for route in ROUTES:
+        before = results["accounts"][first]["routes"].get(route.path, {}).get("cold")
+        after = results["accounts"][last]["routes"].get(route.path, {}).get("cold")
+        if not before or not after:
+            continue
+        growing = [
+            f"{name} x{entry['bytes'] / before[bucket][name]['bytes']:.1f}"
+            for bucket in ("collections", "endpoints")
+            for name, entry in sorted(after.get(bucket, {}).items())
+            if name in before.get(bucket, {}) and before[bucket][name]["bytes"]
+            and entry["bytes"] > 2 * before[bucket][name]["bytes"]
+        ]
+        print(
+            f"{route.path:<11} {before['data_ms']:>7.0f} -> {after['data_ms']:>6.0f} "
+            f"{before['list_documents_bytes'] / 1024:>8.1f} -> {after['list_documents_bytes'] / 1024:>7.1f} "
+            f"{before.get('api_bytes', 0) / 1024:>8.1f} -> {after.get('api_bytes', 0) / 1024:>7.1f}  "
+            f"{', '.join(growing) or '-'}"
+        )
+    print("=" * 60)
+    print("Collections and /api endpoints whose responses more than doubled are listed; those pages")
+    print("load whole collections rather than a page of them.\n")
+
+
+def compare_runs(baseline_path: str, current_path: str, threshold: float = REGRESSION_THRESHOLD) -> int:
+    """Flag pages whose median data time regressed past the threshold or that list more documents."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["accounts"]
+    with open(current_path) as f:
+        current = json.load(f)["accounts"]
+
+    print("\n" + "=" * 60)
+    print("PAGE LOAD COMPARISON")
+    print(f"Baseline: {baseline_path}")
+    print(f"Current:  {current_path}")
+    print(f"Metric: data ms, regression threshold: +{threshold:.0f}%")
+    print("=" * 60)
+    print(f"{'Page':<28} {'Base ms':>9} {'Curr ms':>9} {'Change':>8} {'Lists':>7}")
+
+    regressions = []
+    for label in sorted(set(baseline) & set(current)):
+        for path in baseline[label]["routes"]:
+            for mode in ("cold", "warm"):
+                before = baseline[label]["routes"][path].get(mode)
+                after = current[label]["routes"].get(path, {}).get(mode)
+                name = f"{label} {path} {mode}"
+                if not before or not after:
+                    print(f"{name:<28} {'(missing from current run)':>28}")
+                    continue
+                change = ((after["data_ms"] - before["data_ms"]) / before["data_ms"] * 100
+                          if before["data_ms"] > 0 else 0.0)
+                lists = after["list_documents"] - before["list_documents"]
+                # Baselines written before /api calls were counted only compare Appwrite lists
+                if "api_calls" in before:
+                    lists += after["api_calls"] - before["api_calls"]
+                flag = ""
+                if change > threshold or lists > 0:
+                    flag = "  ⚠️ REGRESSED"
+                    regressions.append(name)
+                print(f"{name:<28} {before['data_ms']:>9.0f} {after['data_ms']:>9.0f} {change:>+7.1f}% {lists:>+7.0f}{flag}")
+
+    print()
+    if regressions:
+        print(f"{len(regressions)} page load(s) regressed:")
+        for name in regressions:
+            print(f"  - {name}")
+    else:
+        print("No regressions ✅")
+    print("=" * 60)
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark cold and warm loads of the sidebar pages")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Base URL of the app (default: {BASE_URL})")
+    parser.add_argument("--account", type=parse_account, action="append", default=[], metavar="LABEL=EMAIL:PASSWORD",
+                        help="Account to sign in as; repeat for each size, smallest first")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help=f"Loads per page and mode (default: {REPEATS})")
+    parser.add_argument("--timeout", type=int, default=TIMEOUT_MS, help=f"Per-step timeout in ms (default: {TIMEOUT_MS})")
+    parser.add_argument("--json", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), default=None,
+                        help="Compare two JSON results files and flag pages that regressed")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help=f"Regression threshold in percent for --compare (default: {REGRESSION_THRESHOLD:.0f})")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        sys.exit(compare_runs(args.compare[0], args.compare[1], args.threshold))
+    if not args.account:
+        parser.error("at least one --account is required")
+
+    print("\n" + "=" * 60)
+    print("KAI FRONTEND BENCHMARK")
+    print(f"Base URL: {args.base_url}")
+    print(f"Accounts: {', '.join(a.label for a in args.account)}")
+    print("=" * 60)
+
+    results = {
+        "run": {
+            "base_url": args.base_url,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "repeats": args.repeats,
+        },
+        "accounts": {},
+    }
+    started = time.perf_counter()
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=not args.headed)
+        for account in args.account:
+            try:
+                results["accounts"][account.label] = bench_account(browser, args, account)
+            except PlaywrightTimeoutError:
+                print(f"❌ Could not sign in as {account.email}")
+        browser.close()
+    results["run"]["duration_s"] = round(time.perf_counter() - started, 1)
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+    if len(results["accounts"]) < len(args.account):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
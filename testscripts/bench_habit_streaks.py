@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the habit logging route (PATCH /api/gpt/habits/{habitId}).
+Seeds habits with long completion histories and times logging a new date,
+both for the common append case and for backfilling a missing past date.
+Histories are stored as completion runs, or as plain dates with --legacy.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from test_api import BASE_URL, create_session, percentile, timed_request
+
+APPWRITE_ENDPOINT = "http://127.0.0.1:8090/v1"
+APPWRITE_PROJECT = "mock"
+DATABASE_ID = "mock"
+USER_ID = "mock_user"
+HISTORY_SIZES = [100, 1000, 10000, 20000]
+REPEATS = 5
+
+
+def build_history(size: int) -> Tuple[List[str], str, int, int]:
+    """
+    Build `size` completed dates ending yesterday with one missing day in the middle.
+    Returns (sorted dates, missing date, current streak, longest streak).
+    """
+    yesterday = date.today() - timedelta(days=1)
+    days = [yesterday - timedelta(days=offset) for offset in range(size, -1, -1)]
+    hole = len(days) // 2
+    missing = days.pop(hole)
+    older, recent = hole, len(days) - hole
+    return [d.isoformat() for d in days], missing.isoformat(), recent, max(older, recent)
+
+
+def encode_runs(dates: List[str]) -> List[str]:
+    """Run-length encode sorted dates as "YYYY-MM-DD/N" entries, like encodeRuns in habit-utils.ts."""
+    runs = []
+    start, length, previous = None, 0, None
+    for day in (date.fromisoformat(d) for d in dates):
+        if length and day == previous + timedelta(days=1):
+            length += 1
+        else:
+            if length:
+                runs.append(f"{start.isoformat()}/{length}")
+            start, length = day, 1
+        previous = day
+    if length:
+        runs.append(f"{start.isoformat()}/{length}")
+    return runs
+
+
+class HabitSeeder:
+    """Creates habit documents directly through the Appwrite REST API."""
+
+    def __init__(self, endpoint: str, project: str, database_id: str, api_key: Optional[str] = None):
+        self.url = f"{endpoint.rstrip('/')}/databases/{database_id}/collections/habits/documents"
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "X-Appwrite-Project": project,
+        })
+        if api_key:
+            self.session.headers["X-Appwrite-Key"] = api_key
+
+    def create_habit(self, user_id: str, title: str, dates: List[str], streak: int, longest: int,
+                     legacy: bool = False) -> str:
+        history = {"completedDates": dates} if legacy else {"completedRuns": encode_runs(dates)}
+        response = self.session.post(self.url, json={
+            "documentId": "unique()",
+            "data": {
+                "title": title,
+                "userId": user_id,
+                "streak": streak,
+                "longestStreak": longest,
+                **history,
+            },
+        })
+        response.raise_for_status()
+        return response.json()["$id"]
+
+    def delete_habit(self, habit_id: str):
+        self.session.delete(f"{self.url}/{habit_id}")
+
+
+def run_benchmark(args) -> Dict[int, Dict[str, List[float]]]:
+    seeder = HabitSeeder(args.appwrite_endpoint, args.project, args.database_id, args.appwrite_key)
+    session = create_session(pool_size=1)
+    headers = {"Content-Type": "application/json", "X-API-Key": args.api_key}
+    today = date.today().isoformat()
+    results = {}
+
+    for size in args.sizes:
+        dates, missing, streak, longest = build_history(size)
+        samples = {"append": [], "backfill": []}
+
+        for i in range(args.repeats):
+            habit_id = seeder.create_habit(
+                args.user_id, f"Bench habit {size}/{i}", dates, streak, longest, legacy=args.legacy
+            )
+            url = f"{args.base_url}/api/gpt/habits/{habit_id}"
+
+            for case, logged in (("append", today), ("backfill", missing)):
+                response, timing = timed_request(
+                    session, "PATCH", url, f"PATCH habit ({case})", headers, {"date": logged}
+                )
+                if response is None or response.status_code != 200:
+                    print(f"❌ {case} failed for {size} dates: {timing['error'] or timing['status']}")
+                    continue
+                samples[case].append(timing["total_ms"])
+
+                doc = response.json()
+                expected = streak + 1 if case == "append" else size + 2
+                if doc.get("streak") != expected:
+                    print(f"⚠️  {case} streak mismatch for {size} dates: {doc.get('streak')} != {expected}")
+
+            if not args.keep:
+                seeder.delete_habit(habit_id)
+
+        results[size] = samples
+        print(f"  seeded and logged {args.repeats} habit(s) with {size} dates")
+
+    return results
+
+
+def print_report(results: Dict[int, Dict[str, List[float]]]):
+    print("\n" + "=" * 60)
+    print("HABIT LOGGING LATENCY BY HISTORY SIZE (ms)")
+    print("=" * 60)
+    print(f"{'Dates':>8}  {'Append p50':>11}  {'Append max':>11}  {'Backfill p50':>13}  {'Backfill max':>13}")
+    for size, samples in results.items():
+        append, backfill = samples["append"], samples["backfill"]
+        print(
+            f"{size:>8}  "
+            f"{percentile(append, 50):>11.1f}  {max(append, default=0.0):>11.1f}  "
+            f"{percentile(backfill, 50):>13.1f}  {max(backfill, default=0.0):>13.1f}"
+        )
+    print("=" * 60)
+    print("Append extends the latest run; backfill merges the two runs around the gap.\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark habit logging against long completion histories")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Base URL for the API (default: {BASE_URL})")
+    parser.add_argument("--api-key", required=True, help="API key for the GPT routes")
+    parser.add_argument("--user-id", default=USER_ID, help=f"Owner of the seeded habits (default: {USER_ID})")
+    parser.add_argument(
+        "--appwrite-endpoint",
+        default=APPWRITE_ENDPOINT,
+        help=f"Appwrite endpoint used to seed habits (default: {APPWRITE_ENDPOINT}, the mock)"
+    )
+    parser.add_argument("--project", default=APPWRITE_PROJECT, help="Appwrite project ID")
+    parser.add_argument("--database-id", default=DATABASE_ID, help="Appwrite database ID")
+    parser.add_argument("--appwrite-key", default=None, help="Appwrite server key (not needed for the mock)")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=HISTORY_SIZES,
+        help=f"History sizes to seed (default: {' '.join(map(str, HISTORY_SIZES))})"
+    )
+    parser.add_argument("--repeats", type=int, default=REPEATS, help=f"Habits per size (default: {REPEATS})")
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Seed the legacy completedDates array, so the first log also migrates the habit to runs"
+    )
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded habits instead of deleting them")
+    parser.add_argument("--json", dest="json_file", default=None, help="Also write raw samples to this JSON file")
+
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("KAI HABIT STREAK BENCHMARK")
+    print(f"Base URL: {args.base_url}")
+    print(f"Seeding through: {args.appwrite_endpoint}")
+    print("=" * 60)
+
+    try:
+        results = run_benchmark(args)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Seeding failed: {e}")
+        sys.exit(1)
+
+    print_report(results)
+
+    if args.json_file:
+        with open(args.json_file, "w") as f:
+            json.dump({
+                str(size): {case: {"samples": values, "median": statistics.median(values) if values else None}
+                            for case, values in samples.items()}
+                for size, samples in results.items()
+            }, f, indent=2)
+        print(f"📝 Samples written to {args.json_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+Generate kai_client.py, a typed async Python client, from the API's OpenAPI spec.
+
+The spec is read from src/app/api/openapi/route.ts by default, so no server has to be
+running; a URL (e.g. http://localhost:3000/api/openapi) or a saved JSON file works too.
+Each operation becomes two methods: ``<name>_request(...)`` builds the HTTP request and
+``<name>(...)`` sends it and returns the decoded JSON. Paged list operations also get an
+``iter_<name>`` async generator that follows ``nextCursor``. Run with ``--check`` in CI to
+fail when the committed client no longer matches the spec.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import urllib.request
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(SCRIPT_DIR, "..", "src")
+SPEC_ROUTE = os.path.join(SRC_DIR, "app", "api", "openapi", "route.ts")
+OUTPUT = os.path.join(SCRIPT_DIR, "kai_client.py")
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+SCALAR_TYPES = {"string": "str", "integer": "int", "number": "float", "boolean": "bool"}
+
+# Tokens of the JavaScript object literal holding the spec in route.ts
+JS_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:\\.|[^'\\])*'|"(?:\\.|[^"\\])*")
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}\[\]:,])
+""", re.S | re.X)
+JS_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+JS_NUMBER_CONST = r"\b(?:export\s+)?const\s+{name}\s*=\s*(-?\d+(?:\.\d+)?)\s*;"
+JS_IMPORT = re.compile(r"import\s*\{([^}]*)\}\s*from\s*'@/([^']+)'")
+JS_KEYWORDS = {"true", "false", "null"}
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def js_literal_to_json(source: str, variable: str = "openApiSpec",
+                       constants: Optional[Dict[str, Any]] = None) -> Any:
+    """Parse the object literal assigned to ``variable`` in a TypeScript file.
+
+    Handles what the spec literal uses: single- or double-quoted strings, bare keys,
+    numbers, true/false/null, comments, trailing commas and the names in ``constants``.
+    """
+    constants = constants or {}
+    match = re.search(rf"\b{variable}\s*=\s*", source)
+    if not match:
+        raise ValueError(f"No `{variable} = ...` in the source")
+    tokens: List[Tuple[str, str]] = []
+    depth = 0
+    pos = match.end()
+    while pos < len(source):
+        token = JS_TOKEN.match(source, pos)
+        if not token:
+            raise ValueError(f"Unexpected {source[pos:pos + 20]!r} at offset {pos}")
+        pos = token.end()
+        kind = token.lastgroup
+        if kind in ("space", "comment"):
+            continue
+        text = token.group()
+        tokens.append((kind, text))
+        if text in "{[":
+            depth += 1
+        elif text in "}]":
+            depth -= 1
+            if depth == 0:
+                break
+
+    out = []
+    for i, (kind, text) in enumerate(tokens):
+        following = tokens[i + 1][1] if i + 1 < len(tokens) else ""
+        if kind == "string":
+            value = re.sub(r"\\(.)", lambda m: JS_ESCAPES.get(m.group(1), m.group(1)), text[1:-1])
+            out.append(json.dumps(value))
+        elif kind == "name" and following == ":":
+            out.append(json.dumps(text))
+        elif kind == "name" and text not in JS_KEYWORDS:
+            if text not in constants:
+                raise ValueError(f"Unknown constant {text!r} in `{variable}`")
+            out.append(json.dumps(constants[text]))
+        elif text == "," and following in ("}", "]"):
+            continue
+        else:
+            out.append(text)
+    return json.loads("".join(out))
+
+
+def numeric_constants(source: str) -> Dict[str, Any]:
+    """Numbers the spec literal refers to by name, imported from '@/...' modules."""
+    constants = {}
+    for names, module in JS_IMPORT.findall(source):
+        with open(os.path.join(SRC_DIR, module + ".ts")) as f:
+            module_source = f.read()
+        for name in (n.strip() for n in names.split(",")):
+            match = re.search(JS_NUMBER_CONST.format(name=re.escape(name)), module_source)
+            if match:
+                constants[name] = json.loads(match.group(1))
+    return constants
+
+
+def load_spec(source: str) -> Any:
+    """Load the spec from a URL, a JSON file or the TypeScript route that serves it."""
+    if source.startswith(("http://", "https://")):
+        with urllib.request.urlopen(source) as response:
+            return json.load(response)
+    with open(source) as f:
+        text = f.read()
+    if source.endswith((".ts", ".js")):
+        return js_literal_to_json(text, constants=numeric_constants(text))
+    return json.loads(text)
+
+
+def snake_case(name: str) -> str:
+    return re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", name).lower()
+
+
+def pascal_case(name: str) -> str:
+    return name[:1].upper() + name[1:]
+
+
+def singular(name: str) -> str:
+    if name.endswith("ies"):
+        return name[:-3] + "y"
+    return name[:-1] if name.endswith("s") else name
+
+
+class Field(NamedTuple):
+    name: str           # name on the wire, e.g. dueDate
+    arg: str            # Python argument name, e.g. due_date
+    annotation: str
+    required: bool
+    description: str
+
+
+class Operation(NamedTuple):
+    operation_id: str
+    method: str
+    path: str
+    summary: str
+    description: str
+    path_params: List[Field]
+    query_params: List[Field]
+    body_fields: List[Field]
+    idempotent: bool    # declares the Idempotency-Key header
+
+    @property
+    def name(self) -> str:
+        return snake_case(self.operation_id)
+
+    @property
+    def paged(self) -> bool:
+        return any(p.name == "cursor" for p in self.query_params)
+
+
+class ClientModel:
+    """Operations and the TypedDicts their request bodies need, in definition order."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.typed_dicts: List[Tuple[str, List[Field]]] = []
+        self.operations: List[Operation] = []
+        for path, item in spec.get("paths", {}).items():
+            for method in HTTP_METHODS:
+                if method in item:
+                    self.operations.append(self._operation(path, method, item[method]))
+
+    def _annotation(self, schema: Dict[str, Any], type_name: str) -> str:
+        kind = schema.get("type")
+        if kind in SCALAR_TYPES:
+            return SCALAR_TYPES[kind]
+        if kind == "array":
+            return f"List[{self._annotation(schema.get('items', {}), type_name)}]"
+        if kind == "object" and schema.get("properties"):
+            fields = self._fields(schema, type_name)
+            self.typed_dicts.append((type_name, fields))
+            return type_name
+        return "Any" if kind is None else "Dict[str, Any]"
+
+    def _fields(self, schema: Dict[str, Any], type_name: str) -> List[Field]:
+        required = set(schema.get("required", []))
+        fields = []
+        for name, prop in schema.get("properties", {}).items():
+            annotation = self._annotation(prop, type_name + pascal_case(singular(name)))
+            fields.append(Field(name, snake_case(name), annotation, name in required, prop.get("description", "")))
+        return fields
+
+    def _operation(self, path: str, method: str, op: Dict[str, Any]) -> Operation:
+        operation_id = op["operationId"]
+        path_params, query_params = [], []
+        idempotent = False
+        for param in op.get("parameters", []):
+            if param.get("in") == "header":
+                idempotent = idempotent or param["name"] == IDEMPOTENCY_HEADER
+                continue
+            field = Field(param["name"], snake_case(param["name"]),
+                          self._annotation(param.get("schema", {}), "Any"),
+                          param.get("in") == "path" or param.get("required", False),
+                          param.get("description", ""))
+            (path_params if param.get("in") == "path" else query_params).append(field)
+        body_schema = (op.get("requestBody", {}).get("content", {})
+                       .get("application/json", {}).get("schema", {}))
+        body_fields = self._fields(body_schema, pascal_case(operation_id)) if body_schema else []
+        return Operation(operation_id, method.upper(), path, op.get("summary", ""),
+                         op.get("description", ""), path_params, query_params, body_fields, idempotent)
+
+
+def render_typed_dict(name: str, fields: List[Field]) -> List[str]:
+    required = [f for f in fields if f.required]
+    optional = [f for f in fields if not f.required]
+
+    def body(group: List[Field]) -> List[str]:
+        return [
+            f"    {f.name}: {f.annotation}" + (f"  # {f.description}" if f.description else "")
+            for f in group
+        ] or ["    pass"]
+
+    if required and optional:
+        return ([f"class _{name}Required(TypedDict):"] + body(required) + ["", ""]
+                + [f"class {name}(_{name}Required, total=False):"] + body(optional))
+    if optional:
+        return [f"class {name}(TypedDict, total=False):"] + body(optional)
+    return [f"class {name}(TypedDict):"] + body(required)
+
+
+def render_signature(op: Operation, with_cursor: bool = True) -> Tuple[str, List[Field]]:
+    """Arguments: path params and required body fields positionally, the rest keyword-only."""
+    positional = op.path_params + [f for f in op.body_fields if f.required]
+    keyword = [f for f in op.body_fields if not f.required]
+    keyword += [f for f in op.query_params if with_cursor or f.name != "cursor"]
+    args = ["self"] + [f"{f.arg}: {f.annotation}" for f in positional]
+    if keyword or op.idempotent:
+        args.append("*")
+    args += [f"{f.arg}: Optional[{f.annotation}] = None" for f in keyword]
+    if op.idempotent:
+        args.append("idempotency_key: Optional[str] = None")
+    return ", ".join(args), positional + keyword
+
+
+def call_args(fields: List[Field], op: Operation) -> str:
+    positional = op.path_params + [f for f in op.body_fields if f.required]
+    args = [f.arg for f in fields if f in positional]
+    args += [f"{f.arg}={f.arg}" for f in fields if f not in positional]
+    if op.idempotent:
+        args.append("idempotency_key=idempotency_key")
+    return ", ".join(args)
+
+
+def wrap_docstring(text: str, indent: str, width: int = 96) -> List[str]:
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(indent) + len(line) + 1 + len(word) > width:
+            lines.append(indent + line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(indent + line)
+    return lines
+
+
+def render_operation(op: Operation) -> List[str]:
+    signature, fields = render_signature(op)
+    path = re.sub(r"\{(\w+)\}", lambda m: "{_segment(" + snake_case(m.group(1)) + ")}", op.path)
+    path_expr = f'f"{path}"' if op.path_params else f'"{path}"'
+    lines = [f"    def {op.name}_request({signature}) -> HTTPRequest:"]
+    lines.append(f'        """Build the {op.operation_id} request, e.g. for ``pipeline``."""')
+    if op.query_params:
+        query = ", ".join(f'"{f.name}": {f.arg}' for f in op.query_params)
+        lines.append(f"        path = _with_query({path_expr}, {{{query}}})")
+        path_expr = "path"
+    if op.body_fields:
+        body = ", ".join(f'"{f.name}": {f.arg}' for f in op.body_fields)
+        lines.append(f"        body = _compact({{{body}}})")
+    body_expr = "body" if op.body_fields else "None"
+    headers_expr = "self._write_headers(idempotency_key)" if op.idempotent else "None"
+    lines.append(f'        return HTTPRequest("{op.method}", {path_expr}, {body_expr}, {headers_expr})')
+    lines.append("")
+
+    returns = "Page" if op.paged else "Dict[str, Any]"
+    lines.append(f"    async def {op.name}({signature}) -> {returns}:")
+    doc = f"{op.summary} ({op.method} {op.path})."
+    if op.description:
+        doc += f" {op.description}"
+    doc_lines = wrap_docstring(doc, "        ")
+    doc_lines[0] = '        """' + doc_lines[0].lstrip()
+    doc_lines[-1] += '"""'
+    lines += doc_lines
+    lines.append(f"        return await self._call(self.{op.name}_request({call_args(fields, op)}))")
+    lines.append("")
+
+    if op.paged:
+        iter_signature, iter_fields = render_signature(op, with_cursor=False)
+        iter_name = "iter_" + re.sub(r"^list_", "", op.name)
+        passed = call_args(iter_fields, op)
+        lines += [
+            f"    async def {iter_name}({iter_signature}) -> AsyncIterator[Dict[str, Any]]:",
+            f'        """Every item of ``{op.name}``, following nextCursor page by page."""',
+            "        cursor = None",
+            "        while True:",
+            f"            page = await self.{op.name}({passed + ', ' if passed else ''}cursor=cursor)",
+            '            for item in page["data"]:',
+            "                yield item",
+            '            cursor = page["nextCursor"]',
+            '            if not page["hasMore"] or not cursor:',
+            "                return",
+            "",
+        ]
+    return lines
+
+
+HEADER = '''#!/usr/bin/env python3
+"""
+Typed async client for the {title} (spec version {version}).
+
+Generated by generate_client.py from {source}.
+Do not edit by hand: change the spec and run `python generate_client.py` again.
+
+    async with KaiClient(api_key) as client:
+        goal = await client.create_goal("Learn Rust")
+        async for task in client.iter_tasks(goal_id=document_id(goal)):
+            ...
+
+Requests share one keep-alive connection pool (see async_http.py). Writes carry a fresh
+Idempotency-Key unless one is passed, so the pool can retry them without duplicates.
+Running the module times concurrent goal -> phase -> task chains against a server.
+"""
+
+import argparse
+import asyncio
+import secrets
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, TypedDict, Union
+from urllib.parse import quote, urlencode
+
+from async_http import AsyncHTTPPool, HTTPRequest, Response
+
+BASE_URL = "http://localhost:3000"
+
+
+class APIError(Exception):
+    """A response outside 2xx."""
+
+    def __init__(self, request: HTTPRequest, response: Response):
+        self.request = request
+        self.response = response
+        self.status = response.status
+        try:
+            detail = (response.json() or {{}}).get("error")
+        except (ValueError, AttributeError):
+            detail = None
+        super().__init__(f"{{request.method}} {{request.path}} failed with status {{response.status}}: "
+                         f"{{detail or response.reason}}")
+
+
+class Page(TypedDict):
+    data: List[Dict[str, Any]]
+    nextCursor: Optional[str]
+    hasMore: bool
+
+'''
+
+HELPERS = '''
+
+def document_id(document: Dict[str, Any]) -> str:
+    """The ID of a document returned by the API."""
+    return document["$id"]
+
+
+def _segment(value: str) -> str:
+    return quote(value, safe="")
+
+
+def _compact(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop unset optional fields so the route sees them as missing."""
+    return {key: value for key, value in body.items() if value is not None}
+
+
+def _with_query(path: str, params: Dict[str, Any]) -> str:
+    query = {key: str(value).lower() if isinstance(value, bool) else value
+             for key, value in params.items() if value is not None}
+    return f"{path}?{urlencode(query)}" if query else path
+
+
+def _decode(request: HTTPRequest, response: Response) -> Any:
+    if not 200 <= response.status < 300:
+        raise APIError(request, response)
+    return response.json()
+
+
+class KaiClient:
+    """Async client for the GPT API. Use it as ``async with KaiClient(api_key) as client``."""
+
+    def __init__(self, api_key: str, base_url: str = BASE_URL, max_connections: int = 10,
+                 retries: int = 3, timeout: float = 30.0, idempotent_writes: bool = True):
+        self.http = AsyncHTTPPool(base_url, {"X-API-Key": api_key}, max_connections=max_connections,
+                                  retries=retries, timeout=timeout)
+        self.idempotent_writes = idempotent_writes
+
+    async def __aenter__(self) -> "KaiClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.http.close()
+
+    def _write_headers(self, idempotency_key: Optional[str]) -> Optional[Dict[str, str]]:
+        key = idempotency_key or (secrets.token_hex(16) if self.idempotent_writes else None)
+        return {"Idempotency-Key": key} if key else None
+
+    async def _call(self, request: HTTPRequest) -> Any:
+        return _decode(request, await self.http.send(request))
+
+    async def pipeline(self, requests: Sequence[HTTPRequest]) -> List[Any]:
+        """Send independent requests back to back on one connection; results come back in order."""
+        responses = await self.http.pipeline(requests)
+        return [_decode(request, response) for request, response in zip(requests, responses)]
+'''
+
+CHAINS = '''
+    # Goal -> phase -> task chains
+
+    async def run_chain(self, title: str, tasks: int = 1, complete: bool = True) -> Dict[str, Any]:
+        """Create a goal with one phase and ``tasks`` tasks, then complete the tasks.
+
+        Each step only waits for the ID it needs: the tasks are created concurrently once
+        the phase exists, and their completions are pipelined on one connection.
+        """
+        goal = await self.create_goal(f"{title} - Goal")
+        phase = await self.create_phase(document_id(goal), f"{title} - Phase", 1)
+        created = await asyncio.gather(*(
+            self.create_task(document_id(phase), f"{title} - Task {i + 1}") for i in range(tasks)
+        ))
+        task_ids = [document_id(task) for task in created]
+        if complete and task_ids:
+            await self.pipeline([self.update_task_request(task_id, True) for task_id in task_ids])
+        return {"goalId": document_id(goal), "phaseId": document_id(phase), "taskIds": task_ids}
+
+    async def run_chains(self, count: int, tasks: int = 1, complete: bool = True,
+                         concurrency: Optional[int] = None,
+                         title: str = "Client chain") -> List[Union[Dict[str, Any], Exception]]:
+        """Run ``count`` chains with at most ``concurrency`` (default: the pool size) at once.
+
+        Failed chains are returned as their exception instead of stopping the others.
+        """
+        slots = asyncio.Semaphore(concurrency or self.http.max_connections)
+
+        async def one(index: int):
+            async with slots:
+                return await self.run_chain(f"{title} #{index + 1}", tasks, complete)
+
+        return await asyncio.gather(*(one(i) for i in range(count)), return_exceptions=True)
+
+
+async def _run(args) -> int:
+    async with KaiClient(args.api_key, args.base_url, max_connections=args.connections) as client:
+        start = time.perf_counter()
+        results = await client.run_chains(args.chains, tasks=args.tasks, concurrency=args.concurrency)
+        elapsed = time.perf_counter() - start
+    failures = [result for result in results if isinstance(result, Exception)]
+    stats = client.http.stats
+
+    print("=" * 60)
+    print("KAI CLIENT CHAINS")
+    print("=" * 60)
+    print(f"Chains: {args.chains - len(failures)} completed, {len(failures)} failed")
+    print(f"Requests: {stats['requests']} in {elapsed:.2f}s "
+          f"({stats['requests'] / elapsed:.1f} req/s, {stats['requests'] / elapsed * 60:.0f} per minute)")
+    print(f"Connections opened: {stats['connections']}, reused: {stats['reused']}, retries: {stats['retries']}")
+    for failure in failures[:5]:
+        print(f"  - {failure}")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run goal -> phase -> task chains through the async client")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Base URL of the API (default: {BASE_URL})")
+    parser.add_argument("--api-key", required=True, help="API key for authentication")
+    parser.add_argument("--chains", type=int, default=100, help="Chains to run (default: 100)")
+    parser.add_argument("--tasks", type=int, default=3, help="Tasks per chain (default: 3)")
+    parser.add_argument("--connections", type=int, default=10, help="Keep-alive connections (default: 10)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Chains in flight at once (default: --connections)")
+    sys.exit(asyncio.run(_run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+CHAIN_OPERATIONS = {"createGoal", "createPhase", "createTask", "updateTask"}
+
+
+def render(spec: Dict[str, Any], source: str) -> str:
+    model = ClientModel(spec)
+    info = spec.get("info", {})
+    lines = [HEADER.format(title=info.get("title", "API"), version=info.get("version", "?"), source=source)]
+    for name, fields in model.typed_dicts:
+        lines += render_typed_dict(name, fields) + ["", ""]
+    text = "\n".join(lines).rstrip("\n") + "\n" + HELPERS + "\n    # Operations\n\n"
+    operation_lines: List[str] = []
+    for op in model.operations:
+        operation_lines += render_operation(op)
+    text += "\n".join(operation_lines).rstrip("\n") + "\n"
+    if CHAIN_OPERATIONS <= {op.operation_id for op in model.operations}:
+        text += CHAINS
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the typed async API client from the OpenAPI spec")
+    parser.add_argument("--spec", default=SPEC_ROUTE,
+                        help="Spec source: the openapi route.ts (default), a JSON file or a URL")
+    parser.add_argument("--output", default=OUTPUT, help="Where to write the client (default: kai_client.py)")
+    parser.add_argument("--check", action="store_true",
+                        help="Don't write; exit with status 1 if --output is out of date")
+    args = parser.parse_args()
+
+    source = args.spec
+    if not source.startswith(("http://", "https://")):
+        # Recorded relative to the repo root (route.ts) or this folder, not as an absolute path
+        source = os.path.relpath(os.path.abspath(source), SCRIPT_DIR).replace(os.sep, "/")
+        source = re.sub(r"^(\.\./)+", "", source)
+    spec = load_spec(args.spec)
+    code = render(spec, source)
+
+    if args.check:
+        try:
+            with open(args.output) as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = None
+        if current != code:
+            print(f"{args.output} is out of date; run generate_client.py")
+            sys.exit(1)
+        print(f"{args.output} is up to date")
+        return
+
+    with open(args.output, "w") as f:
+        f.write(code)
+    model = ClientModel(spec)
+    print(f"Wrote {args.output}: {len(model.operations)} operations, {len(model.typed_dicts)} request types")
+
+
+if __name__ == "__main__":
+    main()
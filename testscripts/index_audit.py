@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Audits Appwrite indexes against the queries the app actually sends.
+
+Reads list queries from captured request logs: the mock's --query-log (JSON
+lines, covering the /api/gpt/* routes) or a browser HAR export (covering the
+pages, which query Appwrite directly). Queries are grouped by shape: the
+collection, the attributes filtered with equal, range filters and ordering.
+Each shape is checked against the indexes declared in scripts/setup-db.js,
+and shapes no index serves in full get a suggested composite index: the equal
+attributes first, then the order (or range) attribute.
+
+--apply creates the suggested indexes on an Appwrite endpoint, skipping any
+that already exist, and --bench replays one logged request per shape before
+and after. --local runs the whole loop against an in-process stand-in seeded
+with a synthetic dataset, for users and documents named in the log.
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from mock_appwrite import DOCUMENTS_PATH, AppwriteError, DocumentStore, MockAppwriteServer, parse_query
+from test_api import create_session, percentile
+
+SETUP_DB = Path(__file__).resolve().parent.parent / "scripts" / "setup-db.js"
+APPWRITE_ENDPOINT = "http://127.0.0.1:8090/v1"
+APPWRITE_PROJECT = "mock"
+DATABASE_ID = "mock"
+REPEATS = 20
+INDEX_READY_TIMEOUT = 60.0
+# Appwrite limits index keys to 36 characters
+MAX_INDEX_KEY = 36
+
+# --local dataset, per user
+LOCAL_USERS = 20
+LOCAL_TASKS_PER_USER = 2000
+LOCAL_GOALS_PER_USER = 10
+LOCAL_PHASES_PER_GOAL = 3
+
+EQUAL_METHODS = {"equal", "isNull"}
+RANGE_METHODS = {"lessThan", "lessThanEqual", "greaterThan", "greaterThanEqual", "between", "startsWith", "isNotNull"}
+ORDER_METHODS = {"orderAsc": "asc", "orderDesc": "desc"}
+
+# createIndex(DB_ID, 'tasks', 'userId_idx', 'key', ['userId']) in scripts/setup-db.js
+INDEX_CALL = r"createIndex\(\s*DB_ID\s*,\s*'([^']+)'\s*,\s*'([^']+)'\s*,\s*'([^']+)'\s*,\s*\[([^\]]*)\]"
+
+
+class QueryShape(NamedTuple):
+    collection: str
+    equal: Tuple[str, ...]
+    ranges: Tuple[str, ...]
+    orders: Tuple[Tuple[str, str], ...]
+
+    def describe(self) -> str:
+        filters = [f"{a}=" for a in self.equal] + [f"{a}<>" for a in self.ranges]
+        orders = [f"{a} {direction}" for a, direction in self.orders]
+        return ", ".join(filters) + (f" / {', '.join(orders)}" if orders else "")
+
+    def index_tail(self) -> List[str]:
+        """Attributes an index needs after the equal ones: the ordering, else the first range filter."""
+        return [a for a, _ in self.orders] if self.orders else list(self.ranges[:1])
+
+
+def read_declared_indexes(path: Path) -> Dict[str, List[dict]]:
+    """Indexes created by scripts/setup-db.js, per collection."""
+    indexes: Dict[str, List[dict]] = defaultdict(list)
+    for collection, key, index_type, attributes in re.findall(INDEX_CALL, path.read_text()):
+        indexes[collection].append({
+            "key": key,
+            "type": index_type,
+            "attributes": [a.strip().strip("'\"") for a in attributes.split(",") if a.strip()],
+        })
+    return indexes
+
+
+def read_log(path: Path) -> List[str]:
+    """URLs of GET requests in a HAR export or a mock --query-log file."""
+    text = path.read_text()
+    if path.suffix == ".har" or text.lstrip().startswith("{\"log\""):
+        entries = json.loads(text)["log"]["entries"]
+        return [e["request"]["url"] for e in entries if e["request"]["method"] == "GET"]
+    urls = []
+    for line in text.splitlines():
+        if line.strip():
+            entry = json.loads(line)
+            if entry.get("method", "GET") == "GET":
+                urls.append(entry.get("url") or entry["path"])
+    return urls
+
+
+def parse_list_request(url: str) -> Optional[Tuple[str, List[dict]]]:
+    """(collection, queries) for a listDocuments request, or None for anything else."""
+    parts = urlsplit(url)
+    match = DOCUMENTS_PATH.match(parts.path)
+    if not match or match.group("document"):
+        return None
+    pairs = [v for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.startswith("queries[")]
+    return match.group("collection"), [parse_query(v) for v in pairs]
+
+
+def flatten(queries: Iterable[dict]) -> Iterable[dict]:
+    for query in queries:
+        if query["method"] == "and":
+            yield from flatten(parse_query(q) if isinstance(q, str) else q for q in query["values"])
+        else:
+            yield query
+
+
+def shape_of(collection: str, queries: List[dict]) -> Optional[QueryShape]:
+    """The index-relevant part of a list query, or None when no index question arises."""
+    equal, ranges, orders = [], [], []
+    for query in flatten(queries):
+        method, attribute = query["method"], query.get("attribute")
+        if attribute == "$id":
+            return None  # Served by the primary key
+        if method in EQUAL_METHODS and attribute not in equal:
+            equal.append(attribute)
+        elif method in RANGE_METHODS and attribute not in ranges:
+            ranges.append(attribute)
+        elif method in ORDER_METHODS and attribute:
+            orders.append((attribute, ORDER_METHODS[method]))
+    if not equal and not ranges and not orders:
+        return None
+    return QueryShape(collection, tuple(equal), tuple(a for a in ranges if a not in equal), tuple(orders))
+
+
+def index_fit(attributes: List[str], shape: QueryShape) -> Tuple[int, bool]:
+    """(equal attributes the index serves as a prefix, whether it serves the whole query)."""
+    prefix = 0
+    while prefix < len(attributes) and attributes[prefix] in shape.equal:
+        prefix += 1
+    tail = shape.index_tail()
+    full = prefix == len(shape.equal) and attributes[prefix:prefix + len(tail)] == tail
+    return prefix, full
+
+
+def index_key(attributes: List[str]) -> str:
+    return ("_".join(a.lstrip("$") for a in attributes) + "_idx")[-MAX_INDEX_KEY:].lstrip("_")
+
+
+def audit(urls: List[str], declared: Dict[str, List[dict]]) -> dict:
+    """Groups logged queries by shape and finds the best declared index and a suggestion for each."""
+    shapes: Dict[QueryShape, dict] = {}
+    skipped = 0
+    for url in urls:
+        try:
+            parsed = parse_list_request(url)
+        except AppwriteError:
+            parsed = None
+        if parsed is None:
+            skipped += 1
+            continue
+        shape = shape_of(*parsed)
+        if shape is None:
+            continue
+        entry = shapes.setdefault(shape, {"shape": shape, "requests": 0, "url": url})
+        entry["requests"] += 1
+
+    used = set()
+    for entry in shapes.values():
+        shape = entry["shape"]
+        best, prefix, full = None, 0, False
+        for index in declared.get(shape.collection, []):
+            index_prefix, index_full = index_fit(index["attributes"], shape)
+            if (index_prefix or index_full) and (index_full, index_prefix) > (full, prefix):
+                best, prefix, full = index, index_prefix, index_full
+        entry["index"] = best["key"] if best else None
+        if best:
+            used.add((shape.collection, best["key"]))
+        if full:
+            entry["status"] = "full"
+        elif best and prefix == len(shape.equal):
+            entry["status"] = "filter only"
+        elif best:
+            entry["status"] = "partial"
+        else:
+            entry["status"] = "scan"
+
+    # One suggestion per shape that is not fully served; longer suggestions that cover
+    # shorter ones replace them
+    needed = [e for e in shapes.values() if e["status"] != "full"]
+    candidates = sorted(
+        {(e["shape"].collection, tuple(list(e["shape"].equal) + e["shape"].index_tail())) for e in needed},
+        key=lambda c: (-len(c[1]), c)
+    )
+    suggestions: List[dict] = []
+    for collection, attributes in candidates:
+        covered = [e for e in needed if e["shape"].collection == collection and index_fit(list(attributes), e["shape"])[1]]
+        if any(all(e in s["entries"] for e in covered) for s in suggestions if s["collection"] == collection):
+            continue
+        suggestions.append({
+            "collection": collection,
+            "key": index_key(list(attributes)),
+            "attributes": list(attributes),
+            "entries": covered,
+        })
+
+    unused = []
+    for collection, indexes in declared.items():
+        for index in indexes:
+            if (collection, index["key"]) in used:
+                continue
+            # A prefix of a longer index serves nothing the longer one can't
+            covering = [i["key"] for i in indexes if len(i["attributes"]) > len(index["attributes"])
+                        and i["attributes"][:len(index["attributes"])] == index["attributes"]]
+            unused.append({"collection": collection, "key": index["key"], "attributes": index["attributes"],
+                           "prefix_of": covering[0] if covering else None})
+    return {
+        "requests": len(urls),
+        "skipped": skipped,
+        "shapes": sorted(shapes.values(), key=lambda e: (e["shape"].collection, -e["requests"])),
+        "suggestions": suggestions,
+        "unused": unused,
+    }
+
+
+class IndexClient:
+    """The indexes and documents endpoints of one Appwrite database."""
+
+    def __init__(self, endpoint: str, project: str, api_key: str, database_id: str):
+        self.endpoint = endpoint.rstrip("/")
+        self.database_id = database_id
+        self.session = create_session(pool_size=1)
+        self.headers = {
+            "Content-Type": "application/json",
+            "X-Appwrite-Project": project,
+            "X-Appwrite-Key": api_key,
+        }
+
+    def _indexes_url(self, collection: str) -> str:
+        return f"{self.endpoint}/databases/{self.database_id}/collections/{collection}/indexes"
+
+    def list(self, collection: str) -> List[dict]:
+        response = self.session.get(self._indexes_url(collection), headers=self.headers, timeout=30)
+        response.raise_for_status()
+        return response.json()["indexes"]
+
+    def ensure(self, collection: str, key: str, index_type: str, attributes: List[str]) -> str:
+        """Create the index unless one with the same key or attributes exists. Returns what happened."""
+        for index in self.list(collection):
+            if index["key"] == key or index["attributes"] == attributes:
+                return f"exists as {index['key']}"
+        response = self.session.post(
+            self._indexes_url(collection),
+            headers=self.headers,
+            json={"key": key, "type": index_type, "attributes": attributes},
+            timeout=30
+        )
+        if response.status_code == 409:
+            return "exists"
+        response.raise_for_status()
+        return "created"
+
+    def wait_until_available(self, collections: Iterable[str], timeout: float = INDEX_READY_TIMEOUT):
+        """Appwrite builds indexes in the background; wait until none is still processing."""
+        deadline = time.time() + timeout
+        for collection in set(collections):
+            while any(i.get("status", "available") != "available" for i in self.list(collection)):
+                if time.time() > deadline:
+                    raise TimeoutError(f"Indexes on {collection} still building after {timeout:.0f} s")
+                time.sleep(1)
+
+    def time_request(self, url: str, repeats: int) -> float:
+        """p50 latency in ms of replaying a logged request against this endpoint."""
+        parts = urlsplit(url)
+        origin = urlsplit(self.endpoint)
+        target = f"{origin.scheme}://{origin.netloc}{parts.path}?{parts.query}"
+        latencies = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            response = self.session.get(target, headers=self.headers, timeout=30)
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+        return percentile(latencies, 50)
+
+
+def logged_values(urls: List[str]) -> Dict[str, List]:
+    """Values the log filters on with equal, per attribute, so --local seeds matching documents."""
+    values: Dict[str, set] = defaultdict(set)
+    for url in urls:
+        parsed = parse_list_request(url)
+        if parsed:
+            for query in flatten(parsed[1]):
+                if query["method"] == "equal":
+                    values[query["attribute"]].update(v for v in query["values"] if isinstance(v, str))
+    return {attribute: sorted(found) for attribute, found in values.items()}
+
+
+def seed_local(store: DocumentStore, users: int, tasks_per_user: int, seen: Dict[str, List]) -> int:
+    """Seed goals, phases, tasks, habits, inbox items and resources. Returns the documents created."""
+    rng = random.Random(42)
+    user_ids = seen.get("userId", []) + [f"seed_user_{i}" for i in range(users)]
+    extra_goals = seen.get("goalId", [])
+    extra_phases = seen.get("phaseId", [])
+    created = 0
+    for user_id in user_ids:
+        goal_ids = [store.create_document("goals", None, {"title": f"Goal {g}", "userId": user_id})["$id"]
+                    for g in range(LOCAL_GOALS_PER_USER)]
+        phase_ids = []
+        for goal_id in goal_ids:
+            for order in range(LOCAL_PHASES_PER_GOAL):
+                phase_ids.append((goal_id, store.create_document("phases", None, {
+                    "title": f"Phase {order}", "goalId": goal_id, "order": order, "isCompleted": False
+                })["$id"]))
+        for i in range(tasks_per_user):
+            goal_id, phase_id = rng.choice(phase_ids)
+            if extra_phases and rng.random() < 0.05:
+                phase_id = rng.choice(extra_phases)
+            if extra_goals and rng.random() < 0.05:
+                goal_id = rng.choice(extra_goals)
+            store.create_document("tasks", None, {
+                "title": f"Task {i}",
+                "userId": user_id,
+                "goalId": goal_id,
+                "phaseId": phase_id,
+                "isCompleted": rng.random() < 0.6,
+                "dueDate": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00.000+00:00",
+            })
+        for i in range(5):
+            store.create_document("habits", None, {"title": f"Habit {i}", "userId": user_id, "streak": 0})
+        for i in range(tasks_per_user // 10):
+            store.create_document("inbox", None, {"content": f"Note {i}", "userId": user_id,
+                                                  "isProcessed": rng.random() < 0.7})
+        for i in range(tasks_per_user // 40):
+            store.create_document("resources", None, {"title": f"File {i}", "userId": user_id,
+                                                      "fileId": f"file_{i}", "bucketId": "resources"})
+        created += (len(goal_ids) + len(phase_ids) + tasks_per_user + 5
+                    + tasks_per_user // 10 + tasks_per_user // 40)
+    return created
+
+
+def print_audit(report: dict, log_paths: List[Path], setup_db: Path):
+    print("\n" + "=" * 60)
+    print("INDEX AUDIT")
+    print(f"Logs: {', '.join(str(p) for p in log_paths)}")
+    print(f"Declared indexes: {setup_db}")
+    print(f"Requests: {report['requests']} ({report['skipped']} not list queries), shapes: {len(report['shapes'])}")
+    print("=" * 60)
+    print(f"{'Collection':<11} {'Reqs':>5}  {'Filters / order':<50} {'Best index':<26} Status")
+    for entry in report["shapes"]:
+        shape = entry["shape"]
+        print(f"{shape.collection:<11} {entry['requests']:>5}  {shape.describe():<50} "
+              f"{entry['index'] or '-':<26} {entry['status']}")
+
+    print("\nMissing indexes:")
+    if not report["suggestions"]:
+        print("  none, every logged query shape is fully served")
+    for suggestion in report["suggestions"]:
+        requests_covered = sum(e["requests"] for e in suggestion["entries"])
+        print(f"  {suggestion['collection']:<11} {suggestion['key']:<36} [{', '.join(suggestion['attributes'])}] "
+              f"shapes: {len(suggestion['entries'])}, requests: {requests_covered}")
+
+    if report["unused"]:
+        print("\nDeclared indexes no logged query relies on:")
+        for index in report["unused"]:
+            note = f" (prefix of {index['prefix_of']})" if index["prefix_of"] else ""
+            print(f"  {index['collection']:<11} {index['key']:<36} [{', '.join(index['attributes'])}]{note}")
+    print("=" * 60)
+
+
+def run_bench(client: IndexClient, report: dict, repeats: int) -> Dict[QueryShape, float]:
+    return {e["shape"]: client.time_request(e["url"], repeats) for e in report["shapes"]}
+
+
+def print_bench(report: dict, before: Dict[QueryShape, float], after: Dict[QueryShape, float]):
+    print("\n" + "=" * 60)
+    print("REPLAY LATENCY (p50 ms)")
+    print("=" * 60)
+    print(f"{'Collection':<11} {'Filters / order':<50} {'Before':>8} {'After':>8} {'Speedup':>8}")
+    for entry in report["shapes"]:
+        shape = entry["shape"]
+        speedup = before[shape] / after[shape] if after[shape] > 0 else 0.0
+        print(f"{shape.collection:<11} {shape.describe():<50} {before[shape]:>8.2f} {after[shape]:>8.2f} "
+              f"{speedup:>7.1f}x")
+    print("=" * 60)
+
+
+def apply_indexes(client: IndexClient, indexes: List[Tuple[str, str, str, List[str]]]):
+    for collection, key, index_type, attributes in indexes:
+        outcome = client.ensure(collection, key, index_type, attributes)
+        print(f"  {collection:<11} {key:<36} {outcome}")
+    client.wait_until_available(collection for collection, _, _, _ in indexes)
+
+
+def write_json(path: str, report: dict, before: Optional[dict], after: Optional[dict]):
+    data = {
+        "requests": report["requests"],
+        "shapes": [
+            {
+                "collection": e["shape"].collection,
+                "equal": list(e["shape"].equal),
+                "ranges": list(e["shape"].ranges),
+                "orders": [list(o) for o in e["shape"].orders],
+                "requests": e["requests"],
+                "index": e["index"],
+                "status": e["status"],
+                "before_ms": before.get(e["shape"]) if before else None,
+                "after_ms": after.get(e["shape"]) if after else None,
+            }
+            for e in report["shapes"]
+        ],
+        "suggestions": [
+            {"collection": s["collection"], "key": s["key"], "attributes": s["attributes"]}
+            for s in report["suggestions"]
+        ],
+        "unused": report["unused"],
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    print(f"Report written to {path}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Check logged Appwrite queries against the declared indexes")
+    parser.add_argument("--log", action="append", required=True,
+                        help="Captured requests: a mock --query-log file or a browser .har export (repeatable)")
+    parser.add_argument("--setup-db", default=str(SETUP_DB), help=f"Script declaring the indexes (default: {SETUP_DB})")
+    parser.add_argument("--apply", action="store_true", help="Create the missing indexes on --endpoint")
+    parser.add_argument("--bench", action="store_true",
+                        help="Replay one logged request per shape against --endpoint before and after --apply")
+    parser.add_argument("--local", action="store_true",
+                        help="Apply and bench against an in-process stand-in seeded with a synthetic dataset")
+    parser.add_argument("--endpoint", default=APPWRITE_ENDPOINT, help=f"Appwrite endpoint (default: {APPWRITE_ENDPOINT})")
+    parser.add_argument("--project", default=APPWRITE_PROJECT, help=f"Appwrite project ID (default: {APPWRITE_PROJECT})")
+    parser.add_argument("--key", default="mock", help="Appwrite API key with databases.write (default: mock)")
+    parser.add_argument("--database-id", default=DATABASE_ID, help=f"Database ID (default: {DATABASE_ID})")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help=f"Replays per shape for --bench (default: {REPEATS})")
+    parser.add_argument("--users", type=int, default=LOCAL_USERS,
+                        help=f"--local: synthetic users besides those in the log (default: {LOCAL_USERS})")
+    parser.add_argument("--tasks-per-user", type=int, default=LOCAL_TASKS_PER_USER,
+                        help=f"--local: tasks per user (default: {LOCAL_TASKS_PER_USER})")
+    parser.add_argument("--json", default=None, help="Write the audit (and latencies) to this JSON file")
+    parser.add_argument("--fail-on-missing", action="store_true", help="Exit with 1 when indexes are missing")
+    args = parser.parse_args(argv)
+
+    log_paths = [Path(p) for p in args.log]
+    setup_db = Path(args.setup_db)
+    urls = [url for path in log_paths for url in read_log(path)]
+    declared = read_declared_indexes(setup_db)
+    report = audit(urls, declared)
+    print_audit(report, log_paths, setup_db)
+
+    before = after = None
+    mock = None
+    try:
+        if args.local:
+            mock = MockAppwriteServer(port=0).start()
+            args.endpoint, args.apply, args.bench = mock.endpoint, True, True
+            started = time.perf_counter()
+            count = seed_local(mock.store, args.users, args.tasks_per_user, logged_values(urls))
+            print(f"\nSeeded {count} documents into a local stand-in in {time.perf_counter() - started:.1f} s")
+
+        if args.apply or args.bench:
+            client = IndexClient(args.endpoint, args.project, args.key, args.database_id)
+            if args.local:
+                print("Declaring the indexes from setup-db.js:")
+                apply_indexes(client, [
+                    (collection, index["key"], index["type"], index["attributes"])
+                    for collection, indexes in declared.items()
+                    for index in indexes
+                ])
+            if args.bench:
+                before = run_bench(client, report, args.repeats)
+            if args.apply:
+                print("Applying missing indexes:")
+                apply_indexes(client, [
+                    (s["collection"], s["key"], "key", s["attributes"]) for s in report["suggestions"]
+                ])
+            if args.bench:
+                after = run_bench(client, report, args.repeats)
+                print_bench(report, before, after)
+    except (requests.RequestException, TimeoutError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        if mock:
+            mock.stop()
+
+    if args.json:
+        write_json(args.json, report, before, after)
+    if args.fail_on_missing and report["suggestions"] and not args.apply:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
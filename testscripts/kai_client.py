@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Typed async client for the Kai Productivity Custom GPT API (spec version 1.0.0).
+
+Generated by generate_client.py from src/app/api/openapi/route.ts.
+Do not edit by hand: change the spec and run `python generate_client.py` again.
+
+    async with KaiClient(api_key) as client:
+        goal = await client.create_goal("Learn Rust")
+        async for task in client.iter_tasks(goal_id=document_id(goal)):
+            ...
+
+Requests share one keep-alive connection pool (see async_http.py). Writes carry a fresh
+Idempotency-Key unless one is passed, so the pool can retry them without duplicates.
+Running the module times concurrent goal -> phase -> task chains against a server.
+"""
+
+import argparse
+import asyncio
+import secrets
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, TypedDict, Union
+from urllib.parse import quote, urlencode
+
+from async_http import AsyncHTTPPool, HTTPRequest, Response
+
+BASE_URL = "http://localhost:3000"
+
+
+class APIError(Exception):
+    """A response outside 2xx."""
+
+    def __init__(self, request: HTTPRequest, response: Response):
+        self.request = request
+        self.response = response
+        self.status = response.status
+        try:
+            detail = (response.json() or {}).get("error")
+        except (ValueError, AttributeError):
+            detail = None
+        super().__init__(f"{request.method} {request.path} failed with status {response.status}: "
+                         f"{detail or response.reason}")
+
+
+class Page(TypedDict):
+    data: List[Dict[str, Any]]
+    nextCursor: Optional[str]
+    hasMore: bool
+
+
+class _CreateGoalTreePhaseTaskRequired(TypedDict):
+    title: str
+
+
+class CreateGoalTreePhaseTask(_CreateGoalTreePhaseTaskRequired, total=False):
+    dueDate: str
+
+
+class _CreateGoalTreePhaseRequired(TypedDict):
+    title: str
+
+
+class CreateGoalTreePhase(_CreateGoalTreePhaseRequired, total=False):
+    order: int  # Defaults to the position in the list, starting at 1
+    tasks: List[CreateGoalTreePhaseTask]
+
+
+class _CreateTasksTaskRequired(TypedDict):
+    title: str
+
+
+class CreateTasksTask(_CreateTasksTaskRequired, total=False):
+    dueDate: str
+
+
+class LogHabitsEntry(TypedDict):
+    habitId: str
+    date: str  # A real calendar date, not after today
+
+
+def document_id(document: Dict[str, Any]) -> str:
+    """The ID of a document returned by the API."""
+    return document["$id"]
+
+
+def _segment(value: str) -> str:
+    return quote(value, safe="")
+
+
+def _compact(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop unset optional fields so the route sees them as missing."""
+    return {key: value for key, value in body.items() if value is not None}
+
+
+def _with_query(path: str, params: Dict[str, Any]) -> str:
+    query = {key: str(value).lower() if isinstance(value, bool) else value
+             for key, value in params.items() if value is not None}
+    return f"{path}?{urlencode(query)}" if query else path
+
+
+def _decode(request: HTTPRequest, response: Response) -> Any:
+    if not 200 <= response.status < 300:
+        raise APIError(request, response)
+    return response.json()
+
+
+class KaiClient:
+    """Async client for the GPT API. Use it as ``async with KaiClient(api_key) as client``."""
+
+    def __init__(self, api_key: str, base_url: str = BASE_URL, max_connections: int = 10,
+                 retries: int = 3, timeout: float = 30.0, idempotent_writes: bool = True):
+        self.http = AsyncHTTPPool(base_url, {"X-API-Key": api_key}, max_connections=max_connections,
+                                  retries=retries, timeout=timeout)
+        self.idempotent_writes = idempotent_writes
+
+    async def __aenter__(self) -> "KaiClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.http.close()
+
+    def _write_headers(self, idempotency_key: Optional[str]) -> Optional[Dict[str, str]]:
+        key = idempotency_key or (secrets.token_hex(16) if self.idempotent_writes else None)
+        return {"Idempotency-Key": key} if key else None
+
+    async def _call(self, request: HTTPRequest) -> Any:
+        return _decode(request, await self.http.send(request))
+
+    async def pipeline(self, requests: Sequence[HTTPRequest]) -> List[Any]:
+        """Send independent requests back to back on one connection; results come back in order."""
+        responses = await self.http.pipeline(requests)
+        return [_decode(request, response) for request, response in zip(requests, responses)]
+
+    # Operations
+
+    def list_goals_request(self, *, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None) -> HTTPRequest:
+        """Build the listGoals request, e.g. for ``pipeline``."""
+        path = _with_query("/api/gpt/goals", {"limit": limit, "cursor": cursor, "fields": fields})
+        return HTTPRequest("GET", path, None, None)
+
+    async def list_goals(self, *, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None) -> Page:
+        """List goals (GET /api/gpt/goals)."""
+        return await self._call(self.list_goals_request(limit=limit, cursor=cursor, fields=fields))
+
+    async def iter_goals(self, *, limit: Optional[int] = None, fields: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Every item of ``list_goals``, following nextCursor page by page."""
+        cursor = None
+        while True:
+            page = await self.list_goals(limit=limit, fields=fields, cursor=cursor)
+            for item in page["data"]:
+                yield item
+            cursor = page["nextCursor"]
+            if not page["hasMore"] or not cursor:
+                return
+
+    def create_goal_request(self, title: str, *, description: Optional[str] = None, deadline: Optional[str] = None, idempotency_key: Optional[str] = None) -> HTTPRequest:
+        """Build the createGoal request, e.g. for ``pipeline``."""
+        body = _compact({"title": title, "description": description, "deadline": deadline})
+        return HTTPRequest("POST", "/api/gpt/goals", body, self._write_headers(idempotency_key))
+
+    async def create_goal(self, title: str, *, description: Optional[str] = None, deadline: Optional[str] = None, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """Create a new goal (POST /api/gpt/goals)."""
+        return await self._call(self.create_goal_request(title, description=description, deadline=deadline, idempotency_key=idempotency_key))
+
+    def create_goal_tree_request(self, title: str, *, description: Optional[str] = None, deadline: Optional[str] = None, phases: Optional[List[CreateGoalTreePhase]] = None, idempotency_key: Optional[str] = None) -> HTTPRequest:
+        """Build the createGoalTree request, e.g. for ``pipeline``."""
+        body = _compact({"title": title, "description": description, "deadline": deadline, "phases": phases})
+        return HTTPRequest("POST", "/api/gpt/goals/tree", body, self._write_headers(idempotency_key))
+
+    async def create_goal_tree(self, title: str, *, description: Optional[str] = None, deadline: Optional[str] = None, phases: Optional[List[CreateGoalTreePhase]] = None, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """Create a goal with its phases and tasks in one request (POST /api/gpt/goals/tree).
+        Prefer this over separate createGoal, createPhase and createTask calls when planning a
+        whole goal. At most 20 phases and 200 tasks per request."""
+        return await self._call(self.create_goal_tree_request(title, description=description, deadline=deadline, phases=phases, idempotency_key=idempotency_key))
+
+    def list_phases_request(self, goal_id: str, *, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None) -> HTTPRequest:
+        """Build the listPhases request, e.g. for ``pipeline``."""
+        path = _with_query(f"/api/gpt/goals/{_segment(goal_id)}/phases", {"limit": limit, "cursor": cursor, "fields": fields})
+        return HTTPRequest("GET", path, None, None)
+
+    async def list_phases(self, goal_id: str, *, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None) -> Page:
+        """List the phases of a goal, ordered by order (GET /api/gpt/goals/{goalId}/phases)."""
+        return await self._call(self.list_phases_request(goal_id, limit=limit, cursor=cursor, fields=fields))
+
+    async def iter_phases(self, goal_id: str, *, limit: Optional[int] = None, fields: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Every item of ``list_phases``, following nextCursor page by page."""
+        cursor = None
+        while True:
+            page = await self.list_phases(goal_id, limit=limit, fields=fields, cursor=cursor)
+            for item in page["data"]:
+                yield item
+            cursor = page["nextCursor"]
+            if not page["hasMore"] or not cursor:
+                return
+
+    def create_phase_request(self, goal_id: str, title: str, order: int, *, idempotency_key: Optional[str] = None) -> HTTPRequest:
+        """Build the createPhase request, e.g. for ``pipeline``."""
+        body = _compact({"title": title, "order": order})
+        return HTTPRequest("POST", f"/api/gpt/goals/{_segment(goal_id)}/phases", body, self._write_headers(idempotency_key))
+
+    async def create_phase(self, goal_id: str, title: str, order: int, *, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """Add a phase to a goal (POST /api/gpt/goals/{goalId}/phases)."""
+        return await self._call(self.create_phase_request(goal_id, title, order, idempotency_key=idempotency_key))
+
+    def list_phase_tasks_request(self, phase_id: str, *, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None) -> HTTPRequest:
+        """Build the listPhaseTasks request, e.g. for ``pipeline``."""
+        path = _with_query(f"/api/gpt/phases/{_segment(phase_id)}/tasks", {"limit": limit, "cursor": cursor, "fields": fields})
+        return HTTPRequest("GET", path, None, None)
+
+    async def list_phase_tasks(self, phase_id: str, *, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None) -> Page:
+        """List the tasks of a phase (GET /api/gpt/phases/{phaseId}/tasks)."""
+        return await self._call(self.list_phase_tasks_request(phase_id, limit=limit, cursor=cursor, fields=fields))
+
+    async def iter_phase_tasks(self, phase_id: str, *, limit: Optional[int] = None, fields: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Every item of ``list_phase_tasks``, following nextCursor page by page."""
+        cursor = None
+        while True:
+            page = await self.list_phase_tasks(phase_id, limit=limit, fields=fields, cursor=cursor)
+            for item in page["data"]:
+                yield item
+            cursor = page["nextCursor"]
+            if not page["hasMore"] or not cursor:
+                return
+
+    def create_task_request(self, phase_id: str, title: str, *, due_date: Optional[str] = None, idempotency_key: Optional[str] = None) -> HTTPRequest:
+        """Build the createTask request, e.g. for ``pipeline``."""
+        body = _compact({"title": title, "dueDate": due_date})
+        return HTTPRequest("POST", f"/api/gpt/phases/{_segment(phase_id)}/tasks", body, self._write_headers(idempotency_key))
+
+    async def create_task(self, phase_id: str, title: str, *, due_date: Optional[str] = None, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """Add a task to a phase (POST /api/gpt/phases/{phaseId}/tasks)."""
+        return await self._call(self.create_task_request(phase_id, title, due_date=due_date, idempotency_key=idempotency_key))
+
+    def create_tasks_request(self, phase_id: str, tasks: List[CreateTasksTask], *, idempotency_key: Optional[str] = None) -> HTTPRequest:
+        """Build the createTasks request, e.g. for ``pipeline``."""
+        body = _compact({"tasks": tasks})
+        return HTTPRequest("POST", f"/api/gpt/phases/{_segment(phase_id)}/tasks/batch", body, self._write_headers(idempotency_key))
+
+    async def create_tasks(self, phase_id: str, tasks: List[CreateTasksTask], *, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """Add several tasks to a phase in one request (POST
+        /api/gpt/phases/{phaseId}/tasks/batch)."""
+        return await self._call(self.create_tasks_request(phase_id, tasks, idempotency_key=idempotency_key))
+
+    def list_tasks_request(self, *, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None, is_completed: Optional[bool] = None, goal_id: Optional[str] = None) -> HTTPRequest:
+        """Build the listTasks request, e.g. for ``pipeline``."""
+        path = _with_query("/api/gpt/tasks", {"limit": limit, "cursor": cursor, "fields": fields, "isCompleted": is_completed, "goalId": goal_id})
+        return HTTPRequest("GET", path, None, None)
+
+    async def list_tasks(self, *, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None, is_completed: Optional[bool] = None, goal_id: Optional[str] = None) -> Page:
+        """List the user's tasks across goals (GET /api/gpt/tasks)."""
+        return await self._call(self.list_tasks_request(limit=limit, cursor=cursor, fields=fields, is_completed=is_completed, goal_id=goal_id))
+
+    async def iter_tasks(self, *, limit: Optional[int] = None, fields: Optional[str] = None, is_completed: Optional[bool] = None, goal_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Every item of ``list_tasks``, following nextCursor page by page."""
+        cursor = None
+        while True:
+            page = await self.list_tasks(limit=limit, fields=fields, is_completed=is_completed, goal_id=goal_id, cursor=cursor)
+            for item in page["data"]:
+                yield item
+            cursor = page["nextCursor"]
+            if not page["hasMore"] or not cursor:
+                return
+
+    def list_habits_request(self, *, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None) -> HTTPRequest:
+        """Build the listHabits request, e.g. for ``pipeline``."""
+        path = _with_query("/api/gpt/habits", {"limit": limit, "cursor": cursor, "fields": fields})
+        return HTTPRequest("GET", path, None, None)
+
+    async def list_habits(self, *, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None) -> Page:
+        """List habits with their streaks (GET /api/gpt/habits). Returns title, streak,
+        longestStreak, lastCompletedDate and recentRuns (the last 30 days) by default. Ask for
+        completedRuns with fields only when the full completion history is needed."""
+        return await self._call(self.list_habits_request(limit=limit, cursor=cursor, fields=fields))
+
+    async def iter_habits(self, *, limit: Optional[int] = None, fields: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Every item of ``list_habits``, following nextCursor page by page."""
+        cursor = None
+        while True:
+            page = await self.list_habits(limit=limit, fields=fields, cursor=cursor)
+            for item in page["data"]:
+                yield item
+            cursor = page["nextCursor"]
+            if not page["hasMore"] or not cursor:
+                return
+
+    def update_task_request(self, task_id: str, is_completed: bool, *, idempotency_key: Optional[str] = None) -> HTTPRequest:
+        """Build the updateTask request, e.g. for ``pipeline``."""
+        body = _compact({"isCompleted": is_completed})
+        return HTTPRequest("PATCH", f"/api/gpt/tasks/{_segment(task_id)}", body, self._write_headers(idempotency_key))
+
+    async def update_task(self, task_id: str, is_completed: bool, *, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """Update task status (PATCH /api/gpt/tasks/{taskId})."""
+        return await self._call(self.update_task_request(task_id, is_completed, idempotency_key=idempotency_key))
+
+    def log_habits_request(self, entries: List[LogHabitsEntry], *, idempotency_key: Optional[str] = None) -> HTTPRequest:
+        """Build the logHabits request, e.g. for ``pipeline``."""
+        body = _compact({"entries": entries})
+        return HTTPRequest("POST", "/api/gpt/habits/log", body, self._write_headers(idempotency_key))
+
+    async def log_habits(self, entries: List[LogHabitsEntry], *, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """Log many habit completions in one request (POST /api/gpt/habits/log). Use this instead
+        of repeated updateHabit calls when logging several habits or backfilling several dates.
+        At most 500 entries per request."""
+        return await self._call(self.log_habits_request(entries, idempotency_key=idempotency_key))
+
+    def update_habit_request(self, habit_id: str, date: str, *, idempotency_key: Optional[str] = None) -> HTTPRequest:
+        """Build the updateHabit request, e.g. for ``pipeline``."""
+        body = _compact({"date": date})
+        return HTTPRequest("PATCH", f"/api/gpt/habits/{_segment(habit_id)}", body, self._write_headers(idempotency_key))
+
+    async def update_habit(self, habit_id: str, date: str, *, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """Log a habit completion for a specific date (PATCH /api/gpt/habits/{habitId})."""
+        return await self._call(self.update_habit_request(habit_id, date, idempotency_key=idempotency_key))
+
+    # Goal -> phase -> task chains
+
+    async def run_chain(self, title: str, tasks: int = 1, complete: bool = True) -> Dict[str, Any]:
+        """Create a goal with one phase and ``tasks`` tasks, then complete the tasks.
+
+        Each step only waits for the ID it needs: the tasks are created concurrently once
+        the phase exists, and their completions are pipelined on one connection.
+        """
+        goal = await self.create_goal(f"{title} - Goal")
+        phase = await self.create_phase(document_id(goal), f"{title} - Phase", 1)
+        created = await asyncio.gather(*(
+            self.create_task(document_id(phase), f"{title} - Task {i + 1}") for i in range(tasks)
+        ))
+        task_ids = [document_id(task) for task in created]
+        if complete and task_ids:
+            await self.pipeline([self.update_task_request(task_id, True) for task_id in task_ids])
+        return {"goalId": document_id(goal), "phaseId": document_id(phase), "taskIds": task_ids}
+
+    async def run_chains(self, count: int, tasks: int = 1, complete: bool = True,
+                         concurrency: Optional[int] = None,
+                         title: str = "Client chain") -> List[Union[Dict[str, Any], Exception]]:
+        """Run ``count`` chains with at most ``concurrency`` (default: the pool size) at once.
+
+        Failed chains are returned as their exception instead of stopping the others.
+        """
+        slots = asyncio.Semaphore(concurrency or self.http.max_connections)
+
+        async def one(index: int):
+            async with slots:
+                return await self.run_chain(f"{title} #{index + 1}", tasks, complete)
+
+        return await asyncio.gather(*(one(i) for i in range(count)), return_exceptions=True)
+
+
+async def _run(args) -> int:
+    async with KaiClient(args.api_key, args.base_url, max_connections=args.connections) as client:
+        start = time.perf_counter()
+        results = await client.run_chains(args.chains, tasks=args.tasks, concurrency=args.concurrency)
+        elapsed = time.perf_counter() - start
+    failures = [result for result in results if isinstance(result, Exception)]
+    stats = client.http.stats
+
+    print("=" * 60)
+    print("KAI CLIENT CHAINS")
+    print("=" * 60)
+    print(f"Chains: {args.chains - len(failures)} completed, {len(failures)} failed")
+    print(f"Requests: {stats['requests']} in {elapsed:.2f}s "
+          f"({stats['requests'] / elapsed:.1f} req/s, {stats['requests'] / elapsed * 60:.0f} per minute)")
+    print(f"Connections opened: {stats['connections']}, reused: {stats['reused']}, retries: {stats['retries']}")
+    for failure in failures[:5]:
+        print(f"  - {failure}")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run goal -> phase -> task chains through the async client")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Base URL of the API (default: {BASE_URL})")
+    parser.add_argument("--api-key", required=True, help="API key for authentication")
+    parser.add_argument("--chains", type=int, default=100, help="Chains to run (default: 100)")
+    parser.add_argument("--tasks", type=int, default=3, help="Tasks per chain (default: 3)")
+    parser.add_argument("--connections", type=int, default=10, help="Keep-alive connections (default: 10)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Chains in flight at once (default: --connections)")
+    sys.exit(asyncio.run(_run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,711 @@
+#!/usr/bin/env python3
+"""
+Local Appwrite stand-in for hermetic API testing.
+
+Implements the subset of the Appwrite Databases REST API used by the
+`/api/gpt/*` routes (list/get/create/update/delete documents, plus bulk
+create) on the api_keys, goals, phases, tasks, habits, inbox and resources
+collections.
+Everything lives in memory, and an optional per-request delay lets you
+benchmark the Next.js layer by itself or simulate a slow database.
+
+Key indexes can be created through the indexes API. List queries use the
+index with the longest prefix of equal filters instead of scanning the whole
+collection, so index changes show up in latency (see index_audit.py).
+--query-log records every document request for later analysis.
+
+Point the Next.js server at it with:
+    NEXT_PUBLIC_APPWRITE_ENDPOINT=http://127.0.0.1:8090/v1
+    NEXT_PUBLIC_APPWRITE_PROJECT_ID=mock
+    NEXT_PUBLIC_APPWRITE_DATABASE_ID=mock
+    APPWRITE_API=mock
+"""
+
+import bisect
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+# Configuration
+HOST = "127.0.0.1"
+PORT = 8090
+DATABASE_ID = "mock"
+COLLECTIONS = ["api_keys", "goals", "phases", "tasks", "habits", "inbox", "resources"]
+
+# Appwrite returns 25 documents when a list query has no limit
+DEFAULT_LIMIT = 25
+MAX_LIMIT = 5000
+
+DOCUMENTS_PATH = re.compile(
+    r"^/v1/databases/(?P<db>[^/]+)/collections/(?P<collection>[^/]+)/documents(?:/(?P<document>[^/]+))?/?$"
+)
+INDEXES_PATH = re.compile(
+    r"^/v1/databases/(?P<db>[^/]+)/collections/(?P<collection>[^/]+)/indexes(?:/(?P<key>[^/]+))?/?$"
+)
+
+# Sorts after every index value, closing a bisect range over an equality prefix
+AFTER_ALL_VALUES = (2,)
+
+# Range filters as (lower, upper) bounds, each (value, inclusive) or None, for narrowing an index range
+RANGE_BOUNDS = {
+    "lessThan": lambda values: (None, (values[0], False)),
+    "lessThanEqual": lambda values: (None, (values[0], True)),
+    "greaterThan": lambda values: ((values[0], False), None),
+    "greaterThanEqual": lambda values: ((values[0], True), None),
+    "between": lambda values: ((values[0], True), (values[1], True)),
+}
+
+
+class AppwriteError(Exception):
+    """Error rendered in Appwrite's JSON error format."""
+
+    def __init__(self, code: int, error_type: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.type = error_type
+        self.message = message
+
+    def to_json(self) -> dict:
+        return {"message": self.message, "code": self.code, "type": self.type, "version": "mock"}
+
+
+def now_iso() -> str:
+    """Current UTC time in Appwrite's datetime format."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def unique_id() -> str:
+    """Generate a 20-character document ID like ID.unique() does."""
+    return f"{int(time.time() * 1000):x}"[-12:] + secrets.token_hex(4)
+
+
+def index_value(value: Any) -> tuple:
+    """Index sort key for one attribute value; null sorts last, as in list ordering."""
+    return (1, 0) if value is None else (0, value)
+
+
+def parse_query(raw: str) -> dict:
+    """Parse a JSON-encoded Appwrite query (the format sent by current SDKs)."""
+    try:
+        query = json.loads(raw)
+    except ValueError:
+        raise AppwriteError(400, "general_query_invalid", f"Invalid query: {raw}")
+    if not isinstance(query, dict) or "method" not in query:
+        raise AppwriteError(400, "general_query_invalid", f"Invalid query: {raw}")
+    query.setdefault("values", [])
+    return query
+
+
+class DocumentStore:
+    """Thread-safe in-memory collections with Appwrite query semantics."""
+
+    FILTERS = {
+        "equal": lambda v, values: v in values if not isinstance(v, list) else any(x in values for x in v),
+        "notEqual": lambda v, values: v not in values,
+        "lessThan": lambda v, values: v is not None and v < values[0],
+        "lessThanEqual": lambda v, values: v is not None and v <= values[0],
+        "greaterThan": lambda v, values: v is not None and v > values[0],
+        "greaterThanEqual": lambda v, values: v is not None and v >= values[0],
+        "between": lambda v, values: v is not None and values[0] <= v <= values[1],
+        "isNull": lambda v, values: v is None,
+        "isNotNull": lambda v, values: v is not None,
+        "startsWith": lambda v, values: isinstance(v, str) and v.startswith(values[0]),
+        "endsWith": lambda v, values: isinstance(v, str) and v.endswith(values[0]),
+        "contains": lambda v, values: v is not None and any(x in v for x in values),
+        "search": lambda v, values: isinstance(v, str) and values[0].lower() in v.lower(),
+    }
+
+    def __init__(self, collections: List[str] = None):
+        self._lock = threading.RLock()
+        self.collections: Dict[str, "OrderedDict[str, dict]"] = {
+            name: OrderedDict() for name in (collections or COLLECTIONS)
+        }
+        # Index definitions per collection, and each index's entries as sorted (key, $sequence, $id)
+        self.indexes: Dict[str, Dict[str, dict]] = {name: {} for name in self.collections}
+        self._index_entries: Dict[Tuple[str, str], List[tuple]] = {}
+        # Last $sequence handed out per collection; never reused, as in Appwrite
+        self._sequences: Dict[str, int] = {name: 0 for name in self.collections}
+
+    def _collection(self, collection: str) -> "OrderedDict[str, dict]":
+        if collection not in self.collections:
+            raise AppwriteError(404, "collection_not_found", "Collection with the requested ID could not be found.")
+        return self.collections[collection]
+
+    @staticmethod
+    def _index_entry(doc: dict, attributes: List[str]) -> tuple:
+        return tuple(index_value(doc.get(attribute)) for attribute in attributes), doc["$sequence"], doc["$id"]
+
+    def _reindex(self, collection: str, old: Optional[dict], new: Optional[dict]):
+        """Keep index entries in step with one document write. Called with the lock held."""
+        for key, index in self.indexes[collection].items():
+            entries = self._index_entries[(collection, key)]
+            if old is not None:
+                entry = self._index_entry(old, index["attributes"])
+                position = bisect.bisect_left(entries, entry)
+                if position < len(entries) and entries[position] == entry:
+                    del entries[position]
+            if new is not None:
+                bisect.insort(entries, self._index_entry(new, index["attributes"]))
+
+    def _candidates(self, collection: str, queries: List[dict]) -> Optional[Tuple[List[dict], List[dict], bool]]:
+        """
+        Documents an index narrows a query down to, or None to scan the collection.
+        Picks the index with the longest prefix of single-value equal filters, preferring one whose
+        next attribute is the first order attribute, which leaves the candidates already sorted.
+        A range filter on that next attribute narrows the candidates further.
+        Returns the candidates, the queries still left to apply, and whether the
+        candidates are already in the requested order. Called with the lock held.
+        """
+        equal = {q.get("attribute"): q["values"][0] for q in queries
+                 if q["method"] == "equal" and len(q["values"]) == 1}
+        orders = [q for q in queries if q["method"] in ("orderAsc", "orderDesc")]
+        order_attributes = [q.get("attribute") or "$sequence" for q in orders]
+        best, best_score = None, (0, False)
+        for key, index in self.indexes[collection].items():
+            attributes = index["attributes"]
+            prefix = 0
+            while prefix < len(attributes) and attributes[prefix] in equal:
+                prefix += 1
+            score = (prefix, attributes[prefix:prefix + 1] == order_attributes[:1])
+            if prefix > 0 and score > best_score:
+                best, best_score = (key, attributes, prefix), score
+        if best is None:
+            return None
+
+        key, attributes, prefix = best
+        entries = self._index_entries[(collection, key)]
+        prefix_key = tuple(index_value(equal[attribute]) for attribute in attributes[:prefix])
+        start = bisect.bisect_left(entries, (prefix_key,))
+        end = bisect.bisect_left(entries, (prefix_key + (AFTER_ALL_VALUES,),))
+        if prefix < len(attributes):
+            for query in queries:
+                if query.get("attribute") != attributes[prefix] or query["method"] not in RANGE_BOUNDS:
+                    continue
+                low, high = RANGE_BOUNDS[query["method"]](query["values"])
+                if low is not None:
+                    low_key = (index_value(low[0]),) if low[1] else (index_value(low[0]), AFTER_ALL_VALUES)
+                    start = max(start, bisect.bisect_left(entries, (prefix_key + low_key,), start, end))
+                if high is not None:
+                    high_key = (index_value(high[0]), AFTER_ALL_VALUES) if high[1] else (index_value(high[0]),)
+                    end = min(end, bisect.bisect_left(entries, (prefix_key + high_key,), start, end))
+                end = max(start, end)
+
+        docs = self.collections[collection]
+        consumed = set(attributes[:prefix])
+        remaining = [q for q in queries if not (q["method"] == "equal" and q.get("attribute") in consumed
+                                                and q["values"] == [equal[q["attribute"]]])]
+        # Index entries tie-break on $sequence, as the stable sort does for ascending order.
+        # Otherwise hand back collection order, so results match a scan.
+        ordered = (len(orders) == 1 and orders[0]["method"] == "orderAsc"
+                   and attributes[prefix:prefix + 1] == order_attributes)
+        selected = entries[start:end] if ordered else sorted(entries[start:end], key=lambda entry: entry[1])
+        return [docs[entry[2]] for entry in selected], remaining, ordered
+
+    def _filter(self, docs: List[dict], queries: List[dict]) -> List[dict]:
+        for query in queries:
+            method = query["method"]
+            if method in self.FILTERS:
+                match = self.FILTERS[method]
+                attribute = query.get("attribute")
+                values = query["values"]
+                docs = [d for d in docs if match(d.get(attribute), values)]
+            elif method == "or":
+                groups = [[parse_query(q) if isinstance(q, str) else q] for q in query["values"]]
+                docs = [d for d in docs if any(self._filter([d], g) for g in groups)]
+            elif method == "and":
+                for q in query["values"]:
+                    docs = self._filter(docs, [parse_query(q) if isinstance(q, str) else q])
+        return docs
+
+    @staticmethod
+    def _sort(docs: List[dict], queries: List[dict]) -> List[dict]:
+        orders = [q for q in queries if q["method"] in ("orderAsc", "orderDesc")]
+        # Apply sort keys from last to first so the first order query wins (stable sort)
+        for query in reversed(orders):
+            attribute = query.get("attribute") or "$sequence"
+            docs = sorted(
+                docs,
+                key=lambda d: (d.get(attribute) is None, d.get(attribute) if d.get(attribute) is not None else 0),
+                reverse=query["method"] == "orderDesc"
+            )
+        return docs
+
+    @staticmethod
+    def _select(doc: dict, attributes: List[str]) -> dict:
+        selected = {key: doc[key] for key in ("$id", "$collectionId", "$databaseId") if key in doc}
+        for attribute in attributes:
+            if attribute == "*":
+                return dict(doc)
+            if attribute in doc:
+                selected[attribute] = doc[attribute]
+        return selected
+
+    def list_documents(self, collection: str, queries: List[dict]) -> dict:
+        with self._lock:
+            all_docs = self._collection(collection)
+            candidates = self._candidates(collection, queries)
+            if candidates is None:
+                candidates = list(all_docs.values()), queries, False
+        docs, remaining, ordered = candidates
+        docs = self._filter(docs, remaining)
+        if not ordered:
+            docs = self._sort(docs, queries)
+        total = len(docs)
+
+        limit, offset, select, cursor = DEFAULT_LIMIT, 0, None, None
+        for query in queries:
+            method, values = query["method"], query["values"]
+            if method == "limit":
+                limit = min(int(values[0]), MAX_LIMIT)
+            elif method == "offset":
+                offset = int(values[0])
+            elif method == "select":
+                select = values
+            elif method in ("cursorAfter", "cursorBefore"):
+                cursor = query
+
+        if cursor:
+            ids = [d["$id"] for d in docs]
+            cursor_id = cursor["values"][0]
+            if cursor_id not in ids:
+                raise AppwriteError(400, "document_not_found", f"Document '{cursor_id}' for the 'cursor' value not found.")
+            index = ids.index(cursor_id)
+            if cursor["method"] == "cursorAfter":
+                docs = docs[index + 1:]
+            else:
+                docs = docs[max(0, index - limit):index]
+
+        page = docs[offset:offset + limit]
+        if select:
+            page = [self._select(d, select) for d in page]
+        return {"total": total, "documents": [dict(d) for d in page]}
+
+    def get_document(self, collection: str, document_id: str, queries: Optional[List[dict]] = None) -> dict:
+        with self._lock:
+            doc = self._collection(collection).get(document_id)
+            if doc is None:
+                raise AppwriteError(404, "document_not_found", "Document with the requested ID could not be found.")
+            doc = dict(doc)
+        for query in queries or []:
+            if query["method"] == "select":
+                doc = self._select(doc, query["values"])
+        return doc
+
+    def create_document(self, collection: str, document_id: Optional[str], data: dict,
+                        permissions: Optional[List[str]] = None) -> dict:
+        if not document_id or document_id == "unique()":
+            document_id = unique_id()
+        timestamp = now_iso()
+        with self._lock:
+            docs = self._collection(collection)
+            if document_id in docs:
+                raise AppwriteError(409, "document_already_exists", "Document with the requested ID already exists.")
+            self._sequences[collection] += 1
+            doc = {
+                **{k: v for k, v in data.items() if not k.startswith("$")},
+                "$id": document_id,
+                "$sequence": self._sequences[collection],
+                "$collectionId": collection,
+                "$databaseId": DATABASE_ID,
+                "$createdAt": data.get("$createdAt", timestamp),
+                "$updatedAt": data.get("$updatedAt", timestamp),
+                "$permissions": permissions or [],
+            }
+            docs[document_id] = doc
+            self._reindex(collection, None, doc)
+            return dict(doc)
+
+    def create_documents(self, collection: str, documents: List[dict]) -> List[dict]:
+        """Bulk create, as POST .../documents with a documents array. Writes all or nothing."""
+        with self._lock:
+            docs = self._collection(collection)
+            ids = [d.get("$id") for d in documents if d.get("$id") not in (None, "unique()")]
+            if len(set(ids)) != len(ids) or any(document_id in docs for document_id in ids):
+                raise AppwriteError(409, "document_already_exists", "Document with the requested ID already exists.")
+            return [
+                self.create_document(collection, d.get("$id"), d, d.get("$permissions"))
+                for d in documents
+            ]
+
+    def update_document(self, collection: str, document_id: str, data: dict,
+                        permissions: Optional[List[str]] = None) -> dict:
+        with self._lock:
+            docs = self._collection(collection)
+            doc = docs.get(document_id)
+            if doc is None:
+                raise AppwriteError(404, "document_not_found", "Document with the requested ID could not be found.")
+            old = dict(doc)
+            doc.update({k: v for k, v in data.items() if not k.startswith("$")})
+            self._reindex(collection, old, doc)
+            doc["$updatedAt"] = now_iso()
+            if permissions is not None:
+                doc["$permissions"] = permissions
+            return dict(doc)
+
+    def delete_document(self, collection: str, document_id: str) -> None:
+        with self._lock:
+            docs = self._collection(collection)
+            doc = docs.pop(document_id, None)
+            if doc is None:
+                raise AppwriteError(404, "document_not_found", "Document with the requested ID could not be found.")
+            self._reindex(collection, doc, None)
+
+    def create_index(self, collection: str, key: str, index_type: str, attributes: List[str],
+                     orders: Optional[List[str]] = None) -> dict:
+        """Create an index and build it at once. Unique indexes are not enforced."""
+        with self._lock:
+            docs = self._collection(collection)
+            if key in self.indexes[collection]:
+                raise AppwriteError(409, "index_already_exists", "Index with the requested key already exists.")
+            index = {
+                "key": key,
+                "type": index_type,
+                "status": "available",
+                "attributes": list(attributes),
+                "orders": list(orders or []),
+            }
+            self.indexes[collection][key] = index
+            self._index_entries[(collection, key)] = sorted(self._index_entry(d, attributes) for d in docs.values())
+            return dict(index)
+
+    def list_indexes(self, collection: str) -> List[dict]:
+        with self._lock:
+            self._collection(collection)
+            return [dict(index) for index in self.indexes[collection].values()]
+
+    def delete_index(self, collection: str, key: str) -> None:
+        with self._lock:
+            self._collection(collection)
+            if self.indexes[collection].pop(key, None) is None:
+                raise AppwriteError(404, "index_not_found", "Index with the requested key could not be found.")
+            del self._index_entries[(collection, key)]
+
+    def reset(self) -> None:
+        """Drop all documents; index definitions are kept."""
+        with self._lock:
+            for docs in self.collections.values():
+                docs.clear()
+            for entries in self._index_entries.values():
+                entries.clear()
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {name: len(docs) for name, docs in self.collections.items()}
+
+
+class MockAppwriteHandler(BaseHTTPRequestHandler):
+    """Routes Appwrite REST calls to the server's DocumentStore."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY every response
+    # waits on the client's delayed ACK (~40 ms) and drowns out injected latency
+    disable_nagle_algorithm = True
+    server: "MockAppwriteHTTPServer"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body: Any):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise AppwriteError(400, "general_argument_invalid", "Request body is not valid JSON.")
+
+    def _queries(self, query_string: str) -> List[dict]:
+        # SDKs send queries[0]=...&queries[1]=..., older clients send queries[]=...
+        pairs = [(k, v) for k, v in parse_qsl(query_string, keep_blank_values=True) if k.startswith("queries[")]
+        return [parse_query(v) for _, v in pairs]
+
+    def _dispatch(self, method: str):
+        url = urlsplit(self.path)
+        try:
+            if url.path.startswith("/__mock__/"):
+                return self._handle_control(method, url.path)
+            if url.path in ("/v1/health", "/v1/health/version"):
+                return self._send_json(200, {"status": "pass", "version": "mock"})
+
+            match = INDEXES_PATH.match(url.path)
+            if match:
+                return self._handle_indexes(method, match.group("collection"), match.group("key"))
+
+            match = DOCUMENTS_PATH.match(url.path)
+            if not match:
+                raise AppwriteError(404, "general_route_not_found", "The requested route was not found.")
+
+            self.server.inject_latency()
+            collection, document_id = match.group("collection"), match.group("document")
+            operation = f"{method} {'document' if document_id else 'documents'}"
+            self.server.record(operation, collection)
+            started = time.perf_counter()
+            try:
+                return self._handle_documents(method, collection, document_id, url.query)
+            finally:
+                self.server.log_query(method, self.path, (time.perf_counter() - started) * 1000)
+        except AppwriteError as e:
+            self._send_json(e.code, e.to_json())
+
+    def _handle_documents(self, method: str, collection: str, document_id: Optional[str], query_string: str):
+        store = self.server.store
+        if method == "GET" and document_id:
+            return self._send_json(200, store.get_document(collection, document_id, self._queries(query_string)))
+        if method == "GET":
+            return self._send_json(200, store.list_documents(collection, self._queries(query_string)))
+        if method == "POST" and not document_id:
+            body = self._read_body()
+            if "documents" in body:
+                docs = store.create_documents(collection, body["documents"])
+                return self._send_json(201, {"total": len(docs), "documents": docs})
+            doc = store.create_document(
+                collection, body.get("documentId"), body.get("data") or {}, body.get("permissions")
+            )
+            return self._send_json(201, doc)
+        if method == "PATCH" and document_id:
+            body = self._read_body()
+            doc = store.update_document(collection, document_id, body.get("data") or {}, body.get("permissions"))
+            return self._send_json(200, doc)
+        if method == "DELETE" and document_id:
+            store.delete_document(collection, document_id)
+            return self._send_no_content()
+        raise AppwriteError(405, "general_not_implemented", f"{method} is not supported on this route.")
+
+    def _handle_indexes(self, method: str, collection: str, key: Optional[str]):
+        store = self.server.store
+        if method == "GET" and not key:
+            indexes = store.list_indexes(collection)
+            return self._send_json(200, {"total": len(indexes), "indexes": indexes})
+        if method == "GET":
+            for index in store.list_indexes(collection):
+                if index["key"] == key:
+                    return self._send_json(200, index)
+            raise AppwriteError(404, "index_not_found", "Index with the requested key could not be found.")
+        if method == "POST" and not key:
+            body = self._read_body()
+            if not body.get("key") or not body.get("attributes"):
+                raise AppwriteError(400, "general_argument_invalid", "Index key and attributes are required.")
+            index = store.create_index(
+                collection, body["key"], body.get("type", "key"), body["attributes"], body.get("orders")
+            )
+            return self._send_json(202, index)
+        if method == "DELETE" and key:
+            store.delete_index(collection, key)
+            return self._send_no_content()
+        raise AppwriteError(405, "general_not_implemented", f"{method} is not supported on this route.")
+
+    def _send_no_content(self):
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _handle_control(self, method: str, path: str):
+        """Mock-only endpoints for inspecting and reconfiguring the server at runtime."""
+        if path == "/__mock__/config":
+            if method == "PATCH":
+                body = self._read_body()
+                self.server.latency_ms = float(body.get("latencyMs", self.server.latency_ms))
+                self.server.jitter_ms = float(body.get("jitterMs", self.server.jitter_ms))
+            return self._send_json(200, {"latencyMs": self.server.latency_ms, "jitterMs": self.server.jitter_ms})
+        if path == "/__mock__/stats":
+            return self._send_json(200, {"requests": self.server.stats(), "documents": self.server.store.counts()})
+        if path == "/__mock__/reset" and method == "POST":
+            self.server.store.reset()
+            return self._send_json(200, {"documents": self.server.store.counts()})
+        raise AppwriteError(404, "general_route_not_found", "The requested route was not found.")
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class MockAppwriteHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], store: DocumentStore,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, verbose: bool = False,
+                 query_log: Optional[str] = None):
+        super().__init__(address, MockAppwriteHandler)
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.verbose = verbose
+        self._stats: Dict[str, int] = defaultdict(int)
+        self._stats_lock = threading.Lock()
+        self._query_log: Optional[TextIO] = open(query_log, "a") if query_log else None
+        self._query_log_lock = threading.Lock()
+
+    def inject_latency(self):
+        """Sleep for the configured latency plus uniform jitter."""
+        delay = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def record(self, operation: str, collection: str):
+        with self._stats_lock:
+            self._stats[f"{operation} {collection}"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def log_query(self, method: str, path: str, elapsed_ms: float):
+        """Append one document request to the --query-log file as a JSON line."""
+        if not self._query_log:
+            return
+        line = json.dumps({"time": now_iso(), "method": method, "path": path, "ms": round(elapsed_ms, 3)})
+        with self._query_log_lock:
+            self._query_log.write(line + "\n")
+            self._query_log.flush()
+
+    def server_close(self):
+        super().server_close()
+        if self._query_log:
+            self._query_log.close()
+
+
+class MockAppwriteServer:
+    """Runs the mock in a background thread, for use from other Python scripts.
+
+    Example:
+        with MockAppwriteServer(port=8090, latency_ms=20) as mock:
+            mock.store.create_document("api_keys", None, {"key": "test", "userId": "user_1"})
+            ...
+    """
+
+    def __init__(self, host: str = HOST, port: int = PORT, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, store: Optional[DocumentStore] = None, verbose: bool = False,
+                 query_log: Optional[str] = None):
+        self.store = store or DocumentStore()
+        self.httpd = MockAppwriteHTTPServer((host, port), self.store, latency_ms, jitter_ms, verbose, query_log)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockAppwriteServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MockAppwriteServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def seed_fixtures(store: DocumentStore, api_key: Optional[str], user_id: str, habit: bool) -> Optional[str]:
+    """Create the API key document and optionally a habit. Returns the habit ID."""
+    if api_key:
+        store.create_document("api_keys", None, {"userId": user_id, "key": api_key, "createdAt": now_iso()})
+    if habit:
+        doc = store.create_document("habits", None, {
+            "title": "Mock Habit",
+            "userId": user_id,
+            "streak": 0,
+            "longestStreak": 0,
+            "completedDates": [],
+        })
+        return doc["$id"]
+    return None
+
+
+def main():
+    """Main entry point for the mock server."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local Appwrite stand-in for the Kai API routes")
+    parser.add_argument("--host", default=HOST, help=f"Interface to bind (default: {HOST})")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Port to listen on (default: {PORT})")
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="Delay added to every database call, to simulate a remote or slow database"
+    )
+    parser.add_argument(
+        "--jitter-ms",
+        type=float,
+        default=0.0,
+        help="Extra random delay (0..jitter) added on top of --latency-ms"
+    )
+    parser.add_argument("--api-key", default=None, help="Seed an api_keys document with this key")
+    parser.add_argument("--user-id", default="mock_user", help="User ID for seeded documents (default: mock_user)")
+    parser.add_argument("--seed-habit", action="store_true", help="Seed a habit for the --habit-id test")
+    parser.add_argument(
+        "--query-log",
+        default=None,
+        help="Append every document request (with its queries) to this file as JSON lines, for index_audit.py"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+    args = parser.parse_args()
+
+    store = DocumentStore()
+    habit_id = seed_fixtures(store, args.api_key, args.user_id, args.seed_habit)
+    httpd = MockAppwriteHTTPServer(
+        (args.host, args.port), store, args.latency_ms, args.jitter_ms, args.verbose, args.query_log
+    )
+
+    print("=" * 60)
+    print("MOCK APPWRITE SERVER")
+    print(f"Endpoint: http://{args.host}:{args.port}/v1")
+    print(f"Injected latency: {args.latency_ms:.0f} ms (+ up to {args.jitter_ms:.0f} ms jitter)")
+    if args.api_key:
+        print(f"Seeded API key for user: {args.user_id}")
+    if habit_id:
+        print(f"Seeded habit ID: {habit_id}")
+    if args.query_log:
+        print(f"Query log: {args.query_log}")
+    print("=" * 60)
+    print("Start Next.js with:")
+    print(f"  NEXT_PUBLIC_APPWRITE_ENDPOINT=http://{args.host}:{args.port}/v1")
+    print("  NEXT_PUBLIC_APPWRITE_PROJECT_ID=mock")
+    print(f"  NEXT_PUBLIC_APPWRITE_DATABASE_ID={DATABASE_ID}")
+    print("  APPWRITE_API=mock")
+    print("=" * 60 + "\n")
+
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
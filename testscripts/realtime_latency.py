@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Measures how long a write made through the GPT API takes to show up in an open
+browser tab. The tab signs in as the API key's owner and sits on /tasks; each
+probe creates a task through POST /api/gpt/phases/{phaseId}/tasks and then
+completes it through PATCH /api/gpt/tasks/{taskId}, timing until the task
+appears in, and then leaves, the active list.
+
+A MutationObserver in the page stamps the moment the DOM changes, so the numbers
+do not include Playwright's polling. Requires Playwright with a browser installed
+(pip install playwright && playwright install chromium) and a real Appwrite
+project, since realtime events come from Appwrite.
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from datetime import date
+from typing import Dict, List, Optional
+
+import requests
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
+from test_api import BASE_URL, create_session, percentile, timed_request
+
+SAMPLES = 20
+TIMEOUT_MS = 15000
+TASKS_READY = "h2:has-text('Tasks')"
+
+# Stamps Date.now() when a probe title appears in (or leaves) the page
+PROBE_SCRIPT = """
+() => {
+    window.__probes = {};
+    const check = () => {
+        const text = document.body.innerText;
+        for (const [title, probe] of Object.entries(window.__probes)) {
+            if (probe.at === null && text.includes(title) === probe.present) {
+                probe.at = Date.now();
+            }
+        }
+    };
+    new MutationObserver(check).observe(document.body, { childList: true, subtree: true, characterData: true });
+}
+"""
+
+
+def watch_for(page, title: str, present: bool):
+    page.evaluate(
+        "([title, present]) => { window.__probes[title] = { present, at: null }; }",
+        [title, present]
+    )
+
+
+def wait_for_probe(page, title: str, timeout_ms: int) -> float:
+    """Wait until the probe fires and return the page's Date.now() stamp in ms."""
+    page.wait_for_function(
+        "(title) => window.__probes[title].at !== null", arg=title, timeout=timeout_ms
+    )
+    return page.evaluate("(title) => window.__probes[title].at", title)
+
+
+class GptClient:
+    """The API side of the probe: the writes the GPT would make."""
+
+    def __init__(self, base_url: str, api_key: str):
+        self.base_url = base_url
+        self.session = create_session(pool_size=1)
+        self.headers = {"Content-Type": "application/json", "X-API-Key": api_key}
+
+    def post(self, path: str, endpoint: str, payload: dict) -> requests.Response:
+        return self.send("POST", path, endpoint, payload)
+
+    def send(self, method: str, path: str, endpoint: str, payload: dict) -> requests.Response:
+        response, timing = timed_request(
+            self.session, method, f"{self.base_url}{path}", endpoint, self.headers, payload
+        )
+        if response is None or response.status_code not in (200, 201):
+            raise requests.RequestException(f"{endpoint} failed: {timing['error'] or timing['status']}")
+        return response
+
+
+def sign_in(page, base_url: str, email: str, password: str):
+    page.goto(f"{base_url}/login")
+    page.fill("input[type='email']", email)
+    page.fill("input[type='password']", password)
+    page.click("button[type='submit']")
+    page.wait_for_url(f"{base_url}/")
+
+
+def run_probes(args) -> Dict[str, List[float]]:
+    gpt = GptClient(args.base_url, args.api_key)
+    run_id = uuid.uuid4().hex[:8]
+    tree = gpt.post(
+        "/api/gpt/goals/tree",
+        "POST /api/gpt/goals/tree",
+        {"title": f"Realtime probe {run_id}", "phases": [{"title": "Probes"}]}
+    ).json()
+    phase_id = tree["phases"][0]["$id"]
+
+    samples: Dict[str, List[float]] = {"create": [], "complete": [], "api_create": [], "api_complete": []}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=not args.headed)
+        page = browser.new_page()
+        page.set_default_timeout(args.timeout)
+        sign_in(page, args.base_url, args.email, args.password)
+        page.click("text=Tasks")
+        page.wait_for_url("**/tasks")
+        page.wait_for_selector(TASKS_READY)
+        page.evaluate(PROBE_SCRIPT)
+
+        for i in range(args.samples):
+            title = f"Realtime probe {run_id}-{i}"
+
+            watch_for(page, title, True)
+            sent = time.time() * 1000
+            task = gpt.post(
+                f"/api/gpt/phases/{phase_id}/tasks",
+                "POST /api/gpt/phases/{phaseId}/tasks",
+                {"title": title, "dueDate": date.today().isoformat()}
+            ).json()
+            samples["api_create"].append(time.time() * 1000 - sent)
+            try:
+                samples["create"].append(wait_for_probe(page, title, args.timeout) - sent)
+            except PlaywrightTimeoutError:
+                print(f"❌ {title} never appeared; is realtime connected?")
+                continue
+
+            watch_for(page, title, False)
+            sent = time.time() * 1000
+            gpt.send(
+                "PATCH",
+                f"/api/gpt/tasks/{task['$id']}",
+                "PATCH /api/gpt/tasks/{taskId}",
+                {"isCompleted": True}
+            )
+            samples["api_complete"].append(time.time() * 1000 - sent)
+            try:
+                samples["complete"].append(wait_for_probe(page, title, args.timeout) - sent)
+            except PlaywrightTimeoutError:
+                print(f"❌ {title} never left the active list")
+
+            print(f"  probe {i + 1}/{args.samples}", end="\r")
+
+        browser.close()
+    print()
+    return samples
+
+
+def print_report(samples: Dict[str, List[float]]):
+    print("\n" + "=" * 60)
+    print("GPT WRITE -> UI LATENCY (ms)")
+    print("=" * 60)
+    print(f"{'Write':<10}  {'n':>4}  {'API p50':>8}  {'UI p50':>8}  {'UI p95':>8}  {'UI max':>8}")
+    for case in ("create", "complete"):
+        ui, api = samples[case], samples[f"api_{case}"]
+        print(
+            f"{case:<10}  {len(ui):>4}  {percentile(api, 50):>8.1f}  "
+            f"{percentile(ui, 50):>8.1f}  {percentile(ui, 95):>8.1f}  {max(ui, default=0.0):>8.1f}"
+        )
+    print("=" * 60)
+    print("UI latency runs from sending the API request to the DOM change, so it includes the API call.\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Measure how fast GPT API writes reach an open browser tab")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Base URL of the app (default: {BASE_URL})")
+    parser.add_argument("--api-key", required=True, help="API key of the signed-in user")
+    parser.add_argument("--email", required=True, help="Email of the API key's owner")
+    parser.add_argument("--password", required=True, help="Password of the API key's owner")
+    parser.add_argument("--samples", type=int, default=SAMPLES, help=f"Tasks created and completed (default: {SAMPLES})")
+    parser.add_argument("--timeout", type=int, default=TIMEOUT_MS, help=f"Per-step timeout in ms (default: {TIMEOUT_MS})")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    args = parser.parse_args(argv)
+
+    print("\n" + "=" * 60)
+    print("KAI REALTIME LATENCY")
+    print(f"Base URL: {args.base_url}")
+    print("=" * 60)
+
+    try:
+        samples = run_probes(args)
+    except requests.RequestException as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print_report(samples)
+    if not samples["create"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
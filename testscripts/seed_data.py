@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Seeds reproducible synthetic accounts for benchmarks and load tests.
+
+Every user gets goal -> phase -> task trees, habits with years of completion
+history, inbox items and resources. The dataset is generated from --seed, so
+the same arguments always produce the same documents with the same IDs, and a
+re-run skips what already exists and fills in the rest.
+
+Targets:
+  appwrite  The Appwrite REST API (the mock by default). Writes each user's
+            documents with bulk creates, many users at a time, and gives
+            every user an API key for the GPT routes (see --keys-file).
+  api       The GPT API, one user per --api-key. Only goal trees can be
+            created there (POST /api/gpt/goals/tree), with new IDs each run.
+  local     An in-process stand-in, seeded directly and then served on --port.
+
+Resources point at file IDs that do not exist in storage; they are only there
+to give the lists a realistic size.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+import requests
+
+from mock_appwrite import AppwriteError, DocumentStore, MockAppwriteServer, now_iso
+from test_api import BASE_URL, create_session
+
+APPWRITE_ENDPOINT = "http://127.0.0.1:8090/v1"
+APPWRITE_PROJECT = "mock"
+DATABASE_ID = "mock"
+WORKERS = 8
+# Documents per bulk create request
+BATCH_SIZE = 100
+# Limits of POST /api/gpt/goals/tree
+MAX_TREE_PHASES = 20
+MAX_TREE_TASKS = 200
+# Days of history kept in recentRuns, as RECENT_DAYS in habit-utils.ts
+RECENT_DAYS = 30
+
+# Write order: a user's goals before their phases, phases before tasks
+COLLECTIONS = ["goals", "phases", "tasks", "habits", "inbox", "resources", "api_keys"]
+
+
+class SeedSpec(NamedTuple):
+    """Size and shape of a seeded dataset."""
+    users: int = 100
+    goals: int = 3              # per user
+    phases: int = 3             # per goal
+    tasks: int = 10             # per phase
+    habits: int = 5             # per user
+    history_years: float = 3.0  # of completions per habit
+    inbox: int = 20             # per user
+    resources: int = 5          # per user
+    habit_format: str = "runs"  # completedRuns, or legacy completedDates
+    seed: int = 1
+    today: str = date.today().isoformat()
+
+    def expected_counts(self) -> Dict[str, int]:
+        goals = self.users * self.goals
+        return {
+            "goals": goals,
+            "phases": goals * self.phases,
+            "tasks": goals * self.phases * self.tasks,
+            "habits": self.users * self.habits,
+            "inbox": self.users * self.inbox,
+            "resources": self.users * self.resources,
+            "api_keys": self.users,
+        }
+
+
+def seed_user_id(index: int) -> str:
+    return f"seed_user_{index:05d}"
+
+
+def permissions_for(user_id: str) -> List[str]:
+    """What the GPT routes grant on the documents they create."""
+    return [f'read("user:{user_id}")', f'update("user:{user_id}")', f'delete("user:{user_id}")']
+
+
+def build_completion_runs(rng: random.Random, days: int, today: date) -> List[str]:
+    """
+    Completion history over the last `days` days as "YYYY-MM-DD/N" runs, oldest first.
+    Each habit gets its own adherence, so streak lengths vary between habits.
+    """
+    adherence = rng.uniform(0.5, 0.95)
+    runs, start, length = [], None, 0
+    for offset in range(days - 1, -1, -1):
+        day = today - timedelta(days=offset)
+        if rng.random() < adherence:
+            if not length:
+                start = day
+            length += 1
+        elif length:
+            runs.append(f"{start.isoformat()}/{length}")
+            length = 0
+    if length:
+        runs.append(f"{start.isoformat()}/{length}")
+    return runs
+
+
+def expand_runs(runs: List[str]) -> List[str]:
+    dates = []
+    for run in runs:
+        start, length = run.split("/")
+        first = date.fromisoformat(start)
+        dates.extend((first + timedelta(days=i)).isoformat() for i in range(int(length)))
+    return dates
+
+
+def summarize_runs(runs: List[str], today: date) -> dict:
+    """The derived habit fields, as summarizeRuns in habit-utils.ts computes them."""
+    if not runs:
+        return {"streak": 0, "longestStreak": 0, "lastCompletedDate": None, "recentRuns": []}
+    parsed = [(date.fromisoformat(run.split("/")[0]), int(run.split("/")[1])) for run in runs]
+    last_start, last_length = parsed[-1]
+    last_date = last_start + timedelta(days=last_length - 1)
+    window_start = today - timedelta(days=RECENT_DAYS - 1)
+    recent = []
+    for start, length in parsed:
+        end = start + timedelta(days=length - 1)
+        if end >= window_start:
+            clipped = max(start, window_start)
+            recent.append(f"{clipped.isoformat()}/{(end - clipped).days + 1}")
+    return {
+        "streak": last_length if (today - last_date).days <= 1 else 0,
+        "longestStreak": max(length for _, length in parsed),
+        "lastCompletedDate": last_date.isoformat(),
+        "recentRuns": recent,
+    }
+
+
+def build_user(spec: SeedSpec, index: int) -> Dict[str, List[dict]]:
+    """
+    All documents for one seeded user, per collection, in the bulk create format
+    ($id and $permissions next to the data). Generated from (seed, index) alone.
+    """
+    rng = random.Random(f"{spec.seed}:{index}")
+    today = date.fromisoformat(spec.today)
+    user_id = seed_user_id(index)
+    prefix = f"s{spec.seed}u{index:05d}"
+    permissions = permissions_for(user_id)
+    docs: Dict[str, List[dict]] = {collection: [] for collection in COLLECTIONS}
+
+    def add(collection: str, document_id: str, data: dict):
+        docs[collection].append({"$id": document_id, "$permissions": permissions, **data})
+
+    for g in range(spec.goals):
+        goal_id = f"{prefix}g{g:02d}"
+        add("goals", goal_id, {
+            "title": f"Goal {g + 1}",
+            "description": f"Seeded goal {g + 1} of {user_id}",
+            "deadline": f"{(today + timedelta(days=rng.randint(30, 365))).isoformat()}T00:00:00.000+00:00",
+            "userId": user_id,
+        })
+        for p in range(spec.phases):
+            phase_id = f"{goal_id}p{p:02d}"
+            add("phases", phase_id, {"title": f"Phase {p + 1}", "goalId": goal_id, "order": p + 1, "isCompleted": False})
+            for t in range(spec.tasks):
+                due = today + timedelta(days=rng.randint(-90, 90))
+                # Most overdue tasks are done, most upcoming ones are not
+                done = rng.random() < (0.8 if due < today else 0.1)
+                add("tasks", f"{phase_id}t{t:03d}", {
+                    "title": f"Task {p + 1}.{t + 1}",
+                    "isCompleted": done,
+                    "dueDate": f"{due.isoformat()}T00:00:00.000+00:00",
+                    "phaseId": phase_id,
+                    "goalId": goal_id,
+                    "userId": user_id,
+                })
+
+    history_days = int(spec.history_years * 365)
+    for h in range(spec.habits):
+        runs = build_completion_runs(rng, history_days, today)
+        history = {"completedRuns": runs} if spec.habit_format == "runs" else {"completedDates": expand_runs(runs)}
+        add("habits", f"{prefix}h{h:02d}", {"title": f"Habit {h + 1}", "userId": user_id,
+                                            **summarize_runs(runs, today), **history})
+
+    for i in range(spec.inbox):
+        add("inbox", f"{prefix}i{i:04d}", {"content": f"Note {i + 1}", "userId": user_id,
+                                           "isProcessed": rng.random() < 0.7})
+    for r in range(spec.resources):
+        add("resources", f"{prefix}r{r:03d}", {"title": f"File {r + 1}.pdf", "fileId": f"{prefix}f{r:03d}",
+                                               "bucketId": "resources", "userId": user_id})
+
+    add("api_keys", f"{prefix}k", {"userId": user_id, "key": f"seed_{spec.seed}_{index:05d}_{rng.getrandbits(64):016x}",
+                                   "createdAt": now_iso()})
+    return docs
+
+
+class SeedStats:
+    """Documents created and found already present, per collection. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.created: Dict[str, int] = {collection: 0 for collection in COLLECTIONS}
+        self.existing: Dict[str, int] = {collection: 0 for collection in COLLECTIONS}
+        self.requests = 0
+
+    def add(self, collection: str, created: int, existing: int = 0, requests_sent: int = 1):
+        with self._lock:
+            self.created[collection] += created
+            self.existing[collection] += existing
+            self.requests += requests_sent
+
+
+class AppwriteWriter:
+    """Writes seeded documents through the Appwrite REST API, with bulk creates where supported."""
+
+    def __init__(self, endpoint: str, project: str, database_id: str, api_key: Optional[str],
+                 workers: int = WORKERS, batch_size: int = BATCH_SIZE, bulk: bool = True):
+        self.url = f"{endpoint.rstrip('/')}/databases/{database_id}/collections"
+        self.batch_size = batch_size
+        self.bulk = bulk
+        self.session = create_session(pool_size=workers)
+        self.headers = {"Content-Type": "application/json", "X-Appwrite-Project": project}
+        if api_key:
+            self.headers["X-Appwrite-Key"] = api_key
+
+    def existing_ids(self, collection: str, ids: List[str]) -> set:
+        """Which of these document IDs are already stored, e.g. by an interrupted earlier run."""
+        response = self.session.get(f"{self.url}/{collection}/documents", headers=self.headers, params={
+            "queries[0]": json.dumps({"method": "equal", "attribute": "$id", "values": ids}),
+            "queries[1]": json.dumps({"method": "select", "values": ["$id"]}),
+            "queries[2]": json.dumps({"method": "limit", "values": [len(ids)]}),
+        }, timeout=30)
+        response.raise_for_status()
+        return {doc["$id"] for doc in response.json()["documents"]}
+
+    def write(self, collection: str, docs: List[dict], stats: SeedStats):
+        url = f"{self.url}/{collection}/documents"
+        for start in range(0, len(docs), self.batch_size):
+            chunk = docs[start:start + self.batch_size]
+            if self.bulk:
+                response = self.session.post(url, headers=self.headers, json={"documents": chunk}, timeout=60)
+                if response.status_code == 409:
+                    # Bulk creates are all or nothing; retry with only the missing documents
+                    existing = self.existing_ids(collection, [doc["$id"] for doc in chunk])
+                    chunk = [doc for doc in chunk if doc["$id"] not in existing]
+                    stats.add(collection, 0, len(existing))
+                    if not chunk:
+                        continue
+                    response = self.session.post(url, headers=self.headers, json={"documents": chunk}, timeout=60)
+                if response.status_code in (200, 201):
+                    stats.add(collection, len(chunk))
+                    continue
+                # Appwrite before 1.7 has no bulk create
+                print(f"⚠️  Bulk create failed ({response.status_code}), writing one document per request")
+                self.bulk = False
+            # One by one, skipping documents left by an earlier run
+            for doc in chunk:
+                data = {k: v for k, v in doc.items() if not k.startswith("$")}
+                response = self.session.post(url, headers=self.headers, json={
+                    "documentId": doc["$id"], "data": data, "permissions": doc["$permissions"]
+                }, timeout=30)
+                if response.status_code == 409:
+                    stats.add(collection, 0, 1)
+                    continue
+                response.raise_for_status()
+                stats.add(collection, 1)
+
+    def seed_user(self, spec: SeedSpec, index: int, stats: SeedStats) -> dict:
+        docs = build_user(spec, index)
+        for collection in COLLECTIONS:
+            self.write(collection, docs[collection], stats)
+        return user_summary(index, docs)
+
+
+class ApiWriter:
+    """Creates goal trees through the GPT API, as the user owning each API key."""
+
+    def __init__(self, base_url: str, api_keys: List[str], workers: int = WORKERS):
+        self.base_url = base_url.rstrip("/")
+        self.api_keys = api_keys
+        self.session = create_session(pool_size=workers)
+
+    def post(self, api_key: str, path: str, payload: dict) -> dict:
+        response = self.session.post(
+            f"{self.base_url}{path}",
+            headers={"Content-Type": "application/json", "X-API-Key": api_key},
+            json=payload,
+            timeout=60
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def seed_user(self, spec: SeedSpec, index: int, stats: SeedStats) -> dict:
+        api_key = self.api_keys[index]
+        docs = build_user(spec, index)
+        tasks_by_phase: Dict[str, List[dict]] = {}
+        for task in docs["tasks"]:
+            tasks_by_phase.setdefault(task["phaseId"], []).append(
+                {"title": task["title"], "dueDate": task["dueDate"]}
+            )
+
+        for goal in docs["goals"]:
+            phases = [p for p in docs["phases"] if p["goalId"] == goal["$id"]]
+            # The tree takes up to MAX_TREE_TASKS tasks; the rest go through each phase's batch route
+            budget, overflow = MAX_TREE_TASKS, []
+            payload_phases = []
+            for phase in phases:
+                tasks = tasks_by_phase.get(phase["$id"], [])
+                payload_phases.append({"title": phase["title"], "order": phase["order"], "tasks": tasks[:budget]})
+                overflow.append(tasks[budget:])
+                budget = max(0, budget - len(tasks))
+            tree = self.post(api_key, "/api/gpt/goals/tree", {
+                "title": goal["title"],
+                "description": goal["description"],
+                "deadline": goal["deadline"],
+                "phases": payload_phases,
+            })
+            stats.add("goals", 1)
+            stats.add("phases", len(tree["phases"]), requests_sent=0)
+            stats.add("tasks", sum(len(p["tasks"]) for p in tree["phases"]), requests_sent=0)
+            for phase, rest in zip(tree["phases"], overflow):
+                for start in range(0, len(rest), MAX_TREE_TASKS):
+                    chunk = rest[start:start + MAX_TREE_TASKS]
+                    self.post(api_key, f"/api/gpt/phases/{phase['$id']}/tasks/batch", {"tasks": chunk})
+                    stats.add("tasks", len(chunk))
+        return {"userId": None, "apiKey": api_key, "habitId": None}
+
+
+def user_summary(index: int, docs: Dict[str, List[dict]]) -> dict:
+    return {
+        "userId": seed_user_id(index),
+        "apiKey": docs["api_keys"][0]["key"],
+        "habitId": docs["habits"][0]["$id"] if docs["habits"] else None,
+    }
+
+
+def seed_store(store: DocumentStore, spec: SeedSpec, stats: Optional[SeedStats] = None) -> List[dict]:
+    """Seed an in-process DocumentStore directly. Returns one summary per user."""
+    stats = stats or SeedStats()
+    users = []
+    for index in range(spec.users):
+        docs = build_user(spec, index)
+        for collection in COLLECTIONS:
+            try:
+                store.create_documents(collection, docs[collection])
+                stats.add(collection, len(docs[collection]), requests_sent=0)
+            except AppwriteError:
+                stats.add(collection, 0, len(docs[collection]), requests_sent=0)
+        users.append(user_summary(index, docs))
+    return users
+
+
+def seed_concurrently(writer, spec: SeedSpec, users: int, workers: int, stats: SeedStats) -> List[dict]:
+    """Seed users in parallel; each user's own documents are written in dependency order."""
+    done = [0]
+    lock = threading.Lock()
+    step = max(1, users // 10)
+
+    def seed_one(index: int) -> dict:
+        summary = writer.seed_user(spec, index, stats)
+        with lock:
+            done[0] += 1
+            if done[0] % step == 0 or done[0] == users:
+                print(f"  {done[0]}/{users} users seeded")
+        return summary
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(seed_one, range(users)))
+
+
+def print_report(spec: SeedSpec, target: str, stats: SeedStats, elapsed: float):
+    expected = spec.expected_counts()
+    print("\n" + "=" * 60)
+    print(f"SEEDED DATASET (target: {target}, seed: {spec.seed}, today: {spec.today})")
+    print("=" * 60)
+    print(f"{'Collection':<11} {'Expected':>10} {'Created':>10} {'Existing':>10}")
+    # The GPT API only creates goal trees
+    for collection in COLLECTIONS[:3] if target == "api" else COLLECTIONS:
+        print(f"{collection:<11} {expected[collection]:>10} {stats.created[collection]:>10} "
+              f"{stats.existing[collection]:>10}")
+    created = sum(stats.created.values())
+    rate = created / elapsed if elapsed > 0 else 0.0
+    print(f"\n{created} documents in {elapsed:.1f} s ({rate:.0f}/s, {stats.requests} requests)")
+    print("=" * 60)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Seed reproducible synthetic accounts for benchmarks")
+    parser.add_argument("--target", choices=["appwrite", "api", "local"], default="appwrite",
+                        help="Where to write: Appwrite REST, the GPT API or an in-process stand-in (default: appwrite)")
+    defaults = SeedSpec()
+    parser.add_argument("--users", type=int, default=defaults.users, help=f"Users to seed (default: {defaults.users})")
+    parser.add_argument("--goals", type=int, default=defaults.goals, help=f"Goals per user (default: {defaults.goals})")
+    parser.add_argument("--phases", type=int, default=defaults.phases, help=f"Phases per goal (default: {defaults.phases})")
+    parser.add_argument("--tasks", type=int, default=defaults.tasks, help=f"Tasks per phase (default: {defaults.tasks})")
+    parser.add_argument("--habits", type=int, default=defaults.habits, help=f"Habits per user (default: {defaults.habits})")
+    parser.add_argument("--history-years", type=float, default=defaults.history_years,
+                        help=f"Years of completion history per habit (default: {defaults.history_years:g})")
+    parser.add_argument("--inbox", type=int, default=defaults.inbox, help=f"Inbox items per user (default: {defaults.inbox})")
+    parser.add_argument("--resources", type=int, default=defaults.resources,
+                        help=f"Resources per user (default: {defaults.resources})")
+    parser.add_argument("--habit-format", choices=["runs", "dates"], default=defaults.habit_format,
+                        help="Store histories as completedRuns, or as legacy completedDates (default: runs)")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help=f"Dataset seed (default: {defaults.seed})")
+    parser.add_argument("--today", default=defaults.today,
+                        help="Date the histories and due dates are relative to (default: today)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help=f"Users seeded in parallel (default: {WORKERS})")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"Documents per bulk create (default: {BATCH_SIZE})")
+    parser.add_argument("--no-bulk", action="store_true", help="Write one document per request")
+    parser.add_argument("--endpoint", default=APPWRITE_ENDPOINT, help=f"Appwrite endpoint (default: {APPWRITE_ENDPOINT})")
+    parser.add_argument("--project", default=APPWRITE_PROJECT, help=f"Appwrite project ID (default: {APPWRITE_PROJECT})")
+    parser.add_argument("--key", default=None, help="Appwrite API key with documents.write (not needed for the mock)")
+    parser.add_argument("--database-id", default=DATABASE_ID, help=f"Database ID (default: {DATABASE_ID})")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"GPT API base URL for --target api (default: {BASE_URL})")
+    parser.add_argument("--api-key", action="append", default=[],
+                        help="GPT API key for --target api, one user each (repeatable)")
+    parser.add_argument("--port", type=int, default=8090, help="Port to serve --target local on (default: 8090)")
+    parser.add_argument("--keys-file", default=None, help="Write the seeded users' API keys here, one per line")
+    parser.add_argument("--manifest", default=None, help="Write the spec, counts and per-user IDs to this JSON file")
+    args = parser.parse_args(argv)
+
+    spec = SeedSpec(
+        users=len(args.api_key) if args.target == "api" else args.users,
+        goals=args.goals, phases=args.phases, tasks=args.tasks, habits=args.habits,
+        history_years=args.history_years, inbox=args.inbox, resources=args.resources,
+        habit_format=args.habit_format, seed=args.seed, today=args.today,
+    )
+    if args.target == "api" and not args.api_key:
+        parser.error("--target api needs at least one --api-key")
+    if args.target == "api" and args.phases > MAX_TREE_PHASES:
+        parser.error(f"--target api creates at most {MAX_TREE_PHASES} phases per goal")
+
+    print("=" * 60)
+    print("SEEDING")
+    print(f"Target: {args.target}, users: {spec.users}" + ("" if args.target == "local" else f", workers: {args.workers}"))
+    print(", ".join(f"{count} {collection}" for collection, count in spec.expected_counts().items()))
+    print("=" * 60)
+
+    stats = SeedStats()
+    started = time.perf_counter()
+    mock = None
+    try:
+        if args.target == "local":
+            mock = MockAppwriteServer(port=args.port)
+            users = seed_store(mock.store, spec, stats)
+        elif args.target == "api":
+            users = seed_concurrently(ApiWriter(args.base_url, args.api_key, args.workers),
+                                      spec, spec.users, args.workers, stats)
+        else:
+            writer = AppwriteWriter(args.endpoint, args.project, args.database_id, args.key,
+                                    args.workers, args.batch_size, bulk=not args.no_bulk)
+            users = seed_concurrently(writer, spec, spec.users, args.workers, stats)
+    except requests.RequestException as e:
+        print(f"❌ Seeding failed: {e}")
+        sys.exit(1)
+    print_report(spec, args.target, stats, time.perf_counter() - started)
+
+    if args.keys_file:
+        with open(args.keys_file, "w") as f:
+            f.writelines(f"{user['apiKey']}\n" for user in users)
+        print(f"API keys written to {args.keys_file}")
+    if args.manifest:
+        with open(args.manifest, "w") as f:
+            json.dump({"spec": spec._asdict(), "target": args.target, "created": stats.created,
+                       "existing": stats.existing, "users": users}, f, indent=2)
+        print(f"Manifest written to {args.manifest}")
+    if users and users[0]["habitId"]:
+        print(f"First user: --api-key {users[0]['apiKey']} --habit-id {users[0]['habitId']}")
+
+    if mock:
+        mock.start()
+        print(f"\nServing the seeded stand-in at {mock.endpoint} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            mock.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,23 @@ Tests all available endpoints: Goals, Phases, Tasks, and Habits.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+import csv
 import json
-from datetime import datetime, timedelta
-from typing import Optional
+import math
+import os
+import random
+import secrets
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 # Configuration
 BASE_URL = "http://localhost:3000" # Replace with your actual API base URL
@@ -19,34 +33,432 @@ HEADERS = {
     "X-API-Key": API_KEY
 }
 
+# HTTP connection pool defaults
+POOL_SIZE = 10
+RETRIES = 2
+TIMEOUT = 30.0
+
+# Default regression threshold (percent) for --compare
+REGRESSION_THRESHOLD = 20.0
+
+# Follow-up requests used to measure warm API-key cache latency
+WARM_REPEATS = 5
+
+# Plan size for the batch vs one-by-one comparison
+BATCH_PHASES = 3
+BATCH_TASKS_PER_PHASE = 5
+
+# Days backfilled by the bulk habit log comparison
+HABIT_BULK_DAYS = 7
+
+# Concurrent copies of one request sent by the idempotency test
+IDEMPOTENCY_DUPLICATES = 5
+
+# Soak mode: total request rate, reporting window and the memory growth (percent) that is flagged
+SOAK_RATE = 10.0
+SOAK_WINDOW = 60.0
+MEMORY_THRESHOLD = 10.0
+# Latency trends smaller than this (ms) over the run are jitter, whatever the percentage
+SOAK_MIN_LATENCY_CHANGE = 5.0
+
+# Tasks seeded and page size for the paging benchmark
+PAGING_TASKS = 10000
+PAGE_SIZE = 100
+BATCH_MAX_TASKS = 200
+
+# Socket setup time (DNS + TCP/TLS connect) spent by the current thread's last request
+_connect_timing = threading.local()
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """HTTPConnection that records how long DNS resolution and connect took."""
+    
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect_timing.seconds = getattr(_connect_timing, "seconds", 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    """HTTPSConnection that records how long DNS resolution, connect and TLS took."""
+    
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect_timing.seconds = getattr(_connect_timing, "seconds", 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools use the timed connection classes."""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+def create_session(pool_size: int = POOL_SIZE, retries: int = RETRIES) -> requests.Session:
+    """Create a keep-alive session with a bounded connection pool and retry policy.
+
+    Retries cover connection failures for every method, but status-based retries
+    (429/502/503/504) only apply to idempotent methods so POSTs are never duplicated.
+    A 429 is retried after its Retry-After.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=(429, 502, 503, 504),
+        raise_on_status=False
+    )
+    adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def connection_stats(session: requests.Session) -> Dict[str, int]:
+    """Return how many requests the session's pools served and how many sockets they opened."""
+    stats = {"requests": 0, "connections": 0, "reused": 0}
+    seen = set()
+    for adapter in session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats["requests"] += pool.num_requests
+            stats["connections"] += pool.num_connections
+    stats["reused"] = max(0, stats["requests"] - stats["connections"])
+    return stats
+
+
+def print_connection_stats(session: requests.Session):
+    """Print connection reuse for a session."""
+    stats = connection_stats(session)
+    reuse_rate = (stats["reused"] / stats["requests"] * 100) if stats["requests"] else 0.0
+    print(f"Connections opened: {stats['connections']}")
+    print(f"Requests sent: {stats['requests']}")
+    print(f"Connection reuse: {stats['reused']} ({reuse_rate:.1f}%)")
+
+
+def timed_request(session: requests.Session, method: str, url: str, endpoint: str,
+                  headers: dict, payload: Optional[dict] = None,
+                  timeout: float = TIMEOUT):
+    """Send a request and measure it.
+
+    Returns ``(response, timing)``. ``response`` is None when the request raised;
+    ``timing`` always holds the endpoint, status and the latency breakdown in ms.
+    """
+    _connect_timing.seconds = 0.0
+    timing: Dict[str, Any] = {
+        "endpoint": endpoint,
+        "method": method,
+        "status": None,
+        "connect_ms": 0.0,
+        "ttfb_ms": 0.0,
+        "total_ms": 0.0,
+        "request_bytes": 0,
+        "response_bytes": 0,
+        "server_timing": "",
+        "error": None,
+        "timestamp": datetime.now().isoformat(),
+    }
+    start = time.perf_counter()
+    try:
+        response = session.request(method, url, headers=headers, json=payload, timeout=timeout)
+        # Read the body inside the timed section so total includes the transfer
+        content = response.content
+    except requests.RequestException as e:
+        timing["total_ms"] = (time.perf_counter() - start) * 1000
+        timing["connect_ms"] = _connect_timing.seconds * 1000
+        timing["error"] = str(e)
+        return None, timing
+    
+    timing["total_ms"] = (time.perf_counter() - start) * 1000
+    timing["connect_ms"] = _connect_timing.seconds * 1000
+    # requests measures elapsed from sending the request until the response headers are parsed
+    timing["ttfb_ms"] = response.elapsed.total_seconds() * 1000
+    timing["status"] = response.status_code
+    body = response.request.body or b""
+    timing["request_bytes"] = len(body.encode() if isinstance(body, str) else body)
+    timing["response_bytes"] = len(content)
+    timing["server_timing"] = response.headers.get("Server-Timing", "")
+    return response, timing
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """Parse a Server-Timing header into {stage: duration in ms}, e.g. "auth;dur=1.2, total;dur=9.8"."""
+    stages: Dict[str, float] = {}
+    for entry in header.split(","):
+        name, *params = [part.strip() for part in entry.split(";")]
+        if not name:
+            continue
+        for param in params:
+            key, _, value = param.partition("=")
+            if key == "dur":
+                stages[name] = stages.get(name, 0.0) + float(value)
+    return stages
+
+
+def summarize_timings(timings: List[dict]) -> Dict[str, Dict[str, float]]:
+    """Aggregate request timings into per-endpoint latency statistics."""
+    grouped: Dict[str, List[dict]] = defaultdict(list)
+    for timing in timings:
+        grouped[timing["endpoint"]].append(timing)
+    
+    summary = {}
+    for endpoint, rows in grouped.items():
+        totals = [float(r["total_ms"]) for r in rows]
+        summary[endpoint] = {
+            "count": len(rows),
+            "errors": sum(1 for r in rows if r.get("error") or not r.get("status")),
+            "connect_ms_mean": sum(float(r["connect_ms"]) for r in rows) / len(rows),
+            "ttfb_ms_p50": percentile([float(r["ttfb_ms"]) for r in rows], 50),
+            "p50": percentile(totals, 50),
+            "p95": percentile(totals, 95),
+            "p99": percentile(totals, 99),
+            "mean": sum(totals) / len(totals),
+            "request_bytes_mean": sum(int(r["request_bytes"]) for r in rows) / len(rows),
+            "response_bytes_mean": sum(int(r["response_bytes"]) for r in rows) / len(rows),
+        }
+    return summary
+
+
+def print_timing_table(timings: List[dict]):
+    """Print the per-endpoint latency breakdown."""
+    summary = summarize_timings(timings)
+    if not summary:
+        return
+    print(f"{'Endpoint':<40} {'Count':>6} {'conn ms':>8} {'ttfb p50':>9} {'p50 ms':>8} {'p95 ms':>8} {'resp B':>8}")
+    for endpoint, stats in summary.items():
+        print(
+            f"{endpoint:<40} {stats['count']:>6} {stats['connect_ms_mean']:>8.1f} "
+            f"{stats['ttfb_ms_p50']:>9.1f} {stats['p50']:>8.1f} {stats['p95']:>8.1f} "
+            f"{stats['response_bytes_mean']:>8.0f}"
+        )
+
+
+def summarize_server_timings(timings: List[dict]) -> Dict[str, Dict[str, float]]:
+    """Per-endpoint p50 of each server-side stage, plus the network share of the client total."""
+    grouped: Dict[str, List[dict]] = defaultdict(list)
+    for timing in timings:
+        stages = parse_server_timing(timing.get("server_timing") or "")
+        if "total" in stages:
+            grouped[timing["endpoint"]].append({**stages, "network": float(timing["total_ms"]) - stages["total"]})
+
+    summary = {}
+    for endpoint, rows in grouped.items():
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        summary[endpoint] = {"count": len(rows)}
+        summary[endpoint].update({name: percentile([row.get(name, 0.0) for row in rows], 50) for name in names})
+    return summary
+
+
+def print_stage_breakdown(timings: List[dict]):
+    """Print where time goes inside each endpoint, from the Server-Timing headers the routes send.
+
+    Stages can nest (a db-list inside auth) or run concurrently (the db-create calls of a goal
+    tree), so they don't add up to the server total.
+    """
+    summary = summarize_server_timings(timings)
+    if not summary:
+        return
+    print("Server-side stages (p50 ms, from Server-Timing):")
+    for endpoint, stages in summary.items():
+        total = stages["total"]
+        print(f"  {endpoint} ({stages['count']} requests, server {total:.1f} ms, network {stages['network']:.1f} ms)")
+        ranked = sorted(
+            ((name, ms) for name, ms in stages.items() if name not in ("count", "total", "network")),
+            key=lambda stage: -stage[1]
+        )
+        for name, ms in ranked:
+            share = ms / total * 100 if total > 0 else 0.0
+            print(f"    {name:<14} {ms:>8.1f} {share:>5.0f}%")
+
+
+RESULT_FIELDS = [
+    "endpoint", "method", "status", "connect_ms", "ttfb_ms", "total_ms",
+    "request_bytes", "response_bytes", "server_timing", "error", "timestamp",
+]
+
+
+def write_results(path: str, timings: List[dict], run_info: dict, tests: Optional[list] = None):
+    """Write request timings to a JSON or CSV file (chosen by extension)."""
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for timing in timings:
+                writer.writerow(timing)
+    else:
+        with open(path, "w") as f:
+            json.dump({
+                "run": run_info,
+                "endpoints": summarize_timings(timings),
+                "stages": summarize_server_timings(timings),
+                "tests": tests or [],
+                "requests": timings,
+            }, f, indent=2)
+    print(f"Results written to {path}")
+
+
+def load_results(path: str) -> List[dict]:
+    """Load request timings from a results file written by write_results."""
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as f:
+            return [
+                {**row, "status": int(row["status"]) if row["status"] else None, "error": row["error"] or None}
+                for row in csv.DictReader(f)
+            ]
+    with open(path) as f:
+        return json.load(f).get("requests", [])
+
+
+def compare_results(baseline_path: str, current_path: str, threshold: float = REGRESSION_THRESHOLD,
+                    metric: str = "p95") -> int:
+    """Diff two result files and flag endpoints whose latency regressed past the threshold."""
+    baseline = summarize_timings(load_results(baseline_path))
+    current = summarize_timings(load_results(current_path))
+    
+    print("\n" + "=" * 60)
+    print("LATENCY COMPARISON")
+    print(f"Baseline: {baseline_path}")
+    print(f"Current:  {current_path}")
+    print(f"Metric: {metric}, regression threshold: +{threshold:.0f}%")
+    print("=" * 60)
+    print(f"{'Endpoint':<40} {'Base ms':>9} {'Curr ms':>9} {'Change':>8}")
+    
+    regressions = []
+    for endpoint in sorted(set(baseline) | set(current)):
+        if endpoint not in baseline or endpoint not in current:
+            side = "baseline" if endpoint not in baseline else "current run"
+            print(f"{endpoint:<40} {'(missing from ' + side + ')':>28}")
+            continue
+        before = baseline[endpoint][metric]
+        after = current[endpoint][metric]
+        change = ((after - before) / before * 100) if before > 0 else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  ⚠️ REGRESSED"
+            regressions.append(endpoint)
+        print(f"{endpoint:<40} {before:>9.1f} {after:>9.1f} {change:>+7.1f}%{flag}")
+    
+    print()
+    if regressions:
+        print(f"{len(regressions)} endpoint(s) regressed by more than {threshold:.0f}%:")
+        for endpoint in regressions:
+            print(f"  - {endpoint}")
+    else:
+        print("No regressions ✅")
+    print("=" * 60)
+    
+    return 1 if regressions else 0
+
 
 class APITestRunner:
     """Test runner for Kai Productivity API endpoints."""
     
-    def __init__(self, base_url: str, headers: dict):
+    def __init__(self, base_url: str, headers: dict, session: Optional[requests.Session] = None,
+                 timeout: float = TIMEOUT):
         self.base_url = base_url
         self.headers = headers
+        self.session = session or create_session()
+        self.timeout = timeout
         self.created_goal_id: Optional[str] = None
         self.created_phase_id: Optional[str] = None
         self.created_task_id: Optional[str] = None
         self.test_results: list = []
+        self.request_timings: List[dict] = []
+        self.last_timing: Optional[dict] = None
+    
+    def request(self, method: str, path: str, endpoint: Optional[str] = None,
+                headers: Optional[dict] = None, payload: Optional[dict] = None) -> requests.Response:
+        """Send a timed request; the timing is attached to the next logged result."""
+        response, timing = timed_request(
+            self.session,
+            method,
+            f"{self.base_url}{path}",
+            endpoint or f"{method} {path}",
+            headers if headers is not None else self.headers,
+            payload,
+            self.timeout
+        )
+        self.request_timings.append(timing)
+        self.last_timing = timing
+        if response is None:
+            raise requests.RequestException(timing["error"])
+        return response
+    
+    def measure_warm_latency(self, endpoint: str, headers: dict, payload: dict,
+                             expected_status: int, repeats: int = WARM_REPEATS):
+        """Repeat a POST /api/gpt/goals request; return (all statuses matched, median latency in ms)."""
+        cold_timing = self.last_timing
+        latencies = []
+        try:
+            for _ in range(repeats):
+                response = self.request("POST", "/api/gpt/goals", endpoint=endpoint, headers=headers, payload=payload)
+                if response.status_code != expected_status:
+                    return False, 0.0
+                latencies.append(self.last_timing["total_ms"])
+        finally:
+            # Keep the first (cold) request's timing for the logged result
+            self.last_timing = cold_timing
+        return True, statistics.median(latencies)
+    
+    @staticmethod
+    def describe_warm_latency(cold_ms: float, warm_ms: float) -> str:
+        """Format a cold vs warm latency comparison."""
+        drop = (cold_ms - warm_ms) / cold_ms * 100 if cold_ms > 0 else 0.0
+        return f"cold {cold_ms:.1f} ms, warm median {warm_ms:.1f} ms ({drop:.0f}% faster)"
     
     def log_result(self, test_name: str, success: bool, message: str, response_data: dict = None):
         """Log test result."""
         status = "✅ PASS" if success else "❌ FAIL"
+        timing, self.last_timing = self.last_timing, None
         result = {
             "test": test_name,
             "success": success,
             "message": message,
-            "response": response_data
+            "response": response_data,
+            "timing": timing
         }
         self.test_results.append(result)
         print(f"{status}: {test_name}")
         print(f"   Message: {message}")
+        if timing:
+            print(
+                f"   Timing: connect {timing['connect_ms']:.1f} ms, TTFB {timing['ttfb_ms']:.1f} ms, "
+                f"total {timing['total_ms']:.1f} ms, sent {timing['request_bytes']} B, "
+                f"received {timing['response_bytes']} B"
+            )
         if response_data:
             print(f"   Response: {json.dumps(response_data, indent=2)[:500]}")
         print()
     
+    def write_results(self, path: str) -> None:
+        """Write this run's tests and request timings to a results file."""
+        write_results(path, self.request_timings, {
+            "mode": "functional",
+            "base_url": self.base_url,
+            "timestamp": datetime.now().isoformat()
+        }, self.test_results)
+    
     def test_create_goal(self) -> bool:
         """Test POST /api/gpt/goals - Create a new goal."""
         print("=" * 60)
@@ -61,10 +473,10 @@ class APITestRunner:
         }
         
         try:
-            response = requests.post(
-                f"{self.base_url}/api/gpt/goals",
-                headers=self.headers,
-                json=payload
+            response = self.request(
+                "POST",
+                "/api/gpt/goals",
+                payload=payload
             )
             
             if response.status_code == 201:
@@ -105,10 +517,11 @@ class APITestRunner:
         }
         
         try:
-            response = requests.post(
-                f"{self.base_url}/api/gpt/goals/{self.created_goal_id}/phases",
-                headers=self.headers,
-                json=payload
+            response = self.request(
+                "POST",
+                f"/api/gpt/goals/{self.created_goal_id}/phases",
+                endpoint="POST /api/gpt/goals/{goalId}/phases",
+                payload=payload
             )
             
             if response.status_code == 201:
@@ -150,15 +563,25 @@ class APITestRunner:
         }
         
         try:
-            response = requests.post(
-                f"{self.base_url}/api/gpt/phases/{self.created_phase_id}/tasks",
-                headers=self.headers,
-                json=payload
+            response = self.request(
+                "POST",
+                f"/api/gpt/phases/{self.created_phase_id}/tasks",
+                endpoint="POST /api/gpt/phases/{phaseId}/tasks",
+                payload=payload
             )
             
             if response.status_code == 201:
                 data = response.json()
                 self.created_task_id = data.get("id") or data.get("taskId") or data.get("$id")
+                # Tasks carry their goal, so goal trees find them with a goalId query
+                if self.created_goal_id and data.get("goalId") != self.created_goal_id:
+                    self.log_result(
+                        "Create Task",
+                        False,
+                        f"Task goalId is {data.get('goalId')}, expected {self.created_goal_id}",
+                        data
+                    )
+                    return False
                 self.log_result(
                     "Create Task",
                     True,
@@ -193,10 +616,11 @@ class APITestRunner:
         }
         
         try:
-            response = requests.patch(
-                f"{self.base_url}/api/gpt/tasks/{self.created_task_id}",
-                headers=self.headers,
-                json=payload
+            response = self.request(
+                "PATCH",
+                f"/api/gpt/tasks/{self.created_task_id}",
+                endpoint="PATCH /api/gpt/tasks/{taskId}",
+                payload=payload
             )
             
             if response.status_code == 200:
@@ -220,6 +644,440 @@ class APITestRunner:
             self.log_result("Update Task", False, f"Exception: {str(e)}")
             return False
     
+    def build_plan(self, phases: int, tasks_per_phase: int) -> dict:
+        """Build a goal tree payload for the batch comparison."""
+        stamp = datetime.now().strftime("%H:%M:%S")
+        return {
+            "title": f"Batch Test Goal {stamp}",
+            "description": "A goal tree created by the API test script",
+            "deadline": (datetime.now() + timedelta(days=30)).isoformat(),
+            "phases": [
+                {
+                    "title": f"Phase {p + 1}",
+                    "order": p + 1,
+                    "tasks": [{"title": f"Task {p + 1}.{t + 1}"} for t in range(tasks_per_phase)]
+                }
+                for p in range(phases)
+            ]
+        }
+    
+    def create_plan_one_by_one(self, plan: dict):
+        """Create a goal tree with one request per document; return (success, elapsed ms, requests)."""
+        start = time.perf_counter()
+        requests_sent = 1
+        goal = {key: plan[key] for key in ("title", "description", "deadline")}
+        response = self.request("POST", "/api/gpt/goals", payload=goal)
+        if response.status_code != 201:
+            return False, 0.0, requests_sent
+        goal_id = response.json()["$id"]
+        
+        for phase in plan["phases"]:
+            requests_sent += 1
+            response = self.request(
+                "POST",
+                f"/api/gpt/goals/{goal_id}/phases",
+                endpoint="POST /api/gpt/goals/{goalId}/phases",
+                payload={"title": phase["title"], "order": phase["order"]}
+            )
+            if response.status_code != 201:
+                return False, 0.0, requests_sent
+            phase_id = response.json()["$id"]
+            
+            for task in phase["tasks"]:
+                requests_sent += 1
+                response = self.request(
+                    "POST",
+                    f"/api/gpt/phases/{phase_id}/tasks",
+                    endpoint="POST /api/gpt/phases/{phaseId}/tasks",
+                    payload=task
+                )
+                if response.status_code != 201:
+                    return False, 0.0, requests_sent
+        
+        return True, (time.perf_counter() - start) * 1000, requests_sent
+    
+    @staticmethod
+    def describe_speedup(single_ms: float, single_requests: int, batch_ms: float) -> str:
+        """Format a one-by-one vs batch comparison."""
+        speedup = single_ms / batch_ms if batch_ms > 0 else 0.0
+        return (
+            f"one-by-one {single_ms:.1f} ms over {single_requests} requests, "
+            f"batch {batch_ms:.1f} ms in 1 request ({speedup:.1f}x faster)"
+        )
+    
+    def test_batch_goal_tree(self, phases: int = BATCH_PHASES, tasks_per_phase: int = BATCH_TASKS_PER_PHASE) -> bool:
+        """Test POST /api/gpt/goals/tree against creating the same tree one request at a time."""
+        print("=" * 60)
+        print("Testing: Batch Goal Tree")
+        print("=" * 60)
+        
+        plan = self.build_plan(phases, tasks_per_phase)
+        
+        try:
+            single_ok, single_ms, single_requests = self.create_plan_one_by_one(plan)
+            if not single_ok:
+                self.log_result(
+                    "Batch Goal Tree",
+                    False,
+                    f"One-by-one baseline failed after {single_requests} requests",
+                    {"status_code": self.last_timing["status"] if self.last_timing else None}
+                )
+                return False
+            
+            response = self.request("POST", "/api/gpt/goals/tree", payload=plan)
+            batch_ms = self.last_timing["total_ms"]
+            
+            if response.status_code != 201:
+                self.log_result(
+                    "Batch Goal Tree",
+                    False,
+                    f"Failed with status {response.status_code}: {response.text}",
+                    {"status_code": response.status_code}
+                )
+                return False
+            
+            data = response.json()
+            created_phases = data.get("phases", [])
+            created_tasks = sum(len(phase.get("tasks", [])) for phase in created_phases)
+            if len(created_phases) != phases or created_tasks != phases * tasks_per_phase:
+                self.log_result(
+                    "Batch Goal Tree",
+                    False,
+                    f"Expected {phases} phases and {phases * tasks_per_phase} tasks, "
+                    f"got {len(created_phases)} and {created_tasks}",
+                    {"status_code": response.status_code}
+                )
+                return False
+            
+            self.created_phase_id = created_phases[0]["$id"] if created_phases else self.created_phase_id
+            self.log_result(
+                "Batch Goal Tree",
+                True,
+                f"Created 1 goal, {phases} phases, {created_tasks} tasks; "
+                + self.describe_speedup(single_ms, single_requests, batch_ms),
+                {"goalId": data.get("$id"), "phases": len(created_phases), "tasks": created_tasks}
+            )
+            return True
+        except Exception as e:
+            self.log_result("Batch Goal Tree", False, f"Exception: {str(e)}")
+            return False
+    
+    def test_batch_tasks(self, count: int = BATCH_PHASES * BATCH_TASKS_PER_PHASE) -> bool:
+        """Test POST /api/gpt/phases/{phaseId}/tasks/batch against one request per task."""
+        print("=" * 60)
+        print("Testing: Batch Tasks")
+        print("=" * 60)
+        
+        if not self.created_phase_id:
+            self.log_result("Batch Tasks", False, "No phase ID available (create phase test may have failed)")
+            return False
+        
+        tasks = [{"title": f"Batch Task {i + 1}"} for i in range(count)]
+        
+        try:
+            start = time.perf_counter()
+            for task in tasks:
+                response = self.request(
+                    "POST",
+                    f"/api/gpt/phases/{self.created_phase_id}/tasks",
+                    endpoint="POST /api/gpt/phases/{phaseId}/tasks",
+                    payload=task
+                )
+                if response.status_code != 201:
+                    self.log_result(
+                        "Batch Tasks",
+                        False,
+                        f"One-by-one baseline failed with status {response.status_code}",
+                        {"status_code": response.status_code}
+                    )
+                    return False
+            single_ms = (time.perf_counter() - start) * 1000
+            
+            response = self.request(
+                "POST",
+                f"/api/gpt/phases/{self.created_phase_id}/tasks/batch",
+                endpoint="POST /api/gpt/phases/{phaseId}/tasks/batch",
+                payload={"tasks": tasks}
+            )
+            batch_ms = self.last_timing["total_ms"]
+            
+            if response.status_code == 201 and len(response.json().get("tasks", [])) == count:
+                self.log_result(
+                    "Batch Tasks",
+                    True,
+                    f"Created {count} tasks; " + self.describe_speedup(single_ms, count, batch_ms),
+                    {"tasks": count}
+                )
+                return True
+            else:
+                self.log_result(
+                    "Batch Tasks",
+                    False,
+                    f"Failed with status {response.status_code}: {response.text}",
+                    {"status_code": response.status_code}
+                )
+                return False
+        except Exception as e:
+            self.log_result("Batch Tasks", False, f"Exception: {str(e)}")
+            return False
+    
+    def seed_paging_tasks(self, count: int) -> Optional[str]:
+        """Create a goal with one phase holding `count` tasks through the batch routes; return the phase ID."""
+        response = self.request(
+            "POST",
+            "/api/gpt/goals/tree",
+            payload={"title": f"Paging Test Goal ({count} tasks)", "phases": [{"title": "Paging Phase"}]}
+        )
+        if response.status_code != 201:
+            return None
+        phase_id = response.json()["phases"][0]["$id"]
+        
+        for start in range(0, count, BATCH_MAX_TASKS):
+            tasks = [{"title": f"Paging Task {i + 1}"} for i in range(start, min(start + BATCH_MAX_TASKS, count))]
+            response = self.request(
+                "POST",
+                f"/api/gpt/phases/{phase_id}/tasks/batch",
+                endpoint="POST /api/gpt/phases/{phaseId}/tasks/batch",
+                payload={"tasks": tasks}
+            )
+            if response.status_code != 201:
+                return None
+            print(f"   Seeded {start + len(tasks)}/{count} tasks", end="\r")
+        print()
+        return phase_id
+    
+    def walk_pages(self, path: str, query: str, endpoint: str) -> dict:
+        """Follow nextCursor until the last page; return counts, ids, timings and the first page's ETag."""
+        walk = {"pages": 0, "ids": [], "latencies": [], "bytes": 0, "elapsed_ms": 0.0, "first_etag": None}
+        cursor = None
+        start = time.perf_counter()
+        while True:
+            url = f"{path}?{query}" + (f"&cursor={cursor}" if cursor else "")
+            response = self.request("GET", url, endpoint=endpoint)
+            if response.status_code != 200:
+                raise requests.RequestException(f"Page {walk['pages'] + 1} failed with status {response.status_code}")
+            page = response.json()
+            if walk["first_etag"] is None:
+                walk["first_etag"] = response.headers.get("ETag")
+            walk["pages"] += 1
+            walk["ids"].extend(doc["$id"] for doc in page["data"])
+            walk["latencies"].append(self.last_timing["total_ms"])
+            walk["bytes"] += self.last_timing["response_bytes"]
+            cursor = page.get("nextCursor")
+            if not page.get("hasMore"):
+                break
+        walk["elapsed_ms"] = (time.perf_counter() - start) * 1000
+        return walk
+    
+    def test_paging(self, count: int = PAGING_TASKS, page_size: int = PAGE_SIZE,
+                    phase_id: Optional[str] = None) -> bool:
+        """Test cursor pagination, field selection and ETags by walking a phase with many tasks."""
+        print("=" * 60)
+        print("Testing: Paging")
+        print("=" * 60)
+        
+        try:
+            if not phase_id:
+                print(f"   Seeding {count} tasks through the batch endpoint...")
+                phase_id = self.seed_paging_tasks(count)
+                if not phase_id:
+                    self.log_result("Paging", False, "Seeding tasks failed", {"status_code": self.last_timing["status"]})
+                    return False
+            
+            path = f"/api/gpt/phases/{phase_id}/tasks"
+            endpoint = "GET /api/gpt/phases/{phaseId}/tasks"
+            full = self.walk_pages(path, f"limit={page_size}", endpoint)
+            sparse = self.walk_pages(path, f"limit={page_size}&fields=title,isCompleted", endpoint + " (fields)")
+            
+            # Unchanged first page: the ETag should turn the response into a 304
+            self.request(
+                "GET",
+                f"{path}?limit={page_size}",
+                endpoint=endpoint + " (If-None-Match)",
+                headers=dict(self.headers, **{"If-None-Match": full["first_etag"] or ""})
+            )
+            not_modified = self.last_timing["status"] == 304
+            
+            # A cursor Appwrite can't resolve is the client's mistake, not a server error
+            self.request("GET", f"{path}?limit={page_size}&cursor=missing-document", endpoint=endpoint + " (bad cursor)")
+            bad_cursor_status = self.last_timing["status"]
+            
+            problems = []
+            if len(full["ids"]) != count:
+                problems.append(f"walked {len(full['ids'])} tasks, expected {count}")
+            if len(set(full["ids"])) != len(full["ids"]):
+                problems.append("duplicate tasks across pages")
+            if sparse["ids"] != full["ids"]:
+                problems.append("sparse walk returned different tasks")
+            if not not_modified:
+                problems.append(f"If-None-Match returned {self.last_timing['status']}, expected 304")
+            if bad_cursor_status != 400:
+                problems.append(f"unknown cursor returned {bad_cursor_status}, expected 400")
+            
+            message = (
+                f"{full['pages']} pages of {page_size} in {full['elapsed_ms'] / 1000:.2f} s "
+                f"(page p50 {percentile(full['latencies'], 50):.1f} ms, p95 {percentile(full['latencies'], 95):.1f} ms, "
+                f"{full['bytes'] / 1024:.0f} KiB); with fields=title,isCompleted "
+                f"{sparse['elapsed_ms'] / 1000:.2f} s, {sparse['bytes'] / 1024:.0f} KiB; "
+                f"If-None-Match {'304' if not_modified else 'not honored'}"
+            )
+            if problems:
+                self.log_result("Paging", False, f"{'; '.join(problems)} ({message})", {"phaseId": phase_id})
+                return False
+            self.log_result("Paging", True, message, {"phaseId": phase_id, "tasks": count})
+            return True
+        except Exception as e:
+            self.log_result("Paging", False, f"Exception: {str(e)}")
+            return False
+    
+    def test_dashboard(self) -> bool:
+        """Test GET /api/dashboard: due-date filtering, trimmed fields and the per-user cache."""
+        print("=" * 60)
+        print("Testing: Dashboard Summary")
+        print("=" * 60)
+        
+        today = datetime.now(timezone.utc).date()
+        due_before = f"{today.isoformat()}T23:59:59.999Z"
+        path = f"/api/dashboard?dueBefore={due_before}"
+        endpoint = "GET /api/dashboard"
+        labels = {"past": -3, "today": 0, "future": 7, "completed": 0}
+        
+        try:
+            response = self.request(
+                "POST",
+                "/api/gpt/goals/tree",
+                endpoint="POST /api/gpt/goals/tree",
+                payload={
+                    "title": "Dashboard Test Goal",
+                    "phases": [{
+                        "title": "Dashboard Test Phase",
+                        "tasks": [
+                            {"title": f"Dashboard {label}", "dueDate": (today + timedelta(days=days)).isoformat()}
+                            for label, days in labels.items()
+                        ],
+                    }],
+                }
+            )
+            if response.status_code != 201:
+                self.log_result("Dashboard Summary", False, f"Seeding failed with status {response.status_code}",
+                                {"status_code": response.status_code})
+                return False
+            ids = {task["title"].split()[-1]: task["$id"] for task in response.json()["phases"][0]["tasks"]}
+            
+            def patch_completed(label: str):
+                response = self.request("PATCH", f"/api/gpt/tasks/{ids[label]}",
+                                        endpoint="PATCH /api/gpt/tasks/{taskId}", payload={"isCompleted": True})
+                if response.status_code != 200:
+                    raise requests.RequestException(f"PATCH failed with status {response.status_code}")
+            
+            def fetch_summary():
+                response = self.request("GET", path, endpoint=endpoint)
+                if response.status_code != 200:
+                    raise requests.RequestException(f"{endpoint} failed with status {response.status_code}")
+                return response.json(), response.headers.get("X-Cache"), self.last_timing
+            
+            patch_completed("completed")
+            first, first_cache, miss = fetch_summary()
+            _, second_cache, hit = fetch_summary()
+            patch_completed("today")
+            after, after_cache, _ = fetch_summary()
+            
+            # What the dashboard downloaded before: full documents for open tasks and habits
+            full_bytes = 0
+            for list_path, list_endpoint in (("/api/gpt/tasks?isCompleted=false&limit=100", "GET /api/gpt/tasks"),
+                                             ("/api/gpt/habits?limit=20", "GET /api/gpt/habits")):
+                self.request("GET", list_path, endpoint=list_endpoint)
+                full_bytes += self.last_timing["response_bytes"]
+            
+            listed = {task["$id"] for task in first["tasks"]}
+            problems = []
+            for label, expected in (("past", True), ("today", True), ("future", False), ("completed", False)):
+                if (ids[label] in listed) != expected:
+                    problems.append(f"{label} task {'missing' if expected else 'listed'}")
+            extra_fields = {key for task in first["tasks"] for key in task} - {"$id", "title", "dueDate", "isCompleted"}
+            extra_fields |= {key for habit in first["habits"] for key in habit} - {"$id", "title", "streak"}
+            if extra_fields:
+                problems.append(f"unexpected fields {sorted(extra_fields)}")
+            if (first_cache, second_cache) != ("MISS", "HIT"):
+                problems.append(f"X-Cache was {first_cache} then {second_cache}, expected MISS then HIT")
+            if after_cache != "MISS" or ids["today"] in {task["$id"] for task in after["tasks"]}:
+                problems.append("completing a task did not invalidate the cached summary")
+            
+            message = (
+                f"{len(first['tasks'])} due tasks, {len(first['habits'])} habits in {miss['response_bytes']} bytes "
+                f"(full task and habit lists: {full_bytes} bytes); "
+                f"miss {miss['total_ms']:.1f} ms, hit {hit['total_ms']:.1f} ms"
+            )
+            if problems:
+                self.log_result("Dashboard Summary", False, f"{'; '.join(problems)} ({message})", {"taskIds": ids})
+                return False
+            self.log_result("Dashboard Summary", True, message, {"taskIds": ids})
+            return True
+        except Exception as e:
+            self.log_result("Dashboard Summary", False, f"Exception: {str(e)}")
+            return False
+    
+    def test_idempotency(self, duplicates: int = IDEMPOTENCY_DUPLICATES) -> bool:
+        """Test Idempotency-Key: concurrent and later retries of one write create one document."""
+        print("=" * 60)
+        print("Testing: Idempotent Retries")
+        print("=" * 60)
+        
+        endpoint = "POST /api/gpt/goals/{goalId}/phases"
+        try:
+            response = self.request("POST", "/api/gpt/goals", payload={"title": "Idempotency Test Goal"})
+            if response.status_code != 201:
+                self.log_result("Idempotent Retries", False, f"Seeding failed with status {response.status_code}",
+                                {"status_code": response.status_code})
+                return False
+            goal_id = response.json()["$id"]
+            path = f"/api/gpt/goals/{goal_id}/phases"
+            url = f"{self.base_url}{path}"
+            headers = dict(self.headers, **{"Idempotency-Key": secrets.token_hex(16)})
+            payload = {"title": "Idempotency Test Phase", "order": 1}
+            
+            # The same request sent several times at once, as a client retrying a timed-out call would
+            with ThreadPoolExecutor(max_workers=duplicates) as executor:
+                results = list(executor.map(
+                    lambda _: timed_request(self.session, "POST", url, endpoint, headers, payload, self.timeout),
+                    range(duplicates)
+                ))
+            self.request_timings.extend(timing for _, timing in results)
+            responses = [response for response, _ in results]
+            later = self.request("POST", path, endpoint=endpoint, headers=headers, payload=payload)
+            reused = self.request("POST", path, endpoint=endpoint, headers=headers,
+                                  payload=dict(payload, title="Different Phase"))
+            listed = self.request("GET", path, endpoint="GET /api/gpt/goals/{goalId}/phases").json()
+            
+            problems = []
+            statuses = sorted(r.status_code if r is not None else 0 for r in responses + [later])
+            if set(statuses) != {201}:
+                problems.append(f"statuses {statuses}, expected all 201")
+            ids = {r.json().get("$id") for r in responses + [later] if r is not None and r.status_code == 201}
+            if len(ids) != 1:
+                problems.append(f"{len(ids)} different phase IDs returned")
+            replayed = sum(1 for r in responses + [later] if r is not None and r.headers.get("Idempotent-Replayed"))
+            if replayed != duplicates:
+                problems.append(f"{replayed} replayed responses, expected {duplicates}")
+            phases = listed["data"]
+            if len(phases) != 1:
+                problems.append(f"{len(phases)} phases created, expected exactly 1")
+            if reused.status_code != 422:
+                problems.append(f"reusing the key for another body returned {reused.status_code}, expected 422")
+            
+            message = (
+                f"{duplicates + 1} requests with one key created {len(phases)} phase(s), "
+                f"{replayed} answered from the stored response"
+            )
+            if problems:
+                self.log_result("Idempotent Retries", False, f"{'; '.join(problems)} ({message})", {"goalId": goal_id})
+                return False
+            self.log_result("Idempotent Retries", True, message, {"goalId": goal_id, "phaseIds": sorted(ids)})
+            return True
+        except Exception as e:
+            self.log_result("Idempotent Retries", False, f"Exception: {str(e)}")
+            return False
+    
     def test_update_habit(self, habit_id: str = None) -> bool:
         """Test PATCH /api/gpt/habits/{habitId} - Log a habit completion."""
         print("=" * 60)
@@ -243,14 +1101,25 @@ class APITestRunner:
         }
         
         try:
-            response = requests.patch(
-                f"{self.base_url}/api/gpt/habits/{habit_id}",
-                headers=self.headers,
-                json=payload
+            response = self.request(
+                "PATCH",
+                f"/api/gpt/habits/{habit_id}",
+                endpoint="PATCH /api/gpt/habits/{habitId}",
+                payload=payload
             )
             
             if response.status_code == 200:
                 data = response.json()
+                # The derived fields list views read must follow the write
+                if data.get("lastCompletedDate") != today or not data.get("recentRuns"):
+                    self.log_result(
+                        "Update Habit",
+                        False,
+                        f"Logged, but lastCompletedDate is {data.get('lastCompletedDate')!r} "
+                        f"and recentRuns is {data.get('recentRuns')!r}",
+                        data
+                    )
+                    return False
                 self.log_result(
                     "Update Habit",
                     True,
@@ -270,6 +1139,86 @@ class APITestRunner:
             self.log_result("Update Habit", False, f"Exception: {str(e)}")
             return False
     
+    def test_update_habit_bulk(self, habit_id: str = None, days: int = HABIT_BULK_DAYS) -> bool:
+        """Test POST /api/gpt/habits/log against one PATCH per date."""
+        print("=" * 60)
+        print("Testing: Bulk Habit Log")
+        print("=" * 60)
+        
+        if not habit_id:
+            self.log_result("Bulk Habit Log", False, "No habit ID provided - pass --habit-id to test this endpoint.")
+            return False
+        
+        # Two separate windows so both sides write new dates: one-by-one backfills the
+        # week before last, the bulk request backfills last week
+        today = datetime.now()
+        single_dates = [(today - timedelta(days=days + d)).strftime("%Y-%m-%d") for d in range(days, 0, -1)]
+        bulk_dates = [(today - timedelta(days=d)).strftime("%Y-%m-%d") for d in range(days, 0, -1)]
+        
+        try:
+            start = time.perf_counter()
+            for date in single_dates:
+                response = self.request(
+                    "PATCH",
+                    f"/api/gpt/habits/{habit_id}",
+                    endpoint="PATCH /api/gpt/habits/{habitId}",
+                    payload={"date": date}
+                )
+                if response.status_code != 200:
+                    self.log_result(
+                        "Bulk Habit Log",
+                        False,
+                        f"One-by-one baseline failed with status {response.status_code}",
+                        {"status_code": response.status_code}
+                    )
+                    return False
+            single_ms = (time.perf_counter() - start) * 1000
+            
+            response = self.request(
+                "POST",
+                "/api/gpt/habits/log",
+                payload={"entries": [{"habitId": habit_id, "date": date} for date in bulk_dates]}
+            )
+            bulk_ms = self.last_timing["total_ms"]
+            
+            data = response.json() if response.status_code == 200 else {}
+            if response.status_code == 200 and data.get("failed") == 0 and data.get("logged") == days:
+                # Impossible and future dates would put the completion runs out of order
+                invalid_dates = ["2024-02-30", "2024-99-01", (today + timedelta(days=1)).strftime("%Y-%m-%d")]
+                rejected = self.request(
+                    "POST",
+                    "/api/gpt/habits/log",
+                    payload={"entries": [{"habitId": habit_id, "date": date} for date in invalid_dates]}
+                )
+                statuses = [result.get("status") for result in rejected.json().get("results", [])] \
+                    if rejected.status_code == 200 else []
+                if statuses != [400] * len(invalid_dates):
+                    self.log_result(
+                        "Bulk Habit Log",
+                        False,
+                        f"Invalid dates {invalid_dates} were not all rejected: {rejected.text[:300]}",
+                        {"status_code": rejected.status_code}
+                    )
+                    return False
+                self.log_result(
+                    "Bulk Habit Log",
+                    True,
+                    f"Logged {days} dates; " + self.describe_speedup(single_ms, days, bulk_ms),
+                    {"logged": data["logged"], "streak": data["results"][-1].get("streak")}
+                )
+                return True
+            else:
+                self.log_result(
+                    "Bulk Habit Log",
+                    False,
+                    f"Failed with status {response.status_code}: {response.text[:300]}",
+                    {"status_code": response.status_code}
+                )
+                return False
+        except Exception as e:
+            self.log_result("Bulk Habit Log", False, f"Exception: {str(e)}")
+            return False
+    
     def test_unauthorized_access(self) -> bool:
         """Test that API rejects requests without valid API key."""
         print("=" * 60)
@@ -280,10 +1229,12 @@ class APITestRunner:
         payload = {"title": "Unauthorized Test"}
         
         try:
-            response = requests.post(
-                f"{self.base_url}/api/gpt/goals",
+            response = self.request(
+                "POST",
+                "/api/gpt/goals",
+                endpoint="POST /api/gpt/goals (no API key)",
                 headers=headers_no_auth,
-                json=payload
+                payload=payload
             )
             
             if response.status_code == 401:
@@ -312,24 +1263,40 @@ class APITestRunner:
         print("Testing: Invalid API Key")
         print("=" * 60)
         
+        # A fresh key per run so the first request really misses the validation cache
         headers_invalid = {
             "Content-Type": "application/json",
-            "X-API-Key": "invalid_key_12345"
+            "X-API-Key": f"invalid_key_{secrets.token_hex(6)}"
         }
         payload = {"title": "Invalid Key Test"}
+        endpoint = "POST /api/gpt/goals (invalid API key)"
         
         try:
-            response = requests.post(
-                f"{self.base_url}/api/gpt/goals",
+            response = self.request(
+                "POST",
+                "/api/gpt/goals",
+                endpoint=endpoint,
                 headers=headers_invalid,
-                json=payload
+                payload=payload
             )
             
             if response.status_code == 401:
+                # Invalid keys are negatively cached, so repeats should skip the api_keys lookup
+                cold_ms = self.last_timing["total_ms"]
+                all_rejected, warm_ms = self.measure_warm_latency(endpoint, headers_invalid, payload, 401)
+                if not all_rejected:
+                    self.log_result(
+                        "Invalid API Key",
+                        False,
+                        "First request was rejected (401) but a repeated request was not",
+                        {"status_code": response.status_code}
+                    )
+                    return False
                 self.log_result(
                     "Invalid API Key",
                     True,
-                    "API correctly rejected request with invalid API key (401)",
+                    "API correctly rejected request with invalid API key (401); "
+                    + self.describe_warm_latency(cold_ms, warm_ms),
                     {"status_code": response.status_code}
                 )
                 return True
@@ -345,6 +1312,54 @@ class APITestRunner:
             self.log_result("Invalid API Key", False, f"Exception: {str(e)}")
             return False
     
+    def test_warm_api_key(self) -> bool:
+        """Test that repeated requests with a valid API key are served from the key cache."""
+        print("=" * 60)
+        print("Testing: Warm API Key")
+        print("=" * 60)
+        
+        # No title: the route validates the key, then rejects the body without writing anything
+        payload = {"description": "API key cache test"}
+        endpoint = "POST /api/gpt/goals (valid API key, no title)"
+        
+        try:
+            response = self.request(
+                "POST",
+                "/api/gpt/goals",
+                endpoint=endpoint,
+                payload=payload
+            )
+            
+            if response.status_code == 400:
+                cold_ms = self.last_timing["total_ms"]
+                all_accepted, warm_ms = self.measure_warm_latency(endpoint, self.headers, payload, 400)
+                if not all_accepted:
+                    self.log_result(
+                        "Warm API Key",
+                        False,
+                        "First request passed authentication but a repeated request did not",
+                        {"status_code": response.status_code}
+                    )
+                    return False
+                self.log_result(
+                    "Warm API Key",
+                    True,
+                    "Valid API key accepted on every request; " + self.describe_warm_latency(cold_ms, warm_ms),
+                    {"status_code": response.status_code}
+                )
+                return True
+            else:
+                self.log_result(
+                    "Warm API Key",
+                    False,
+                    f"Expected 400 after authentication, got {response.status_code}",
+                    {"status_code": response.status_code}
+                )
+                return False
+        except Exception as e:
+            self.log_result("Warm API Key", False, f"Exception: {str(e)}")
+            return False
+    
     def test_missing_required_fields(self) -> bool:
         """Test that API validates required fields."""
         print("=" * 60)
@@ -357,10 +1372,11 @@ class APITestRunner:
         }
         
         try:
-            response = requests.post(
-                f"{self.base_url}/api/gpt/goals",
-                headers=self.headers,
-                json=payload
+            response = self.request(
+                "POST",
+                "/api/gpt/goals",
+                endpoint="POST /api/gpt/goals (missing title)",
+                payload=payload
             )
             
             # Expect 400 Bad Request for missing required fields
@@ -395,6 +1411,7 @@ class APITestRunner:
         # Authentication tests
         self.test_unauthorized_access()
         self.test_invalid_api_key()
+        self.test_warm_api_key()
         
         # Validation tests
         self.test_missing_required_fields()
@@ -404,10 +1421,13 @@ class APITestRunner:
         self.test_create_phase()
         self.test_create_task()
         self.test_update_task()
+        self.test_dashboard()
+        self.test_idempotency()
         
         # Habit test (requires existing habit ID)
         if habit_id:
             self.test_update_habit(habit_id)
+            self.test_update_habit_bulk(habit_id)
         else:
             print("=" * 60)
             print("SKIPPING: Update Habit Test")
@@ -415,7 +1435,7 @@ class APITestRunner:
             print("=" * 60 + "\n")
         
         # Summary
-        self.print_summary()
+        return self.print_summary()
     
     def print_summary(self):
         """Print test summary."""
@@ -431,6 +1451,12 @@ class APITestRunner:
         print(f"Passed: {passed} ✅")
         print(f"Failed: {failed} ❌")
         print(f"Success Rate: {(passed/total*100):.1f}%" if total > 0 else "N/A")
+        print()
+        print_connection_stats(self.session)
+        print()
+        print_timing_table(self.request_timings)
+        print()
+        print_stage_breakdown(self.request_timings)
         
         if failed > 0:
             print("\nFailed Tests:")
@@ -444,6 +1470,606 @@ class APITestRunner:
         return 0 if failed == 0 else 1
 
 
+def percentile(values: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class LoadTestRunner:
+    """Drives the goal -> phase -> task -> update chain from many virtual users at once.
+
+    Virtual users take their API keys round-robin from ``keys``. With ``noisy_users`` set,
+    that many extra users start halfway through the run and send chains on ``noisy_key``
+    as fast as they can, ignoring 429s, so the report can show whether the other keys'
+    latency holds while one key is throttled.
+    """
+    
+    CREATE_GOAL = "POST /api/gpt/goals"
+    CREATE_PHASE = "POST /api/gpt/goals/{goalId}/phases"
+    CREATE_TASK = "POST /api/gpt/phases/{phaseId}/tasks"
+    UPDATE_TASK = "PATCH /api/gpt/tasks/{taskId}"
+    ENDPOINTS = [CREATE_GOAL, CREATE_PHASE, CREATE_TASK, UPDATE_TASK]
+    
+    def __init__(self, base_url: str, headers: dict, users: int = 10,
+                 duration: Optional[float] = None, iterations: Optional[int] = None,
+                 session: Optional[requests.Session] = None, timeout: float = TIMEOUT,
+                 keys: Optional[List[str]] = None, think_time: float = 0.0,
+                 noisy_key: Optional[str] = None, noisy_users: int = 0):
+        self.base_url = base_url
+        self.headers = headers
+        self.keys = keys or [headers.get("X-API-Key")]
+        self.think_time = think_time
+        self.noisy_key = noisy_key or headers.get("X-API-Key")
+        self.noisy_users = noisy_users if duration else 0
+        # One shared pool for every virtual user; size it to the user count by default
+        self.session = session or create_session(pool_size=max(users + noisy_users, 1))
+        self.timeout = timeout
+        self.users = max(1, users)
+        self.duration = duration
+        # Without a duration, each virtual user runs a fixed number of chains
+        self.iterations = iterations if iterations is not None else (None if duration else 5)
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.status_codes: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.timings: List[dict] = []
+        # Successful request latencies (ms) and 429 counts per client group, see _client_group
+        self.client_latencies: Dict[str, List[float]] = defaultdict(list)
+        self.throttled: Dict[str, int] = defaultdict(int)
+        self.chains_completed = 0
+        self.elapsed = 0.0
+        self._chains_started = 0
+        self._noisy_started = threading.Event()
+        self._lock = threading.Lock()
+    
+    def _client_group(self, noisy: bool) -> str:
+        """Report row for a request: the noisy key, or the other keys before/while it runs."""
+        if noisy:
+            return "noisy key"
+        if not self.noisy_users:
+            return "all keys"
+        return "other keys (with noisy)" if self._noisy_started.is_set() else "other keys (alone)"
+    
+    def _record(self, timing: dict, ok: bool, noisy: bool = False):
+        """Record a single request sample (thread-safe). 429s are counted apart from errors."""
+        endpoint = timing["endpoint"]
+        group = self._client_group(noisy)
+        with self._lock:
+            self.timings.append(timing)
+            self.latencies[endpoint].append(timing["total_ms"] / 1000)
+            if timing["status"] is not None:
+                self.status_codes[endpoint][timing["status"]] += 1
+            if timing["status"] == 429:
+                self.throttled[group] += 1
+            elif not ok:
+                self.errors[endpoint] += 1
+            else:
+                self.client_latencies[group].append(timing["total_ms"])
+    
+    def _timed_request(self, endpoint: str, method: str, path: str, payload: dict,
+                       expected_status: int, headers: Optional[dict] = None,
+                       noisy: bool = False) -> Optional[dict]:
+        """Send one request, record its latency and return the JSON body on success."""
+        response, timing = timed_request(
+            self.session,
+            method,
+            f"{self.base_url}{path}",
+            endpoint,
+            headers or self.headers,
+            payload,
+            self.timeout
+        )
+        ok = response is not None and response.status_code == expected_status
+        self._record(timing, ok, noisy)
+        if not ok:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return None
+    
+    def _run_chain(self, user_index: int, iteration: int, headers: Optional[dict] = None,
+                   noisy: bool = False) -> bool:
+        """Run one goal -> phase -> task -> update chain; stop at the first failure."""
+        label = f"Load Test VU{user_index} #{iteration}"
+        
+        def request(endpoint: str, method: str, path: str, payload: dict, expected_status: int):
+            return self._timed_request(endpoint, method, path, payload, expected_status, headers, noisy)
+        
+        goal = request(self.CREATE_GOAL, "POST", "/api/gpt/goals", {
+            "title": f"{label} - Goal",
+            "description": "Created by the API load test",
+            "deadline": (datetime.now() + timedelta(days=30)).isoformat()
+        }, 201)
+        goal_id = goal and (goal.get("id") or goal.get("goalId") or goal.get("$id"))
+        if not goal_id:
+            return False
+        
+        phase = request(self.CREATE_PHASE, "POST", f"/api/gpt/goals/{goal_id}/phases", {
+            "title": f"{label} - Phase",
+            "order": 1
+        }, 201)
+        phase_id = phase and (phase.get("id") or phase.get("phaseId") or phase.get("$id"))
+        if not phase_id:
+            return False
+        
+        task = request(self.CREATE_TASK, "POST", f"/api/gpt/phases/{phase_id}/tasks", {
+            "title": f"{label} - Task",
+            "dueDate": (datetime.now() + timedelta(days=7)).isoformat()
+        }, 201)
+        task_id = task and (task.get("id") or task.get("taskId") or task.get("$id"))
+        if not task_id:
+            return False
+        
+        return request(self.UPDATE_TASK, "PATCH", f"/api/gpt/tasks/{task_id}", {
+            "isCompleted": True
+        }, 200) is not None
+    
+    def run_chain(self) -> bool:
+        """Run one chain outside ``run()``, e.g. as part of other traffic; see ``drain_window``."""
+        with self._lock:
+            self._chains_started += 1
+            iteration = self._chains_started
+        if not self._run_chain(0, iteration):
+            return False
+        with self._lock:
+            self.chains_completed += 1
+        return True
+    
+    def drain_window(self) -> List[dict]:
+        """Return the timings recorded since the last call and reset every per-request sample.
+        
+        Callers running chains for hours with ``run_chain`` drain once per window, so nothing
+        here grows with the length of the run.
+        """
+        with self._lock:
+            timings, self.timings = self.timings, []
+            self.latencies.clear()
+            self.errors.clear()
+            self.status_codes.clear()
+            self.client_latencies.clear()
+            self.throttled.clear()
+        return timings
+    
+    def _virtual_user(self, user_index: int, deadline: Optional[float]):
+        """Loop the chain until the iteration count or the deadline is reached."""
+        headers = dict(self.headers, **{"X-API-Key": self.keys[(user_index - 1) % len(self.keys)]})
+        iteration = 0
+        while True:
+            if self.iterations is not None and iteration >= self.iterations:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            iteration += 1
+            if self._run_chain(user_index, iteration, headers):
+                with self._lock:
+                    self.chains_completed += 1
+            if self.think_time:
+                time.sleep(self.think_time)
+    
+    def _noisy_user(self, user_index: int, start_at: float, deadline: float):
+        """From ``start_at``, send chains on the noisy key back to back until the deadline."""
+        headers = dict(self.headers, **{"X-API-Key": self.noisy_key})
+        time.sleep(max(0.0, start_at - time.perf_counter()))
+        self._noisy_started.set()
+        iteration = 0
+        while time.perf_counter() < deadline:
+            iteration += 1
+            self._run_chain(user_index, iteration, headers, noisy=True)
+    
+    def run(self) -> int:
+        """Run the load test and print the report. Returns the process exit code."""
+        print("\n" + "=" * 60)
+        print("KAI PRODUCTIVITY API LOAD TEST")
+        print(f"Base URL: {self.base_url}")
+        print(f"Virtual users: {self.users}")
+        if self.duration:
+            print(f"Duration: {self.duration:.0f}s")
+        if self.iterations is not None:
+            print(f"Iterations per user: {self.iterations}")
+        if len(self.keys) > 1:
+            print(f"API keys: {len(self.keys)}")
+        if self.noisy_users:
+            print(f"Noisy users: {self.noisy_users} on one key, from {self.duration / 2:.0f}s")
+        print(f"Timestamp: {datetime.now().isoformat()}")
+        print("=" * 60 + "\n")
+        
+        start = time.perf_counter()
+        deadline = start + self.duration if self.duration else None
+        with ThreadPoolExecutor(max_workers=self.users + self.noisy_users) as executor:
+            futures = [executor.submit(self._virtual_user, i + 1, deadline) for i in range(self.users)]
+            futures += [
+                executor.submit(self._noisy_user, self.users + i + 1, start + self.duration / 2, deadline)
+                for i in range(self.noisy_users)
+            ]
+            for future in futures:
+                future.result()
+        self.elapsed = time.perf_counter() - start
+        
+        return self.print_report()
+    
+    def print_report(self) -> int:
+        """Print throughput and latency percentiles per endpoint."""
+        print("=" * 60)
+        print("LOAD TEST REPORT")
+        print("=" * 60)
+        
+        elapsed = self.elapsed or 1e-9
+        total_requests = sum(len(v) for v in self.latencies.values())
+        total_errors = sum(self.errors.values())
+        
+        print(f"Wall time: {self.elapsed:.2f}s")
+        print(f"Chains completed: {self.chains_completed}")
+        print(f"Requests: {total_requests} ({total_requests / elapsed:.1f} req/s)")
+        print(f"Errors: {total_errors}")
+        print(f"Throttled (429): {sum(self.throttled.values())}")
+        print_connection_stats(self.session)
+        print()
+        print(f"{'Endpoint':<40} {'Count':>6} {'Err':>5} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for endpoint in self.ENDPOINTS:
+            samples = self.latencies.get(endpoint, [])
+            if not samples:
+                continue
+            ms = [s * 1000 for s in samples]
+            print(
+                f"{endpoint:<40} {len(samples):>6} {self.errors.get(endpoint, 0):>5} "
+                f"{len(samples) / elapsed:>7.1f} {percentile(ms, 50):>8.1f} "
+                f"{percentile(ms, 95):>8.1f} {percentile(ms, 99):>8.1f}"
+            )
+        
+        if total_errors:
+            print("\nStatus codes for failing endpoints:")
+            for endpoint in self.ENDPOINTS:
+                if self.errors.get(endpoint):
+                    codes = ", ".join(f"{code}: {count}" for code, count in sorted(self.status_codes[endpoint].items()))
+                    print(f"  - {endpoint}: {codes or 'connection errors only'}")
+        
+        if self.noisy_users or self.throttled:
+            print(f"\n{'Client':<28} {'OK':>6} {'429':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+            for group in ("all keys", "other keys (alone)", "other keys (with noisy)", "noisy key"):
+                ms = self.client_latencies.get(group, [])
+                if not ms and not self.throttled.get(group):
+                    continue
+                print(
+                    f"{group:<28} {len(ms):>6} {self.throttled.get(group, 0):>6} "
+                    f"{percentile(ms, 50):>8.1f} {percentile(ms, 95):>8.1f} {percentile(ms, 99):>8.1f}"
+                )
+        
+        print("\nLatency breakdown:")
+        print_timing_table(self.timings)
+        print()
+        print_stage_breakdown(self.timings)
+        
+        print("\n" + "=" * 60)
+        
+        return 0 if total_errors == 0 else 1
+    
+    def write_results(self, path: str) -> None:
+        """Write every load-test request timing to a results file."""
+        write_results(path, self.timings, {
+            "mode": "load",
+            "base_url": self.base_url,
+            "users": self.users,
+            "duration": self.duration,
+            "iterations": self.iterations,
+            "keys": len(self.keys),
+            "think_time": self.think_time,
+            "noisy_users": self.noisy_users,
+            "throttled": dict(self.throttled),
+            "elapsed_s": self.elapsed,
+            "timestamp": datetime.now().isoformat()
+        })
+
+
+class ProcessSampler:
+    """Reads a local process's resident memory and CPU time from /proc (Linux only)."""
+    
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.ticks_per_second = os.sysconf("SC_CLK_TCK")
+        self._last_cpu: Optional[float] = None
+        self._last_time: Optional[float] = None
+    
+    @staticmethod
+    def find(match: str) -> Optional[int]:
+        """Return the PID of the first process whose command line contains ``match``.
+        
+        This process and its ancestors are skipped: the shell that started the runner has
+        ``match`` in its own command line.
+        """
+        skip = set()
+        pid = os.getpid()
+        while pid > 1:
+            skip.add(pid)
+            try:
+                with open(f"/proc/{pid}/status") as f:
+                    pid = next(int(line.split()[1]) for line in f if line.startswith("PPid:"))
+            except (OSError, StopIteration):
+                break
+        for entry in sorted(os.listdir("/proc"), key=lambda e: int(e) if e.isdigit() else 0):
+            if not entry.isdigit() or int(entry) in skip:
+                continue
+            try:
+                with open(f"/proc/{entry}/cmdline", "rb") as f:
+                    cmdline = f.read().replace(b"\0", b" ").decode(errors="replace")
+            except OSError:
+                continue
+            if match in cmdline:
+                return int(entry)
+        return None
+    
+    def rss_mb(self) -> float:
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+        return 0.0
+    
+    def cpu_seconds(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            # Fields after the command name, which may contain spaces; utime and stime are 14 and 15
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self.ticks_per_second
+    
+    def sample(self) -> Dict[str, float]:
+        """RSS in MB, and CPU use in percent of one core since the previous sample."""
+        now, cpu = time.perf_counter(), self.cpu_seconds()
+        cpu_pct = 0.0
+        if self._last_cpu is not None and now > self._last_time:
+            cpu_pct = (cpu - self._last_cpu) / (now - self._last_time) * 100
+        self._last_cpu, self._last_time = cpu, now
+        return {"rss_mb": self.rss_mb(), "cpu_pct": cpu_pct}
+
+
+def linear_trend(xs: List[float], ys: List[float]) -> Tuple[float, float]:
+    """Least-squares fit of ys against xs; returns (slope, intercept)."""
+    n = len(xs)
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return 0.0, mean_y
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+    return slope, mean_y - slope * mean_x
+
+
+class SoakTestRunner:
+    """Drives steady mixed traffic for a long time and reports latency and server memory per window.
+    
+    Slow degradation (habit histories growing with every logged day, memory held by
+    long-lived server objects) only shows over hours, so each window records per-endpoint
+    percentiles alongside the server's RSS and CPU, and the report fits a trend line through
+    them. The first window is treated as warm-up and left out of the trends.
+    """
+    
+    LIST_GOALS = "GET /api/gpt/goals"
+    LIST_TASKS = "GET /api/gpt/tasks"
+    DASHBOARD = "GET /api/dashboard"
+    LOG_HABIT = "PATCH /api/gpt/habits/{habitId}"
+    
+    def __init__(self, base_url: str, headers: dict, duration: float, rate: float = SOAK_RATE,
+                 users: int = 4, window: float = SOAK_WINDOW, habit_id: Optional[str] = None,
+                 sampler: Optional[ProcessSampler] = None, latency_threshold: float = REGRESSION_THRESHOLD,
+                 memory_threshold: float = MEMORY_THRESHOLD, session: Optional[requests.Session] = None,
+                 timeout: float = TIMEOUT):
+        self.base_url = base_url
+        self.headers = headers
+        self.duration = duration
+        self.rate = rate
+        self.users = max(1, users)
+        self.window = window
+        self.habit_id = habit_id
+        self.sampler = sampler
+        self.latency_threshold = latency_threshold
+        self.memory_threshold = memory_threshold
+        self.session = session or create_session(pool_size=self.users)
+        self.timeout = timeout
+        # Reuse the load test's chain for the write traffic
+        self.chains = LoadTestRunner(base_url, headers, users=1, session=self.session, timeout=timeout)
+        # (action, weight); habit logging only runs with a habit ID
+        self.mix = [(self._list_goals, 3), (self._list_tasks, 3), (self._dashboard, 2), (self._chain, 1)]
+        if habit_id:
+            self.mix.append((self._log_habit, 3))
+        self.windows: List[dict] = []
+        self.trends: List[dict] = []
+        self._window_timings: List[dict] = []
+        self._habit_days = 0
+        self._lock = threading.Lock()
+    
+    def _get(self, endpoint: str, path: str):
+        _, timing = timed_request(self.session, "GET", f"{self.base_url}{path}", endpoint, self.headers,
+                                  timeout=self.timeout)
+        self._record(timing)
+    
+    def _record(self, timing: dict):
+        with self._lock:
+            self._window_timings.append(timing)
+    
+    def _list_goals(self):
+        self._get(self.LIST_GOALS, "/api/gpt/goals?limit=25")
+    
+    def _list_tasks(self):
+        self._get(self.LIST_TASKS, "/api/gpt/tasks?isCompleted=false&limit=25")
+    
+    def _dashboard(self):
+        due_before = f"{datetime.now(timezone.utc).date().isoformat()}T23:59:59.999Z"
+        self._get(self.DASHBOARD, f"/api/dashboard?dueBefore={due_before}")
+    
+    def _chain(self):
+        # goal -> phase -> task -> update; the load runner keeps the timings until the window closes
+        self.chains.run_chain()
+    
+    def _log_habit(self):
+        # Every other day further back, so each log starts a new completion run and the
+        # habit's history keeps growing through the run (adjacent days would extend one run)
+        with self._lock:
+            self._habit_days += 2
+            day = (datetime.now().date() - timedelta(days=self._habit_days)).isoformat()
+        _, timing = timed_request(self.session, "PATCH", f"{self.base_url}/api/gpt/habits/{self.habit_id}",
+                                  self.LOG_HABIT, self.headers, {"date": day}, self.timeout)
+        self._record(timing)
+    
+    def _worker(self, deadline: float, stop: threading.Event):
+        """Run weighted random actions at this worker's share of the target rate."""
+        interval = self.users / self.rate
+        actions, weights = zip(*self.mix)
+        next_at = time.perf_counter() + random.uniform(0, interval)
+        while not stop.is_set() and next_at < deadline:
+            stop.wait(max(0.0, next_at - time.perf_counter()))
+            random.choices(actions, weights)[0]()
+            next_at += interval
+            # Don't burst to catch up after a slow request; keep the steady pace instead
+            next_at = max(next_at, time.perf_counter())
+    
+    def _close_window(self, start: float):
+        with self._lock:
+            timings, self._window_timings = self._window_timings, []
+        timings += self.chains.drain_window()
+        row: Dict[str, Any] = {
+            "elapsed_s": round(time.perf_counter() - start, 1),
+            "requests": len(timings),
+            "errors": sum(1 for t in timings if t["status"] is None or t["status"] >= 400),
+            "endpoints": {
+                endpoint: {key: round(stats[key], 2) for key in ("count", "errors", "p50", "p95", "p99")}
+                for endpoint, stats in summarize_timings(timings).items()
+            },
+        }
+        totals = [t["total_ms"] for t in timings]
+        row.update({f"p{pct}": round(percentile(totals, pct), 2) for pct in (50, 95, 99)})
+        if self.sampler:
+            try:
+                row.update({key: round(value, 2) for key, value in self.sampler.sample().items()})
+            except OSError as e:
+                print(f"  Server process sampling stopped: {e}")
+                self.sampler = None
+        self.windows.append(row)
+        
+        minutes, seconds = divmod(int(row["elapsed_s"]), 60)
+        server = f", RSS {row['rss_mb']:.1f} MB, CPU {row['cpu_pct']:.0f}%" if "rss_mb" in row else ""
+        print(f"[{minutes // 60:02d}:{minutes % 60:02d}:{seconds:02d}] {row['requests']} req, "
+              f"p50 {row['p50']:.1f} / p95 {row['p95']:.1f} / p99 {row['p99']:.1f} ms, "
+              f"{row['errors']} errors{server}")
+    
+    def run(self) -> int:
+        """Run the soak test and print the report. Returns the process exit code."""
+        print("\n" + "=" * 60)
+        print("KAI PRODUCTIVITY API SOAK TEST")
+        print(f"Base URL: {self.base_url}")
+        print(f"Duration: {self.duration:.0f}s in {self.window:.0f}s windows")
+        print(f"Rate: {self.rate:.1f} req/s from {self.users} workers")
+        print(f"Server process: {self.sampler.pid if self.sampler else 'not sampled'}")
+        if not self.habit_id:
+            print("Habit logging: skipped (pass --habit-id to include it)")
+        print(f"Timestamp: {datetime.now().isoformat()}")
+        print("=" * 60 + "\n")
+        
+        start = time.perf_counter()
+        deadline = start + self.duration
+        stop = threading.Event()
+        if self.sampler:
+            self.sampler.sample()
+        workers = [threading.Thread(target=self._worker, args=(deadline, stop), daemon=True)
+                   for _ in range(self.users)]
+        for worker in workers:
+            worker.start()
+        try:
+            next_window = start + self.window
+            while next_window <= deadline:
+                time.sleep(max(0.0, next_window - time.perf_counter()))
+                self._close_window(start)
+                next_window += self.window
+        except KeyboardInterrupt:
+            print("\nInterrupted; reporting the windows so far")
+        stop.set()
+        for worker in workers:
+            worker.join()
+        
+        return self.print_report()
+    
+    def _trend(self, name: str, values: List[float], threshold: float, unit: str,
+               min_change: float = 0.0) -> dict:
+        """Fit a line through a per-window series; flag it when the fitted growth passes
+        ``threshold`` percent and ``min_change`` in absolute terms."""
+        xs = [w["elapsed_s"] / 3600 for w in self.windows[1:]]
+        slope, intercept = linear_trend(xs, values)
+        first = intercept + slope * xs[0]
+        last = intercept + slope * xs[-1]
+        growth = (last - first) / first * 100 if first > 0 else 0.0
+        return {"series": name, "unit": unit, "slope_per_hour": slope, "start": first, "end": last,
+                "growth_pct": growth, "flagged": growth > threshold and last - first > min_change}
+    
+    def print_report(self) -> int:
+        """Print the per-window table and the latency and memory trends. Returns 1 if any trend is flagged."""
+        print("\n" + "=" * 60)
+        print("SOAK TEST REPORT")
+        print("=" * 60)
+        if len(self.windows) < 3:
+            print("Not enough windows for trends (need 3; the first is warm-up). "
+                  "Use a longer --duration or a shorter --window.")
+            return 0
+        
+        print(f"{'Window':>8} {'Req':>6} {'Err':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'RSS MB':>8} {'CPU %':>6}")
+        for w in self.windows:
+            server = f"{w['rss_mb']:>8.1f} {w['cpu_pct']:>6.0f}" if "rss_mb" in w else f"{'-':>8} {'-':>6}"
+            print(f"{w['elapsed_s']:>7.0f}s {w['requests']:>6} {w['errors']:>5} {w['p50']:>8.1f} "
+                  f"{w['p95']:>8.1f} {w['p99']:>8.1f} {server}")
+        
+        steady = self.windows[1:]
+        self.trends = []
+        endpoints = sorted({e for w in steady for e in w["endpoints"]})
+        for endpoint in endpoints:
+            if all(endpoint in w["endpoints"] for w in steady):
+                p95s = [w["endpoints"][endpoint]["p95"] for w in steady]
+                self.trends.append(self._trend(f"{endpoint} p95", p95s, self.latency_threshold, "ms",
+                                               SOAK_MIN_LATENCY_CHANGE))
+        if all("rss_mb" in w for w in steady):
+            self.trends.append(self._trend("server RSS", [w["rss_mb"] for w in steady],
+                                           self.memory_threshold, "MB"))
+        
+        print(f"\nTrends after the warm-up window (flagged above +{self.latency_threshold:.0f}% and "
+              f"+{SOAK_MIN_LATENCY_CHANGE:.0f} ms latency, +{self.memory_threshold:.0f}% memory):")
+        print(f"{'Series':<44} {'Start':>9} {'End':>9} {'Per hour':>9} {'Change':>8}")
+        for t in self.trends:
+            flag = "  <-- growing" if t["flagged"] else ""
+            print(f"{t['series']:<44} {t['start']:>9.1f} {t['end']:>9.1f} {t['slope_per_hour']:>+9.1f} "
+                  f"{t['growth_pct']:>+7.1f}%{flag}")
+        
+        flagged = [t for t in self.trends if t["flagged"]]
+        print(f"\n{len(flagged)} of {len(self.trends)} series trending upwards")
+        print("=" * 60)
+        return 1 if flagged else 0
+    
+    def write_results(self, path: str) -> None:
+        """Write the per-window rows (CSV) or the windows and trends (JSON)."""
+        if path.lower().endswith(".csv"):
+            fields = ["elapsed_s", "endpoint", "count", "errors", "p50", "p95", "p99", "rss_mb", "cpu_pct"]
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                for w in self.windows:
+                    for endpoint, stats in w["endpoints"].items():
+                        writer.writerow({"elapsed_s": w["elapsed_s"], "endpoint": endpoint, **stats,
+                                         "rss_mb": w.get("rss_mb"), "cpu_pct": w.get("cpu_pct")})
+        else:
+            with open(path, "w") as f:
+                json.dump({
+                    "run": {
+                        "mode": "soak",
+                        "base_url": self.base_url,
+                        "duration": self.duration,
+                        "rate": self.rate,
+                        "window": self.window,
+                        "server_pid": self.sampler.pid if self.sampler else None,
+                        "timestamp": datetime.now().isoformat(),
+                    },
+                    "windows": self.windows,
+                    "trends": self.trends,
+                }, f, indent=2)
+        print(f"Results written to {path}")
+
+
 def main():
     """Main entry point for the test script."""
     import argparse
@@ -466,20 +2092,225 @@ def main():
     )
     parser.add_argument(
         "--test",
-        choices=["all", "goal", "phase", "task", "habit", "auth"],
+        choices=["all", "goal", "phase", "task", "habit", "auth", "batch", "paging", "dashboard",
+                 "idempotency"],
         default="all",
         help="Specific test to run (default: all)"
     )
+    parser.add_argument(
+        "--paging-tasks",
+        type=int,
+        default=PAGING_TASKS,
+        help=f"Tasks seeded for --test paging (default: {PAGING_TASKS})"
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=PAGE_SIZE,
+        help=f"Page size for --test paging (default: {PAGE_SIZE})"
+    )
+    parser.add_argument(
+        "--paging-phase-id",
+        default=None,
+        help="Walk an already seeded phase instead of seeding --paging-tasks new tasks"
+    )
+    parser.add_argument(
+        "--load",
+        action="store_true",
+        help="Run the goal/phase/task/update chain as concurrent virtual users"
+    )
+    parser.add_argument(
+        "--soak",
+        action="store_true",
+        help="Drive steady mixed traffic for --duration and report latency and server memory trends"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=SOAK_RATE,
+        help=f"Soak mode: total requests per second (default: {SOAK_RATE:.0f})"
+    )
+    parser.add_argument(
+        "--window",
+        type=float,
+        default=SOAK_WINDOW,
+        help=f"Soak mode: seconds per reporting window (default: {SOAK_WINDOW:.0f})"
+    )
+    parser.add_argument(
+        "--server-pid",
+        type=int,
+        default=None,
+        help="Soak mode: PID of the local server process to sample RSS and CPU from"
+    )
+    parser.add_argument(
+        "--server-match",
+        default="next-server",
+        help="Soak mode: find the server process by this command-line text when --server-pid is "
+             "not set (default: next-server)"
+    )
+    parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=MEMORY_THRESHOLD,
+        help=f"Soak mode: flag server RSS growth above this percent (default: {MEMORY_THRESHOLD:.0f})"
+    )
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=None,
+        help="Concurrent virtual users in load mode (default: 10), or workers in soak mode (default: 4)"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Load mode: run for this many seconds instead of a fixed iteration count"
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=None,
+        help="Load mode: chains per virtual user (default: 5 when --duration is not set)"
+    )
+    parser.add_argument(
+        "--keys-file",
+        default=None,
+        help="Load mode: spread virtual users over the API keys in this file, one per line"
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.0,
+        help="Load mode: seconds each virtual user waits between chains (default: 0)"
+    )
+    parser.add_argument(
+        "--noisy-users",
+        type=int,
+        default=0,
+        help="Load mode: extra users flooding one key from halfway through --duration"
+    )
+    parser.add_argument(
+        "--noisy-key",
+        default=None,
+        help="API key used by --noisy-users (default: --api-key)"
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=None,
+        help=f"Max pooled keep-alive connections (default: {POOL_SIZE}, or --users in load mode)"
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=RETRIES,
+        help=f"Retries for failed connections and 502/503/504 on idempotent requests (default: {RETRIES})"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=TIMEOUT,
+        help=f"Per-request timeout in seconds (default: {TIMEOUT:.0f})"
+    )
+    parser.add_argument(
+        "--results-file",
+        default=None,
+        help="Write per-request timings to this file (.json or .csv)"
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        default=None,
+        help="Compare two results files and flag endpoints that regressed"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD,
+        help=f"Regression threshold in percent for --compare and soak latency trends "
+             f"(default: {REGRESSION_THRESHOLD:.0f})"
+    )
+    parser.add_argument(
+        "--metric",
+        choices=["p50", "p95", "p99", "mean"],
+        default="p95",
+        help="Latency statistic used by --compare (default: p95)"
+    )
     
     args = parser.parse_args()
     
+    if args.compare:
+        exit(compare_results(args.compare[0], args.compare[1], args.threshold, args.metric))
+    
     # Update headers with provided API key
     headers = {
         "Content-Type": "application/json",
         "X-API-Key": args.api_key
     }
     
-    runner = APITestRunner(args.base_url, headers)
+    if args.soak:
+        if not args.duration:
+            parser.error("--soak needs --duration (seconds)")
+        pid = args.server_pid or ProcessSampler.find(args.server_match)
+        if pid is None:
+            print(f"No local process matching {args.server_match!r}; server memory and CPU won't be sampled")
+        soak_runner = SoakTestRunner(
+            args.base_url,
+            headers,
+            duration=args.duration,
+            rate=args.rate,
+            users=args.users or 4,
+            window=args.window,
+            habit_id=args.habit_id,
+            sampler=ProcessSampler(pid) if pid else None,
+            latency_threshold=args.threshold,
+            memory_threshold=args.memory_threshold,
+            session=create_session(pool_size=args.pool_size or args.users or 4, retries=args.retries),
+            timeout=args.timeout
+        )
+        exit_code = soak_runner.run()
+        if args.results_file:
+            soak_runner.write_results(args.results_file)
+        exit(exit_code)
+    
+    if args.load:
+        args.users = args.users or 10
+        if args.noisy_users and not args.duration:
+            parser.error("--noisy-users needs --duration")
+        noisy_key = args.noisy_key or args.api_key
+        keys = [args.api_key]
+        if args.keys_file:
+            with open(args.keys_file) as f:
+                keys = [line.strip() for line in f if line.strip()]
+        if args.noisy_users:
+            keys = [key for key in keys if key != noisy_key]
+            if not keys:
+                parser.error("--noisy-users needs other keys for the regular users (--keys-file)")
+        session = create_session(
+            pool_size=args.pool_size or max(args.users + args.noisy_users, 1),
+            retries=args.retries
+        )
+        load_runner = LoadTestRunner(
+            args.base_url,
+            headers,
+            users=args.users,
+            duration=args.duration,
+            iterations=args.iterations,
+            session=session,
+            timeout=args.timeout,
+            keys=keys,
+            think_time=args.think_time,
+            noisy_key=noisy_key,
+            noisy_users=args.noisy_users
+        )
+        exit_code = load_runner.run()
+        if args.results_file:
+            load_runner.write_results(args.results_file)
+        exit(exit_code)
+    
+    session = create_session(pool_size=args.pool_size or POOL_SIZE, retries=args.retries)
+    runner = APITestRunner(args.base_url, headers, session=session, timeout=args.timeout)
     
     if args.test == "all":
         exit_code = runner.run_all_tests(habit_id=args.habit_id)
@@ -499,15 +2330,33 @@ def main():
     elif args.test == "habit":
         if args.habit_id:
             runner.test_update_habit(args.habit_id)
+            runner.test_update_habit_bulk(args.habit_id)
         else:
             print("Error: --habit-id is required for habit test")
             exit_code = 1
         exit_code = runner.print_summary()
+    elif args.test == "batch":
+        runner.test_batch_goal_tree()
+        runner.test_batch_tasks()
+        exit_code = runner.print_summary()
+    elif args.test == "paging":
+        runner.test_paging(args.paging_tasks, args.page_size, args.paging_phase_id)
+        exit_code = runner.print_summary()
+    elif args.test == "dashboard":
+        runner.test_dashboard()
+        exit_code = runner.print_summary()
+    elif args.test == "idempotency":
+        runner.test_idempotency()
+        exit_code = runner.print_summary()
     elif args.test == "auth":
         runner.test_unauthorized_access()
         runner.test_invalid_api_key()
+        runner.test_warm_api_key()
         exit_code = runner.print_summary()
     
+    if args.results_file:
+        runner.write_results(args.results_file)
+    
     exit(exit_code)
 
 